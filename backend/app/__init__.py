@@ -157,6 +157,14 @@ def create_app(test_config=None):
     except Exception as e:
         logger.error(f"Failed to initialize Hyperliquid scheduler: {str(e)}")
     
+    # Initialize trade watch engine for waiting/active AI trades
+    try:
+        from services.trade_watch_service import auto_start_trade_watch
+        auto_start_trade_watch()
+        logger.info("Trade watch initialized")
+    except Exception as e:
+        logger.error(f"Failed to initialize trade watch: {str(e)}")
+    
     # Initialize Macro Sentiment scanner
     try:
         from services.macro_scanner_service import auto_start_scanner
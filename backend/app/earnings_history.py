@@ -5,6 +5,7 @@ import logging
 from typing import Dict, List, Any, Optional, Tuple
 from app.utils import convert_numpy_types
 from app.market_data import market_data
+from app.earnings_history_store import earnings_history_store
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -29,13 +30,12 @@ def get_earnings_history(ticker: str, years: int = 7) -> Dict[str, Any]:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=years * 365)
         
-        # Get earnings dates
-        earnings_dates = market_data.get_historical_earnings_dates(ticker, start_date)
+        # Get earnings dates and daily closes from the local store,
+        # which only fetches data newer than what it already has
+        earnings_dates, historical_prices = earnings_history_store.get_history(ticker, start_date, end_date)
         if not earnings_dates:
             return {"error": f"No earnings data found for {ticker}"}
         
-        # Get historical prices
-        historical_prices = get_historical_prices(ticker, start_date, end_date)
         if historical_prices is None:
             return {"error": f"Failed to retrieve historical price data for {ticker}"}
         
@@ -83,47 +83,56 @@ def calculate_post_earnings_performance(earnings_dates: List[str],
     Returns:
         List of dictionaries with date and performance data
     """
-    performance_data = []
-    
-    for earnings_date in earnings_dates:
-        try:
-            # Convert string date to datetime
-            earnings_datetime = pd.to_datetime(earnings_date)
-            
-            # Find the next trading day
-            next_day = earnings_datetime + pd.Timedelta(days=1)
-            while next_day not in historical_prices.index:
-                next_day += pd.Timedelta(days=1)
-                # If we've looked 7 days ahead and still no trading day, skip this earnings date
-                if (next_day - earnings_datetime).days > 7:
-                    logger.warning(f"Could not find trading day after earnings on {earnings_date}")
-                    break
-            
-            # Find the previous trading day
-            prev_day = earnings_datetime
-            while prev_day not in historical_prices.index:
-                prev_day -= pd.Timedelta(days=1)
-                # If we've looked 7 days back and still no trading day, skip this earnings date
-                if (earnings_datetime - prev_day).days > 7:
-                    logger.warning(f"Could not find trading day before earnings on {earnings_date}")
-                    break
-            
-            # If we found both days in the price data
-            if next_day in historical_prices.index and prev_day in historical_prices.index:
-                # Calculate percentage change
-                prev_close = historical_prices.loc[prev_day, 'Close']
-                next_close = historical_prices.loc[next_day, 'Close']
-                percent_change = ((next_close - prev_close) / prev_close) * 100
-                
-                # Add to performance data
-                performance_data.append({
-                    "earnings_date": earnings_date,
-                    "next_trading_day": next_day.strftime('%Y-%m-%d'),
-                    "percent_change": round(percent_change, 2)
-                })
-                
-        except Exception as e:
-            logger.error(f"Error calculating performance for earnings date {earnings_date}: {str(e)}")
+    if not earnings_dates or historical_prices is None or historical_prices.empty:
+        return []
+    
+    # Daily closes as a sorted trading-day index and a flat float array
+    closes = historical_prices['Close']
+    if isinstance(closes, pd.DataFrame):
+        closes = closes.iloc[:, 0]
+    closes = closes.sort_index()
+    trading_days = pd.DatetimeIndex(closes.index).tz_localize(None).normalize().values
+    close_values = closes.to_numpy(dtype=float)
+    
+    earnings = pd.to_datetime(pd.Series(earnings_dates), errors='coerce')
+    valid_dates = earnings.notna().to_numpy()
+    if not valid_dates.all():
+        logger.warning(f"Skipping {int((~valid_dates).sum())} unparseable earnings dates")
+    earnings_array = earnings[valid_dates].to_numpy(dtype='datetime64[ns]')
+    earnings_strings = np.asarray(earnings_dates, dtype=object)[valid_dates]
+    
+    # First trading day strictly after the earnings date and the last one on or before it
+    next_idx = np.searchsorted(trading_days, earnings_array, side='right')
+    prev_idx = next_idx - 1
+    
+    # Only use days within a week of the announcement
+    max_gap = np.timedelta64(7, 'D')
+    has_next = next_idx < len(trading_days)
+    has_prev = prev_idx >= 0
+    safe_next = np.minimum(next_idx, len(trading_days) - 1)
+    safe_prev = np.maximum(prev_idx, 0)
+    has_next &= (trading_days[safe_next] - earnings_array) <= max_gap
+    has_prev &= (earnings_array - trading_days[safe_prev]) <= max_gap
+    
+    for missing_date in earnings_strings[~has_next]:
+        logger.warning(f"Could not find trading day after earnings on {missing_date}")
+    for missing_date in earnings_strings[has_next & ~has_prev]:
+        logger.warning(f"Could not find trading day before earnings on {missing_date}")
+    
+    found = has_next & has_prev
+    prev_close = close_values[safe_prev[found]]
+    next_close = close_values[safe_next[found]]
+    percent_changes = np.round((next_close - prev_close) / prev_close * 100, 2)
+    next_days = pd.DatetimeIndex(trading_days[safe_next[found]]).strftime('%Y-%m-%d')
+    
+    performance_data = [
+        {
+            "earnings_date": earnings_date,
+            "next_trading_day": next_day,
+            "percent_change": float(percent_change)
+        }
+        for earnings_date, next_day, percent_change in zip(earnings_strings[found], next_days, percent_changes)
+    ]
     
     # Sort by earnings date
     performance_data.sort(key=lambda x: x["earnings_date"])
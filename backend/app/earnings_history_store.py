@@ -0,0 +1,309 @@
+"""
+Earnings History Store Module
+
+This module persists historical earnings dates and daily closing prices per
+ticker in a local SQLite database so that earnings history lookups do not
+re-download years of data on every request.
+
+Only closes newer than the last stored trading day are fetched from the
+market data provider; earnings dates are replaced as a whole, since the
+provider's list includes scheduled dates that may move. Each ticker is
+refreshed at most once per refresh interval.
+"""
+
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# How often a ticker's stored data is checked against the provider
+PRICE_REFRESH_INTERVAL = timedelta(hours=6)
+EARNINGS_REFRESH_INTERVAL = timedelta(hours=24)
+
+
+class EarningsHistoryStore:
+    """
+    Local store for per-ticker earnings dates and daily closes.
+
+    Data is kept in SQLite and refreshed incrementally: the first lookup for a
+    ticker downloads the requested range, later lookups only download the days
+    after the last stored trading day. Earnings dates are refetched for the
+    stored window and replaced.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, provider=None,
+                 price_refresh_interval: timedelta = PRICE_REFRESH_INTERVAL,
+                 earnings_refresh_interval: timedelta = EARNINGS_REFRESH_INTERVAL):
+        """
+        Initialize the store.
+
+        Args:
+            db_path (Optional[str]): Path to SQLite database file
+            provider: Market data provider (defaults to the configured app provider)
+            price_refresh_interval (timedelta): Minimum time between price refreshes
+            earnings_refresh_interval (timedelta): Minimum time between earnings date refreshes
+        """
+        self.db_path = db_path or os.path.join(os.path.dirname(__file__), '..', 'instance', 'earnings_history.db')
+        self._provider = provider
+        self.price_refresh_interval = price_refresh_interval
+        self.earnings_refresh_interval = earnings_refresh_interval
+        self.db_lock = Lock()
+        self._ticker_locks: Dict[str, Lock] = {}
+        self._ensure_database()
+
+    @property
+    def provider(self):
+        """Market data provider, resolved lazily to avoid import-time API setup."""
+        if self._provider is None:
+            from app.market_data import market_data
+            self._provider = market_data
+        return self._provider
+
+    def _ensure_database(self):
+        """Ensure the database and tables exist."""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS earnings_dates (
+                    ticker TEXT NOT NULL,
+                    earnings_date TEXT NOT NULL,
+                    PRIMARY KEY (ticker, earnings_date)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS daily_closes (
+                    ticker TEXT NOT NULL,
+                    trade_date TEXT NOT NULL,
+                    close REAL NOT NULL,
+                    PRIMARY KEY (ticker, trade_date)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    ticker TEXT PRIMARY KEY,
+                    first_price_date TEXT,
+                    last_price_date TEXT,
+                    prices_refreshed_at TEXT,
+                    earnings_start_date TEXT,
+                    earnings_refreshed_at TEXT
+                )
+            ''')
+
+            conn.commit()
+
+    def _get_ticker_lock(self, ticker: str) -> Lock:
+        """Get the lock serializing refreshes for a single ticker."""
+        with self.db_lock:
+            if ticker not in self._ticker_locks:
+                self._ticker_locks[ticker] = Lock()
+            return self._ticker_locks[ticker]
+
+    def _get_sync_state(self, conn: sqlite3.Connection, ticker: str) -> Dict[str, Optional[str]]:
+        """Get the stored sync state for a ticker (empty dict if never synced)."""
+        conn.row_factory = sqlite3.Row
+        row = conn.execute('SELECT * FROM sync_state WHERE ticker = ?', (ticker,)).fetchone()
+        return dict(row) if row else {}
+
+    @staticmethod
+    def _is_stale(refreshed_at: Optional[str], interval: timedelta, now: datetime) -> bool:
+        """Check whether a refresh timestamp is older than the given interval."""
+        if not refreshed_at:
+            return True
+        return now - datetime.fromisoformat(refreshed_at) >= interval
+
+    @staticmethod
+    def _extract_closes(prices: Optional[pd.DataFrame]) -> List[Tuple[str, float]]:
+        """
+        Extract (YYYY-MM-DD, close) pairs from a provider price frame.
+
+        Handles both flat columns and the (field, ticker) MultiIndex columns
+        returned by newer yfinance versions.
+        """
+        if prices is None or prices.empty or 'Close' not in prices.columns.get_level_values(0):
+            return []
+
+        closes = prices['Close']
+        if isinstance(closes, pd.DataFrame):
+            closes = closes.iloc[:, 0]
+        closes = closes.dropna()
+
+        dates = pd.to_datetime(closes.index).strftime('%Y-%m-%d')
+        return list(zip(dates, closes.astype(float).tolist()))
+
+    def _refresh_prices(self, ticker: str, start_date: datetime, end_date: datetime,
+                        state: Dict[str, Optional[str]], now: datetime):
+        """Download the missing part of the daily close history for a ticker."""
+        start_str = start_date.strftime('%Y-%m-%d')
+        first_price_date = state.get('first_price_date')
+        last_price_date = state.get('last_price_date')
+
+        if not first_price_date or start_str < first_price_date:
+            # Nothing stored yet, or the requested window reaches further back
+            fetch_start = start_date
+        elif self._is_stale(state.get('prices_refreshed_at'), self.price_refresh_interval, now):
+            fetch_start = datetime.strptime(last_price_date, '%Y-%m-%d') + timedelta(days=1)
+        else:
+            return
+
+        rows = []
+        if fetch_start.date() < end_date.date():
+            logger.info(f"Fetching daily prices for {ticker} since {fetch_start.strftime('%Y-%m-%d')}")
+            rows = self._extract_closes(self.provider.get_historical_prices(ticker, fetch_start, end_date))
+
+        with sqlite3.connect(self.db_path) as conn:
+            if rows:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO daily_closes (ticker, trade_date, close) VALUES (?, ?, ?)',
+                    [(ticker, trade_date, close) for trade_date, close in rows]
+                )
+
+            stored_first, stored_last = conn.execute(
+                'SELECT MIN(trade_date), MAX(trade_date) FROM daily_closes WHERE ticker = ?', (ticker,)
+            ).fetchone()
+            if stored_first is None:
+                # Provider returned nothing; retry on the next lookup
+                return
+
+            conn.execute('''
+                INSERT INTO sync_state (ticker, first_price_date, last_price_date, prices_refreshed_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(ticker) DO UPDATE SET
+                    first_price_date = excluded.first_price_date,
+                    last_price_date = excluded.last_price_date,
+                    prices_refreshed_at = excluded.prices_refreshed_at
+            ''', (ticker, min(stored_first, start_str), stored_last, now.isoformat()))
+            conn.commit()
+
+    def _refresh_earnings_dates(self, ticker: str, start_date: datetime,
+                                state: Dict[str, Optional[str]], now: datetime):
+        """Replace a ticker's stored earnings dates with the provider's current list."""
+        start_str = start_date.strftime('%Y-%m-%d')
+        earnings_start_date = state.get('earnings_start_date')
+
+        covers_window = earnings_start_date is not None and earnings_start_date <= start_str
+        if covers_window and not self._is_stale(state.get('earnings_refreshed_at'),
+                                                self.earnings_refresh_interval, now):
+            return
+
+        # The provider returns the whole history on every call, and its list includes the next
+        # scheduled date, which may later move or pass; refetching the full stored window and
+        # replacing it keeps quarters announced after a stored future date, and drops stale ones
+        new_start = min(earnings_start_date, start_str) if earnings_start_date else start_str
+        logger.info(f"Fetching earnings dates for {ticker} since {new_start}")
+        earnings_dates = self.provider.get_historical_earnings_dates(
+            ticker, datetime.strptime(new_start, '%Y-%m-%d')
+        ) or []
+
+        with sqlite3.connect(self.db_path) as conn:
+            if earnings_dates:
+                conn.execute('DELETE FROM earnings_dates WHERE ticker = ?', (ticker,))
+                conn.executemany(
+                    'INSERT OR IGNORE INTO earnings_dates (ticker, earnings_date) VALUES (?, ?)',
+                    [(ticker, earnings_date) for earnings_date in earnings_dates]
+                )
+            elif not covers_window:
+                # Provider returned nothing for a new window; retry on the next lookup
+                return
+
+            conn.execute('''
+                INSERT INTO sync_state (ticker, earnings_start_date, earnings_refreshed_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(ticker) DO UPDATE SET
+                    earnings_start_date = excluded.earnings_start_date,
+                    earnings_refreshed_at = excluded.earnings_refreshed_at
+            ''', (ticker, new_start, now.isoformat()))
+            conn.commit()
+
+    def refresh(self, ticker: str, start_date: datetime, end_date: datetime):
+        """
+        Bring the stored data for a ticker up to date for the given window.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (datetime): Start of the requested history window
+            end_date (datetime): End of the requested history window
+        """
+        with self._get_ticker_lock(ticker):
+            now = datetime.now()
+            with sqlite3.connect(self.db_path) as conn:
+                state = self._get_sync_state(conn, ticker)
+
+            self._refresh_earnings_dates(ticker, start_date, state, now)
+            self._refresh_prices(ticker, start_date, end_date, state, now)
+
+    def get_earnings_dates(self, ticker: str, start_date: datetime) -> List[str]:
+        """
+        Get stored earnings dates for a ticker on or after start_date.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (datetime): Start date for historical data
+
+        Returns:
+            List of earnings dates in YYYY-MM-DD format, sorted ascending
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                'SELECT earnings_date FROM earnings_dates WHERE ticker = ? AND earnings_date >= ? '
+                'ORDER BY earnings_date',
+                (ticker, start_date.strftime('%Y-%m-%d'))
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_daily_closes(self, ticker: str, start_date: datetime, end_date: datetime) -> Optional[pd.DataFrame]:
+        """
+        Get stored daily closes for a ticker as a DataFrame indexed by date.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (datetime): Start date for historical data
+            end_date (datetime): End date for historical data
+
+        Returns:
+            DataFrame with a 'Close' column, or None if nothing is stored
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                'SELECT trade_date, close FROM daily_closes WHERE ticker = ? AND trade_date >= ? AND trade_date <= ? '
+                'ORDER BY trade_date',
+                (ticker, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        dates, closes = zip(*rows)
+        return pd.DataFrame({'Close': closes}, index=pd.DatetimeIndex(pd.to_datetime(dates), name='Date'))
+
+    def get_history(self, ticker: str, start_date: datetime,
+                    end_date: datetime) -> Tuple[List[str], Optional[pd.DataFrame]]:
+        """
+        Refresh a ticker if needed and return its stored earnings dates and closes.
+
+        Args:
+            ticker (str): Stock ticker symbol
+            start_date (datetime): Start date for historical data
+            end_date (datetime): End date for historical data
+
+        Returns:
+            Tuple of (earnings dates, daily close DataFrame or None)
+        """
+        ticker = ticker.upper()
+        self.refresh(ticker, start_date, end_date)
+        return (self.get_earnings_dates(ticker, start_date),
+                self.get_daily_closes(ticker, start_date, end_date))
+
+
+# Global instance
+earnings_history_store = EarningsHistoryStore()
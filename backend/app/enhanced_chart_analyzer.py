@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 import os
 
+from services.http_session_pool import get_http_pool
+
 logger = logging.getLogger(__name__)
 
 class EnhancedChartAnalyzer:
@@ -426,7 +428,7 @@ EXAMPLE for multiple strategies:
                 ]
             }
             
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=45)
+            response = get_http_pool().post(self.api_url, headers=headers, json=payload, timeout=45)
             
             if response.status_code != 200:
                 logger.error(f"Claude API error in {stage}: {response.status_code} - {response.text}")
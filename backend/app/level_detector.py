@@ -6,9 +6,12 @@ and market data, providing level-based trading insights.
 """
 
 import logging
+import time
+from threading import Lock
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import yfinance as yf
 from app.chart_context import chart_context_manager
 
@@ -22,9 +25,71 @@ class LevelDetector:
     to provide comprehensive level-based insights.
     """
     
-    def __init__(self):
-        """Initialize the level detector."""
+    # yfinance periods used to serve calculate_level_strength lookbacks from the history cache
+    LOOKBACK_PERIODS = [(30, '1mo'), (90, '3mo'), (180, '6mo'), (365, '1y'), (730, '2y'), (1825, '5y')]
+    
+    def __init__(self, cache_ttl: int = 300):
+        """
+        Initialize the level detector.
+        
+        Args:
+            cache_ttl (int): Seconds to keep fetched history and detected levels per (ticker, period)
+        """
         self.context_manager = chart_context_manager
+        
+        # Memoized price history and technical levels keyed by (ticker, period)
+        self._history_cache = {}
+        self._levels_cache = {}
+        self._cache_ttl = cache_ttl
+        self._cache_lock = Lock()
+    
+    def _get_cached(self, cache: Dict, key: Tuple[str, str]):
+        """Get a cached value if it is still within the TTL."""
+        with self._cache_lock:
+            if key in cache:
+                value, timestamp = cache[key]
+                if time.time() - timestamp < self._cache_ttl:
+                    return value
+                del cache[key]
+        return None
+    
+    def _set_cached(self, cache: Dict, key: Tuple[str, str], value):
+        """Store a value in one of the TTL caches."""
+        with self._cache_lock:
+            cache[key] = (value, time.time())
+    
+    def clear_cache(self, ticker: Optional[str] = None):
+        """
+        Clear memoized history and levels.
+        
+        Args:
+            ticker (Optional[str]): Only clear entries for this ticker (default: all)
+        """
+        with self._cache_lock:
+            for cache in (self._history_cache, self._levels_cache):
+                if ticker is None:
+                    cache.clear()
+                else:
+                    for key in [k for k in cache if k[0] == ticker.upper()]:
+                        del cache[key]
+    
+    def get_history(self, ticker: str, period: str = "6mo"):
+        """
+        Get daily price history for a ticker, memoized per (ticker, period).
+        
+        Args:
+            ticker (str): Stock ticker symbol
+            period (str): Historical data period
+            
+        Returns:
+            DataFrame: Historical OHLCV data (may be empty)
+        """
+        key = (ticker.upper(), period)
+        hist = self._get_cached(self._history_cache, key)
+        if hist is None:
+            hist = yf.Ticker(ticker).history(period=period)
+            self._set_cached(self._history_cache, key, hist)
+        return hist
     
     def extract_levels_from_analysis(self, analysis_data: Dict[str, Any]) -> Dict[str, List[float]]:
         """
@@ -104,9 +169,13 @@ class LevelDetector:
             Dict[str, List[float]]: Detected technical levels
         """
         try:
+            key = (ticker.upper(), period)
+            cached_levels = self._get_cached(self._levels_cache, key)
+            if cached_levels is not None:
+                return {level_type: list(levels) for level_type, levels in cached_levels.items()}
+            
             # Get historical data
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=period)
+            hist = self.get_history(ticker, period)
             
             if hist.empty:
                 logger.warning(f"No historical data for {ticker}")
@@ -133,8 +202,9 @@ class LevelDetector:
             for level_type in levels:
                 levels[level_type] = self._clean_levels(levels[level_type])
             
+            self._set_cached(self._levels_cache, key, levels)
             logger.info(f"Detected {len(levels['support'])} support and {len(levels['resistance'])} resistance levels for {ticker}")
-            return levels
+            return {level_type: list(values) for level_type, values in levels.items()}
             
         except Exception as e:
             logger.error(f"Error detecting technical levels for {ticker}: {str(e)}")
@@ -151,29 +221,25 @@ class LevelDetector:
             Dict[str, List[float]]: Pivot support and resistance levels
         """
         try:
-            highs = hist_data['High'].values
-            lows = hist_data['Low'].values
-            
-            support_levels = []
-            resistance_levels = []
+            highs = hist_data['High'].to_numpy(dtype=float)
+            lows = hist_data['Low'].to_numpy(dtype=float)
             
             # Find local minima (support) and maxima (resistance)
             window = 5  # Look for pivots in 5-day windows
+            span = 2 * window + 1
             
-            for i in range(window, len(lows) - window):
-                # Check for local minimum (support)
-                if all(lows[i] <= lows[i-j] for j in range(1, window+1)) and \
-                   all(lows[i] <= lows[i+j] for j in range(1, window+1)):
-                    support_levels.append(lows[i])
-                
-                # Check for local maximum (resistance)
-                if all(highs[i] >= highs[i-j] for j in range(1, window+1)) and \
-                   all(highs[i] >= highs[i+j] for j in range(1, window+1)):
-                    resistance_levels.append(highs[i])
+            if len(lows) < span:
+                return {'support': [], 'resistance': []}
+            
+            # A bar is a pivot when it equals the extreme of the window centred on it
+            center_lows = lows[window:len(lows) - window]
+            center_highs = highs[window:len(highs) - window]
+            is_support = center_lows == sliding_window_view(lows, span).min(axis=1)
+            is_resistance = center_highs == sliding_window_view(highs, span).max(axis=1)
             
             return {
-                'support': support_levels,
-                'resistance': resistance_levels
+                'support': center_lows[is_support].tolist(),
+                'resistance': center_highs[is_resistance].tolist()
             }
             
         except Exception as e:
@@ -192,24 +258,27 @@ class LevelDetector:
         """
         try:
             # Find high volume days
-            volume_threshold = hist_data['Volume'].quantile(0.8)
-            high_volume_data = hist_data[hist_data['Volume'] >= volume_threshold]
+            volume = hist_data['Volume'].to_numpy(dtype=float)
+            volume_threshold = np.nanquantile(volume, 0.8)
+            high_volume = volume >= volume_threshold
             
-            if high_volume_data.empty:
+            if not high_volume.any():
                 return {'support': [], 'resistance': []}
             
-            # Use VWAP-like calculation for volume levels
-            vwap_levels = []
-            for _, row in high_volume_data.iterrows():
-                typical_price = (row['High'] + row['Low'] + row['Close']) / 3
-                vwap_levels.append(typical_price)
+            # Use VWAP-like typical price for volume levels
+            typical_prices = (
+                hist_data['High'].to_numpy(dtype=float) +
+                hist_data['Low'].to_numpy(dtype=float) +
+                hist_data['Close'].to_numpy(dtype=float)
+            ) / 3
             
             # Cluster similar levels
-            clustered_levels = self._cluster_levels(vwap_levels)
+            clustered_levels = np.asarray(self._cluster_levels(typical_prices[high_volume]))
+            current_price = hist_data['Close'].iloc[-1]
             
             return {
-                'support': [level for level in clustered_levels if level < hist_data['Close'].iloc[-1]],
-                'resistance': [level for level in clustered_levels if level > hist_data['Close'].iloc[-1]]
+                'support': clustered_levels[clustered_levels < current_price].tolist(),
+                'resistance': clustered_levels[clustered_levels > current_price].tolist()
             }
             
         except Exception as e:
@@ -259,26 +328,30 @@ class LevelDetector:
         Returns:
             List[float]: Clustered levels
         """
-        if not levels:
+        levels = np.sort(np.asarray(levels, dtype=float))
+        levels = levels[~np.isnan(levels)]
+        if levels.size == 0:
             return []
         
-        levels = sorted(levels)
+        # Single sweep over sorted levels, keeping a running sum per cluster
         clustered = []
-        current_cluster = [levels[0]]
+        cluster_sum = levels[0]
+        cluster_count = 1
         
         for level in levels[1:]:
             # Check if level is within tolerance of current cluster
-            cluster_avg = sum(current_cluster) / len(current_cluster)
+            cluster_avg = cluster_sum / cluster_count
             if abs(level - cluster_avg) / cluster_avg <= tolerance:
-                current_cluster.append(level)
+                cluster_sum += level
+                cluster_count += 1
             else:
                 # Finalize current cluster and start new one
-                clustered.append(sum(current_cluster) / len(current_cluster))
-                current_cluster = [level]
+                clustered.append(float(cluster_avg))
+                cluster_sum = level
+                cluster_count = 1
         
         # Add final cluster
-        if current_cluster:
-            clustered.append(sum(current_cluster) / len(current_cluster))
+        clustered.append(float(cluster_sum / cluster_count))
         
         return clustered
     
@@ -408,36 +481,37 @@ class LevelDetector:
             float: Level strength score (0.0 to 1.0)
         """
         try:
-            # Get historical data
-            stock = yf.Ticker(ticker)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=lookback_days)
-            hist = stock.history(start=start_date, end=end_date)
+            # Get historical data from the memoized history for the smallest covering period
+            period = next((p for days, p in self.LOOKBACK_PERIODS if lookback_days <= days), 'max')
+            hist = self.get_history(ticker, period)
             
             if hist.empty:
                 return 0.5  # Default strength
             
+            start_date = datetime.now() - timedelta(days=lookback_days)
+            index = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+            hist = hist[index >= start_date]
+            
             # Count how many times price tested this level
             tolerance = 0.02  # 2% tolerance
-            test_count = 0
-            bounce_count = 0
+            highs = hist['High'].to_numpy(dtype=float)
+            lows = hist['Low'].to_numpy(dtype=float)
+            closes = hist['Close'].to_numpy(dtype=float)
+            
+            # Check if price tested the level
+            if level_type == 'support':
+                tested = (lows <= level_price * (1 + tolerance)) & (lows >= level_price * (1 - tolerance))
+                # Check if it bounced (closed higher)
+                bounced = tested & (closes > level_price)
+            elif level_type == 'resistance':
+                tested = (highs >= level_price * (1 - tolerance)) & (highs <= level_price * (1 + tolerance))
+                # Check if it rejected (closed lower)
+                bounced = tested & (closes < level_price)
+            else:
+                tested = bounced = np.zeros(len(hist), dtype=bool)
             
-            for _, row in hist.iterrows():
-                high, low, close = row['High'], row['Low'], row['Close']
-                
-                # Check if price tested the level
-                if level_type == 'support':
-                    if low <= level_price * (1 + tolerance) and low >= level_price * (1 - tolerance):
-                        test_count += 1
-                        # Check if it bounced (closed higher)
-                        if close > level_price:
-                            bounce_count += 1
-                elif level_type == 'resistance':
-                    if high >= level_price * (1 - tolerance) and high <= level_price * (1 + tolerance):
-                        test_count += 1
-                        # Check if it rejected (closed lower)
-                        if close < level_price:
-                            bounce_count += 1
+            test_count = int(tested.sum())
+            bounce_count = int(bounced.sum())
             
             # Calculate strength based on tests and bounces
             if test_count == 0:
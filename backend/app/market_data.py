@@ -11,11 +11,11 @@ The module uses the MARKET_DATA_SOURCE configuration to determine which source t
 
 import logging
 import pandas as pd
-import requests
 from datetime import datetime, timedelta
 import time
 from typing import Dict, List, Any, Optional, Tuple, Union
 from app.rate_limiter import RateLimiter
+from services.http_session_pool import get_http_pool
 import os
 import importlib
 
@@ -362,7 +362,7 @@ class AlphaVantageProvider(BaseMarketDataProvider):
                 return None
             
             # Make the request
-            response = requests.get(self.base_url, params=params)
+            response = get_http_pool().get(self.base_url, params=params, timeout=30)
             
             # Check for errors
             if response.status_code != 200:
@@ -6,11 +6,12 @@ It integrates with multiple data sources to ensure reliable market data availabi
 """
 
 import yfinance as yf
-import requests
 from flask import Blueprint, request, jsonify
 from datetime import datetime, timedelta
 import logging
 
+from services.http_session_pool import get_http_pool
+
 logger = logging.getLogger(__name__)
 
 market_data_bp = Blueprint('market_data', __name__)
@@ -231,7 +232,7 @@ def fetch_hyperliquid_data(symbol, timeframe, period):
         logger.info(f"🌐 [Hyperliquid] Request body: {request_body}")
         
         # Make API request
-        response = requests.post(
+        response = get_http_pool().post(
             'https://api.hyperliquid.xyz/info',
             json=request_body,
             headers={'Content-Type': 'application/json'},
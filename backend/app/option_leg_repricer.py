@@ -0,0 +1,250 @@
+"""
+Option Leg Repricer - Batch repricing of option spread legs for the Active Trades panel
+
+Reprices the legs of every open spread in one pass: option chains are fetched once per
+unique (ticker, expiration), concurrently under a global limit, and cached for a short
+refresh window. Each chain is indexed by sorted strike so legs are matched with a binary
+search instead of a float mask over the whole chain.
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+import numpy as np
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+# Strikes within this distance of the requested strike are treated as a match
+STRIKE_TOLERANCE = 0.01
+
+
+class ChainSideIndex:
+    """Strike-sorted view of one side (calls or puts) of an option chain."""
+
+    def __init__(self, options_df):
+        if options_df is None or options_df.empty:
+            self.strikes = np.empty(0)
+            self.prices = np.empty(0)
+            return
+
+        def column(name):
+            if name in options_df.columns:
+                return options_df[name].to_numpy(dtype=float)
+            return np.zeros(len(options_df))
+
+        strikes = column('strike')
+        bid, ask, last_price = column('bid'), column('ask'), column('lastPrice')
+
+        # Mid price when both sides are quoted, otherwise last price, otherwise 0
+        with np.errstate(invalid='ignore'):
+            prices = np.where((bid > 0) & (ask > 0), (bid + ask) / 2,
+                              np.where(last_price > 0, last_price, 0.0))
+
+        # Stable sort keeps the chain's own order for duplicate strikes
+        order = np.argsort(strikes, kind='stable')
+        self.strikes = strikes[order]
+        self.prices = prices[order]
+
+    def lookup(self, strike: float) -> Optional[float]:
+        """
+        Find the price for a strike in O(log n).
+
+        Returns:
+            Optional[float]: Price for the strike, or None if the strike is not listed
+        """
+        i = np.searchsorted(self.strikes, strike - STRIKE_TOLERANCE, side='right')
+        if i < len(self.strikes) and self.strikes[i] < strike + STRIKE_TOLERANCE:
+            return float(self.prices[i])
+        return None
+
+
+class ChainIndex:
+    """Indexed calls and puts for one (ticker, expiration) option chain."""
+
+    def __init__(self, option_chain):
+        self.sides = {
+            'call': ChainSideIndex(option_chain.calls),
+            'put': ChainSideIndex(option_chain.puts)
+        }
+
+    def lookup(self, option_type: str, strike: float) -> Optional[float]:
+        """Find the price of a call or put strike (raises ValueError for other types)."""
+        if option_type not in self.sides:
+            raise ValueError(f"Invalid option type: {option_type}")
+        return self.sides[option_type].lookup(strike)
+
+
+class OptionLegRepricer:
+    """
+    Batch repricing service for option spread legs.
+
+    Chain fetches are shared: concurrent and repeated requests for the same
+    (ticker, expiration) within the cache window reuse one download.
+    """
+
+    def __init__(self, cache_ttl: Optional[int] = None, max_concurrent_fetches: Optional[int] = None,
+                 ticker_factory: Callable[[str], Any] = None):
+        """
+        Initialize the repricer.
+
+        Args:
+            cache_ttl: Seconds a fetched chain is reused (default OPTION_CHAIN_CACHE_SECONDS or 30)
+            max_concurrent_fetches: Global limit on concurrent chain downloads
+                (default OPTION_CHAIN_MAX_CONCURRENT_FETCHES or 8)
+            ticker_factory: Callable returning a yfinance-like Ticker for a symbol
+        """
+        self.cache_ttl = cache_ttl if cache_ttl is not None else int(os.getenv('OPTION_CHAIN_CACHE_SECONDS', '30'))
+        self.max_concurrent_fetches = max_concurrent_fetches or int(os.getenv('OPTION_CHAIN_MAX_CONCURRENT_FETCHES', '8'))
+        self.ticker_factory = ticker_factory or yf.Ticker
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_fetches,
+                                            thread_name_prefix="OptionChainFetch")
+        self._chain_cache: Dict[Tuple[str, str], Tuple[Future, float]] = {}
+        self._cache_lock = threading.Lock()
+
+        # Fetch statistics
+        self.chain_fetches = 0
+        self.cache_hits = 0
+
+    def _fetch_chain(self, stock, ticker: str, expiration: str) -> ChainIndex:
+        """Download and index one option chain (runs on the fetch pool)."""
+        logger.info(f"Fetching option chain for {ticker} expiration {expiration}")
+        return ChainIndex(stock.option_chain(expiration))
+
+    def _get_chains(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Future]:
+        """
+        Get chain futures for (ticker, expiration) keys, submitting fetches for missing ones.
+
+        Args:
+            keys: Unique (ticker, expiration) pairs
+
+        Returns:
+            Dict mapping each key to a Future resolving to its ChainIndex
+        """
+        now = time.time()
+        futures = {}
+        tickers = {}
+
+        with self._cache_lock:
+            for key in keys:
+                cached = self._chain_cache.get(key)
+                if cached is not None:
+                    future, fetched_at = cached
+                    failed = future.done() and future.exception() is not None
+                    if not failed and (not future.done() or now - fetched_at < self.cache_ttl):
+                        self.cache_hits += 1
+                        futures[key] = future
+                        continue
+
+                ticker, expiration = key
+                if ticker not in tickers:
+                    tickers[ticker] = self.ticker_factory(ticker)
+                future = self._executor.submit(self._fetch_chain, tickers[ticker], ticker, expiration)
+                self._chain_cache[key] = (future, now)
+                self.chain_fetches += 1
+                futures[key] = future
+
+            # Drop expired entries so the cache only holds the current refresh window
+            for key in [k for k, (f, t) in self._chain_cache.items() if f.done() and now - t >= self.cache_ttl]:
+                del self._chain_cache[key]
+
+        return futures
+
+    def reprice_spreads(self, spreads: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Reprice the legs of many spreads across tickers.
+
+        Args:
+            spreads (List[Dict]): Spreads to reprice, each with:
+                - id: spread identifier (used as result key)
+                - ticker: stock ticker symbol
+                - contracts: option contracts as accepted by fetch_specific_option_prices
+
+        Returns:
+            Dict mapping spread id to a result in the fetch_specific_option_prices format
+        """
+        timestamp = datetime.now().isoformat()
+        keys = list(dict.fromkeys(
+            (spread['ticker'].upper(), contract['expiration'])
+            for spread in spreads for contract in spread['contracts']
+        ))
+        chains = self._get_chains(keys)
+
+        results = {}
+        for spread in spreads:
+            ticker = spread['ticker'].upper()
+            result = {
+                'success': True,
+                'prices': {},
+                'errors': [],
+                'timestamp': timestamp,
+                'ticker': ticker
+            }
+
+            for leg_index, contract in enumerate(spread['contracts']):
+                exp_date = contract['expiration']
+                try:
+                    chain = chains[(ticker, exp_date)].result()
+                except Exception as e:
+                    error_msg = f"Error fetching option chain for {exp_date}: {str(e)}"
+                    if error_msg not in result['errors']:
+                        result['errors'].append(error_msg)
+                        logger.error(error_msg)
+                    continue
+
+                try:
+                    option_type = contract['optionType'].lower()
+                    strike = float(contract['strike'])
+                    current_price = chain.lookup(option_type, strike)
+
+                    if current_price is None:
+                        error_msg = f"No {option_type} option found for strike ${strike} on {exp_date}"
+                        result['errors'].append(error_msg)
+                        logger.warning(error_msg)
+                        continue
+
+                    if current_price == 0:
+                        result['errors'].append(f"No valid price data for {option_type} ${strike} {exp_date}")
+
+                    # Store the price with leg index as key
+                    result['prices'][f'leg_{leg_index}'] = round(current_price, 2)
+
+                except Exception as e:
+                    error_msg = f"Error processing leg {leg_index}: {str(e)}"
+                    result['errors'].append(error_msg)
+                    logger.error(error_msg)
+
+            # Set success to False if we have errors and no prices
+            if result['errors'] and not result['prices']:
+                result['success'] = False
+
+            results[str(spread['id'])] = result
+
+        return results
+
+    def clear_cache(self):
+        """Drop all cached chains."""
+        with self._cache_lock:
+            self._chain_cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get chain fetch statistics."""
+        with self._cache_lock:
+            cached_chains = len(self._chain_cache)
+        return {
+            'chain_fetches': self.chain_fetches,
+            'cache_hits': self.cache_hits,
+            'cached_chains': cached_chains,
+            'cache_ttl_seconds': self.cache_ttl,
+            'max_concurrent_fetches': self.max_concurrent_fetches
+        }
+
+
+# Global instance
+option_leg_repricer = OptionLegRepricer()
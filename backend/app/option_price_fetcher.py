@@ -4,11 +4,12 @@ This module is EXCLUSIVELY for the Active Trades panel to fetch real-time prices
 for exact option contracts in a spread.
 """
 
-import yfinance as yf
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
+from app.option_leg_repricer import option_leg_repricer
+
 logger = logging.getLogger(__name__)
 
 def fetch_specific_option_prices(ticker: str, option_contracts: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -34,94 +35,11 @@ def fetch_specific_option_prices(ticker: str, option_contracts: List[Dict[str, A
     """
     
     try:
-        # Initialize yfinance ticker
-        stock = yf.Ticker(ticker)
-        
-        result = {
-            'success': True,
-            'prices': {},
-            'errors': [],
-            'timestamp': datetime.now().isoformat(),
-            'ticker': ticker
-        }
-        
-        # Group contracts by expiration date to minimize API calls
-        contracts_by_expiration = {}
-        for i, contract in enumerate(option_contracts):
-            exp_date = contract['expiration']
-            if exp_date not in contracts_by_expiration:
-                contracts_by_expiration[exp_date] = []
-            contracts_by_expiration[exp_date].append((i, contract))
-        
-        # Fetch option chains for each unique expiration
-        for exp_date, contracts in contracts_by_expiration.items():
-            try:
-                logger.info(f"Fetching option chain for {ticker} expiration {exp_date}")
-                
-                # Get option chain for this expiration
-                option_chain = stock.option_chain(exp_date)
-                
-                # Process each contract for this expiration
-                for leg_index, contract in contracts:
-                    try:
-                        option_type = contract['optionType'].lower()
-                        strike = float(contract['strike'])
-                        
-                        # Get the appropriate option chain (calls or puts)
-                        if option_type == 'call':
-                            options_df = option_chain.calls
-                        elif option_type == 'put':
-                            options_df = option_chain.puts
-                        else:
-                            raise ValueError(f"Invalid option type: {option_type}")
-                        
-                        # Find the exact strike price match
-                        matching_options = options_df[abs(options_df['strike'] - strike) < 0.01]
-                        
-                        if len(matching_options) == 0:
-                            error_msg = f"No {option_type} option found for strike ${strike} on {exp_date}"
-                            result['errors'].append(error_msg)
-                            logger.warning(error_msg)
-                            continue
-                        
-                        # Get the first (and should be only) matching option
-                        option_data = matching_options.iloc[0]
-                        
-                        # Calculate mid price (bid + ask) / 2, fallback to last price
-                        bid = option_data.get('bid', 0)
-                        ask = option_data.get('ask', 0)
-                        last_price = option_data.get('lastPrice', 0)
-                        
-                        if bid > 0 and ask > 0:
-                            current_price = (bid + ask) / 2
-                        elif last_price > 0:
-                            current_price = last_price
-                        else:
-                            current_price = 0
-                            result['errors'].append(f"No valid price data for {option_type} ${strike} {exp_date}")
-                        
-                        # Store the price with leg index as key
-                        result['prices'][f'leg_{leg_index}'] = round(current_price, 2)
-                        
-                        logger.info(f"Found price for leg {leg_index}: {option_type} ${strike} {exp_date} = ${current_price:.2f}")
-                        
-                    except Exception as e:
-                        error_msg = f"Error processing leg {leg_index}: {str(e)}"
-                        result['errors'].append(error_msg)
-                        logger.error(error_msg)
-                        continue
-                        
-            except Exception as e:
-                error_msg = f"Error fetching option chain for {exp_date}: {str(e)}"
-                result['errors'].append(error_msg)
-                logger.error(error_msg)
-                continue
-        
-        # Set success to False if we have errors and no prices
-        if result['errors'] and not result['prices']:
-            result['success'] = False
-            
-        return result
+        # Chains are fetched and cached by the shared batch repricer so single-spread
+        # refreshes and panel-wide refreshes reuse the same downloads
+        return option_leg_repricer.reprice_spreads([
+            {'id': ticker, 'ticker': ticker, 'contracts': option_contracts}
+        ])[ticker]
         
     except Exception as e:
         logger.error(f"Critical error in fetch_specific_option_prices: {str(e)}")
@@ -133,6 +51,62 @@ def fetch_specific_option_prices(ticker: str, option_contracts: List[Dict[str, A
             'ticker': ticker
         }
 
+def fetch_option_prices_batch(trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fetch prices for the option legs of many trades across tickers in one pass.
+    
+    Each trade is validated on its own: valid trades are repriced, and a trade
+    with invalid contracts gets an unsuccessful result listing its errors
+    instead of failing the whole batch.
+    
+    Args:
+        trades (List[Dict]): Trades to reprice, each with:
+            - id: trade identifier (used as result key)
+            - ticker: stock ticker symbol
+            - contracts: option contracts as accepted by fetch_specific_option_prices
+    
+    Returns:
+        Dict containing:
+        - success: bool - False only if no trade could be priced
+        - results: Dict[str, Dict] - fetch_specific_option_prices results keyed by trade id
+        - validation_errors: List[str] - trades skipped for lacking an id or ticker
+        - timestamp: str - when prices were fetched
+    """
+    timestamp = datetime.now().isoformat()
+    valid_trades = []
+    rejected = {}
+    validation_errors = []
+    
+    for i, trade in enumerate(trades):
+        if not isinstance(trade, dict) or not trade.get('ticker') or 'id' not in trade:
+            validation_errors.append(f"Trade {i}: Missing 'id' or 'ticker'")
+            continue
+        
+        try:
+            errors = validate_option_contracts(trade.get('contracts'))
+        except Exception as e:
+            errors = [f"Invalid contract specifications: {str(e)}"]
+        
+        if errors:
+            rejected[str(trade['id'])] = {
+                'success': False,
+                'prices': {},
+                'errors': errors,
+                'timestamp': timestamp,
+                'ticker': str(trade['ticker']).upper()
+            }
+        else:
+            valid_trades.append(trade)
+    
+    results = option_leg_repricer.reprice_spreads(valid_trades) if valid_trades else {}
+    results.update(rejected)
+    return {
+        'success': not (results or validation_errors) or any(r['success'] for r in results.values()),
+        'results': results,
+        'validation_errors': validation_errors,
+        'timestamp': timestamp
+    }
+
 def validate_option_contracts(option_contracts: List[Dict[str, Any]]) -> List[str]:
     """
     Validate option contract specifications.
@@ -3717,7 +3717,8 @@ def model_iv_crush_earnings(front_iv, back_iv, days_to_front_exp, ticker=None):
     }
 
 
-def analyze_options(ticker, run_full_analysis=False, strategy_type=None, earnings_date=None):
+def analyze_options(ticker, run_full_analysis=False, strategy_type=None, earnings_date=None,
+                    include_strategy_availability=False):
     """
     Analyze options data for a given ticker and provide a recommendation.
     
@@ -3726,6 +3727,8 @@ def analyze_options(ticker, run_full_analysis=False, strategy_type=None, earning
         run_full_analysis (bool): Whether to run full strategy analysis
         strategy_type (str, optional): Type of strategy to analyze ('calendar', 'naked', 'ironCondor')
         earnings_date (str, optional): Earnings date in YYYY-MM-DD format for earnings-optimized analysis
+        include_strategy_availability (bool): Whether to add strategyAvailability evaluated from
+            the option chains fetched for this analysis
         
     Returns:
         dict: Analysis results including metrics and recommendation
@@ -3913,6 +3916,12 @@ def analyze_options(ticker, run_full_analysis=False, strategy_type=None, earning
             "timestamp": datetime.now().timestamp()
         }
         
+        if include_strategy_availability:
+            from app.strategy_checker import check_strategies_availability
+            result["strategyAvailability"] = check_strategies_availability(
+                ticker, options_chains=options_chains, current_price=underlying_price
+            )
+        
         # Calculate basic liquidity score for screener display (using improved calculation)
         try:
             # Get the first available expiration for liquidity calculation
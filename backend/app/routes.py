@@ -5,7 +5,7 @@ This module defines the API routes for the options earnings screener.
 Merged from run_direct.py to provide unified Flask app flow.
 """
 
-from flask import Blueprint, jsonify, request, Response
+from flask import Blueprint, jsonify, request, Response, make_response
 import logging
 import concurrent.futures
 import json
@@ -35,7 +35,7 @@ from app.earnings_calendar import (
 from app.data_fetcher import get_stock_info, get_current_price
 from app.rate_limiter import update_rate_limiter_config, yf_rate_limiter, get_current_price
 from .earnings_history import get_earnings_history, get_earnings_performance_stats
-from .option_price_fetcher import fetch_specific_option_prices, validate_option_contracts
+from .option_price_fetcher import fetch_specific_option_prices, fetch_option_prices_batch, validate_option_contracts
 
 # Import configuration
 try:
@@ -271,20 +271,13 @@ def process_ticker(earning):
                 "timestamp": datetime.now().timestamp()
             }
             
-        # Import strategy checker
-        from app.strategy_checker import check_strategies_availability
-        
         # Get earnings date from the earnings data
         earnings_date = earning.get('date', '')
         
-        # Run basic analysis to get metrics and recommendation, passing earnings date
-        analysis = analyze_options(ticker, earnings_date=earnings_date)
-        
-        # Check strategy availability instead of running full analysis
-        strategy_availability = check_strategies_availability(ticker)
-        
-        # Add strategy availability to the analysis result
-        analysis['strategyAvailability'] = strategy_availability
+        # Run basic analysis to get metrics and recommendation, passing earnings date.
+        # Strategy availability is evaluated from the option chains the analysis already
+        # fetched instead of running full analysis or re-downloading them.
+        analysis = analyze_options(ticker, earnings_date=earnings_date, include_strategy_availability=True)
         
         # Add company name, report time, and earnings date from earnings data
         analysis['companyName'] = earning.get('companyName', '')
@@ -1184,6 +1177,66 @@ def fetch_option_prices(ticker):
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@api_bp.route('/fetch-option-prices/batch', methods=['POST'])
+def fetch_option_prices_for_trades():
+    """
+    Fetch real-time prices for the option legs of all open trades in one request.
+    
+    Option chains are fetched once per unique ticker and expiration across all trades.
+    
+    Expected POST body:
+    {
+        "trades": [
+            {
+                "id": "trade-1",
+                "ticker": "AAPL",
+                "contracts": [
+                    {
+                        "optionType": "call",
+                        "strike": 150.0,
+                        "expiration": "2025-07-18",
+                        "quantity": 1,
+                        "isLong": true
+                    },
+                    ...
+                ]
+            },
+            ...
+        ]
+    }
+    """
+    try:
+        # Validate request
+        if not request.is_json:
+            return jsonify({
+                "success": False,
+                "error": "Request must be JSON",
+                "timestamp": datetime.now().isoformat()
+            }), 400
+        
+        data = request.get_json()
+        trades = data.get('trades')
+        
+        if not isinstance(trades, list):
+            return jsonify({
+                "success": False,
+                "error": "Missing 'trades' list in request body",
+                "timestamp": datetime.now().isoformat()
+            }), 400
+        
+        # Trades are validated individually: invalid ones get an error entry in the
+        # results instead of rejecting the request
+        logger.info(f"Fetching option prices for {len(trades)} trades")
+        return jsonify(fetch_option_prices_batch(trades))
+        
+    except Exception as e:
+        logger.error(f"Error in fetch_option_prices_for_trades: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": f"Internal server error: {str(e)}",
+            "timestamp": datetime.now().isoformat()
+        }), 500
+
 # Error handlers
 # Chart Analysis Endpoints
 @api_bp.route('/chart-analysis/analyze', methods=['POST'])
@@ -1890,58 +1943,63 @@ def get_active_trade_service():
         active_trade_service = ActiveTradeService(chart_context_manager.db_path)
     return active_trade_service
 
+def _trade_list_response(payload, etag):
+    """
+    Build a conditional response for a cached trade list.
+    
+    Returns 304 when the client's If-None-Match already matches the etag, otherwise
+    the JSON payload with an ETag so polling clients can revalidate cheaply.
+    """
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response = jsonify({**payload, "timestamp": datetime.now().timestamp()})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @api_bp.route('/active-trades/history-all', methods=['GET'])
 def get_all_trades_history():
     """
     Get all trades including closed ones for AI Trade Tracker history.
     
+    Query parameters:
+        limit (int): Maximum number of trades per page (default: 1000, max: 1000)
+        cursor (str): next_cursor from the previous page (keyset on updated_at, id)
+    
     Returns:
-        JSON: List of all trades (active and closed)
+        JSON: Page of trades (active and closed), newest first
     """
     try:
+        limit = request.args.get('limit', 1000, type=int)
+        cursor = request.args.get('cursor')
+        
+        if limit <= 0 or limit > 1000:
+            return jsonify({
+                "error": "limit must be between 1 and 1000",
+                "timestamp": datetime.now().timestamp()
+            }), 400
+        
         trade_service = get_active_trade_service()
         
-        # Query all trades from database (including closed ones)
-        import sqlite3
-        with sqlite3.connect(trade_service.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT id, ticker, timeframe, status, action, entry_price, target_price,
-                       stop_loss, current_price, unrealized_pnl, created_at, updated_at,
-                       close_time, close_price, close_reason, realized_pnl
-                FROM active_trades
-                ORDER BY updated_at DESC
-                LIMIT 1000
-            ''')
-            
-            all_trades = []
-            for row in cursor.fetchall():
-                id, ticker, timeframe, status, action, entry_price, target_price, stop_loss, current_price, unrealized_pnl, created_at, updated_at, close_time, close_price, close_reason, realized_pnl = row
-                all_trades.append({
-                    'id': id,
-                    'ticker': ticker,
-                    'timeframe': timeframe,
-                    'status': status,
-                    'action': action,
-                    'entry_price': entry_price,
-                    'target_price': target_price,
-                    'stop_loss': stop_loss,
-                    'current_price': current_price,
-                    'unrealized_pnl': unrealized_pnl,
-                    'created_at': created_at,
-                    'updated_at': updated_at,
-                    'close_time': close_time,
-                    'close_price': close_price,
-                    'close_reason': close_reason,
-                    'realized_pnl': realized_pnl
-                })
+        def load_page():
+            page = trade_service.get_trades_page(limit, cursor)
+            return {
+                "all_trades": page['trades'],
+                "count": len(page['trades']),
+                "next_cursor": page['next_cursor'],
+                "has_more": page['has_more']
+            }
         
-        return jsonify({
-            "all_trades": all_trades,
-            "count": len(all_trades),
-            "timestamp": datetime.now().timestamp()
-        })
+        try:
+            payload, etag = trade_service.get_cached_trade_query(('history-all', limit, cursor), load_page)
+        except ValueError as e:
+            return jsonify({
+                "error": str(e),
+                "timestamp": datetime.now().timestamp()
+            }), 400
+        
+        return _trade_list_response(payload, etag)
         
     except Exception as e:
         logger.error(f"Error getting all trades history: {str(e)}")
@@ -2088,69 +2146,15 @@ def get_all_active_trades():
     try:
         trade_service = get_active_trade_service()
         
-        # Query all active trades from database
-        import sqlite3
-        with sqlite3.connect(trade_service.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT at.ticker, at.timeframe, at.status, at.action, at.entry_price, at.target_price,
-                       at.stop_loss, at.current_price, at.unrealized_pnl, at.created_at, at.updated_at,
-                       at.close_time, at.close_price, at.close_reason, at.realized_pnl,
-                       ca.analysis_data
-                FROM active_trades at
-                LEFT JOIN chart_analyses ca ON at.analysis_id = ca.id
-                WHERE at.status IN ('waiting', 'active')
-                ORDER BY at.updated_at DESC
-            ''')
-            
-            active_trades = []
-            for row in cursor.fetchall():
-                ticker, timeframe, status, action, entry_price, target_price, stop_loss, current_price, unrealized_pnl, created_at, updated_at, close_time, close_price, close_reason, realized_pnl, analysis_data = row
-                
-                # Extract AI reasoning from chart analysis data
-                reasoning = None
-                if analysis_data:
-                    try:
-                        import json
-                        parsed_analysis = json.loads(analysis_data)
-                        # Extract reasoning from the chart analysis - this is where the real AI reasoning is stored
-                        reasoning = (parsed_analysis.get('recommendations', {}).get('reasoning') or
-                                   parsed_analysis.get('analysis', {}).get('reasoning') or
-                                   parsed_analysis.get('reasoning') or
-                                   parsed_analysis.get('ai_reasoning') or
-                                   parsed_analysis.get('recommendation_reasoning'))
-                    except (json.JSONDecodeError, AttributeError, TypeError):
-                        logger.warning(f"Failed to parse analysis data for {ticker}")
-                
-                # Fallback reasoning if none found
-                if not reasoning:
-                    reasoning = f"Production {action.upper()} trade from Chart Analysis"
-                
-                active_trades.append({
-                    'ticker': ticker,
-                    'timeframe': timeframe,
-                    'status': status,
-                    'action': action,
-                    'entry_price': entry_price,
-                    'target_price': target_price,
-                    'stop_loss': stop_loss,
-                    'current_price': current_price,
-                    'unrealized_pnl': unrealized_pnl,
-                    'created_at': created_at,
-                    'updated_at': updated_at,
-                    'close_time': close_time,
-                    'close_price': close_price,
-                    'close_reason': close_reason,
-                    'realized_pnl': realized_pnl,
-                    'reasoning': reasoning
-                })
+        def load_active_trades():
+            active_trades = trade_service.get_open_trades_overview()
+            return {
+                "active_trades": active_trades,
+                "count": len(active_trades)
+            }
         
-        return jsonify({
-            "active_trades": active_trades,
-            "count": len(active_trades),
-            "timestamp": datetime.now().timestamp()
-        })
+        payload, etag = trade_service.get_cached_trade_query('all-active', load_active_trades)
+        return _trade_list_response(payload, etag)
         
     except Exception as e:
         logger.error(f"Error getting all active trades: {str(e)}")
@@ -6,14 +6,96 @@ without running full analysis. This is used to optimize the scan process.
 """
 
 import logging
-import yfinance as yf
-from datetime import datetime, timedelta
-from app.data_fetcher import get_stock_data, get_options_data, get_current_price
+import numpy as np
+from app.data_fetcher import get_stock_data, get_current_price
 
 # Set up logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Strikes within this fraction of the current price count as near the money
+NEAR_MONEY_RANGE = (0.8, 1.2)
+
+def _strikes(frame):
+    """Strike prices of a chain side as a float array (empty when the side is missing)."""
+    if frame is None or frame.empty:
+        return np.empty(0)
+    return frame['strike'].to_numpy(dtype=float)
+
+def evaluate_strategy_availability(options_chains, current_price):
+    """
+    Evaluate calendar, naked and iron condor availability from already-fetched chains.
+    
+    All three strategies are evaluated from the same strike arrays, so no additional
+    market data requests are needed when the chains were fetched for analysis.
+    
+    Args:
+        options_chains (dict): Option chains keyed by expiration date (YYYY-MM-DD), each
+            with calls and puts DataFrames as returned by Ticker.option_chain
+        current_price (float): Current stock price
+        
+    Returns:
+        dict: Dictionary with availability for each strategy
+    """
+    availability = {
+        "calendar_available": False,
+        "naked_available": False,
+        "iron_condor_available": False
+    }
+    if current_price is None or not options_chains:
+        return availability
+    
+    exp_dates = sorted(options_chains)
+    front_chain = options_chains[exp_dates[0]]
+    front_calls = _strikes(front_chain.calls)
+    front_puts = _strikes(front_chain.puts)
+    
+    low, high = current_price * NEAR_MONEY_RANGE[0], current_price * NEAR_MONEY_RANGE[1]
+    near_calls = front_calls[(front_calls >= low) & (front_calls <= high)]
+    near_puts = front_puts[(front_puts >= low) & (front_puts <= high)]
+    
+    # Naked options: any call or put strike near the current price
+    availability["naked_available"] = bool(near_calls.size or near_puts.size)
+    
+    # Iron condor: at least 2 OTM calls and 2 OTM puts in the front month
+    availability["iron_condor_available"] = bool(
+        np.count_nonzero(front_calls > current_price) >= 2 and
+        np.count_nonzero(front_puts < current_price) >= 2
+    )
+    
+    # Calendar spread: a near-the-money call strike listed in both front and back month
+    if len(exp_dates) >= 2:
+        back_calls = _strikes(options_chains[exp_dates[1]].calls)
+        availability["calendar_available"] = bool(np.intersect1d(near_calls, back_calls).size)
+    
+    return availability
+
+def _fetch_availability_inputs(ticker, expirations):
+    """
+    Fetch the nearest option chains and the current price for a ticker.
+    
+    Args:
+        ticker (str): Stock ticker symbol
+        expirations (int): Number of nearest expirations to fetch
+        
+    Returns:
+        tuple: (options_chains dict, current price), or (None, None) if unavailable
+    """
+    stock = get_stock_data(ticker)
+    if not stock:
+        return None, None
+    
+    exp_dates = sorted(stock.options)
+    if not exp_dates:
+        return None, None
+    
+    current_price = get_current_price(stock)
+    if current_price is None:
+        return None, None
+    
+    options_chains = {exp_date: stock.option_chain(exp_date) for exp_date in exp_dates[:expirations]}
+    return options_chains, current_price
+
 def check_calendar_spread_availability(ticker):
     """
     Quickly check if calendar spreads are available for a ticker.
@@ -25,47 +107,8 @@ def check_calendar_spread_availability(ticker):
         bool: True if calendar spreads are available, False otherwise
     """
     try:
-        # Get stock data
-        stock = get_stock_data(ticker)
-        if not stock or len(stock.options) < 2:
-            return False
-            
-        # Get current price
-        current_price = get_current_price(stock)
-        if current_price is None:
-            return False
-            
-        # Get expiration dates
-        exp_dates = sorted(stock.options)
-        if len(exp_dates) < 2:
-            return False
-            
-        # Get front and back month
-        front_month = exp_dates[0]
-        back_month = exp_dates[1]
-        
-        # Check if there are common strikes
-        try:
-            front_chain = stock.option_chain(front_month)
-            back_chain = stock.option_chain(back_month)
-            
-            if front_chain.calls.empty or back_chain.calls.empty:
-                return False
-                
-            front_strikes = set(front_chain.calls['strike'].unique())
-            back_strikes = set(back_chain.calls['strike'].unique())
-            
-            common_strikes = front_strikes.intersection(back_strikes)
-            
-            # Check if there are strikes near the current price
-            near_strikes = [strike for strike in common_strikes 
-                           if current_price * 0.8 <= strike <= current_price * 1.2]
-                           
-            return len(near_strikes) > 0
-        except Exception as e:
-            logger.warning(f"Error checking calendar spread availability for {ticker}: {str(e)}")
-            return False
-            
+        options_chains, current_price = _fetch_availability_inputs(ticker, 2)
+        return evaluate_strategy_availability(options_chains, current_price)["calendar_available"]
     except Exception as e:
         logger.warning(f"Error checking calendar spread availability for {ticker}: {str(e)}")
         return False
@@ -81,48 +124,8 @@ def check_naked_options_availability(ticker):
         bool: True if naked options are available, False otherwise
     """
     try:
-        # Get stock data
-        stock = get_stock_data(ticker)
-        if not stock or len(stock.options) == 0:
-            return False
-            
-        # Get current price
-        current_price = get_current_price(stock)
-        if current_price is None:
-            return False
-            
-        # Get nearest expiration
-        exp_dates = sorted(stock.options)
-        if not exp_dates:
-            return False
-            
-        # Check if there are options available
-        try:
-            chain = stock.option_chain(exp_dates[0])
-            
-            if chain.calls.empty and chain.puts.empty:
-                return False
-                
-            # Check if there are strikes near the current price
-            if not chain.calls.empty:
-                call_strikes = chain.calls['strike'].unique()
-                near_call_strikes = [strike for strike in call_strikes 
-                                   if current_price * 0.8 <= strike <= current_price * 1.2]
-                if len(near_call_strikes) > 0:
-                    return True
-                    
-            if not chain.puts.empty:
-                put_strikes = chain.puts['strike'].unique()
-                near_put_strikes = [strike for strike in put_strikes 
-                                  if current_price * 0.8 <= strike <= current_price * 1.2]
-                if len(near_put_strikes) > 0:
-                    return True
-                    
-            return False
-        except Exception as e:
-            logger.warning(f"Error checking naked options availability for {ticker}: {str(e)}")
-            return False
-            
+        options_chains, current_price = _fetch_availability_inputs(ticker, 1)
+        return evaluate_strategy_availability(options_chains, current_price)["naked_available"]
     except Exception as e:
         logger.warning(f"Error checking naked options availability for {ticker}: {str(e)}")
         return False
@@ -138,59 +141,31 @@ def check_iron_condor_availability(ticker):
         bool: True if iron condors are available, False otherwise
     """
     try:
-        # Get stock data
-        stock = get_stock_data(ticker)
-        if not stock or len(stock.options) == 0:
-            return False
-            
-        # Get current price
-        current_price = get_current_price(stock)
-        if current_price is None:
-            return False
-            
-        # Get nearest expiration
-        exp_dates = sorted(stock.options)
-        if not exp_dates:
-            return False
-            
-        # Check if there are options available
-        try:
-            chain = stock.option_chain(exp_dates[0])
-            
-            if chain.calls.empty or chain.puts.empty:
-                return False
-                
-            # Check if there are enough OTM calls and puts for spreads
-            otm_calls = chain.calls[chain.calls['strike'] > current_price]
-            otm_puts = chain.puts[chain.puts['strike'] < current_price]
-            
-            # Need at least 2 OTM calls and 2 OTM puts for iron condor
-            return len(otm_calls) >= 2 and len(otm_puts) >= 2
-            
-        except Exception as e:
-            logger.warning(f"Error checking iron condor availability for {ticker}: {str(e)}")
-            return False
-            
+        options_chains, current_price = _fetch_availability_inputs(ticker, 1)
+        return evaluate_strategy_availability(options_chains, current_price)["iron_condor_available"]
     except Exception as e:
         logger.warning(f"Error checking iron condor availability for {ticker}: {str(e)}")
         return False
 
-def check_strategies_availability(ticker):
+def check_strategies_availability(ticker, options_chains=None, current_price=None):
     """
     Check availability of all strategies for a ticker.
     
+    Pass the chains and price already fetched for analysis to avoid any market data
+    requests; otherwise the two nearest chains are fetched once for all strategies.
+    
     Args:
         ticker (str): Stock ticker symbol
+        options_chains (dict, optional): Option chains keyed by expiration date
+        current_price (float, optional): Current stock price
         
     Returns:
         dict: Dictionary with availability for each strategy
     """
-    calendar_available = check_calendar_spread_availability(ticker)
-    naked_available = check_naked_options_availability(ticker)
-    iron_condor_available = check_iron_condor_availability(ticker)
-    
-    return {
-        "calendar_available": calendar_available,
-        "naked_available": naked_available,
-        "iron_condor_available": iron_condor_available
-    }
\ No newline at end of file
+    try:
+        if options_chains is None or current_price is None:
+            options_chains, current_price = _fetch_availability_inputs(ticker, 2)
+        return evaluate_strategy_availability(options_chains, current_price)
+    except Exception as e:
+        logger.warning(f"Error checking strategy availability for {ticker}: {str(e)}")
+        return evaluate_strategy_availability(None, None)
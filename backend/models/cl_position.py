@@ -10,7 +10,7 @@ import logging
 import json
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 from threading import Lock
 
 logger = logging.getLogger(__name__)
@@ -109,6 +109,20 @@ class CLPosition:
             logger.error(f"Error initializing CL positions database: {str(e)}")
             raise
     
+    REQUIRED_FIELDS = [
+        'trade_name', 'pair_symbol', 'price_range_min', 'price_range_max',
+        'liquidity_amount', 'initial_investment', 'entry_date'
+    ]
+    
+    INSERT_POSITION_SQL = '''
+        INSERT INTO cl_positions (
+            id, trade_name, pair_symbol, contract_address, token0_address, token1_address,
+            protocol, chain, price_range_min, price_range_max, liquidity_amount, initial_investment,
+            entry_date, exit_date, status, fees_collected, notes,
+            created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
     def create_position(self, position_data: Dict[str, Any]) -> str:
         """
         Create a new CL position.
@@ -123,13 +137,8 @@ class CLPosition:
             ValueError: If required fields are missing
             Exception: If database operation fails
         """
-        required_fields = [
-            'trade_name', 'pair_symbol', 'price_range_min', 'price_range_max',
-            'liquidity_amount', 'initial_investment', 'entry_date'
-        ]
-        
         # Validate required fields
-        for field in required_fields:
+        for field in self.REQUIRED_FIELDS:
             if field not in position_data:
                 raise ValueError(f"Missing required field: {field}")
         
@@ -141,34 +150,8 @@ class CLPosition:
                 with sqlite3.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
-                    cursor.execute('''
-                        INSERT INTO cl_positions (
-                            id, trade_name, pair_symbol, contract_address, token0_address, token1_address,
-                            protocol, chain, price_range_min, price_range_max, liquidity_amount, initial_investment,
-                            entry_date, exit_date, status, fees_collected, notes,
-                            created_at, updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        position_id,
-                        position_data['trade_name'],
-                        position_data['pair_symbol'],
-                        position_data.get('contract_address'),
-                        position_data.get('token0_address'),
-                        position_data.get('token1_address'),
-                        position_data.get('protocol', 'HyperSwap'),
-                        position_data.get('chain', 'HyperEVM'),
-                        position_data['price_range_min'],
-                        position_data['price_range_max'],
-                        position_data['liquidity_amount'],
-                        position_data['initial_investment'],
-                        position_data['entry_date'],
-                        position_data.get('exit_date'),
-                        position_data.get('status', 'active'),
-                        position_data.get('fees_collected', 0),
-                        position_data.get('notes', ''),
-                        current_timestamp,
-                        current_timestamp
-                    ))
+                    cursor.execute(self.INSERT_POSITION_SQL,
+                                   self._position_row(position_id, position_data, current_timestamp))
                     
                     conn.commit()
                     logger.info(f"Created CL position: {position_id}")
@@ -178,6 +161,70 @@ class CLPosition:
             logger.error(f"Error creating CL position: {str(e)}")
             raise
     
+    def create_positions(self, positions: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create several CL positions in a single transaction.
+        
+        Either every position is inserted or, if any insert fails, none are.
+        
+        Args:
+            positions (List[Dict[str, Any]]): Position data for each position
+            
+        Returns:
+            List[str]: The IDs of the created positions, in input order
+            
+        Raises:
+            ValueError: If any position is missing a required field (nothing is inserted)
+            Exception: If database operation fails (nothing is inserted)
+        """
+        for index, position_data in enumerate(positions):
+            for field in self.REQUIRED_FIELDS:
+                if field not in position_data:
+                    raise ValueError(f"Position {index}: Missing required field: {field}")
+        
+        try:
+            position_ids = [str(uuid.uuid4()) for _ in positions]
+            current_timestamp = int(datetime.now().timestamp())
+            
+            with self.db_lock:
+                # The connection context manager commits once at the end, or rolls back on error
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.executemany(self.INSERT_POSITION_SQL, (
+                        self._position_row(position_id, position_data, current_timestamp)
+                        for position_id, position_data in zip(position_ids, positions)
+                    ))
+            
+            logger.info(f"Created {len(position_ids)} CL positions")
+            return position_ids
+            
+        except Exception as e:
+            logger.error(f"Error creating CL positions: {str(e)}")
+            raise
+    
+    def _position_row(self, position_id: str, position_data: Dict[str, Any], timestamp: int) -> tuple:
+        """Build the INSERT_POSITION_SQL parameters for one position, applying column defaults."""
+        return (
+            position_id,
+            position_data['trade_name'],
+            position_data['pair_symbol'],
+            position_data.get('contract_address'),
+            position_data.get('token0_address'),
+            position_data.get('token1_address'),
+            position_data.get('protocol', 'HyperSwap'),
+            position_data.get('chain', 'HyperEVM'),
+            position_data['price_range_min'],
+            position_data['price_range_max'],
+            position_data['liquidity_amount'],
+            position_data['initial_investment'],
+            position_data['entry_date'],
+            position_data.get('exit_date'),
+            position_data.get('status', 'active'),
+            position_data.get('fees_collected', 0),
+            position_data.get('notes', ''),
+            timestamp,
+            timestamp
+        )
+    
     def get_positions(self, status: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get CL positions with optional filtering.
@@ -222,6 +269,37 @@ class CLPosition:
             logger.error(f"Error retrieving CL positions: {str(e)}")
             raise
     
+    def iter_positions(self, status: Optional[str] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over CL positions without loading them all at once.
+        
+        Args:
+            status (Optional[str]): Filter by status ('active' or 'closed')
+            batch_size (int): Rows fetched from SQLite per batch
+            
+        Yields:
+            Dict[str, Any]: Position dictionaries, newest first
+        """
+        query = 'SELECT * FROM cl_positions'
+        params = []
+        
+        if status:
+            query += ' WHERE status = ?'
+            params.append(status)
+        
+        query += ' ORDER BY created_at DESC'
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(query, params)
+            
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+    
     def get_position_by_id(self, position_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a specific CL position by ID.
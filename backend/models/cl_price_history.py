@@ -8,9 +8,11 @@ of token pairs in concentrated liquidity positions.
 import sqlite3
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Iterator
 from threading import Lock
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,6 +70,10 @@ class CLPriceHistory:
                     CREATE INDEX IF NOT EXISTS idx_cl_price_history_token_pair
                     ON cl_price_history(token_pair)
                 ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_cl_price_history_position_timestamp
+                    ON cl_price_history(position_id, timestamp)
+                ''')
                 cursor.execute('''
                     CREATE INDEX IF NOT EXISTS idx_cl_price_history_timestamp
                     ON cl_price_history(timestamp)
@@ -192,6 +198,165 @@ class CLPriceHistory:
             logger.error(f"Error retrieving price history: {str(e)}")
             raise
     
+    def iter_price_history(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all price history records without loading them all at once.
+        
+        Args:
+            batch_size (int): Rows fetched from SQLite per batch
+            
+        Yields:
+            Dict[str, Any]: Price history records, ordered by position then time
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute('SELECT * FROM cl_price_history ORDER BY position_id, timestamp ASC')
+            
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+    
+    def get_price_arrays(self, position_id: Optional[str] = None,
+                         token_pair: Optional[str] = None,
+                         start_time: Optional[int] = None,
+                         end_time: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get price history as typed arrays, oldest first.
+        
+        Args:
+            position_id (Optional[str]): Filter by position ID
+            token_pair (Optional[str]): Filter by token pair
+            start_time (Optional[int]): Start timestamp filter
+            end_time (Optional[int]): End timestamp filter
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: int64 epoch-second timestamps and float64 prices
+        """
+        try:
+            query = 'SELECT timestamp, price FROM cl_price_history WHERE 1=1'
+            params = []
+            
+            if position_id:
+                query += ' AND position_id = ?'
+                params.append(position_id)
+            
+            if token_pair:
+                query += ' AND token_pair = ?'
+                params.append(token_pair)
+            
+            if start_time:
+                query += ' AND timestamp >= ?'
+                params.append(start_time)
+            
+            if end_time:
+                query += ' AND timestamp <= ?'
+                params.append(end_time)
+            
+            query += ' ORDER BY timestamp ASC'
+            
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(query, params).fetchall()
+            
+            if not rows:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+            
+            timestamps, prices = zip(*rows)
+            return np.array(timestamps, dtype=np.int64), np.array(prices, dtype=np.float64)
+        
+        except Exception as e:
+            logger.error(f"Error retrieving price arrays: {str(e)}")
+            raise
+    
+    def get_position_price_arrays(self, position_ids: List[str],
+                                  start_time: Optional[int] = None,
+                                  end_time: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the price histories of several positions in one query as typed arrays.
+        
+        Args:
+            position_ids (List[str]): Position IDs to load
+            start_time (Optional[int]): Start timestamp filter
+            end_time (Optional[int]): End timestamp filter
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: int64 index into position_ids, int64 epoch-second
+            timestamps and float64 prices, ordered by position then time
+        """
+        try:
+            index = {position_id: i for i, position_id in enumerate(position_ids)}
+            if not index:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+            
+            query = f'''
+                SELECT position_id, timestamp, price FROM cl_price_history
+                WHERE position_id IN ({','.join('?' * len(index))})
+            '''
+            params = list(index)
+            
+            if start_time:
+                query += ' AND timestamp >= ?'
+                params.append(start_time)
+            
+            if end_time:
+                query += ' AND timestamp <= ?'
+                params.append(end_time)
+            
+            query += ' ORDER BY position_id, timestamp ASC'
+            
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(query, params).fetchall()
+            
+            if not rows:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+            
+            positions, timestamps, prices = zip(*rows)
+            return (np.fromiter((index[p] for p in positions), dtype=np.int64, count=len(rows)),
+                    np.array(timestamps, dtype=np.int64), np.array(prices, dtype=np.float64))
+        
+        except Exception as e:
+            logger.error(f"Error retrieving position price arrays: {str(e)}")
+            raise
+    
+    def get_history_watermark(self, position_ids: List[str]) -> Tuple[int, int, int]:
+        """
+        Get a watermark that changes when the positions' price history gains or prunes rows.
+        
+        Built from per-position index lookups (newest row ID, first and last
+        timestamp), so it costs one seek per position regardless of history length.
+        
+        Args:
+            position_ids (List[str]): Position IDs to cover
+        
+        Returns:
+            Tuple[int, int, int]: Highest row ID, sum of first timestamps and latest timestamp
+            (zeros if no rows)
+        """
+        try:
+            if not position_ids:
+                return 0, 0, 0
+            
+            with sqlite3.connect(self.db_path) as conn:
+                max_id, first_sum, max_timestamp = conn.execute(f'''
+                    WITH ids(position_id) AS (VALUES {','.join(['(?)'] * len(position_ids))})
+                    SELECT
+                        COALESCE(MAX((SELECT MAX(id) FROM cl_price_history h
+                                      WHERE h.position_id = ids.position_id)), 0),
+                        COALESCE(SUM((SELECT MIN(timestamp) FROM cl_price_history h
+                                      WHERE h.position_id = ids.position_id)), 0),
+                        COALESCE(MAX((SELECT MAX(timestamp) FROM cl_price_history h
+                                      WHERE h.position_id = ids.position_id)), 0)
+                    FROM ids
+                ''', list(position_ids)).fetchone()
+            
+            return max_id, first_sum, max_timestamp
+        
+        except Exception as e:
+            logger.error(f"Error retrieving price history watermark: {str(e)}")
+            raise
+    
     def get_latest_price(self, token_pair: str) -> Optional[Dict[str, Any]]:
         """
         Get the latest price for a token pair.
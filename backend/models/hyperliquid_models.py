@@ -8,14 +8,128 @@ including trades, portfolio snapshots, vault equities, and sync status.
 import sqlite3
 import logging
 import json
+import os
 import uuid
+import zlib
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List, Union
 from threading import Lock
 from enum import Enum
+from itertools import groupby
 
 logger = logging.getLogger(__name__)
 
+# Typed fill columns returned by get_trades (raw payloads live in hyperliquid_fill_archive)
+TRADE_COLUMNS = (
+    'id', 'account_type', 'wallet_address', 'trade_id', 'coin', 'side', 'px', 'sz', 'time',
+    'start_position', 'dir', 'closed_pnl', 'hash', 'oid', 'crossed', 'fee', 'fee_token',
+    'liquidation_markup', 'created_at', 'updated_at'
+)
+
+# Rollup bucket sizes in milliseconds and the metrics kept per bucket
+ROLLUP_BUCKETS = {'hour': 60 * 60 * 1000, 'day': 24 * 60 * 60 * 1000}
+ROLLUP_METRICS = ('bucket_start', 'trade_count', 'volume', 'fees', 'realized_pnl', 'win_count', 'loss_count')
+ROLLUP_TRIGGERS = ('hyperliquid_trades_rollup_insert', 'hyperliquid_trades_rollup_delete',
+                   'hyperliquid_trades_rollup_update')
+
+
+def _rollup_upserts(row: str, sign: str) -> str:
+    """Trigger body statements adding (sign '') or removing (sign '-') trade `row` (NEW/OLD) to each rollup bucket."""
+    return ''.join(f'''
+        INSERT INTO hyperliquid_trade_rollups (
+            account_type, wallet_address, bucket, bucket_start, coin,
+            trade_count, volume, fees, realized_pnl, win_count, loss_count
+        ) VALUES (
+            {row}.account_type, {row}.wallet_address, '{bucket}', {row}.time - {row}.time % {size_ms}, {row}.coin,
+            {sign}1, {sign}({row}.px * {row}.sz), {sign}COALESCE({row}.fee, 0), {sign}COALESCE({row}.closed_pnl, 0),
+            {sign}(COALESCE({row}.closed_pnl, 0) > 0), {sign}(COALESCE({row}.closed_pnl, 0) < 0)
+        )
+        ON CONFLICT(account_type, wallet_address, bucket, bucket_start, coin) DO UPDATE SET
+            trade_count = trade_count + excluded.trade_count,
+            volume = volume + excluded.volume,
+            fees = fees + excluded.fees,
+            realized_pnl = realized_pnl + excluded.realized_pnl,
+            win_count = win_count + excluded.win_count,
+            loss_count = loss_count + excluded.loss_count;''' for bucket, size_ms in ROLLUP_BUCKETS.items())
+
+
+def rollup_trigger_statements() -> List[str]:
+    """
+    CREATE TRIGGER statements keeping hyperliquid_trade_rollups in step with hyperliquid_trades.
+
+    Triggers run for every writer, including maintenance scripts that insert or
+    delete trades directly. INSERT OR REPLACE only fires the delete trigger when
+    recursive_triggers is on, so replacing writers should delete the old row first.
+    """
+    insert, delete, update = ROLLUP_TRIGGERS
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {insert} AFTER INSERT ON hyperliquid_trades BEGIN"
+        f"{_rollup_upserts('NEW', '')}\n        END",
+        f"CREATE TRIGGER IF NOT EXISTS {delete} AFTER DELETE ON hyperliquid_trades BEGIN"
+        f"{_rollup_upserts('OLD', '-')}\n        END",
+        f"CREATE TRIGGER IF NOT EXISTS {update} "
+        f"AFTER UPDATE OF account_type, wallet_address, coin, px, sz, time, closed_pnl, fee "
+        f"ON hyperliquid_trades BEGIN{_rollup_upserts('OLD', '-')}{_rollup_upserts('NEW', '')}\n        END",
+    ]
+
+# Equity bucket resolutions in seconds (5m, 1h, 4h, 1d, 1w), finest first
+EQUITY_RESOLUTIONS = (5 * 60, 60 * 60, 4 * 60 * 60, 24 * 60 * 60, 7 * 24 * 60 * 60)
+
+# Raw equity series: (table, owner column, scope column, time column, value column)
+EQUITY_SOURCES = {
+    'portfolio': ('hyperliquid_portfolio_snapshots', 'account_type', 'wallet_address', 'snapshot_time', 'account_value'),
+    'vault': ('hyperliquid_vault_equities', 'vault_address', 'user_address', 'timestamp', 'equity'),
+}
+
+# LTTB reads up to this many times max_points before reducing
+LTTB_OVERSAMPLE = 4
+
+
+def lttb_downsample(points: List[tuple], threshold: int) -> List[tuple]:
+    """
+    Downsample points with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, from each of threshold - 2 buckets in
+    between, the point forming the largest triangle with the previously kept
+    point and the average of the next bucket.
+
+    Args:
+        points (List[tuple]): Points sorted by time whose first two items are (time, value)
+        threshold (int): Maximum number of points to return (at least 3)
+
+    Returns:
+        List[tuple]: The kept points, in order
+    """
+    if threshold < 3:
+        raise ValueError("LTTB threshold must be at least 3")
+    if len(points) <= threshold:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (len(points) - 2) / (threshold - 2)
+    previous = 0
+
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, len(points))
+        next_bucket = points[next_start:next_end]
+        avg_time = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_value = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        prev_time, prev_value = points[previous][0], points[previous][1]
+        best, best_area = next_start - 1, -1.0
+        for j in range(int(i * every) + 1, next_start):
+            area = abs((prev_time - avg_time) * (points[j][1] - prev_value) -
+                       (prev_time - points[j][0]) * (avg_value - prev_value))
+            if area > best_area:
+                best, best_area = j, area
+
+        sampled.append(points[best])
+        previous = best
+
+    sampled.append(points[-1])
+    return sampled
+
 
 class AccountType(Enum):
     """Account types for Hyperliquid data"""
@@ -39,17 +153,21 @@ class HyperliquidDatabase:
     trades, portfolio snapshots, vault equities, and sync status tracking.
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, archive_raw_fills: Optional[bool] = None):
         """
         Initialize the Hyperliquid database manager.
         
         Args:
             db_path (Optional[str]): Path to SQLite database file
+            archive_raw_fills (Optional[bool]): Keep a compressed copy of each raw fill payload
+                (default HYPERLIQUID_ARCHIVE_RAW_FILLS or false)
         """
-        import os
         self.db_path = db_path or os.path.join(
             os.path.dirname(__file__), '..', 'instance', 'hyperliquid_data.db'
         )
+        if archive_raw_fills is None:
+            archive_raw_fills = os.getenv('HYPERLIQUID_ARCHIVE_RAW_FILLS', 'false').lower() == 'true'
+        self.archive_raw_fills = archive_raw_fills
         self.db_lock = Lock()
         self._ensure_database()
     
@@ -57,7 +175,6 @@ class HyperliquidDatabase:
         """Ensure the database and all tables exist."""
         try:
             # Create instance directory if it doesn't exist
-            import os
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
             with sqlite3.connect(self.db_path) as conn:
@@ -86,10 +203,47 @@ class HyperliquidDatabase:
                         raw_data TEXT,
                         created_at INTEGER NOT NULL,
                         updated_at INTEGER NOT NULL,
+                        fee_token TEXT,
                         UNIQUE(trade_id, account_type, wallet_address)
                     )
                 ''')
                 
+                # Add fee_token to databases created before it was promoted from raw_data
+                try:
+                    cursor.execute('ALTER TABLE hyperliquid_trades ADD COLUMN fee_token TEXT')
+                except sqlite3.OperationalError:
+                    pass  # Column already exists
+                
+                # Optional compressed archive of raw fill payloads
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS hyperliquid_fill_archive (
+                        trade_row_id TEXT PRIMARY KEY,
+                        account_type TEXT NOT NULL,
+                        wallet_address TEXT NOT NULL,
+                        trade_id TEXT NOT NULL,
+                        payload BLOB NOT NULL,
+                        created_at INTEGER NOT NULL
+                    )
+                ''')
+                
+                # Hourly and daily trade metrics per account and coin, maintained by triggers on hyperliquid_trades
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS hyperliquid_trade_rollups (
+                        account_type TEXT NOT NULL,
+                        wallet_address TEXT NOT NULL,
+                        bucket TEXT NOT NULL,
+                        bucket_start INTEGER NOT NULL,
+                        coin TEXT NOT NULL,
+                        trade_count INTEGER NOT NULL DEFAULT 0,
+                        volume REAL NOT NULL DEFAULT 0,
+                        fees REAL NOT NULL DEFAULT 0,
+                        realized_pnl REAL NOT NULL DEFAULT 0,
+                        win_count INTEGER NOT NULL DEFAULT 0,
+                        loss_count INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (account_type, wallet_address, bucket, bucket_start, coin)
+                    )
+                ''')
+                
                 # Create hyperliquid_portfolio_snapshots table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS hyperliquid_portfolio_snapshots (
@@ -122,6 +276,25 @@ class HyperliquidDatabase:
                     )
                 ''')
                 
+                # Create hyperliquid_equity_buckets table (OHLC of portfolio/vault equity per resolution)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS hyperliquid_equity_buckets (
+                        series TEXT NOT NULL,
+                        owner TEXT NOT NULL,
+                        scope TEXT NOT NULL,
+                        resolution INTEGER NOT NULL,
+                        bucket_start INTEGER NOT NULL,
+                        open REAL NOT NULL,
+                        high REAL NOT NULL,
+                        low REAL NOT NULL,
+                        close REAL NOT NULL,
+                        sample_count INTEGER NOT NULL,
+                        first_time INTEGER NOT NULL,
+                        last_time INTEGER NOT NULL,
+                        PRIMARY KEY (series, owner, scope, resolution, bucket_start)
+                    )
+                ''')
+                
                 # Create hyperliquid_sync_status table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS hyperliquid_sync_status (
@@ -144,7 +317,8 @@ class HyperliquidDatabase:
                 
                 # Create indexes for performance
                 indexes = [
-                    'CREATE INDEX IF NOT EXISTS idx_hyperliquid_trades_account_type ON hyperliquid_trades(account_type)',
+                    'CREATE INDEX IF NOT EXISTS idx_hyperliquid_trades_account_time ON hyperliquid_trades(account_type, wallet_address, time)',
+                    'CREATE INDEX IF NOT EXISTS idx_hyperliquid_trades_account_coin_time ON hyperliquid_trades(account_type, wallet_address, coin, time)',
                     'CREATE INDEX IF NOT EXISTS idx_hyperliquid_trades_wallet_address ON hyperliquid_trades(wallet_address)',
                     'CREATE INDEX IF NOT EXISTS idx_hyperliquid_trades_coin ON hyperliquid_trades(coin)',
                     'CREATE INDEX IF NOT EXISTS idx_hyperliquid_trades_time ON hyperliquid_trades(time)',
@@ -167,6 +341,28 @@ class HyperliquidDatabase:
                 for index_sql in indexes:
                     cursor.execute(index_sql)
                 
+                # account_type alone is a prefix of the composite indexes
+                cursor.execute('DROP INDEX IF EXISTS idx_hyperliquid_trades_account_type')
+                
+                self._migrate_raw_fills(conn)
+                
+                # Rollups are maintained by triggers; rebuild them when the triggers are first
+                # installed, since trades may have been written or deleted without updating them
+                installed = {name for (name,) in cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'hyperliquid_trades'"
+                )}
+                for trigger_sql in rollup_trigger_statements():
+                    cursor.execute(trigger_sql)
+                if (not installed.issuperset(ROLLUP_TRIGGERS) and
+                        cursor.execute('SELECT 1 FROM hyperliquid_trades LIMIT 1').fetchone() is not None):
+                    self.rebuild_trade_rollups(conn)
+                
+                # Build equity buckets for snapshots stored before buckets existed
+                if (cursor.execute('SELECT 1 FROM hyperliquid_equity_buckets LIMIT 1').fetchone() is None and
+                        any(cursor.execute(f'SELECT 1 FROM {source[0]} LIMIT 1').fetchone()
+                            for source in EQUITY_SOURCES.values())):
+                    self.rebuild_equity_buckets(conn)
+                
                 conn.commit()
                 logger.info(f"Hyperliquid database initialized at {self.db_path}")
                 
@@ -174,6 +370,87 @@ class HyperliquidDatabase:
             logger.error(f"Error initializing Hyperliquid database: {str(e)}")
             raise
     
+    def _migrate_raw_fills(self, conn: sqlite3.Connection):
+        """
+        Move raw_data JSON written by older versions out of hyperliquid_trades.
+        
+        fee_token is promoted from the payload, and every existing payload is kept
+        as a compressed archive row whatever archive_raw_fills says (that setting
+        only applies to new writes). raw_data is cleared only for rows whose payload
+        is in the archive.
+        """
+        cursor = conn.cursor()
+        if cursor.execute('SELECT 1 FROM hyperliquid_trades WHERE raw_data IS NOT NULL LIMIT 1').fetchone() is None:
+            return
+        
+        cursor.execute('''
+            UPDATE hyperliquid_trades SET fee_token = json_extract(raw_data, '$.feeToken')
+            WHERE raw_data IS NOT NULL AND fee_token IS NULL AND json_valid(raw_data)
+        ''')
+        conn.create_function(
+            'compress_payload', 1,
+            lambda text: zlib.compress(text if isinstance(text, bytes) else str(text).encode())
+        )
+        cursor.execute('''
+            INSERT OR IGNORE INTO hyperliquid_fill_archive
+                (trade_row_id, account_type, wallet_address, trade_id, payload, created_at)
+            SELECT id, account_type, wallet_address, trade_id, compress_payload(raw_data), created_at
+            FROM hyperliquid_trades WHERE raw_data IS NOT NULL
+        ''')
+        cursor.execute('''
+            UPDATE hyperliquid_trades SET raw_data = NULL
+            WHERE raw_data IS NOT NULL
+              AND id IN (SELECT trade_row_id FROM hyperliquid_fill_archive)
+        ''')
+        logger.info(f"Archived {cursor.rowcount} raw fill payloads out of hyperliquid_trades")
+    
+    @staticmethod
+    def _trade_row(trade_data: Dict[str, Any], account_type: AccountType, wallet_address: str,
+                   row_id: str, current_timestamp: int) -> tuple:
+        """Typed hyperliquid_trades values for a fill from the Hyperliquid API."""
+        return (
+            row_id,
+            account_type.value,
+            wallet_address,
+            trade_data.get('tid', ''),
+            trade_data.get('coin', ''),
+            trade_data.get('side', ''),
+            float(trade_data.get('px', 0)),
+            float(trade_data.get('sz', 0)),
+            int(trade_data.get('time', 0)),
+            float(trade_data.get('startPosition', 0)) if trade_data.get('startPosition') else None,
+            trade_data.get('dir', ''),
+            float(trade_data.get('closedPnl', 0)) if trade_data.get('closedPnl') else None,
+            trade_data.get('hash', ''),
+            int(trade_data.get('oid', 0)) if trade_data.get('oid') else None,
+            bool(trade_data.get('crossed', False)),
+            float(trade_data.get('fee', 0)) if trade_data.get('fee') else None,
+            trade_data.get('feeToken'),
+            float(trade_data.get('liquidationMarkup', 0)) if trade_data.get('liquidationMarkup') else None,
+            current_timestamp,
+            current_timestamp
+        )
+    
+    _TRADE_INSERT_COLUMNS = '''
+        hyperliquid_trades (
+            id, account_type, wallet_address, trade_id, coin, side, px, sz, time,
+            start_position, dir, closed_pnl, hash, oid, crossed, fee, fee_token, liquidation_markup,
+            created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    @staticmethod
+    def _archive_fills(cursor: sqlite3.Cursor, rows: List[tuple], fills: List[Dict[str, Any]]):
+        """Store compressed raw payloads for inserted trade rows."""
+        cursor.executemany('''
+            INSERT OR REPLACE INTO hyperliquid_fill_archive
+                (trade_row_id, account_type, wallet_address, trade_id, payload, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [
+            (row[0], row[1], row[2], row[3], zlib.compress(json.dumps(fill).encode()), row[-1])
+            for row, fill in zip(rows, fills)
+        ])
+    
     def insert_trade(self, trade_data: Dict[str, Any], account_type: AccountType, wallet_address: str) -> str:
         """
         Insert a new trade record.
@@ -182,55 +459,210 @@ class HyperliquidDatabase:
             trade_data (Dict[str, Any]): Trade data from Hyperliquid API
             account_type (AccountType): Type of account (personal_wallet or trading_vault)
             wallet_address (str): Wallet address
-            
+        
         Returns:
             str: The ID of the inserted trade
         """
         try:
             trade_id = str(uuid.uuid4())
             current_timestamp = int(datetime.now(timezone.utc).timestamp())
+            row = self._trade_row(trade_data, account_type, wallet_address, trade_id, current_timestamp)
             
             with self.db_lock:
                 with sqlite3.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO hyperliquid_trades (
-                            id, account_type, wallet_address, trade_id, coin, side, px, sz, time,
-                            start_position, dir, closed_pnl, hash, oid, crossed, fee, liquidation_markup,
-                            raw_data, created_at, updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        trade_id,
-                        account_type.value,
-                        wallet_address,
-                        trade_data.get('tid', ''),
-                        trade_data.get('coin', ''),
-                        trade_data.get('side', ''),
-                        float(trade_data.get('px', 0)),
-                        float(trade_data.get('sz', 0)),
-                        int(trade_data.get('time', 0)),
-                        float(trade_data.get('startPosition', 0)) if trade_data.get('startPosition') else None,
-                        trade_data.get('dir', ''),
-                        float(trade_data.get('closedPnl', 0)) if trade_data.get('closedPnl') else None,
-                        trade_data.get('hash', ''),
-                        int(trade_data.get('oid', 0)) if trade_data.get('oid') else None,
-                        bool(trade_data.get('crossed', False)),
-                        float(trade_data.get('fee', 0)) if trade_data.get('fee') else None,
-                        float(trade_data.get('liquidationMarkup', 0)) if trade_data.get('liquidationMarkup') else None,
-                        json.dumps(trade_data),
-                        current_timestamp,
-                        current_timestamp
-                    ))
+                    # Replace by deleting first so the rollup triggers remove the old trade
+                    cursor.execute(
+                        'DELETE FROM hyperliquid_trades WHERE trade_id = ? AND account_type = ? AND wallet_address = ?',
+                        (row[3], row[1], row[2])
+                    )
+                    cursor.execute('INSERT INTO' + self._TRADE_INSERT_COLUMNS, row)
+                    
+                    if self.archive_raw_fills:
+                        self._archive_fills(cursor, [row], [trade_data])
                     
                     conn.commit()
                     logger.debug(f"Inserted trade: {trade_data.get('tid', 'unknown')} for {account_type.value}")
                     return trade_id
-                    
+        
         except Exception as e:
             logger.error(f"Error inserting trade: {str(e)}")
             raise
     
+    def insert_trades(self, fills: List[Dict[str, Any]], account_type: AccountType,
+                      wallet_address: str) -> Dict[str, Any]:
+        """
+        Insert many fills in one transaction, skipping fills that are already stored.
+        
+        Args:
+            fills (List[Dict[str, Any]]): Fills from the Hyperliquid API
+            account_type (AccountType): Type of account
+            wallet_address (str): Wallet address
+        
+        Returns:
+            Dict[str, Any]: Counts of new and already stored fills plus per-fill errors
+        """
+        current_timestamp = int(datetime.now(timezone.utc).timestamp())
+        rows, valid_fills, errors = [], [], []
+        
+        for fill in fills:
+            if not fill.get('tid', ''):
+                continue
+            try:
+                rows.append(self._trade_row(fill, account_type, wallet_address, str(uuid.uuid4()), current_timestamp))
+                valid_fills.append(fill)
+            except (TypeError, ValueError) as e:
+                errors.append(f"Error processing trade {fill.get('tid', 'unknown')}: {e}")
+        
+        new_trades = 0
+        if rows:
+            with self.db_lock:
+                with sqlite3.connect(self.db_path) as conn:
+                    cursor = conn.cursor()
+                    cursor.executemany('INSERT OR IGNORE INTO' + self._TRADE_INSERT_COLUMNS, rows)
+                    # rowcount excludes the rollup rows written by triggers (total_changes would not)
+                    new_trades = cursor.rowcount
+                    
+                    if new_trades and self.archive_raw_fills:
+                        inserted = list(zip(rows, valid_fills))
+                        if new_trades < len(rows):
+                            # Keep only the rows that were inserted, not the ignored duplicates
+                            new_ids = {row[0] for row in cursor.execute(
+                                'SELECT id FROM hyperliquid_trades WHERE account_type = ? AND wallet_address = ? AND created_at = ?',
+                                (account_type.value, wallet_address, current_timestamp)
+                            )}
+                            inserted = [(row, fill) for row, fill in inserted if row[0] in new_ids]
+                        
+                        self._archive_fills(cursor, [row for row, _ in inserted], [fill for _, fill in inserted])
+                    
+                    conn.commit()
+        
+        logger.debug(f"Inserted {new_trades} of {len(rows)} fills for {account_type.value}: {wallet_address}")
+        return {
+            'new_trades': new_trades,
+            'existing_trades': len(rows) - new_trades,
+            'errors': errors
+        }
+    
+    def rebuild_trade_rollups(self, conn: Optional[sqlite3.Connection] = None):
+        """
+        Recompute all rollups from hyperliquid_trades.
+        
+        Triggers keep the rollups current, so this is only needed to repair drift
+        (it runs automatically when the triggers are first installed).
+        
+        Args:
+            conn (Optional[sqlite3.Connection]): Connection to use (its transaction is not committed)
+        """
+        if conn is None:
+            with self.db_lock:
+                with sqlite3.connect(self.db_path) as own_conn:
+                    self.rebuild_trade_rollups(own_conn)
+                    own_conn.commit()
+            return
+        
+        conn.execute('DELETE FROM hyperliquid_trade_rollups')
+        for bucket, size_ms in ROLLUP_BUCKETS.items():
+            conn.execute('''
+                INSERT INTO hyperliquid_trade_rollups (
+                    account_type, wallet_address, bucket, bucket_start, coin,
+                    trade_count, volume, fees, realized_pnl, win_count, loss_count
+                )
+                SELECT account_type, wallet_address, ?, time - time % ?, coin,
+                       COUNT(*), SUM(px * sz), SUM(COALESCE(fee, 0)), SUM(COALESCE(closed_pnl, 0)),
+                       SUM(COALESCE(closed_pnl, 0) > 0), SUM(COALESCE(closed_pnl, 0) < 0)
+                FROM hyperliquid_trades
+                GROUP BY account_type, wallet_address, time - time % ?, coin
+            ''', (bucket, size_ms, size_ms))
+        logger.info("Rebuilt Hyperliquid trade rollups")
+    
+    def get_trade_rollups(self, account_type: AccountType, wallet_address: str, bucket: str = 'day',
+                          coin: Optional[str] = None, start_time: Optional[int] = None,
+                          end_time: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get pre-aggregated trade metrics per time bucket, oldest first.
+        
+        Args:
+            account_type (AccountType): Account type
+            wallet_address (str): Wallet address
+            bucket (str): 'hour' or 'day'
+            coin (Optional[str]): Only this coin (default: all coins summed)
+            start_time (Optional[int]): Only buckets starting at or after this time (ms)
+            end_time (Optional[int]): Only buckets starting at or before this time (ms)
+        
+        Returns:
+            List[Dict[str, Any]]: bucket_start, trade_count, volume, fees, realized_pnl,
+                win_count and loss_count per bucket
+        """
+        if bucket not in ROLLUP_BUCKETS:
+            raise ValueError(f"Invalid rollup bucket: {bucket}")
+        
+        query = '''
+            SELECT bucket_start, SUM(trade_count), SUM(volume), SUM(fees), SUM(realized_pnl),
+                   SUM(win_count), SUM(loss_count)
+            FROM hyperliquid_trade_rollups
+            WHERE account_type = ? AND wallet_address = ? AND bucket = ?
+        '''
+        params = [account_type.value, wallet_address, bucket]
+        
+        if coin:
+            query += ' AND coin = ?'
+            params.append(coin)
+        
+        if start_time is not None:
+            query += ' AND bucket_start >= ?'
+            params.append(start_time)
+        
+        if end_time is not None:
+            query += ' AND bucket_start <= ?'
+            params.append(end_time)
+        
+        query += ' GROUP BY bucket_start HAVING SUM(trade_count) > 0 ORDER BY bucket_start'
+        
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(query, params).fetchall()
+        
+        return [dict(zip(ROLLUP_METRICS, row)) for row in rows]
+    
+    def get_coin_rollup_totals(self, account_type: AccountType, wallet_address: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all-time trade metrics per coin from the daily rollups.
+        
+        Args:
+            account_type (AccountType): Account type
+            wallet_address (str): Wallet address
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Metrics per coin
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('''
+                SELECT coin, SUM(trade_count), SUM(volume), SUM(fees), SUM(realized_pnl),
+                       SUM(win_count), SUM(loss_count)
+                FROM hyperliquid_trade_rollups
+                WHERE account_type = ? AND wallet_address = ? AND bucket = 'day'
+                GROUP BY coin HAVING SUM(trade_count) > 0
+            ''', (account_type.value, wallet_address)).fetchall()
+        
+        return {row[0]: dict(zip(ROLLUP_METRICS[1:], row[1:])) for row in rows}
+    
+    def get_archived_fill(self, trade_row_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the raw API payload archived for a trade row.
+        
+        Args:
+            trade_row_id (str): hyperliquid_trades.id of the trade
+        
+        Returns:
+            Optional[Dict[str, Any]]: The raw fill, or None if it was not archived
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                'SELECT payload FROM hyperliquid_fill_archive WHERE trade_row_id = ?', (trade_row_id,)
+            ).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+    
     def insert_portfolio_snapshot(self, portfolio_data: Dict[str, Any], account_type: AccountType, wallet_address: str) -> str:
         """
         Insert a portfolio snapshot.
@@ -250,6 +682,12 @@ class HyperliquidDatabase:
             with self.db_lock:
                 with sqlite3.connect(self.db_path) as conn:
                     cursor = conn.cursor()
+                    account_value = float(portfolio_data.get('accountValue', 0))
+                    replaced = cursor.execute(
+                        'SELECT 1 FROM hyperliquid_portfolio_snapshots '
+                        'WHERE account_type = ? AND wallet_address = ? AND snapshot_time = ?',
+                        (account_type.value, wallet_address, current_timestamp)
+                    ).fetchone() is not None
                     
                     cursor.execute('''
                         INSERT OR REPLACE INTO hyperliquid_portfolio_snapshots (
@@ -261,7 +699,7 @@ class HyperliquidDatabase:
                         account_type.value,
                         wallet_address,
                         current_timestamp,
-                        float(portfolio_data.get('accountValue', 0)),
+                        account_value,
                         float(portfolio_data.get('totalNtlPos', 0)) if portfolio_data.get('totalNtlPos') else None,
                         float(portfolio_data.get('totalRawUsd', 0)) if portfolio_data.get('totalRawUsd') else None,
                         json.dumps(portfolio_data.get('marginSummary', {})),
@@ -269,6 +707,8 @@ class HyperliquidDatabase:
                         json.dumps(portfolio_data),
                         current_timestamp
                     ))
+                    self._add_equity_sample(cursor, 'portfolio', account_type.value, wallet_address,
+                                            current_timestamp, account_value, replaced)
                     
                     conn.commit()
                     logger.debug(f"Inserted portfolio snapshot for {account_type.value}")
@@ -297,6 +737,12 @@ class HyperliquidDatabase:
             with self.db_lock:
                 with sqlite3.connect(self.db_path) as conn:
                     cursor = conn.cursor()
+                    equity = float(vault_data.get('equity', 0))
+                    replaced = cursor.execute(
+                        'SELECT 1 FROM hyperliquid_vault_equities '
+                        'WHERE vault_address = ? AND user_address = ? AND timestamp = ?',
+                        (vault_address, user_address, current_timestamp)
+                    ).fetchone() is not None
                     
                     cursor.execute('''
                         INSERT OR REPLACE INTO hyperliquid_vault_equities (
@@ -306,11 +752,13 @@ class HyperliquidDatabase:
                         equity_id,
                         vault_address,
                         user_address,
-                        float(vault_data.get('equity', 0)),
+                        equity,
                         current_timestamp,
                         json.dumps(vault_data),
                         current_timestamp
                     ))
+                    self._add_equity_sample(cursor, 'vault', vault_address, user_address,
+                                            current_timestamp, equity, replaced)
                     
                     conn.commit()
                     logger.debug(f"Inserted vault equity for {vault_address}")
@@ -398,25 +846,31 @@ class HyperliquidDatabase:
             return False
     
     def get_trades(self, account_type: Optional[AccountType] = None, wallet_address: Optional[str] = None,
-                   limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+                   limit: Optional[int] = None, offset: int = 0, coin: Optional[str] = None,
+                   start_time: Optional[int] = None, end_time: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get trades with optional filtering.
         
+        Only the typed columns are read, so no JSON is decoded; raw payloads are
+        available through get_archived_fill when archiving is enabled.
+        
         Args:
             account_type (Optional[AccountType]): Filter by account type
             wallet_address (Optional[str]): Filter by wallet address
             limit (Optional[int]): Limit number of results
             offset (int): Offset for pagination
+            coin (Optional[str]): Filter by coin
+            start_time (Optional[int]): Only trades at or after this time (ms)
+            end_time (Optional[int]): Only trades at or before this time (ms)
             
         Returns:
             List[Dict[str, Any]]: List of trade records
         """
         try:
             with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
-                query = 'SELECT * FROM hyperliquid_trades'
+                query = f"SELECT {', '.join(TRADE_COLUMNS)} FROM hyperliquid_trades"
                 params = []
                 conditions = []
                 
@@ -428,6 +882,18 @@ class HyperliquidDatabase:
                     conditions.append('wallet_address = ?')
                     params.append(wallet_address)
                 
+                if coin:
+                    conditions.append('coin = ?')
+                    params.append(coin)
+                
+                if start_time is not None:
+                    conditions.append('time >= ?')
+                    params.append(start_time)
+                
+                if end_time is not None:
+                    conditions.append('time <= ?')
+                    params.append(end_time)
+                
                 if conditions:
                     query += ' WHERE ' + ' AND '.join(conditions)
                 
@@ -438,18 +904,7 @@ class HyperliquidDatabase:
                     params.extend([limit, offset])
                 
                 cursor.execute(query, params)
-                rows = cursor.fetchall()
-                
-                trades = []
-                for row in rows:
-                    trade = dict(row)
-                    # Parse raw_data JSON
-                    if trade['raw_data']:
-                        try:
-                            trade['raw_data'] = json.loads(trade['raw_data'])
-                        except json.JSONDecodeError:
-                            pass
-                    trades.append(trade)
+                trades = [dict(zip(TRADE_COLUMNS, row)) for row in cursor.fetchall()]
                 
                 logger.debug(f"Retrieved {len(trades)} trades")
                 return trades
@@ -520,6 +975,223 @@ class HyperliquidDatabase:
             logger.error(f"Error retrieving portfolio snapshots: {str(e)}")
             raise
     
+    @staticmethod
+    def _aggregate_equity(samples: List[tuple]) -> Dict[tuple, list]:
+        """
+        Aggregate (time, value) samples sorted by time into OHLC buckets.
+        
+        Returns:
+            Dict[tuple, list]: (resolution, bucket_start) -> [open, high, low, close,
+                sample_count, first_time, last_time]
+        """
+        buckets: Dict[tuple, list] = {}
+        for sample_time, value in samples:
+            for resolution in EQUITY_RESOLUTIONS:
+                key = (resolution, sample_time - sample_time % resolution)
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = [value, value, value, value, 1, sample_time, sample_time]
+                else:
+                    bucket[1] = max(bucket[1], value)
+                    bucket[2] = min(bucket[2], value)
+                    bucket[3] = value
+                    bucket[4] += 1
+                    bucket[6] = sample_time
+        return buckets
+    
+    @staticmethod
+    def _upsert_equity_buckets(cursor: sqlite3.Cursor, series: str, owner: str, scope: str,
+                               buckets: Dict[tuple, list]):
+        """Merge aggregated buckets into hyperliquid_equity_buckets."""
+        cursor.executemany('''
+            INSERT INTO hyperliquid_equity_buckets (
+                series, owner, scope, resolution, bucket_start,
+                open, high, low, close, sample_count, first_time, last_time
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(series, owner, scope, resolution, bucket_start) DO UPDATE SET
+                open = CASE WHEN excluded.first_time < first_time THEN excluded.open ELSE open END,
+                close = CASE WHEN excluded.last_time >= last_time THEN excluded.close ELSE close END,
+                high = MAX(high, excluded.high),
+                low = MIN(low, excluded.low),
+                sample_count = sample_count + excluded.sample_count,
+                first_time = MIN(first_time, excluded.first_time),
+                last_time = MAX(last_time, excluded.last_time)
+        ''', [(series, owner, scope) + key + tuple(bucket) for key, bucket in buckets.items()])
+    
+    def _add_equity_sample(self, cursor: sqlite3.Cursor, series: str, owner: str, scope: str,
+                           sample_time: int, value: float, replaced: bool):
+        """
+        Fold a newly written equity sample into every bucket resolution.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor inside the transaction that wrote the sample
+            series (str): 'portfolio' or 'vault'
+            owner (str): account_type for portfolios, vault_address for vaults
+            scope (str): wallet_address for portfolios, user_address for vaults
+            sample_time (int): Sample time in seconds
+            value (float): Equity value
+            replaced (bool): Whether the write replaced a sample with the same time
+        """
+        if not replaced:
+            self._upsert_equity_buckets(cursor, series, owner, scope,
+                                        self._aggregate_equity([(sample_time, value)]))
+            return
+        
+        # A replaced sample can't be subtracted from high/low, so recompute its buckets
+        table, owner_column, scope_column, time_column, value_column = EQUITY_SOURCES[series]
+        keys = {(resolution, sample_time - sample_time % resolution) for resolution in EQUITY_RESOLUTIONS}
+        cursor.executemany('''
+            DELETE FROM hyperliquid_equity_buckets
+            WHERE series = ? AND owner = ? AND scope = ? AND resolution = ? AND bucket_start = ?
+        ''', [(series, owner, scope) + key for key in keys])
+        
+        widest = EQUITY_RESOLUTIONS[-1]
+        window_start = sample_time - sample_time % widest
+        samples = cursor.execute(f'''
+            SELECT {time_column}, {value_column} FROM {table}
+            WHERE {owner_column} = ? AND {scope_column} = ? AND {time_column} >= ? AND {time_column} < ?
+            ORDER BY {time_column}
+        ''', (owner, scope, window_start, window_start + widest)).fetchall()
+        
+        buckets = self._aggregate_equity(samples)
+        self._upsert_equity_buckets(cursor, series, owner, scope,
+                                    {key: bucket for key, bucket in buckets.items() if key in keys})
+    
+    def rebuild_equity_buckets(self, conn: Optional[sqlite3.Connection] = None):
+        """
+        Recompute all equity buckets from the portfolio snapshot and vault equity tables.
+        
+        Only needed when snapshots were written or deleted outside this class.
+        
+        Args:
+            conn (Optional[sqlite3.Connection]): Connection to use (its transaction is not committed)
+        """
+        if conn is None:
+            with self.db_lock:
+                with sqlite3.connect(self.db_path) as own_conn:
+                    self.rebuild_equity_buckets(own_conn)
+                    own_conn.commit()
+            return
+        
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM hyperliquid_equity_buckets')
+        for series, (table, owner_column, scope_column, time_column, value_column) in EQUITY_SOURCES.items():
+            rows = conn.execute(f'''
+                SELECT {owner_column}, {scope_column}, {time_column}, {value_column} FROM {table}
+                ORDER BY {owner_column}, {scope_column}, {time_column}
+            ''')
+            for (owner, scope), group in groupby(rows, key=lambda row: (row[0], row[1])):
+                buckets = self._aggregate_equity([(row[2], row[3]) for row in group])
+                self._upsert_equity_buckets(cursor, series, owner, scope, buckets)
+        logger.info("Rebuilt Hyperliquid equity buckets")
+    
+    def _get_equity_series(self, series: str, owner: str, scope: str, start_time: Optional[int],
+                           end_time: Optional[int], max_points: int, method: str) -> Dict[str, Any]:
+        """Read an equity series at the coarsest detail that still fits max_points."""
+        if method not in ('ohlc', 'lttb'):
+            raise ValueError(f"Invalid downsampling method: {method}")
+        if max_points < 3:
+            raise ValueError("max_points must be at least 3")
+        
+        table, owner_column, scope_column, time_column, value_column = EQUITY_SOURCES[series]
+        coarsest = EQUITY_RESOLUTIONS[-1]
+        budget = max_points * LTTB_OVERSAMPLE if method == 'lttb' else max_points
+        
+        with sqlite3.connect(self.db_path) as conn:
+            # Time span of the series from the few coarsest buckets
+            query = '''
+                SELECT MIN(first_time), MAX(last_time), SUM(sample_count) FROM hyperliquid_equity_buckets
+                WHERE series = ? AND owner = ? AND scope = ? AND resolution = ?
+            '''
+            params = [series, owner, scope, coarsest]
+            if start_time is not None:
+                query += ' AND bucket_start > ?'
+                params.append(start_time - coarsest)
+            if end_time is not None:
+                query += ' AND bucket_start <= ?'
+                params.append(end_time)
+            first_time, last_time, sample_count = conn.execute(query, params).fetchone()
+            
+            if not sample_count:
+                return {'resolution': None, 'method': method, 'points': []}
+            
+            start = first_time if start_time is None else max(start_time, first_time)
+            end = last_time if end_time is None else min(end_time, last_time)
+            
+            resolution = next((r for r in EQUITY_RESOLUTIONS if (end - start) // r + 1 <= budget), coarsest)
+            rows = conn.execute('''
+                SELECT bucket_start, open, high, low, close, sample_count FROM hyperliquid_equity_buckets
+                WHERE series = ? AND owner = ? AND scope = ? AND resolution = ?
+                  AND bucket_start BETWEEN ? AND ?
+                ORDER BY bucket_start
+            ''', (series, owner, scope, resolution, start - start % resolution, end)).fetchall()
+            
+            if sum(row[5] for row in rows) <= budget:
+                # Few enough snapshots in range to return them at full resolution
+                resolution = 0
+                rows = conn.execute(f'''
+                    SELECT {time_column}, {value_column}, {value_column}, {value_column}, {value_column}
+                    FROM {table}
+                    WHERE {owner_column} = ? AND {scope_column} = ? AND {time_column} BETWEEN ? AND ?
+                    ORDER BY {time_column}
+                ''', (owner, scope, start, end)).fetchall()
+        
+        if method == 'lttb':
+            points = [{'time': row[0], 'value': row[1]}
+                      for row in lttb_downsample([(row[0], row[4]) for row in rows], max_points)]
+        else:
+            # Ranges longer than max_points coarsest buckets: merge neighbouring buckets
+            step = -(-len(rows) // max_points)
+            points = []
+            for i in range(0, len(rows), step):
+                group = rows[i:i + step]
+                points.append({
+                    'time': group[0][0],
+                    'open': group[0][1],
+                    'high': max(row[2] for row in group),
+                    'low': min(row[3] for row in group),
+                    'close': group[-1][4],
+                    'value': group[-1][4]
+                })
+        
+        return {'resolution': resolution, 'method': method, 'points': points}
+    
+    def get_portfolio_equity_series(self, account_type: AccountType, wallet_address: str,
+                                    start_time: Optional[int] = None, end_time: Optional[int] = None,
+                                    max_points: int = 500, method: str = 'ohlc') -> Dict[str, Any]:
+        """
+        Get account value over time, downsampled to at most max_points points.
+        
+        Raw snapshots are returned when they fit the budget; otherwise the finest
+        precomputed bucket resolution that fits is used, so the amount of data read
+        is bounded by max_points whatever the range.
+        
+        Args:
+            account_type (AccountType): Account type
+            wallet_address (str): Wallet address
+            start_time (Optional[int]): Range start in seconds (default: first snapshot)
+            end_time (Optional[int]): Range end in seconds (default: latest snapshot)
+            max_points (int): Maximum number of points to return
+            method (str): 'ohlc' for open/high/low/close buckets, 'lttb' for representative points
+        
+        Returns:
+            Dict[str, Any]: resolution (seconds per bucket, 0 for raw snapshots), method and
+                points ({time, value} plus open/high/low/close for 'ohlc'), oldest first
+        """
+        return self._get_equity_series('portfolio', account_type.value, wallet_address,
+                                       start_time, end_time, max_points, method)
+    
+    def get_vault_equity_series(self, vault_address: str, user_address: str,
+                                start_time: Optional[int] = None, end_time: Optional[int] = None,
+                                max_points: int = 500, method: str = 'ohlc') -> Dict[str, Any]:
+        """
+        Get a user's vault equity over time, downsampled to at most max_points points.
+        
+        See get_portfolio_equity_series for the arguments and result.
+        """
+        return self._get_equity_series('vault', vault_address, user_address,
+                                       start_time, end_time, max_points, method)
+    
     def update_sync_status(self, account_type: AccountType, wallet_address: str, sync_type: str, 
                           status: SyncStatus, error_message: Optional[str] = None, 
                           metadata: Optional[Dict[str, Any]] = None) -> None:
@@ -649,7 +1321,7 @@ class HyperliquidDatabase:
     
     def get_trade_statistics(self, account_type: AccountType, wallet_address: str) -> Dict[str, Any]:
         """
-        Calculate trade statistics for an account.
+        Calculate trade statistics for an account from the daily rollups.
         
         Args:
             account_type (AccountType): Type of account
@@ -659,54 +1331,41 @@ class HyperliquidDatabase:
             Dict[str, Any]: Trade statistics
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get basic trade counts
-                cursor.execute('''
-                    SELECT 
-                        COUNT(*) as total_trades,
-                        COUNT(DISTINCT coin) as unique_coins,
-                        SUM(CASE WHEN closed_pnl > 0 THEN 1 ELSE 0 END) as winning_trades,
-                        SUM(CASE WHEN closed_pnl < 0 THEN 1 ELSE 0 END) as losing_trades,
-                        SUM(CASE WHEN closed_pnl IS NOT NULL THEN closed_pnl ELSE 0 END) as total_pnl,
-                        SUM(CASE WHEN fee IS NOT NULL THEN fee ELSE 0 END) as total_fees,
-                        AVG(CASE WHEN closed_pnl IS NOT NULL THEN closed_pnl ELSE 0 END) as avg_pnl
-                    FROM hyperliquid_trades 
-                    WHERE account_type = ? AND wallet_address = ?
-                ''', (account_type.value, wallet_address))
-                
-                stats = cursor.fetchone()
-                
-                if not stats or stats[0] == 0:
-                    return {
-                        'total_trades': 0,
-                        'unique_coins': 0,
-                        'winning_trades': 0,
-                        'losing_trades': 0,
-                        'win_rate': 0,
-                        'total_pnl': 0,
-                        'total_fees': 0,
-                        'net_pnl': 0,
-                        'avg_pnl': 0
-                    }
-                
-                total_trades, unique_coins, winning_trades, losing_trades, total_pnl, total_fees, avg_pnl = stats
-                
-                win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-                net_pnl = total_pnl - total_fees
-                
+            coins = self.get_coin_rollup_totals(account_type, wallet_address)
+            total_trades = sum(c['trade_count'] for c in coins.values())
+            
+            if total_trades == 0:
                 return {
-                    'total_trades': total_trades,
-                    'unique_coins': unique_coins,
-                    'winning_trades': winning_trades,
-                    'losing_trades': losing_trades,
-                    'win_rate': round(win_rate, 2),
-                    'total_pnl': round(total_pnl, 2),
-                    'total_fees': round(total_fees, 2),
-                    'net_pnl': round(net_pnl, 2),
-                    'avg_pnl': round(avg_pnl, 2)
+                    'total_trades': 0,
+                    'unique_coins': 0,
+                    'winning_trades': 0,
+                    'losing_trades': 0,
+                    'win_rate': 0,
+                    'total_pnl': 0,
+                    'total_fees': 0,
+                    'net_pnl': 0,
+                    'avg_pnl': 0
                 }
+            
+            winning_trades = sum(c['win_count'] for c in coins.values())
+            losing_trades = sum(c['loss_count'] for c in coins.values())
+            total_pnl = sum(c['realized_pnl'] for c in coins.values())
+            total_fees = sum(c['fees'] for c in coins.values())
+            
+            win_rate = winning_trades / total_trades * 100
+            net_pnl = total_pnl - total_fees
+            
+            return {
+                'total_trades': total_trades,
+                'unique_coins': len(coins),
+                'winning_trades': winning_trades,
+                'losing_trades': losing_trades,
+                'win_rate': round(win_rate, 2),
+                'total_pnl': round(total_pnl, 2),
+                'total_fees': round(total_fees, 2),
+                'net_pnl': round(net_pnl, 2),
+                'avg_pnl': round(total_pnl / total_trades, 2)
+            }
                 
         except Exception as e:
             logger.error(f"Error calculating trade statistics: {str(e)}")
@@ -8,6 +8,7 @@ including market data, AI analysis results, and system state tracking.
 import sqlite3
 import logging
 import json
+import time
 import uuid
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List, Union
@@ -17,6 +18,12 @@ import os
 
 logger = logging.getLogger(__name__)
 
+# In-memory snapshots of hot read queries, invalidated on writes through any
+# MacroSentimentDatabase for the same file (keyed by absolute database path)
+_data_versions: Dict[str, int] = {}
+_snapshots: Dict[tuple, tuple] = {}
+_snapshot_lock = Lock()
+
 
 class TrendDirection(Enum):
     """Trend direction enumeration"""
@@ -70,6 +77,43 @@ class MacroSentimentDatabase:
         self.db_lock = Lock()
         self._ensure_database()
     
+    def _mark_data_changed(self):
+        """Invalidate cached snapshots for this database after a market data or analysis write."""
+        key = os.path.abspath(self.db_path)
+        with _snapshot_lock:
+            _data_versions[key] = _data_versions.get(key, 0) + 1
+    
+    def get_cached_snapshot(self, name: str, loader, max_age: float) -> Any:
+        """
+        Serve a read query from memory until data is written or max_age seconds pass.
+        
+        The max_age bound covers writes made by other processes (e.g. collection scripts).
+        Only successful loads are cached: an exception raised by the loader propagates
+        and the next call loads again, so loaders should raise rather than return a fallback.
+        
+        Args:
+            name (str): Snapshot name
+            loader: Callable computing the snapshot on a miss
+            max_age (float): Maximum snapshot age in seconds
+            
+        Returns:
+            Any: Snapshot value
+        """
+        db_key = os.path.abspath(self.db_path)
+        with _snapshot_lock:
+            version = _data_versions.get(db_key, 0)
+            cached = _snapshots.get((db_key, name))
+            if cached and cached[0] == version and time.time() - cached[1] < max_age:
+                return cached[2]
+        
+        value = loader()
+        
+        with _snapshot_lock:
+            # Don't cache a result that may predate a write made while loading
+            if _data_versions.get(db_key, 0) == version:
+                _snapshots[(db_key, name)] = (version, time.time(), value)
+        return value
+    
     def _ensure_database(self):
         """Ensure the database and all tables exist with proper schema."""
         try:
@@ -360,6 +404,7 @@ class MacroSentimentDatabase:
                     ))
                     
                     conn.commit()
+                    self._mark_data_changed()
                     logger.debug(f"Inserted market data for timestamp {market_data['timestamp']}")
                     return str(cursor.lastrowid)
                     
@@ -434,6 +479,7 @@ class MacroSentimentDatabase:
                     ''', (analysis_id, analysis_data['analysis_timestamp'], current_timestamp))
                     
                     conn.commit()
+                    self._mark_data_changed()
                     logger.info(f"Inserted sentiment analysis {analysis_id}")
                     return str(analysis_id)
                     
@@ -442,25 +488,50 @@ class MacroSentimentDatabase:
             raise
     
     def get_latest_sentiment(self) -> Optional[Dict[str, Any]]:
-        """Get the most recent sentiment analysis."""
+        """Get the most recent sentiment analysis (served from memory until a new one is stored)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT * FROM macro_sentiment_analysis 
-                    ORDER BY analysis_timestamp DESC 
-                    LIMIT 1
-                ''')
-                
-                row = cursor.fetchone()
-                return dict(row) if row else None
-                
+            latest = self.get_cached_snapshot('latest_sentiment', self._query_latest_sentiment, max_age=60)
+            return dict(latest) if latest else None
+            
         except Exception as e:
             logger.error(f"Error getting latest sentiment: {str(e)}")
             return None
     
+    def _query_latest_sentiment(self) -> Optional[Dict[str, Any]]:
+        """Query the most recent sentiment analysis."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT * FROM macro_sentiment_analysis 
+                ORDER BY analysis_timestamp DESC 
+                LIMIT 1
+            ''')
+            
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def get_market_data_stats(self, since_timestamp: int) -> Dict[str, Any]:
+        """
+        Get count and time range of market data collected since a timestamp.
+        
+        Args:
+            since_timestamp (int): Unix timestamp lower bound
+            
+        Returns:
+            Dict[str, Any]: count, earliest_date and latest_date (Unix timestamps)
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT COUNT(*), MIN(timestamp), MAX(timestamp)
+                FROM macro_market_data
+                WHERE timestamp >= ?
+            ''', (since_timestamp,))
+            count, earliest, latest = cursor.fetchone()
+            return {'count': count, 'earliest_date': earliest, 'latest_date': latest}
+    
     def get_market_data_range(self, start_timestamp: int, end_timestamp: int) -> List[Dict[str, Any]]:
         """Get market data within timestamp range."""
         try:
@@ -494,6 +565,7 @@ class MacroSentimentDatabase:
                 cursor.execute('DELETE FROM sqlite_sequence WHERE name="macro_market_data"')
                 
                 conn.commit()
+                self._mark_data_changed()
                 
                 logger.info("All market data cleared from database")
                 return True
@@ -517,6 +589,7 @@ class MacroSentimentDatabase:
                 ''', ids)
                 
                 conn.commit()
+                self._mark_data_changed()
                 
                 logger.info(f"Deleted {cursor.rowcount} market data records")
                 return True
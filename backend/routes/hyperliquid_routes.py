@@ -7,7 +7,7 @@ from the frontend application.
 
 from flask import Blueprint, request, jsonify, current_app
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
 import os
 
@@ -45,6 +45,45 @@ def get_account_type_from_string(account_type_str: str) -> AccountType:
         raise ValueError(f"Invalid account type: {account_type_str}")
 
 
+def _period_start(bucket_start_ms: int, timeframe: str) -> datetime:
+    """Start of the hourly/daily/weekly/monthly period containing a rollup bucket (UTC)."""
+    start = datetime.fromtimestamp(bucket_start_ms / 1000, tz=timezone.utc)
+    if timeframe == 'weekly':
+        start = (start - timedelta(days=start.weekday())).replace(hour=0)
+    elif timeframe == 'monthly':
+        start = start.replace(day=1, hour=0)
+    return start
+
+
+# Equity chart ranges in seconds (None: full history) and the max-points budget
+EQUITY_RANGES = {'1d': 86400, '7d': 7 * 86400, '30d': 30 * 86400, '90d': 90 * 86400, '1y': 365 * 86400, 'all': None}
+DEFAULT_EQUITY_POINTS = 500
+MAX_EQUITY_POINTS = 5000
+
+
+def _equity_query_args() -> Dict[str, Any]:
+    """Parse range/start_time/end_time/max_points/method query parameters for equity series."""
+    range_name = request.args.get('range', 'all')
+    if range_name not in EQUITY_RANGES:
+        raise ValueError(f"Invalid range: {range_name}")
+    
+    end_time = request.args.get('end_time', type=int)
+    start_time = request.args.get('start_time', type=int)
+    if start_time is None and EQUITY_RANGES[range_name] is not None:
+        start_time = (end_time or int(datetime.now(timezone.utc).timestamp())) - EQUITY_RANGES[range_name]
+    
+    max_points = request.args.get('max_points', DEFAULT_EQUITY_POINTS, type=int)
+    if not 3 <= max_points <= MAX_EQUITY_POINTS:
+        raise ValueError(f"max_points must be between 3 and {MAX_EQUITY_POINTS}")
+    
+    return {
+        'start_time': start_time,
+        'end_time': end_time,
+        'max_points': max_points,
+        'method': request.args.get('method', 'ohlc')
+    }
+
+
 @hyperliquid_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -194,6 +233,87 @@ def get_portfolio():
         }), 500
 
 
+@hyperliquid_bp.route('/portfolio/equity', methods=['GET'])
+def get_portfolio_equity():
+    """Get account value over time, downsampled for charting"""
+    try:
+        if not database:
+            return jsonify({
+                'success': False,
+                'error': 'Database not available'
+            }), 503
+        
+        account_type_str = request.args.get('account_type')
+        wallet_address = request.args.get('wallet_address')
+        if not account_type_str or not wallet_address:
+            return jsonify({
+                'success': False,
+                'error': 'account_type and wallet_address are required'
+            }), 400
+        
+        try:
+            account_type = get_account_type_from_string(account_type_str)
+            equity = database.get_portfolio_equity_series(account_type, wallet_address, **_equity_query_args())
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            **equity,
+            'count': len(equity['points'])
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Error getting portfolio equity: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@hyperliquid_bp.route('/vault/equity', methods=['GET'])
+def get_vault_equity():
+    """Get a user's vault equity over time, downsampled for charting"""
+    try:
+        if not database:
+            return jsonify({
+                'success': False,
+                'error': 'Database not available'
+            }), 503
+        
+        vault_address = request.args.get('vault_address')
+        user_address = request.args.get('user_address')
+        if not vault_address or not user_address:
+            return jsonify({
+                'success': False,
+                'error': 'vault_address and user_address are required'
+            }), 400
+        
+        try:
+            equity = database.get_vault_equity_series(vault_address, user_address, **_equity_query_args())
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            **equity,
+            'count': len(equity['points'])
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Error getting vault equity: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @hyperliquid_bp.route('/statistics', methods=['GET'])
 def get_statistics():
     """Get trade statistics for an account"""
@@ -205,8 +325,13 @@ def get_statistics():
             }), 503
         
         # Get query parameters
-        account_type_str = request.args.get('account_type', required=True)
-        wallet_address = request.args.get('wallet_address', required=True)
+        account_type_str = request.args.get('account_type')
+        wallet_address = request.args.get('wallet_address')
+        if not account_type_str or not wallet_address:
+            return jsonify({
+                'success': False,
+                'error': 'account_type and wallet_address are required'
+            }), 400
         
         # Convert account type
         account_type = get_account_type_from_string(account_type_str)
@@ -354,8 +479,13 @@ def get_account_summary():
             }), 503
         
         # Get query parameters
-        account_type_str = request.args.get('account_type', required=True)
-        wallet_address = request.args.get('wallet_address', required=True)
+        account_type_str = request.args.get('account_type')
+        wallet_address = request.args.get('wallet_address')
+        if not account_type_str or not wallet_address:
+            return jsonify({
+                'success': False,
+                'error': 'account_type and wallet_address are required'
+            }), 400
         
         # Convert account type
         account_type = get_account_type_from_string(account_type_str)
@@ -421,27 +551,38 @@ def get_performance_data():
             }), 503
         
         # Get query parameters
-        account_type_str = request.args.get('account_type', required=True)
-        wallet_address = request.args.get('wallet_address', required=True)
-        timeframe = request.args.get('timeframe', 'monthly')  # daily, weekly, monthly
+        account_type_str = request.args.get('account_type')
+        wallet_address = request.args.get('wallet_address')
+        if not account_type_str or not wallet_address:
+            return jsonify({
+                'success': False,
+                'error': 'account_type and wallet_address are required'
+            }), 400
+        timeframe = request.args.get('timeframe', 'monthly')  # hourly, daily, weekly, monthly
+        if timeframe not in ('hourly', 'daily', 'weekly', 'monthly'):
+            return jsonify({
+                'success': False,
+                'error': f'Invalid timeframe: {timeframe}'
+            }), 400
         
         # Convert account type
         account_type = get_account_type_from_string(account_type_str)
         
-        # Get trades for performance calculation
-        trades = database.get_trades(
+        # Pre-aggregated trade metrics (bounded by the number of buckets, not trades)
+        rollups = database.get_trade_rollups(
             account_type=account_type,
-            wallet_address=wallet_address
+            wallet_address=wallet_address,
+            bucket='hour' if timeframe == 'hourly' else 'day'
         )
         
-        # Get portfolio snapshots for account value over time
-        portfolio_snapshots = database.get_portfolio_snapshots(
+        # Account value over the full history, downsampled from the precomputed equity buckets
+        account_values = database.get_portfolio_equity_series(
             account_type=account_type,
             wallet_address=wallet_address,
-            limit=100
+            max_points=DEFAULT_EQUITY_POINTS,
+            method='lttb'
         )
         
-        # Process data based on timeframe
         performance_data = {
             'trades_over_time': [],
             'pnl_over_time': [],
@@ -449,31 +590,45 @@ def get_performance_data():
             'coin_performance': {}
         }
         
-        # Group trades by timeframe and calculate metrics
-        # This is a simplified version - you might want to implement more sophisticated grouping
-        for trade in trades:
-            trade_date = datetime.fromtimestamp(trade['time'] / 1000, tz=timezone.utc)
-            
-            # Group by coin
-            coin = trade['coin']
-            if coin not in performance_data['coin_performance']:
-                performance_data['coin_performance'][coin] = {
-                    'total_trades': 0,
-                    'total_pnl': 0,
-                    'total_volume': 0
-                }
-            
-            coin_perf = performance_data['coin_performance'][coin]
-            coin_perf['total_trades'] += 1
-            coin_perf['total_pnl'] += trade.get('closed_pnl', 0) or 0
-            coin_perf['total_volume'] += trade['px'] * trade['sz']
-        
-        # Add portfolio snapshots to account value over time
-        for snapshot in portfolio_snapshots:
-            snapshot_date = datetime.fromtimestamp(snapshot['snapshot_time'], tz=timezone.utc)
+        # Group rollup buckets into timeframe periods (rollups are ordered by time)
+        periods = {}
+        for row in rollups:
+            period = _period_start(row['bucket_start'], timeframe)
+            totals = periods.setdefault(period, {'count': 0, 'pnl': 0.0, 'volume': 0.0, 'fees': 0.0})
+            totals['count'] += row['trade_count']
+            totals['pnl'] += row['realized_pnl']
+            totals['volume'] += row['volume']
+            totals['fees'] += row['fees']
+        
+        cumulative_pnl = 0.0
+        for period, totals in periods.items():
+            date = period.isoformat()
+            cumulative_pnl += totals['pnl']
+            performance_data['trades_over_time'].append({
+                'date': date,
+                'count': totals['count'],
+                'pnl': round(totals['pnl'], 2),
+                'volume': round(totals['volume'], 2),
+                'fees': round(totals['fees'], 2)
+            })
+            performance_data['pnl_over_time'].append({
+                'date': date,
+                'pnl': round(totals['pnl'], 2),
+                'cumulative_pnl': round(cumulative_pnl, 2)
+            })
+        
+        for coin, totals in database.get_coin_rollup_totals(account_type, wallet_address).items():
+            performance_data['coin_performance'][coin] = {
+                'total_trades': totals['trade_count'],
+                'total_pnl': totals['realized_pnl'],
+                'total_volume': totals['volume']
+            }
+        
+        for point in account_values['points']:
+            point_date = datetime.fromtimestamp(point['time'], tz=timezone.utc)
             performance_data['account_value_over_time'].append({
-                'date': snapshot_date.isoformat(),
-                'value': snapshot['account_value']
+                'date': point_date.isoformat(),
+                'value': point['value']
             })
         
         return jsonify({
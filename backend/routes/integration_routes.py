@@ -11,26 +11,28 @@ This module provides REST API endpoints for third-party integrations including:
 """
 
 import logging
-from flask import Blueprint, request, jsonify, Response, stream_template
+from flask import Blueprint, request, jsonify, Response, send_file
 from flask_cors import cross_origin
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
-import json
 import uuid
 import hmac
 import hashlib
-import time
+import os
+import math
 from functools import wraps
 import jwt
 from werkzeug.exceptions import BadRequest, Unauthorized, Forbidden, NotFound
 
 # Import services
 from services.cl_service import CLService
-from services.alert_service import AlertService
+from services.alert_service import get_alert_service
 from services.position_optimizer import PositionOptimizer
 from services.advanced_analytics import AdvancedAnalytics
-from services.reporting_service import ReportingService
+from services.reporting_service import ReportingService, ReportType, ExportFormat, REPORT_JOB_FORMATS
 from services.system_monitor import SystemMonitor
+from services.sse_hub import BroadcastHub, HubFullError
+from services.request_rate_limiter import RequestRateLimiter, MemoryRateLimitStore, SQLiteRateLimitStore
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +41,7 @@ integration_bp = Blueprint('integration', __name__, url_prefix='/api/v1/integrat
 
 # Initialize services
 cl_service = CLService()
-alert_service = AlertService()
+alert_service = get_alert_service()
 optimizer = PositionOptimizer()
 analytics = AdvancedAnalytics()
 reporting_service = ReportingService()
@@ -51,12 +53,17 @@ API_CONFIG = {
     'webhook_secret': 'your-webhook-secret',  # Should be in environment variables
     'rate_limit': {
         'requests_per_minute': 100,
-        'requests_per_hour': 1000
+        'requests_per_hour': 1000,
+        'max_clients': 100000,  # per-process client keys kept before the least recently seen is evicted
+        'shared_store_path': os.environ.get('RATE_LIMIT_DB_PATH')  # SQLite file shared by all workers
     }
 }
 
-# Rate limiting storage (would use Redis in production)
-rate_limit_storage = {}
+# Rate limiting state: per-process LRU by default, or one SQLite file so every worker enforces the same limit
+if API_CONFIG['rate_limit']['shared_store_path']:
+    request_limiter = RequestRateLimiter(SQLiteRateLimitStore(API_CONFIG['rate_limit']['shared_store_path']))
+else:
+    request_limiter = RequestRateLimiter(MemoryRateLimitStore(API_CONFIG['rate_limit']['max_clients']))
 
 
 def require_api_key(f):
@@ -101,30 +108,15 @@ def require_jwt_token(f):
 
 
 def rate_limit(requests_per_minute: int = 60):
-    """Decorator to implement rate limiting."""
+    """Decorator to implement rate limiting per endpoint and client address."""
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            client_ip = request.remote_addr
-            current_time = time.time()
-            
-            # Clean old entries
-            cutoff_time = current_time - 60  # 1 minute ago
-            if client_ip in rate_limit_storage:
-                rate_limit_storage[client_ip] = [
-                    timestamp for timestamp in rate_limit_storage[client_ip]
-                    if timestamp > cutoff_time
-                ]
-            
-            # Check rate limit
-            if client_ip not in rate_limit_storage:
-                rate_limit_storage[client_ip] = []
-            
-            if len(rate_limit_storage[client_ip]) >= requests_per_minute:
-                return jsonify({'error': 'Rate limit exceeded'}), 429
-            
-            # Add current request
-            rate_limit_storage[client_ip].append(current_time)
+            decision = request_limiter.hit(f"{f.__name__}:{request.remote_addr}", requests_per_minute)
+            if not decision.allowed:
+                return jsonify({'error': 'Rate limit exceeded'}), 429, {
+                    'Retry-After': str(math.ceil(decision.retry_after))
+                }
             
             return f(*args, **kwargs)
         return decorated_function
@@ -294,28 +286,22 @@ def bulk_import_positions():
         if not isinstance(positions, list):
             return jsonify({'error': 'Positions must be an array'}), 400
         
-        results = []
-        errors = []
+        # All rows are validated first and inserted in one transaction; unless
+        # allow_partial is set, any invalid row rejects the whole import
+        allow_partial = bool(data.get('allow_partial', False))
+        outcome = cl_service.bulk_create_positions(positions, allow_partial=allow_partial)
         
-        for i, position_data in enumerate(positions):
-            try:
-                position = cl_service.create_position(position_data)
-                results.append({
-                    'index': i,
-                    'status': 'success',
-                    'position_id': position['id']
-                })
-            except Exception as e:
-                errors.append({
-                    'index': i,
-                    'status': 'error',
-                    'error': str(e)
-                })
+        if outcome['errors'] and not allow_partial:
+            return jsonify({
+                'error': f"Bulk import rejected: {len(outcome['errors'])} invalid positions, nothing imported",
+                'results': outcome['results'],
+                'errors': outcome['errors']
+            }), 400
         
         return jsonify({
-            'message': f'Bulk import completed: {len(results)} successful, {len(errors)} failed',
-            'results': results,
-            'errors': errors
+            'message': f"Bulk import completed: {len(outcome['results'])} successful, {len(outcome['errors'])} failed",
+            'results': outcome['results'],
+            'errors': outcome['errors']
         })
         
     except Exception as e:
@@ -564,37 +550,152 @@ def export_report(report_type: str):
         return jsonify({'error': 'Internal server error'}), 500
 
 
+# Background report jobs
+REPORT_JOB_TYPES = {
+    'positions': ReportType.POSITION_DETAIL,
+    'portfolio': ReportType.PORTFOLIO_SUMMARY,
+    'tax': ReportType.TAX_REPORT,
+}
+
+
+@integration_bp.route('/export/jobs', methods=['POST'])
+@cross_origin()
+@require_jwt_token
+@rate_limit(10)  # 10 report jobs per minute
+def submit_export_job():
+    """Queue a report to be rendered in the background; poll the job and download the file when done."""
+    try:
+        data = request.get_json(silent=True) or {}
+        report_type = REPORT_JOB_TYPES.get(data.get('report_type'))
+        if report_type is None:
+            return jsonify({'error': f"report_type must be one of {sorted(REPORT_JOB_TYPES)}"}), 400
+        
+        try:
+            export_format = ExportFormat(data.get('format', REPORT_JOB_FORMATS[report_type][0].value))
+        except ValueError:
+            return jsonify({'error': 'Unsupported export format'}), 400
+        
+        if export_format not in REPORT_JOB_FORMATS[report_type]:
+            return jsonify({'error': f"{data['report_type']} reports support "
+                                     f"{[f.value for f in REPORT_JOB_FORMATS[report_type]]}"}), 400
+        
+        status = data.get('status')
+        parameters = {}
+        portfolio_metrics = None
+        price_history = None
+        
+        # Sources are lazy iterators, read by the job worker as it writes the file
+        positions = cl_service.iter_positions(status=status, include_calculations=True)
+        if report_type == ReportType.PORTFOLIO_SUMMARY:
+            totals = cl_service.portfolio_summary_accumulator()
+            positions = totals.track(positions)
+            portfolio_metrics = totals.summary
+            if export_format == ExportFormat.EXCEL and data.get('include_history'):
+                price_history = cl_service.iter_price_history(status=status)
+        elif report_type == ReportType.TAX_REPORT:
+            parameters['tax_year'] = int(data.get('year', datetime.now().year))
+        
+        job_id = reporting_service.submit_report_job(report_type, export_format, positions,
+                                                     portfolio_metrics=portfolio_metrics,
+                                                     price_history=price_history,
+                                                     parameters=parameters)
+        
+        return jsonify({
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f"{integration_bp.url_prefix}/export/jobs/{job_id}",
+            'download_url': f"{integration_bp.url_prefix}/export/jobs/{job_id}/download"
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error submitting export job: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@integration_bp.route('/export/jobs/<job_id>', methods=['GET'])
+@cross_origin()
+@require_jwt_token
+def get_export_job(job_id: str):
+    """Get the status of a report job."""
+    try:
+        job = reporting_service.get_report_job(job_id)
+        if not job:
+            return jsonify({'error': 'Report job not found'}), 404
+        
+        return jsonify({
+            'job_id': job['id'],
+            'report_type': job['report_type'],
+            'format': job['export_format'],
+            'status': job['status'],
+            'file_size': job['file_size'],
+            'generation_time_ms': job['generation_time_ms'],
+            'error': job['error_message'],
+            'created_at': datetime.fromtimestamp(job['created_at']).isoformat()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting export job {job_id}: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@integration_bp.route('/export/jobs/<job_id>/download', methods=['GET'])
+@cross_origin()
+@require_jwt_token
+def download_export_job(job_id: str):
+    """Download the file rendered by a completed report job."""
+    try:
+        job = reporting_service.get_report_job(job_id)
+        if not job:
+            return jsonify({'error': 'Report job not found'}), 404
+        
+        if job['status'] != 'completed':
+            return jsonify({'error': f"Report job is {job['status']}", 'status': job['status']}), 409
+        
+        return send_file(job['file_path'], mimetype=job['mimetype'], as_attachment=True,
+                         download_name=job['download_name'])
+        
+    except Exception as e:
+        logger.error(f"Error downloading export job {job_id}: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 # Real-time streaming endpoints
+def _metrics_stream_payload() -> Dict[str, Any]:
+    """Metrics stream payload, computed once per tick for every connected client."""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'metrics': monitor.get_current_metrics(),
+        'health': monitor.get_health_status()
+    }
+
+
+metrics_hub = BroadcastHub(_metrics_stream_payload, interval_seconds=5, max_subscribers=100,
+                           name='metrics-stream')
+
+
 @integration_bp.route('/stream/metrics')
 @cross_origin()
 @require_jwt_token
 def stream_metrics():
     """Stream real-time system metrics."""
+    try:
+        subscription = metrics_hub.subscribe()
+    except HubFullError:
+        return jsonify({'error': 'Too many metrics stream clients, try again later'}), 503
+    
     def generate_metrics():
-        while True:
-            try:
-                metrics = monitor.get_current_metrics()
-                health = monitor.get_health_status()
-                
-                data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'metrics': metrics,
-                    'health': health
-                }
-                
-                yield f"data: {json.dumps(data)}\n\n"
-                time.sleep(5)  # Update every 5 seconds
-                
-            except Exception as e:
-                logger.error(f"Error streaming metrics: {str(e)}")
-                break
+        try:
+            yield from subscription
+        finally:
+            subscription.close()
     
     return Response(
         generate_metrics(),
         mimetype='text/event-stream',
         headers={
             'Cache-Control': 'no-cache',
-            'Connection': 'keep-alive'
+            'Connection': 'keep-alive',
+            'X-Accel-Buffering': 'no'
         }
     )
 
@@ -615,6 +716,10 @@ def get_system_status():
             'health': health_status,
             'metrics': current_metrics,
             'active_alerts': len(active_alerts),
+            'alert_dispatch': alert_service.get_dispatch_metrics(),
+            'metric_sampler': monitor.get_sampler_stats(),
+            'metrics_stream': metrics_hub.get_metrics(),
+            'rate_limiter': request_limiter.get_metrics(),
             'timestamp': datetime.now().isoformat()
         })
         
@@ -14,7 +14,7 @@ from typing import Dict, Any, Optional
 
 # Import services
 try:
-    from ..services.macro_bootstrap_service import MacroBootstrapService, run_bootstrap, check_bootstrap_status
+    from ..services.macro_bootstrap_service import MacroBootstrapService, run_bootstrap, get_bootstrap_status
     from ..services.macro_scanner_service import get_scanner, get_scanner_status, trigger_manual_scan
     from ..services.macro_ai_service import MacroAIService, get_latest_macro_sentiment, trigger_macro_analysis
     from ..services.macro_chart_service import MacroChartService, get_chart_summary
@@ -24,7 +24,7 @@ except ImportError:
     import sys
     import os
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from services.macro_bootstrap_service import MacroBootstrapService, run_bootstrap, check_bootstrap_status
+    from services.macro_bootstrap_service import MacroBootstrapService, run_bootstrap, get_bootstrap_status
     from services.macro_scanner_service import get_scanner, get_scanner_status, trigger_manual_scan
     from services.macro_ai_service import MacroAIService, get_latest_macro_sentiment, trigger_macro_analysis
     from services.macro_chart_service import MacroChartService, get_chart_summary
@@ -53,8 +53,8 @@ def get_macro_sentiment_status():
         # Get system status
         scanner_status = get_scanner_status()
         
-        # Get bootstrap status
-        bootstrap_status = asyncio.run(check_bootstrap_status())
+        # Get bootstrap status (in-memory snapshot, refreshed when new data is written)
+        bootstrap_status = get_bootstrap_status()
         
         # Calculate next update time
         next_update = None
@@ -279,8 +279,8 @@ def get_system_health():
         # Get scanner status
         scanner_status = get_scanner_status()
         
-        # Get bootstrap status
-        bootstrap_status = asyncio.run(check_bootstrap_status())
+        # Get bootstrap status (in-memory snapshot, refreshed when new data is written)
+        bootstrap_status = get_bootstrap_status()
         
         # Get recent data quality
         recent_data = db.get_market_data_range(
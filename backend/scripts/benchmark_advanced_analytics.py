@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Advanced Analytics Benchmark
+
+Compares the previous per-row analytics (lists of price dicts, ISO dates parsed
+row by row, Python loops over windows) against the vectorized analytics core
+(PriceSeries arrays, NumPy/pandas rolling windows) across history lengths:
+- Load: reading a position's history from cl_price_history (dict rows vs typed arrays)
+- Parse: turning price records with ISO dates into prices and timestamps
+- Rolling risk: 30-period volatility, VaR/CVaR 95% and drawdown at every point
+- Regimes: 30-period regime label at every point
+- Features: IL/fee prediction feature matrix plus IL and fee targets
+
+Usage:
+    python backend/scripts/benchmark_advanced_analytics.py
+    python backend/scripts/benchmark_advanced_analytics.py --lengths 1000,5000 --window 60
+"""
+
+import sys
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.cl_price_history import CLPriceHistory
+from services.analytics_core import (
+    PriceSeries, rolling_volatility, rolling_var_cvar, drawdown_series, regime_labels, prediction_features
+)
+
+POSITION = {'entry_price': 2000.0, 'price_range_min': 1800.0, 'price_range_max': 2200.0, 'fee_tier': 0.003}
+
+
+def make_records(count, seed=21):
+    rng = np.random.default_rng(seed)
+    prices = 2000 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    volumes = rng.uniform(1e5, 1e6, count)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    return [{'timestamp': (start + timedelta(hours=i)).isoformat(), 'price': float(prices[i]),
+             'volume': float(volumes[i])} for i in range(count)]
+
+
+def load_history(db_path, records):
+    history = CLPriceHistory(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            'INSERT INTO cl_price_history (position_id, token_pair, price, timestamp) VALUES (?, ?, ?, ?)',
+            [('pos-1', 'ETH/USDC', r['price'], 1577836800 + 3600 * i) for i, r in enumerate(records)]
+        )
+    return history
+
+
+# Previous per-row implementations
+
+def legacy_load(records):
+    data = sorted(records, key=lambda x: x['timestamp'])
+    times = [datetime.fromisoformat(r['timestamp'].replace('Z', '+00:00')).timestamp() for r in data]
+    return times, [float(r['price']) for r in data]
+
+
+def legacy_rolling_risk(prices, window):
+    returns = np.diff(prices) / np.array(prices[:-1])
+    log_returns = np.diff(np.log(prices))
+    results = []
+    for end in range(window, len(returns) + 1):
+        chunk = returns[end - window:end]
+        var_95 = np.percentile(chunk, 5)
+        results.append((np.std(log_returns[end - window:end]) * np.sqrt(252), var_95,
+                        np.mean(chunk[chunk <= var_95])))
+    cumulative = np.cumprod(1 + returns)
+    drawdown = (cumulative - np.maximum.accumulate(cumulative)) / np.maximum.accumulate(cumulative)
+    return results, drawdown
+
+
+def legacy_regimes(prices, window):
+    labels = []
+    for end in range(window, len(prices) + 1):
+        chunk = prices[end - window:end]
+        returns = np.diff(np.log(chunk))
+        volatility = np.std(returns) * np.sqrt(252)
+        trend = np.polyfit(range(len(chunk)), chunk, 1)[0]
+        avg_return = np.mean(returns[-20:])
+        if volatility > 0.6:
+            labels.append('high_volatility')
+        elif volatility < 0.2:
+            labels.append('low_volatility')
+        elif trend > 0.02 and avg_return > 0:
+            labels.append('bull_market')
+        elif trend < -0.02 and avg_return < 0:
+            labels.append('bear_market')
+        else:
+            labels.append('sideways')
+    return labels
+
+
+def legacy_features(data):
+    features, il_values, fee_values = [], [], []
+    for i in range(len(data)):
+        price = float(data[i]['price'])
+        volume = float(data[i].get('volume', 0))
+        if i >= 5:
+            prices_5d = [float(data[j]['price']) for j in range(i - 4, i + 1)]
+            sma_5, volatility_5d = np.mean(prices_5d), np.std(prices_5d)
+        else:
+            sma_5, volatility_5d = price, 0
+        if i >= 20:
+            prices_20d = [float(data[j]['price']) for j in range(i - 19, i + 1)]
+            sma_20, volatility_20d = np.mean(prices_20d), np.std(prices_20d)
+        else:
+            sma_20, volatility_20d = price, 0
+        features.append([price, volume, sma_5, sma_20, volatility_5d, volatility_20d,
+                         price / sma_5 if sma_5 > 0 else 1, price / sma_20 if sma_20 > 0 else 1])
+        in_range = POSITION['price_range_min'] <= price <= POSITION['price_range_max']
+        il_values.append(abs(price - POSITION['entry_price']) / POSITION['entry_price'] * (0.1 if in_range else 0.3))
+        fee_values.append(volume * POSITION['fee_tier'] * 0.5 if in_range else 0)
+    return np.array(features), il_values, fee_values
+
+
+# Vectorized implementations
+
+def vectorized_rolling_risk(series, window):
+    returns = series.simple_returns()
+    return (rolling_volatility(series.log_returns(), window), rolling_var_cvar(returns, window),
+            drawdown_series(returns))
+
+
+def vectorized_features(series):
+    prices = series.prices
+    in_range = (prices >= POSITION['price_range_min']) & (prices <= POSITION['price_range_max'])
+    il = np.abs(prices - POSITION['entry_price']) / POSITION['entry_price'] * np.where(in_range, 0.1, 0.3)
+    fees = np.where(in_range, series.volumes * POSITION['fee_tier'] * 0.5, 0.0)
+    return prediction_features(series), il, fees
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark vectorized advanced analytics')
+    parser.add_argument('--lengths', default='1000,10000,100000', help='Comma-separated history lengths')
+    parser.add_argument('--window', type=int, default=30, help='Rolling window length')
+    args = parser.parse_args()
+
+    print(f"{'Points':>8} {'Step':<13} {'per-row ms':>11} {'vectorized ms':>14} {'Speedup':>8}")
+    for length in (int(n) for n in args.lengths.split(',')):
+        records = make_records(length)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            history = load_history(os.path.join(tmp_dir, 'cl_positions.db'), records)
+            legacy_ms, rows = timed(lambda: [float(r['price']) for r in
+                                             history.get_price_history(position_id='pos-1')[::-1]])
+            vector_ms, loaded = timed(lambda: PriceSeries.load(position_id='pos-1', price_history=history))
+            assert np.allclose(rows, loaded.prices)
+            steps = [('Load', legacy_ms, vector_ms)]
+
+        legacy_ms, (_, legacy_prices) = timed(lambda: legacy_load(records))
+        vector_ms, series = timed(lambda: PriceSeries.from_records(records))
+        steps.append(('Parse', legacy_ms, vector_ms))
+
+        legacy_ms, (legacy_risk, _) = timed(lambda: legacy_rolling_risk(legacy_prices, args.window))
+        vector_ms, (volatility, _, _) = timed(lambda: vectorized_rolling_risk(series, args.window))
+        assert np.allclose([r[0] for r in legacy_risk], volatility[args.window - 1:])
+        steps.append(('Rolling risk', legacy_ms, vector_ms))
+
+        legacy_ms, legacy_labels = timed(lambda: legacy_regimes(legacy_prices, args.window))
+        vector_ms, (labels, _) = timed(lambda: regime_labels(series.prices, vol_window=args.window - 1,
+                                                             trend_window=args.window))
+        assert list(labels[args.window - 1:]) == legacy_labels
+        steps.append(('Regimes', legacy_ms, vector_ms))
+
+        legacy_ms, (legacy_matrix, _, _) = timed(lambda: legacy_features(records))
+        vector_ms, (matrix, _, _) = timed(lambda: vectorized_features(series))
+        assert np.allclose(legacy_matrix, matrix)
+        steps.append(('Features', legacy_ms, vector_ms))
+
+        for label, legacy_ms, vector_ms in steps:
+            print(f"{length:>8,} {label:<13} {legacy_ms:>11.1f} {vector_ms:>14.1f} {legacy_ms / vector_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
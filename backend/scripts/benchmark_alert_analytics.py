@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Alert Analytics Benchmark
+
+Compares the previous five aggregate queries over the alerts table with the
+single query over the materialized daily counters used by
+AlertService.get_alert_analytics, for history sizes and analysis windows.
+Alerts are spread evenly over the last year.
+
+Usage:
+    python backend/scripts/benchmark_alert_analytics.py
+    python backend/scripts/benchmark_alert_analytics.py --alerts 10000,100000 --days 7,30
+"""
+
+import sys
+import os
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.alert_service import AlertService, AlertType, AlertSeverity, AlertStatus
+
+
+def populate(db_path, count, seed=8):
+    """Insert alerts directly, then restart the service so the counters are backfilled."""
+    rng = random.Random(seed)
+    now = int(time.time())
+    types = [t.value for t in AlertType]
+    severities = [s.value for s in AlertSeverity]
+    statuses = [s.value for s in AlertStatus]
+    rows = []
+    for i in range(count):
+        created_at = now - rng.randrange(365 * 86400)
+        status = rng.choice(statuses)
+        acknowledged_at = created_at + rng.randrange(3600) if status == 'acknowledged' else None
+        rows.append((f'alert-{i}', 'rule', f'pos-{i % 500}', rng.choice(types), rng.choice(severities),
+                     'title', 'message', status, created_at, created_at, acknowledged_at,
+                     int(rng.random() < 0.1)))
+
+    AlertService(db_path).shutdown()
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany('''
+            INSERT INTO alerts (id, rule_id, position_id, alert_type, severity, title, message,
+                                status, created_at, updated_at, acknowledged_at, escalation_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.execute('DELETE FROM alert_daily_counts')
+    started = time.perf_counter()
+    service = AlertService(db_path)
+    return service, (time.perf_counter() - started) * 1000
+
+
+def legacy_analytics(db_path, days):
+    """Previous approach: five aggregate queries over the alerts table."""
+    start_timestamp = int((datetime.now() - timedelta(days=days)).timestamp())
+    with sqlite3.connect(db_path) as conn:
+        status_counts = dict(conn.execute(
+            'SELECT status, COUNT(*) FROM alerts WHERE created_at >= ? GROUP BY status', (start_timestamp,)))
+        type_counts = dict(conn.execute(
+            'SELECT alert_type, COUNT(*) FROM alerts WHERE created_at >= ? GROUP BY alert_type', (start_timestamp,)))
+        severity_counts = dict(conn.execute(
+            'SELECT severity, COUNT(*) FROM alerts WHERE created_at >= ? GROUP BY severity', (start_timestamp,)))
+        avg_response_time = conn.execute('''
+            SELECT AVG(acknowledged_at - created_at) FROM alerts
+            WHERE created_at >= ? AND acknowledged_at IS NOT NULL
+        ''', (start_timestamp,)).fetchone()[0] or 0
+        total, escalated = conn.execute('''
+            SELECT COUNT(*), SUM(CASE WHEN escalation_count > 0 THEN 1 ELSE 0 END)
+            FROM alerts WHERE created_at >= ?
+        ''', (start_timestamp,)).fetchone()
+    return {
+        'total_alerts': sum(status_counts.values()),
+        'status_breakdown': status_counts,
+        'type_breakdown': type_counts,
+        'severity_breakdown': severity_counts,
+        'avg_response_time_seconds': avg_response_time,
+        'escalation_rate_percent': (escalated / total * 100) if total else 0
+    }
+
+
+def timed(fn, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark alert analytics queries')
+    parser.add_argument('--alerts', default='10000,100000,1000000', help='Comma-separated alert history sizes')
+    parser.add_argument('--days', default='1,7,30,365', help='Comma-separated analysis windows in days')
+    args = parser.parse_args()
+
+    windows = [int(d) for d in args.days.split(',')]
+    print(f"{'Alerts':>10} {'Days':>5} {'Window':>9} {'legacy ms':>10} {'counters ms':>12} {'Speedup':>8}")
+    for count in (int(n) for n in args.alerts.split(',')):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            service, backfill_ms = populate(os.path.join(tmp_dir, 'alerts.db'), count)
+            print(f"{count:>10,} backfill {backfill_ms:.1f} ms")
+            for days in windows:
+                legacy_ms, _ = timed(lambda: legacy_analytics(service.db_path, days))
+                counters_ms, analytics = timed(lambda: service.get_alert_analytics(days))
+                print(f"{count:>10,} {days:>5} {analytics['total_alerts']:>9,} {legacy_ms:>10.2f} "
+                      f"{counters_ms:>12.2f} {legacy_ms / counters_ms:>7.1f}x")
+            service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
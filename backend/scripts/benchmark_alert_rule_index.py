@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Alert Rule Evaluation Benchmark
+
+Compares checking every alert rule against every position (rules x positions
+predicate checks) with the compiled AlertRuleIndex for a monitoring sweep.
+Rules are a mix of wildcard and position-specific threshold rules whose
+thresholds are spread so only a small share match at any time.
+
+Usage:
+    python backend/scripts/benchmark_alert_rule_index.py
+    python backend/scripts/benchmark_alert_rule_index.py --rules 1000,50000 --positions 2000
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.alert_rule_index import AlertRuleIndex, compile_conditions
+
+FIELDS = ['impermanent_loss', 'apr', 'current_value', 'fees_collected']
+
+
+def make_rules(count, positions, seed=5):
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        field = rng.choice(FIELDS)
+        conditions = {field: {'gt': rng.uniform(90, 100)}} if i % 2 else {field: {'lt': rng.uniform(0, 10)}}
+        position_id = f'pos-{rng.randrange(positions)}' if i % 4 else None
+        rules.append((f'rule-{i}', 'custom', position_id, conditions))
+    return rules
+
+
+def make_positions(count, seed=6):
+    rng = random.Random(seed)
+    return [{'id': f'pos-{i}', **{field: rng.uniform(5, 95) for field in FIELDS}} for i in range(count)]
+
+
+def scan_all(rules, positions):
+    """Previous approach: every rule's predicates checked against every position payload."""
+    compiled = [(rule_id, position_id, compile_conditions(conditions))
+                for rule_id, _, position_id, conditions in rules]
+    matches = []
+    for row, position in enumerate(positions):
+        for rule_id, position_id, predicates in compiled:
+            if position_id is not None and position_id != position['id']:
+                continue
+            if all(p.check(float(position.get(p.field, float('nan')))) for p in predicates):
+                matches.append((rule_id, row))
+    return matches
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark indexed alert rule evaluation')
+    parser.add_argument('--rules', default='1000,10000,100000', help='Comma-separated rule counts')
+    parser.add_argument('--positions', type=int, default=1000, help='Positions per sweep')
+    parser.add_argument('--scan-limit', type=int, default=10000, help='Largest rule count to run the full scan for')
+    args = parser.parse_args()
+
+    positions = make_positions(args.positions)
+    print(f"{'Rules':>8} {'Positions':>9} {'Matches':>8} {'build ms':>9} {'scan ms':>9} {'index ms':>9} {'Speedup':>8}")
+    for count in (int(n) for n in args.rules.split(',')):
+        rules = make_rules(count, args.positions)
+        index = AlertRuleIndex()
+        build_ms, _ = timed(lambda: index.load(rules))
+        index_ms, matches = timed(lambda: index.evaluate(positions))
+
+        if count <= args.scan_limit:
+            scan_ms, expected = timed(lambda: scan_all(rules, positions))
+            assert sorted(expected) == sorted((rule.rule_id, row) for rule, row in matches)
+            scan, speedup = f"{scan_ms:>9.1f}", f"{scan_ms / index_ms:>7.1f}x"
+        else:
+            scan, speedup = f"{'-':>9}", f"{'-':>8}"
+
+        print(f"{count:>8,} {args.positions:>9,} {len(matches):>8,} {build_ms:>9.1f} {scan} {index_ms:>9.1f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
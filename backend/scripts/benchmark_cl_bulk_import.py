@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+CL Position Bulk Import Benchmark
+
+Compares the previous bulk import path (CLService.create_position per row:
+one connection, commit and read-back per position) with
+CLService.bulk_create_positions (validate every row, then one executemany
+in a single transaction). The per-row path is timed on a sample and
+extrapolated, since at 10k positions it takes minutes.
+
+Usage:
+    python backend/scripts/benchmark_cl_bulk_import.py
+    python backend/scripts/benchmark_cl_bulk_import.py --positions 1000,10000,50000 --legacy-sample 500
+"""
+
+import sys
+import os
+import time
+import argparse
+import logging
+import tempfile
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.cl_service import CLService
+
+
+def make_positions(count):
+    return [{
+        'trade_name': f'Position {i}',
+        'pair_symbol': 'ETH/USDC',
+        'price_range_min': 1500.0,
+        'price_range_max': 2500.0,
+        'liquidity_amount': 1000.0 + i,
+        'initial_investment': 5000.0,
+        'entry_date': '2025-01-15T00:00:00'
+    } for i in range(count)]
+
+
+def timed(fn, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk import of CL positions')
+    parser.add_argument('--positions', default='100,1000,10000', help='Comma-separated import sizes')
+    parser.add_argument('--legacy-sample', type=int, default=200, help='Rows timed on the per-row path')
+    args = parser.parse_args()
+
+    # Per-row INFO logging would dominate the per-row path's timing
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = CLService(os.path.join(tmp_dir, 'cl.db'))
+        sample = make_positions(args.legacy_sample)
+        legacy_ms, _ = timed(lambda: [service.create_position(p) for p in sample], repeat=1)
+        legacy_row_ms = legacy_ms / len(sample)
+
+    print(f"{'Positions':>10} {'per-row ms (est.)':>18} {'bulk ms':>9} {'Speedup':>9}")
+    for count in (int(n) for n in args.positions.split(',')):
+        positions = make_positions(count)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            service = CLService(os.path.join(tmp_dir, 'cl.db'))
+            bulk_ms, outcome = timed(lambda: service.bulk_create_positions(positions))
+            assert outcome['imported'] == count
+        print(f"{count:>10,} {legacy_row_ms * count:>18,.0f} {bulk_ms:>9.1f} {legacy_row_ms * count / bulk_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Database Metrics Benchmark
+
+Compares the previous SystemMonitor database metrics collection (COUNT(*)
+over every table) with the statistics-based collection, both on a cached
+cycle and on a cycle that refreshes sqlite_stat1 and dbstat sizes, and
+measures what timing a statement through QueryStats adds per execution.
+
+Usage:
+    python backend/scripts/benchmark_database_metrics.py
+    python backend/scripts/benchmark_database_metrics.py --rows 100000,1000000
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import sqlite3
+import argparse
+import tempfile
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.system_monitor import SystemMonitor
+
+
+def legacy_collect(db_path):
+    """Previous approach: COUNT(*) over every table."""
+    with sqlite3.connect(db_path) as conn:
+        tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        return {name: conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0] for (name,) in tables}
+
+
+def populate(db_path, count):
+    """Fill system_metrics and health_checks with `count` rows each."""
+    now = int(time.time())
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany('''
+            INSERT INTO system_metrics (id, timestamp, metric_type, cpu_usage, memory_usage, disk_usage,
+                                        network_io, process_count, uptime_seconds, load_average)
+            VALUES (?, ?, 'system', 25.0, 50.0, 40.0, ?, 200, ?, '[1.0, 1.0, 1.0]')
+        ''', ((str(uuid.uuid4()), now - i, json.dumps({'bytes_sent': i}), i) for i in range(count)))
+        conn.executemany('''
+            INSERT INTO health_checks (id, component, status, message, timestamp, response_time_ms)
+            VALUES (?, ?, 'healthy', 'ok', ?, 1.0)
+        ''', ((str(uuid.uuid4()), f'component-{i % 10}', now - i) for i in range(count)))
+
+
+def timed(fn, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SystemMonitor database metrics collection')
+    parser.add_argument('--rows', default='10000,100000,1000000', help='Comma-separated rows per large table')
+    parser.add_argument('--statements', type=int, default=20000, help='Statements for the timing overhead check')
+    args = parser.parse_args()
+
+    print(f"{'Rows':>10} {'legacy ms':>10} {'refresh ms':>11} {'cached ms':>10} {'Speedup':>8}")
+    for count in (int(n) for n in args.rows.split(',')):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            monitor = SystemMonitor(os.path.join(tmp_dir, 'monitoring.db'))
+            populate(monitor.db_path, count)
+
+            legacy_ms, _ = timed(lambda: legacy_collect(monitor.db_path))
+            monitor.table_stats_refresh_seconds = 0
+            refresh_ms, _ = timed(monitor._collect_database_metrics)
+            monitor.table_stats_refresh_seconds = 3600
+            cached_ms, _ = timed(monitor._collect_database_metrics)
+            print(f"{count:>10,} {legacy_ms:>10.2f} {refresh_ms:>11.2f} {cached_ms:>10.2f} "
+                  f"{legacy_ms / cached_ms:>7.1f}x")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monitor = SystemMonitor(os.path.join(tmp_dir, 'monitoring.db'))
+
+        def run(connect):
+            with connect(monitor.db_path) as conn:
+                for i in range(args.statements):
+                    conn.execute('SELECT status FROM monitoring_alerts WHERE id = ?', (str(i),)).fetchone()
+
+        plain_ms, _ = timed(lambda: run(sqlite3.connect))
+        timed_ms, _ = timed(lambda: run(monitor.query_stats.connect))
+        print(f"\nstatement timing overhead: {(timed_ms - plain_ms) / args.statements * 1000:.2f} us per execution "
+              f"({plain_ms:.1f} ms plain, {timed_ms:.1f} ms timed for {args.statements:,} statements)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+HTTP Session Pool Benchmark
+
+Compares per-request latency of bare requests.post calls (new connection every time)
+against the shared keep-alive HTTPSessionPool, sequentially and from concurrent threads.
+
+Requests go to a local HTTP/1.1 stub server (no network access needed). Each new
+connection is delayed by --handshake-ms to approximate the TCP+TLS handshake cost of
+a remote API; requests on a reused connection skip it.
+
+Usage:
+    python backend/scripts/benchmark_http_session_pool.py
+    python backend/scripts/benchmark_http_session_pool.py --requests 500 --handshake-ms 40 --threads 8
+"""
+
+import sys
+import os
+import time
+import json
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.http_session_pool import HTTPSessionPool
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Keep-alive JSON endpoint that charges a handshake delay per new connection."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    handshake = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        with StubHandler.lock:
+            StubHandler.connections += 1
+        time.sleep(StubHandler.handshake)
+        super().setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps({'ok': True}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def benchmark(label, send, count, threads):
+    StubHandler.connections = 0
+    started = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda _: send(), range(count)))
+    else:
+        for _ in range(count):
+            send()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<36} {StubHandler.connections:>11} {elapsed / count * 1000:>12.2f} {elapsed:>10.2f}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the shared HTTP session pool')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per run')
+    parser.add_argument('--handshake-ms', type=float, default=20.0, help='Simulated cost of opening a connection')
+    parser.add_argument('--threads', type=int, default=4, help='Threads for the concurrent runs')
+    args = parser.parse_args()
+
+    StubHandler.handshake = args.handshake_ms / 1000.0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/info'
+    payload = {'type': 'allMids'}
+
+    pool = HTTPSessionPool(max_per_host=args.threads)
+
+    def bare():
+        requests.post(url, json=payload, timeout=10).json()
+
+    def pooled():
+        pool.post(url, json=payload, timeout=10).json()
+
+    print(f"{args.requests} requests, {args.handshake_ms:.0f}ms simulated handshake per connection\n")
+    print(f"{'Client':<36} {'Connections':>11} {'ms / request':>12} {'Total s':>10}")
+    bare_seq = benchmark('requests.post', bare, args.requests, 1)
+    pooled_seq = benchmark('HTTPSessionPool', pooled, args.requests, 1)
+    bare_conc = benchmark(f'requests.post ({args.threads} threads)', bare, args.requests, args.threads)
+    pooled_conc = benchmark(f'HTTPSessionPool ({args.threads} threads)', pooled, args.requests, args.threads)
+
+    print(f"\nSpeedup: {bare_seq / pooled_seq:.1f}x sequential, {bare_conc / pooled_conc:.1f}x concurrent")
+    for host, stats in pool.get_stats().items():
+        print(f"Pool stats for {host}: {stats}")
+
+    pool.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Hyperliquid Equity Series Benchmark
+
+Compares reading portfolio snapshots at full resolution (get_portfolio_snapshots)
+against the downsampled equity series served from precomputed buckets, for chart
+ranges from one day to the full history of --snapshots one-minute snapshots.
+
+Usage:
+    python backend/scripts/benchmark_hyperliquid_equity_series.py
+    python backend/scripts/benchmark_hyperliquid_equity_series.py --snapshots 100000 --max-points 300
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import sqlite3
+import argparse
+import tempfile
+
+import numpy as np
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.hyperliquid_models import HyperliquidDatabase, AccountType
+
+WALLET = '0x0000000000000000000000000000000000000001'
+DAY = 24 * 60 * 60
+
+
+def load_snapshots(db_path, count, seed=7):
+    """Write one-minute snapshots straight into the snapshot table."""
+    rng = np.random.default_rng(seed)
+    end = int(time.time())
+    times = end - 60 * np.arange(count)[::-1]
+    values = 10000 + np.cumsum(rng.normal(0, 5, count))
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany('''
+            INSERT INTO hyperliquid_portfolio_snapshots (
+                id, account_type, wallet_address, snapshot_time, account_value,
+                total_ntl_pos, total_raw_usd, margin_summary, positions, raw_data, created_at
+            ) VALUES (?, ?, ?, ?, ?, NULL, NULL, ?, ?, ?, ?)
+        ''', [
+            (str(uuid.uuid4()), 'personal_wallet', WALLET, int(t), float(v), '{}', '[]',
+             json.dumps({'accountValue': f'{v:.2f}'}), int(t))
+            for t, v in zip(times, values)
+        ])
+    return end
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark downsampled Hyperliquid equity series')
+    parser.add_argument('--snapshots', type=int, default=525600, help='Number of one-minute snapshots')
+    parser.add_argument('--max-points', type=int, default=500, help='Point budget per chart request')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per query (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = HyperliquidDatabase(os.path.join(tmp_dir, 'equity.db'), archive_raw_fills=False)
+        end = load_snapshots(db.db_path, args.snapshots)
+
+        started = time.perf_counter()
+        db.rebuild_equity_buckets()
+        print(f"{args.snapshots:,} snapshots, buckets built in {time.perf_counter() - started:.1f}s\n")
+
+        full_ms, snapshots = timed(lambda: db.get_portfolio_snapshots(AccountType.PERSONAL_WALLET, WALLET), 1)
+        print(f"Full resolution (get_portfolio_snapshots): {len(snapshots):,} rows in {full_ms:.0f} ms\n")
+
+        print(f"{'Range':<8} {'Method':<6} {'Resolution':>10} {'Points':>7} {'ms':>8}")
+        for label, span in (('1d', DAY), ('7d', 7 * DAY), ('30d', 30 * DAY), ('1y', 365 * DAY), ('all', None)):
+            start_time = end - span if span else None
+            for method in ('ohlc', 'lttb'):
+                ms, series = timed(lambda: db.get_portfolio_equity_series(
+                    AccountType.PERSONAL_WALLET, WALLET, start_time=start_time,
+                    max_points=args.max_points, method=method
+                ), args.repeat)
+                print(f"{label:<8} {method:<6} {series['resolution']:>10} {len(series['points']):>7} {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Hyperliquid Fill Storage Benchmark
+
+Compares the previous fill storage (full JSON payload in raw_data, decoded on every
+read, single-column indexes) against the columnar layout (typed columns, composite
+account/time and account/coin/time indexes, no JSON on read) at --fills synthetic fills.
+
+Usage:
+    python backend/scripts/benchmark_hyperliquid_fill_storage.py
+    python backend/scripts/benchmark_hyperliquid_fill_storage.py --fills 100000 --coins 50
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import sqlite3
+import argparse
+import tempfile
+
+import numpy as np
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.hyperliquid_models import HyperliquidDatabase, AccountType
+
+WALLET = '0x0000000000000000000000000000000000000001'
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def make_fills(count, coins, seed=11):
+    rng = np.random.default_rng(seed)
+    start = 1700000000000
+    times = np.sort(start + rng.integers(0, 365 * DAY_MS, count))
+    coin_names = [f'COIN{i}' for i in range(coins)]
+    coin_index = rng.integers(0, coins, count)
+    prices = rng.uniform(1, 5000, count)
+    sizes = rng.uniform(0.01, 10, count)
+    return [{
+        'coin': coin_names[coin_index[i]], 'px': f'{prices[i]:.4f}', 'sz': f'{sizes[i]:.4f}',
+        'side': 'B' if i % 2 else 'A', 'time': int(times[i]), 'startPosition': '0.0',
+        'dir': 'Open Long' if i % 2 else 'Close Long', 'closedPnl': f'{prices[i] * 0.001:.4f}',
+        'hash': f'0x{i:064x}', 'oid': 1000000 + i, 'crossed': bool(i % 3), 'fee': '0.0150',
+        'tid': 500000000 + i, 'feeToken': 'USDC'
+    } for i in range(count)]
+
+
+def build_legacy(db_path, fills):
+    """Previous layout: typed columns plus the full JSON payload in raw_data."""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('''
+            CREATE TABLE hyperliquid_trades (
+                id TEXT PRIMARY KEY, account_type TEXT NOT NULL, wallet_address TEXT NOT NULL,
+                trade_id TEXT NOT NULL, coin TEXT NOT NULL, side TEXT NOT NULL, px REAL NOT NULL,
+                sz REAL NOT NULL, time INTEGER NOT NULL, start_position REAL, dir TEXT,
+                closed_pnl REAL, hash TEXT, oid INTEGER, crossed BOOLEAN, fee REAL,
+                liquidation_markup REAL, raw_data TEXT, created_at INTEGER NOT NULL,
+                updated_at INTEGER NOT NULL, UNIQUE(trade_id, account_type, wallet_address)
+            )
+        ''')
+        for column in ('account_type', 'wallet_address', 'coin', 'time', 'side'):
+            conn.execute(f'CREATE INDEX idx_legacy_{column} ON hyperliquid_trades({column})')
+        conn.executemany('INSERT INTO hyperliquid_trades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', [
+            (str(uuid.uuid4()), 'personal_wallet', WALLET, f['tid'], f['coin'], f['side'], float(f['px']),
+             float(f['sz']), f['time'], 0.0, f['dir'], float(f['closedPnl']), f['hash'], f['oid'],
+             f['crossed'], float(f['fee']), None, json.dumps(f), 0, 0)
+            for f in fills
+        ])
+
+
+def legacy_get_trades(db_path, coin=None, start_time=None, limit=None):
+    """Previous get_trades read path: SELECT * and json.loads on every row."""
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        query = 'SELECT * FROM hyperliquid_trades WHERE account_type = ? AND wallet_address = ?'
+        params = ['personal_wallet', WALLET]
+        if coin:
+            query += ' AND coin = ?'
+            params.append(coin)
+        if start_time is not None:
+            query += ' AND time >= ?'
+            params.append(start_time)
+        query += ' ORDER BY time DESC'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        trades = []
+        for row in conn.execute(query, params):
+            trade = dict(row)
+            if trade['raw_data']:
+                trade['raw_data'] = json.loads(trade['raw_data'])
+            trades.append(trade)
+        return trades
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Hyperliquid fill storage layouts')
+    parser.add_argument('--fills', type=int, default=500000, help='Number of synthetic fills')
+    parser.add_argument('--coins', type=int, default=20, help='Number of distinct coins')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per query (best is reported)')
+    args = parser.parse_args()
+
+    fills = make_fills(args.fills, args.coins)
+    window_start = fills[-1]['time'] - 30 * DAY_MS
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = os.path.join(tmp_dir, 'legacy.db')
+        columnar_path = os.path.join(tmp_dir, 'columnar.db')
+
+        started = time.perf_counter()
+        build_legacy(legacy_path, fills)
+        legacy_load = time.perf_counter() - started
+
+        started = time.perf_counter()
+        db = HyperliquidDatabase(columnar_path, archive_raw_fills=False)
+        db.insert_trades(fills, AccountType.PERSONAL_WALLET, WALLET)
+        columnar_load = time.perf_counter() - started
+
+        queries = [
+            ('All fills for account',
+             lambda: legacy_get_trades(legacy_path),
+             lambda: db.get_trades(AccountType.PERSONAL_WALLET, WALLET)),
+            ('Latest 100 fills',
+             lambda: legacy_get_trades(legacy_path, limit=100),
+             lambda: db.get_trades(AccountType.PERSONAL_WALLET, WALLET, limit=100)),
+            ('One coin, last 30 days',
+             lambda: legacy_get_trades(legacy_path, coin='COIN0', start_time=window_start),
+             lambda: db.get_trades(AccountType.PERSONAL_WALLET, WALLET, coin='COIN0', start_time=window_start)),
+        ]
+
+        print(f"{args.fills:,} fills across {args.coins} coins\n")
+        print(f"{'Query':<28} {'Rows':>8} {'raw_data ms':>12} {'columnar ms':>12} {'Speedup':>8}")
+        for label, legacy_fn, columnar_fn in queries:
+            legacy_ms, legacy_rows = timed(legacy_fn, args.repeat)
+            columnar_ms, columnar_rows = timed(columnar_fn, args.repeat)
+            assert len(legacy_rows) == len(columnar_rows), label
+            print(f"{label:<28} {len(columnar_rows):>8,} {legacy_ms:>12.1f} {columnar_ms:>12.1f} "
+                  f"{legacy_ms / columnar_ms:>7.1f}x")
+
+        print(f"\nLoad time: raw_data {legacy_load:.1f}s, columnar {columnar_load:.1f}s")
+        print(f"File size: raw_data {os.path.getsize(legacy_path) / 1e6:.1f} MB, "
+              f"columnar {os.path.getsize(columnar_path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
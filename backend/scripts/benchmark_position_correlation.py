@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Position Correlation Benchmark
+
+Compares a per-pair return correlation (each position loaded separately with
+get_price_history, returns aligned through dicts, np.corrcoef per pair) against
+the CorrelationEngine (one query, one grid, masked matrix products), cold and
+served from the watermark cache, for portfolios of increasing size with
+--days of hourly prices per position.
+
+Usage:
+    python backend/scripts/benchmark_position_correlation.py
+    python backend/scripts/benchmark_position_correlation.py --positions 50,500 --days 14
+"""
+
+import sys
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+
+import numpy as np
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from models.cl_price_history import CLPriceHistory
+from services.correlation_engine import CorrelationEngine
+
+HOUR = 3600
+START = 1700000000
+
+
+def load_history(db_path, positions, hours, seed=17):
+    """Write hourly prices driven by a few shared factors for each position."""
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, (hours, 4))
+    history = CLPriceHistory(db_path)
+    rows = []
+    for i in range(positions):
+        loadings = rng.normal(0, 1, 4)
+        prices = 100 * np.exp(np.cumsum(factors @ loadings * 0.5 + rng.normal(0, 0.005, hours)))
+        rows.extend((f'pos-{i}', 'X/USDC', float(p), START + h * HOUR + int(rng.integers(0, 60)))
+                    for h, p in enumerate(prices))
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            'INSERT INTO cl_price_history (position_id, token_pair, price, timestamp) VALUES (?, ?, ?, ?)', rows
+        )
+    return history
+
+
+def per_pair_correlation(history, position_ids):
+    """Correlation computed pair by pair from dict-aligned hourly returns."""
+    returns = {}
+    for position_id in position_ids:
+        records = history.get_price_history(position_id=position_id, limit=None)
+        by_hour = {r['timestamp'] // HOUR: r['price'] for r in reversed(records)}
+        hours = sorted(by_hour)
+        returns[position_id] = {h: np.log(by_hour[h] / by_hour[p]) for p, h in zip(hours, hours[1:])}
+
+    matrix = {}
+    for a in position_ids:
+        matrix[a] = {}
+        for b in position_ids:
+            common = sorted(returns[a].keys() & returns[b].keys())
+            matrix[a][b] = np.corrcoef([returns[a][h] for h in common], [returns[b][h] for h in common])[0, 1]
+    return matrix
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the position return correlation engine')
+    parser.add_argument('--positions', default='10,100,300', help='Comma-separated portfolio sizes')
+    parser.add_argument('--days', type=int, default=30, help='Days of hourly prices per position')
+    args = parser.parse_args()
+    hours = args.days * 24
+
+    print(f"{'Positions':>9} {'Rows':>9} {'per-pair ms':>12} {'engine ms':>10} {'cached ms':>10} {'Speedup':>8}")
+    for count in (int(n) for n in args.positions.split(',')):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            history = load_history(os.path.join(tmp_dir, 'cl_positions.db'), count, hours)
+            position_ids = [f'pos-{i}' for i in range(count)]
+            engine = CorrelationEngine(history, lookback=hours * HOUR)
+
+            legacy_ms, legacy = timed(lambda: per_pair_correlation(history, position_ids))
+            engine_ms, result = timed(lambda: engine.compute(position_ids))
+            cached_ms, cached = timed(lambda: engine.compute(position_ids))
+            assert cached is result
+
+            expected = np.array([[legacy[a][b] for b in position_ids] for a in position_ids])
+            assert np.allclose(expected, result.correlation, atol=1e-9)
+
+            print(f"{count:>9,} {count * hours:>9,} {legacy_ms:>12.1f} {engine_ms:>10.1f} {cached_ms:>10.2f} "
+                  f"{legacy_ms / engine_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
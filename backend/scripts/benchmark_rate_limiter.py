@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Request Rate Limiter Benchmark
+
+Compares the previous integration route limiter (a per-IP list of
+timestamps, filtered on every request and never evicted) with the GCRA
+limiter on its in-memory LRU store and its shared SQLite store: time per
+check for a few busy clients and for many distinct clients, and the number
+of client entries left in memory.
+
+Usage:
+    python backend/scripts/benchmark_rate_limiter.py
+    python backend/scripts/benchmark_rate_limiter.py --clients 100000 --limit 120
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.request_rate_limiter import RequestRateLimiter, MemoryRateLimitStore, SQLiteRateLimitStore
+
+
+def legacy_hit(storage, client_ip, requests_per_minute, current_time):
+    """Previous approach: rebuild the client's timestamp list on every request."""
+    cutoff_time = current_time - 60
+    if client_ip in storage:
+        storage[client_ip] = [timestamp for timestamp in storage[client_ip] if timestamp > cutoff_time]
+    if client_ip not in storage:
+        storage[client_ip] = []
+    if len(storage[client_ip]) >= requests_per_minute:
+        return False
+    storage[client_ip].append(current_time)
+    return True
+
+
+def timed(fn, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the per-client request rate limiter')
+    parser.add_argument('--clients', type=int, default=100000, help='Distinct clients for the many-clients run')
+    parser.add_argument('--busy-requests', type=int, default=100000, help='Requests from the busy clients run')
+    parser.add_argument('--limit', type=int, default=1000, help='Requests per minute allowed per client')
+    parser.add_argument('--max-clients', type=int, default=10000, help='LRU bound for the memory store')
+    parser.add_argument('--sqlite-requests', type=int, default=20000, help='Requests for the SQLite store run')
+    args = parser.parse_args()
+
+    # Requests are spread over one minute of simulated time
+    def workload(count, clients):
+        return [(f'10.{i % clients // 65536}.{i % clients // 256 % 256}.{i % clients % 256}', i * 60.0 / count)
+                for i in range(count)]
+
+    print(f"{'Workload':<28} {'limiter':<8} {'us/check':>9} {'entries kept':>13}")
+    for name, requests in (('10 busy clients', workload(args.busy_requests, 10)),
+                           (f'{args.clients:,} distinct clients', workload(args.clients, args.clients))):
+        def run_legacy():
+            storage = {}
+            for client_ip, now in requests:
+                legacy_hit(storage, client_ip, args.limit, now)
+            return len(storage)
+
+        def run_gcra():
+            store = MemoryRateLimitStore(args.max_clients)
+            limiter = RequestRateLimiter(store)
+            for client_ip, now in requests:
+                limiter.hit(client_ip, args.limit, 60, now=1000000 + now)
+            return store.get_metrics()['clients']
+
+        legacy_ms, legacy_kept = timed(run_legacy)
+        gcra_ms, gcra_kept = timed(run_gcra)
+        print(f"{name:<28} {'legacy':<8} {legacy_ms * 1000 / len(requests):>9.2f} {legacy_kept:>13,}")
+        print(f"{name:<28} {'gcra':<8} {gcra_ms * 1000 / len(requests):>9.2f} {gcra_kept:>13,}")
+
+    requests = workload(args.sqlite_requests, args.sqlite_requests)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        limiter = RequestRateLimiter(SQLiteRateLimitStore(os.path.join(tmp_dir, 'rate_limits.db')))
+        sqlite_ms, _ = timed(lambda: [limiter.hit(client_ip, args.limit, 60) for client_ip, _ in requests], repeat=1)
+        print(f"{f'{len(requests):,} distinct clients':<28} {'sqlite':<8} {sqlite_ms * 1000 / len(requests):>9.2f} "
+              f"{limiter.get_metrics()['clients']:>13,}")
+
+
+if __name__ == "__main__":
+    main()
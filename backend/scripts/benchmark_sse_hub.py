@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+SSE Metrics Stream Benchmark
+
+Compares the work done per 5s tick of the metrics stream with one generator
+per client (each computing and serializing its own payload) against the
+BroadcastHub (one payload and frame per tick, fanned out to subscriber
+queues), for increasing numbers of connected clients.
+
+Usage:
+    python backend/scripts/benchmark_sse_hub.py
+    python backend/scripts/benchmark_sse_hub.py --clients 1,10,100 --ticks 20
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.system_monitor import SystemMonitor
+from services.sse_hub import BroadcastHub
+
+
+def timed(fn, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the SSE metrics broadcast hub')
+    parser.add_argument('--clients', default='1,10,50,100', help='Comma-separated numbers of connected clients')
+    parser.add_argument('--ticks', type=int, default=10, help='Ticks to time per measurement')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monitor = SystemMonitor(os.path.join(tmp_dir, 'monitoring.db'))
+        produce_calls = [0]
+
+        def payload():
+            produce_calls[0] += 1
+            return {
+                'timestamp': datetime.now().isoformat(),
+                'metrics': monitor.get_current_metrics(),
+                'health': monitor.get_health_status()
+            }
+
+        print(f"{'Clients':>8} {'per-client ms/tick':>19} {'hub ms/tick':>12} {'Speedup':>8} {'hub produce calls':>18}")
+        for clients in (int(n) for n in args.clients.split(',')):
+            def per_client():
+                for _ in range(args.ticks):
+                    for _ in range(clients):
+                        f"data: {json.dumps(payload())}\n\n"
+
+            # A long interval keeps the producer thread idle after its first tick; publish() is timed directly
+            hub = BroadcastHub(payload, interval_seconds=3600, max_subscribers=clients, queue_size=args.ticks + 1)
+            subscriptions = [hub.subscribe() for _ in range(clients)]
+
+            def broadcast():
+                for _ in range(args.ticks):
+                    hub.publish(payload())
+                for subscription in subscriptions:
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+
+            legacy_ms, _ = timed(per_client)
+            broadcast()
+            produce_calls[0] = 0
+            hub_ms, _ = timed(broadcast)
+            hub.close()
+            print(f"{clients:>8} {legacy_ms / args.ticks:>19.3f} {hub_ms / args.ticks:>12.3f} "
+                  f"{legacy_ms / hub_ms:>7.1f}x {produce_calls[0] // 3:>18}")
+
+
+if __name__ == "__main__":
+    main()
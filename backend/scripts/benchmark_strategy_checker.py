@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Strategy Availability Benchmark
+
+Compares market data requests and wall time per ticker for the three standalone
+strategy checks, the single-pass check_strategies_availability fetch, and the
+scan path where availability is evaluated from chains analyze_options already fetched.
+
+Market data is simulated (no network access needed); each request sleeps for
+--latency-ms to approximate a yfinance round trip.
+
+Usage:
+    python backend/scripts/benchmark_strategy_checker.py
+    python backend/scripts/benchmark_strategy_checker.py --tickers 50 --latency-ms 150
+"""
+
+import sys
+import os
+import time
+import argparse
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import app.data_fetcher as data_fetcher
+from app.strategy_checker import (
+    check_calendar_spread_availability,
+    check_naked_options_availability,
+    check_iron_condor_availability,
+    check_strategies_availability,
+)
+
+
+class SimulatedTicker:
+    """yfinance Ticker stand-in that counts and delays market data requests."""
+
+    requests = 0
+    latency = 0.0
+    expirations = 8
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+        rng = np.random.default_rng(abs(hash(ticker)) % (2 ** 32))
+        self.price = float(rng.uniform(20, 500))
+        strikes = np.round(self.price * np.linspace(0.5, 1.5, 60), 0)
+        self.chains = {
+            f'2030-{month:02d}-15': SimpleNamespace(
+                calls=pd.DataFrame({'strike': strikes}),
+                puts=pd.DataFrame({'strike': strikes})
+            )
+            for month in range(1, self.expirations + 1)
+        }
+        self._options = None
+
+    @classmethod
+    def _request(cls):
+        cls.requests += 1
+        time.sleep(cls.latency)
+
+    @property
+    def options(self):
+        if self._options is None:
+            self._request()
+            self._options = tuple(self.chains)
+        return self._options
+
+    def history(self, period):
+        self._request()
+        return pd.DataFrame({'Close': [self.price]})
+
+    def option_chain(self, exp_date):
+        self._request()
+        return self.chains[exp_date]
+
+
+def run_standalone_checks(ticker):
+    return (check_calendar_spread_availability(ticker),
+            check_naked_options_availability(ticker),
+            check_iron_condor_availability(ticker))
+
+
+def run_single_pass(ticker):
+    return tuple(check_strategies_availability(ticker).values())
+
+
+def run_with_analysis_chains(ticker):
+    # analyze_options has already created the Ticker, listed expirations and fetched chains
+    stock = SimulatedTicker(ticker)
+    return tuple(check_strategies_availability(
+        ticker, options_chains=stock.chains, current_price=stock.price
+    ).values())
+
+
+def benchmark(label, fn, tickers):
+    SimulatedTicker.requests = 0
+    started = time.perf_counter()
+    results = [fn(ticker) for ticker in tickers]
+    elapsed = time.perf_counter() - started
+    print(f"{label:<40} {SimulatedTicker.requests / len(tickers):>8.1f} {elapsed / len(tickers) * 1000:>12.2f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark strategy availability checks')
+    parser.add_argument('--tickers', type=int, default=20, help='Number of simulated tickers')
+    parser.add_argument('--latency-ms', type=float, default=100.0, help='Simulated latency per request')
+    args = parser.parse_args()
+
+    data_fetcher.yf.Ticker = SimulatedTicker
+    SimulatedTicker.latency = args.latency_ms / 1000.0
+    tickers = [f'T{i:03d}' for i in range(args.tickers)]
+
+    print(f"{args.tickers} tickers, {args.latency_ms:.0f}ms simulated latency per request\n")
+    print(f"{'Path':<40} {'Requests':>8} {'ms / ticker':>12}")
+    standalone = benchmark('Three standalone checks', run_standalone_checks, tickers)
+    single = benchmark('check_strategies_availability (fetch)', run_single_pass, tickers)
+    prefetched = benchmark('Evaluated from analysis chains', run_with_analysis_chains, tickers)
+
+    assert standalone == single == prefetched, "Availability results differ between paths"
+    print("\nAll paths agree on strategy availability")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+System Monitor Sampling Benchmark
+
+Measures the cost of one SystemMonitor sample with the non-blocking sampler
+against the previous blocking cpu_percent(interval=1) collection, runs the
+sampler on its 1s schedule to report its CPU overhead, and compares serving
+metric history from the in-memory rings with the previous per-cycle rows
+read back from SQLite.
+
+Usage:
+    python backend/scripts/benchmark_system_monitor.py
+    python backend/scripts/benchmark_system_monitor.py --samples 200 --run-seconds 30
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime
+
+import psutil
+
+# Add backend to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from services.system_monitor import SystemMonitor, SystemMetrics, MetricType
+
+
+def legacy_history(db_path, hours):
+    """Previous approach: read every stored row of the window and parse its JSON fields."""
+    start_timestamp = int(time.time()) - hours * 3600
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute('SELECT * FROM system_metrics WHERE timestamp >= ? ORDER BY timestamp ASC',
+                            (start_timestamp,)).fetchall()
+    metrics = []
+    for row in rows:
+        metric_dict = dict(row)
+        for field in ('network_io', 'load_average'):
+            if metric_dict[field]:
+                metric_dict[field] = json.loads(metric_dict[field])
+        metrics.append(metric_dict)
+    return metrics
+
+
+def populate(monitor, days, interval_seconds):
+    """Fill the rings with one sample per interval, and the table with the matching legacy rows."""
+    now = int(time.time())
+    rows = []
+    for timestamp in range(now - days * 86400, now, interval_seconds):
+        metrics = SystemMetrics(
+            timestamp=datetime.fromtimestamp(timestamp), cpu_usage=25.0, memory_usage=50.0, disk_usage=40.0,
+            network_io={'bytes_sent': timestamp, 'bytes_recv': timestamp, 'packets_sent': 0, 'packets_recv': 0},
+            process_count=200, uptime_seconds=timestamp, load_average=[1.0, 1.0, 1.0]
+        )
+        monitor._record_sample(metrics, 0.0, 0.0)
+        rows.append((str(uuid.uuid4()), timestamp, MetricType.SYSTEM.value, 25.0, 50.0, 40.0,
+                     json.dumps(metrics.network_io), 200, timestamp, json.dumps(metrics.load_average)))
+    monitor._pending_rollups.clear()
+
+    with sqlite3.connect(monitor.db_path) as conn:
+        conn.executemany('''
+            INSERT INTO system_metrics (id, timestamp, metric_type, cpu_usage, memory_usage, disk_usage,
+                                        network_io, process_count, uptime_seconds, load_average)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+
+
+def timed(fn, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SystemMonitor sampling and history queries')
+    parser.add_argument('--samples', type=int, default=100, help='Non-blocking samples to time')
+    parser.add_argument('--blocking-samples', type=int, default=2, help='Blocking (1s) samples to time')
+    parser.add_argument('--run-seconds', type=float, default=10, help='Seconds to run the 1s sampler for')
+    parser.add_argument('--history-days', type=int, default=7, help='Days of history for the query comparison')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monitor = SystemMonitor(os.path.join(tmp_dir, 'monitoring.db'))
+
+        blocking_ms, _ = timed(lambda: psutil.cpu_percent(interval=1), repeat=args.blocking_samples)
+        for _ in range(args.samples):
+            monitor._collect_system_metrics()
+        stats = monitor.get_sampler_stats()
+        print(f"blocking sample     {blocking_ms:10.2f} ms (cpu_percent(interval=1))")
+        print(f"non-blocking sample {stats['avg_sample_ms']:10.3f} ms avg, {stats['max_sample_ms']:.3f} ms max, "
+              f"{stats['cpu_ms_per_sample']:.3f} ms CPU")
+
+        sampler = SystemMonitor(os.path.join(tmp_dir, 'sampler.db'))
+        sampler.start_monitoring(interval_seconds=60)
+        time.sleep(args.run_seconds)
+        sampler.stop_monitoring()
+        stats = sampler.get_sampler_stats()
+        print(f"1s sampler for {args.run_seconds:.0f}s  {stats['samples']} samples, "
+              f"overhead {stats['overhead_pct']:.4f}% of one core")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monitor = SystemMonitor(os.path.join(tmp_dir, 'monitoring.db'))
+        populate(monitor, args.history_days, 60)
+
+        print(f"\n{'Hours':>6} {'Res':>4} {'Points':>7} {'SQLite rows':>12} {'legacy ms':>10} {'memory ms':>10} {'Speedup':>8}")
+        for hours in (1, 24, args.history_days * 24):
+            legacy_ms, rows = timed(lambda: legacy_history(monitor.db_path, hours))
+            memory_ms, points = timed(lambda: monitor.get_metrics_history('system', hours))
+            print(f"{hours:>6} {points[0]['resolution'] if points else '-':>4} {len(points):>7,} {len(rows):>12,} "
+                  f"{legacy_ms:>10.2f} {memory_ms:>10.2f} {legacy_ms / max(memory_ms, 1e-6):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,9 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List, Tuple
 import sqlite3
 import os
+import time
+import base64
+import hashlib
 from threading import Lock
 from enum import Enum
 
@@ -38,6 +41,15 @@ class TradeCloseReason(Enum):
     EXPIRATION = "expiration"
 
 
+# Read-side cache for the trade list endpoints. Every ActiveTradeService write bumps the
+# version of its database, which invalidates cached results for that database; the TTL
+# bounds staleness when another process writes to the same file.
+TRADE_QUERY_CACHE_TTL = 60  # seconds
+_trades_versions: Dict[str, int] = {}
+_trade_query_cache: Dict[Tuple[str, Any], Tuple[int, float, Any, str]] = {}
+_trade_cache_lock = Lock()
+
+
 class ActiveTradeService:
     """Service for managing active trade lifecycle and state"""
     
@@ -47,6 +59,58 @@ class ActiveTradeService:
         self.db_lock = Lock()
         self._ensure_active_trades_table()
     
+    def _mark_trades_changed(self):
+        """Invalidate cached trade query results for this database after a write"""
+        key = os.path.abspath(self.db_path)
+        with _trade_cache_lock:
+            _trades_versions[key] = _trades_versions.get(key, 0) + 1
+    
+    def get_cached_trade_query(self, query_key: Any, loader) -> Tuple[Any, str]:
+        """
+        Serve a trade query from the read cache, running the loader on a miss.
+        
+        Args:
+            query_key: Hashable key identifying the query and its parameters
+            loader: Callable returning the JSON-serializable query result
+            
+        Returns:
+            Tuple of (result, etag) where the etag changes whenever the result may have changed
+        """
+        db_key = os.path.abspath(self.db_path)
+        cache_key = (db_key, query_key)
+        
+        with _trade_cache_lock:
+            version = _trades_versions.get(db_key, 0)
+            cached = _trade_query_cache.get(cache_key)
+            if cached and cached[0] == version and time.time() - cached[1] < TRADE_QUERY_CACHE_TTL:
+                return cached[2], cached[3]
+        
+        result = loader()
+        etag = hashlib.md5(json.dumps(result, sort_keys=True, default=str).encode()).hexdigest()
+        
+        with _trade_cache_lock:
+            # Only cache if no write happened while loading
+            if _trades_versions.get(db_key, 0) == version:
+                _trade_query_cache[cache_key] = (version, time.time(), result, etag)
+        
+        return result, etag
+    
+    @staticmethod
+    def _extract_reasoning(analysis_data: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Extract the AI reasoning string from chart analysis data"""
+        if not isinstance(analysis_data, dict):
+            return None
+        
+        def section(key):
+            value = analysis_data.get(key)
+            return value if isinstance(value, dict) else {}
+        
+        return (section('recommendations').get('reasoning') or
+                section('analysis').get('reasoning') or
+                analysis_data.get('reasoning') or
+                analysis_data.get('ai_reasoning') or
+                analysis_data.get('recommendation_reasoning'))
+    
     def _safe_parse_datetime(self, datetime_str):
         """Safely parse datetime string with validation"""
         if not datetime_str or not isinstance(datetime_str, str):
@@ -103,6 +167,13 @@ class ActiveTradeService:
                 logger.debug(f"No valid baseline time found for trade {trade['id']}, skipping historical check")
                 return None
             
+            # The trade watch engine has already checked highs/lows up to last_watched_at,
+            # so only candles after it need replaying
+            last_watched = self._safe_parse_datetime(trade.get('last_watched_at'))
+            if last_watched and last_watched > baseline_time:
+                baseline_time = last_watched
+                baseline_description = "last trade watch time"
+            
             logger.info(f"🔍 Checking historical data since {baseline_description}: {baseline_time}")
             
             # Use the existing market data infrastructure to get historical candles
@@ -141,6 +212,8 @@ class ActiveTradeService:
                         candle_timestamp = parsed_time.timestamp()
                     else:
                         continue
+                elif isinstance(candle_time, datetime):
+                    candle_timestamp = candle_time.timestamp()
                 else:
                     candle_timestamp = float(candle_time)
                 
@@ -411,6 +484,8 @@ class ActiveTradeService:
                     
                     conn.commit()
                     
+                    self._mark_trades_changed()
+                    
                     logger.info(f"🎯 Trade {trade_id} closed: {exit_reason} at ${exit_price} (P&L: ${realized_pnl:.2f})")
                     return True
                     
@@ -418,6 +493,217 @@ class ActiveTradeService:
             logger.error(f"Error closing trade {trade_id} with exit: {str(e)}")
             return False
 
+    def get_open_trades(self) -> List[Dict[str, Any]]:
+        """
+        Get all waiting and active trades across tickers in a single query.
+        
+        Returns:
+            List of open trades with the fields needed for trigger/exit evaluation
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT id, ticker, timeframe, action, entry_price, target_price, stop_loss,
+                           entry_condition, status, max_favorable_price, max_adverse_price,
+                           created_at, last_watched_at
+                    FROM active_trades
+                    WHERE status IN ('waiting', 'active')
+                ''')
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error getting open trades: {str(e)}")
+            return []
+    
+    TRADE_LIST_COLUMNS = (
+        'id', 'ticker', 'timeframe', 'status', 'action', 'entry_price', 'target_price',
+        'stop_loss', 'current_price', 'unrealized_pnl', 'created_at', 'updated_at',
+        'close_time', 'close_price', 'close_reason', 'realized_pnl'
+    )
+    
+    def get_open_trades_overview(self) -> List[Dict[str, Any]]:
+        """
+        Get all waiting/active trades with their stored AI reasoning for the trade tracker.
+        
+        Returns:
+            List of trade summaries ordered by most recently updated
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {', '.join(self.TRADE_LIST_COLUMNS)}, reasoning
+                FROM active_trades
+                WHERE status IN ('waiting', 'active')
+                ORDER BY updated_at DESC, id DESC
+            ''')
+            
+            trades = []
+            for row in cursor.fetchall():
+                trade = dict(row)
+                if not trade['reasoning']:
+                    trade['reasoning'] = f"Production {str(trade['action']).upper()} trade from Chart Analysis"
+                trades.append(trade)
+            return trades
+    
+    @staticmethod
+    def encode_trade_cursor(updated_at: Any, trade_id: int) -> str:
+        """Encode an (updated_at, id) keyset position as an opaque cursor"""
+        raw = json.dumps([str(updated_at) if updated_at is not None else None, trade_id])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def decode_trade_cursor(cursor: str) -> Tuple[Optional[str], int]:
+        """Decode a cursor produced by encode_trade_cursor (raises ValueError if invalid)"""
+        try:
+            updated_at, trade_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            return updated_at, int(trade_id)
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+    
+    def get_trades_page(self, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of all trades (including closed) using keyset pagination.
+        
+        Args:
+            limit: Maximum number of trades to return
+            cursor: Cursor from a previous page's next_cursor (None for the first page)
+            
+        Returns:
+            Dict with trades, next_cursor (None on the last page) and has_more
+        """
+        query = f'SELECT {", ".join(self.TRADE_LIST_COLUMNS)} FROM active_trades'
+        params: List[Any] = []
+        
+        if cursor:
+            updated_at, trade_id = self.decode_trade_cursor(cursor)
+            if updated_at is None:
+                # NULL updated_at sorts last in DESC order; continue within the NULL block
+                query += ' WHERE updated_at IS NULL AND id < ?'
+                params = [trade_id]
+            else:
+                query += ' WHERE (updated_at < ? OR (updated_at = ? AND id < ?) OR updated_at IS NULL)'
+                params = [updated_at, updated_at, trade_id]
+        
+        query += ' ORDER BY updated_at DESC, id DESC LIMIT ?'
+        params.append(limit + 1)
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(query, params).fetchall()
+        
+        trades = [dict(row) for row in rows[:limit]]
+        has_more = len(rows) > limit
+        next_cursor = None
+        if has_more and trades:
+            next_cursor = self.encode_trade_cursor(trades[-1]['updated_at'], trades[-1]['id'])
+        
+        return {'trades': trades, 'next_cursor': next_cursor, 'has_more': has_more}
+    
+    def record_watch_cycle(self, watch_time: datetime, price_updates: List[Dict[str, Any]],
+                           triggers: List[Dict[str, Any]], exits: List[Dict[str, Any]]) -> bool:
+        """
+        Persist the results of one trade watch cycle in a single transaction.
+        
+        Args:
+            watch_time: Time the live prices were observed
+            price_updates: Per-trade dicts with trade_id, price, unrealized_pnl,
+                max_favorable_price, max_adverse_price and wicks_checked (only trades
+                whose highs/lows were checked up to watch_time advance last_watched_at)
+            triggers: Per-trade dicts with trade_id and price for entry triggers hit this cycle
+            exits: Per-trade dicts with trade_id, exit_price, exit_reason, exit_type,
+                realized_pnl and waiting_trade for target/stop hits this cycle
+            
+        Returns:
+            True if the cycle was recorded, False otherwise
+        """
+        try:
+            watch_time_str = watch_time.isoformat()
+            with self.db_lock:
+                with sqlite3.connect(self.db_path) as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.executemany('''
+                        UPDATE active_trades
+                        SET current_price = ?, unrealized_pnl = ?, max_favorable_price = ?,
+                            max_adverse_price = ?, last_watched_at = COALESCE(?, last_watched_at)
+                        WHERE id = ? AND status IN ('waiting', 'active')
+                    ''', [
+                        (u['price'], u['unrealized_pnl'], u['max_favorable_price'], u['max_adverse_price'],
+                         watch_time_str if u.get('wicks_checked') else None, u['trade_id'])
+                        for u in price_updates
+                    ])
+                    
+                    for trigger in triggers:
+                        candle_data = {'price': trigger['price'], 'time': watch_time_str, 'source': 'trade_watch'}
+                        cursor.execute('''
+                            UPDATE active_trades
+                            SET status = ?, trigger_hit_time = ?, trigger_hit_price = ?,
+                                trigger_hit_candle_data = ?, updated_at = ?
+                            WHERE id = ? AND status = ?
+                        ''', (
+                            TradeStatus.ACTIVE.value, watch_time_str, trigger['price'],
+                            json.dumps(candle_data), datetime.now(), trigger['trade_id'],
+                            TradeStatus.WAITING.value
+                        ))
+                        if cursor.rowcount == 0:
+                            # Closed or triggered elsewhere since the cycle read it
+                            continue
+                        self._add_trade_update(cursor, trigger['trade_id'], trigger['price'], 'trigger_hit',
+                                             {'trigger_time': watch_time_str, 'trigger_price': trigger['price'],
+                                              'candle_data': candle_data})
+                    
+                    for exit_info in exits:
+                        if exit_info['exit_type'] == "WIN":
+                            status = TradeStatus.PROFIT_HIT.value
+                            close_reason = TradeCloseReason.PROFIT_TARGET.value
+                        else:
+                            status = TradeStatus.STOP_HIT.value
+                            close_reason = TradeCloseReason.STOP_LOSS.value
+                        
+                        close_details = {
+                            'exit_reason': exit_info['exit_reason'],
+                            'exit_type': exit_info['exit_type'],
+                            'trade_watch_exit': True
+                        }
+                        if exit_info.get('waiting_trade'):
+                            close_details['invalidation_reason'] = 'Stop loss hit before entry trigger'
+                            close_details['waiting_trade'] = True
+                        
+                        cursor.execute('''
+                            UPDATE active_trades
+                            SET status = ?, close_time = ?, close_price = ?, close_reason = ?,
+                                close_details = ?, realized_pnl = ?, current_price = ?, unrealized_pnl = 0,
+                                last_watched_at = ?, updated_at = ?
+                            WHERE id = ? AND status IN ('waiting', 'active')
+                        ''', (
+                            status, watch_time_str, exit_info['exit_price'], close_reason,
+                            json.dumps(close_details), exit_info['realized_pnl'], exit_info['exit_price'],
+                            watch_time_str, datetime.now(), exit_info['trade_id']
+                        ))
+                        if cursor.rowcount == 0:
+                            # Closed elsewhere since the cycle read it
+                            continue
+                        self._add_trade_update(cursor, exit_info['trade_id'], exit_info['exit_price'],
+                                             exit_info['exit_reason'].lower(), {
+                                                 'exit_type': exit_info['exit_type'],
+                                                 'pnl': exit_info['realized_pnl'],
+                                                 'trade_watch_exit': True,
+                                                 'exit_time': watch_time_str
+                                             })
+                        logger.info(f"🎯 Trade {exit_info['trade_id']} closed by trade watch: "
+                                    f"{exit_info['exit_reason']} at ${exit_info['exit_price']}")
+                    
+                    conn.commit()
+                    
+                    self._mark_trades_changed()
+                    return True
+                    
+        except Exception as e:
+            logger.error(f"Error recording trade watch cycle: {str(e)}")
+            return False
+
     def _get_last_chart_analysis_time(self, ticker: str) -> Optional[datetime]:
         """
         Get the timestamp of the most recent chart analysis record for this ticker.
@@ -646,7 +932,50 @@ class ActiveTradeService:
                     ON trade_updates(trade_id, update_time)
                 ''')
                 
+                # Add last_watched_at field if it doesn't exist (migration)
+                # Set by the trade watch engine each time it evaluates the trade at a live price
+                try:
+                    cursor.execute('ALTER TABLE active_trades ADD COLUMN last_watched_at DATETIME')
+                    logger.info("Added last_watched_at field to active_trades table")
+                except sqlite3.OperationalError as e:
+                    if "duplicate column name" not in str(e).lower():
+                        logger.warning(f"Could not add last_watched_at field: {e}")
+                
+                # Add reasoning field if it doesn't exist (migration)
+                # Extracted from the analysis at write time so trade lists never parse analysis blobs
+                try:
+                    cursor.execute('ALTER TABLE active_trades ADD COLUMN reasoning TEXT')
+                    logger.info("Added reasoning field to active_trades table")
+                    
+                    # One-time backfill for trades created before the column existed
+                    cursor.execute('''
+                        SELECT at.id, ca.analysis_data
+                        FROM active_trades at
+                        JOIN chart_analyses ca ON at.analysis_id = ca.id
+                    ''')
+                    backfill = []
+                    for trade_id, analysis_data in cursor.fetchall():
+                        try:
+                            reasoning = self._extract_reasoning(json.loads(analysis_data))
+                        except (json.JSONDecodeError, TypeError):
+                            reasoning = None
+                        if reasoning:
+                            backfill.append((reasoning, trade_id))
+                    cursor.executemany('UPDATE active_trades SET reasoning = ? WHERE id = ?', backfill)
+                    logger.info(f"Backfilled reasoning for {len(backfill)} trades")
+                except sqlite3.OperationalError as e:
+                    if "duplicate column name" not in str(e).lower() and "no such table" not in str(e).lower():
+                        logger.warning(f"Could not add reasoning field: {e}")
+                
+                # Keyset pagination index for trade history
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_active_trades_updated_id
+                    ON active_trades(updated_at DESC, id DESC)
+                ''')
+                
                 conn.commit()
+                
+                self._mark_trades_changed()
                 logger.info("Active trades database schema ensured")
                 
         except Exception as e:
@@ -831,6 +1160,8 @@ class ActiveTradeService:
                             })
                             
                             conn.commit()
+                            
+                            self._mark_trades_changed()
                             logger.info(f"✅ Updated existing trade {existing_id} for {ticker} with new AI parameters")
                             return existing_id
                         else:
@@ -843,8 +1174,9 @@ class ActiveTradeService:
                         INSERT INTO active_trades (
                             ticker, timeframe, analysis_id, action, entry_price, target_price, stop_loss,
                             entry_strategy, entry_condition, status, trigger_hit_time, trigger_hit_price,
-                            trigger_hit_candle_data, current_price, original_analysis_data, original_context
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            trigger_hit_candle_data, current_price, original_analysis_data, original_context,
+                            reasoning
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     ''', (
                         ticker.upper(),
                         timeframe,
@@ -861,16 +1193,19 @@ class ActiveTradeService:
                         trigger_hit_candle_data,
                         analysis_data.get('currentPrice', 0.0),
                         json.dumps(analysis_data),
-                        json.dumps(context) if context else None
+                        json.dumps(context) if context else None,
+                        self._extract_reasoning(analysis_data)
                     ))
                     
                     trade_id = cursor.lastrowid
                     conn.commit()
+                    self._mark_trades_changed()
                     
                     # Add initial trade update
                     self._add_trade_update(cursor, trade_id, analysis_data.get('currentPrice', 0.0), 
                                          'trade_created', {'initial_status': initial_status})
                     conn.commit()
+                    self._mark_trades_changed()
                     
                     logger.info(f"✅ Created {initial_status} trade for {ticker} (ID: {trade_id})")
                     return trade_id
@@ -985,6 +1320,8 @@ class ActiveTradeService:
                     
                     conn.commit()
                     
+                    self._mark_trades_changed()
+                    
                     logger.info(f"🎯 Updated trade {trade['id']} for {ticker}: trigger hit at ${trigger_details.get('trigger_price')}")
                     return True
                     
@@ -1117,6 +1454,8 @@ class ActiveTradeService:
                     
                     conn.commit()
                     
+                    self._mark_trades_changed()
+                    
                     return {
                         'trade_id': trade['id'],
                         'status': trade['status'],
@@ -1191,6 +1530,8 @@ class ActiveTradeService:
                     
                     conn.commit()
                     
+                    self._mark_trades_changed()
+                    
                     logger.info(f"🤖 AI closed trade {trade['id']} for {ticker}: {reason}")
                     return True
                     
@@ -1301,6 +1642,8 @@ class ActiveTradeService:
                     
                     conn.commit()
                     
+                    self._mark_trades_changed()
+                    
                     reason_text = {
                         'profit_hit': 'Profit target hit',
                         'stop_hit': 'Stop loss hit',
@@ -1556,6 +1899,8 @@ class ActiveTradeService:
                     
                     conn.commit()
                     
+                    self._mark_trades_changed()
+                    
                     logger.info(f"Cleaned up {deleted_count} old trades older than {days_to_keep} days")
                     return deleted_count
                     
@@ -1667,6 +2012,8 @@ class ActiveTradeService:
                         logger.info(f"🔍 [DEBUG] ActiveTradeService: Force closed trade {trade_id} for {ticker}")
                     
                     conn.commit()
+                    
+                    self._mark_trades_changed()
                     logger.info(f"🔍 [DEBUG] ActiveTradeService: Successfully force closed {len(trades)} trades for analysis {analysis_id}")
                     return True
                     
@@ -1756,6 +2103,8 @@ class ActiveTradeService:
                     
                     conn.commit()
                     
+                    self._mark_trades_changed()
+                    
                     logger.info(f"🗑️ Trade {trade_id} ({ticker}) deleted successfully. Reason: {reason}")
                     return True
                     
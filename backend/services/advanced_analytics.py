@@ -14,7 +14,7 @@ import logging
 import numpy as np
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple, Callable
+from typing import Dict, Any, Optional, List, Tuple, Callable, Union
 from dataclasses import dataclass
 from enum import Enum
 import json
@@ -26,6 +26,11 @@ from sklearn.ensemble import RandomForestRegressor
 import warnings
 warnings.filterwarnings('ignore')
 
+from services.analytics_core import (
+    PriceSeries, value_at_risk, max_drawdown, drawdown_series, rolling_volatility,
+    rolling_var_cvar, regime_labels, classify_regimes, prediction_features
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -424,41 +429,33 @@ class AdvancedAnalytics:
             logger.error(f"Error running backtest: {str(e)}")
             raise
     
-    def calculate_risk_metrics(self, returns: List[float], 
-                             benchmark_returns: Optional[List[float]] = None) -> RiskMetrics:
+    def calculate_risk_metrics(self, returns: Union[List[float], np.ndarray], 
+                             benchmark_returns: Optional[Union[List[float], np.ndarray]] = None) -> RiskMetrics:
         """
         Calculate comprehensive risk metrics.
         
         Args:
-            returns (List[float]): Portfolio returns
-            benchmark_returns (Optional[List[float]]): Benchmark returns for relative metrics
+            returns (Union[List[float], np.ndarray]): Portfolio returns
+            benchmark_returns (Optional[Union[List[float], np.ndarray]]): Benchmark returns for relative metrics
             
         Returns:
             RiskMetrics: Comprehensive risk metrics
         """
         try:
-            if not returns:
+            returns_array = np.asarray(returns, dtype=np.float64)
+            if returns_array.size == 0:
                 raise ValueError("Returns data required for risk analysis")
             
-            returns_array = np.array(returns)
-            
-            # Value at Risk (VaR)
-            var_95 = np.percentile(returns_array, 5)
-            var_99 = np.percentile(returns_array, 1)
-            
-            # Conditional Value at Risk (CVaR)
-            cvar_95 = np.mean(returns_array[returns_array <= var_95])
-            cvar_99 = np.mean(returns_array[returns_array <= var_99])
+            # Value at Risk (VaR) and Conditional Value at Risk (CVaR)
+            var_95, cvar_95 = value_at_risk(returns_array, 0.95)
+            var_99, cvar_99 = value_at_risk(returns_array, 0.99)
             
             # Maximum Drawdown
-            cumulative_returns = np.cumprod(1 + returns_array)
-            peak = np.maximum.accumulate(cumulative_returns)
-            drawdown = (cumulative_returns - peak) / peak
-            max_drawdown = np.min(drawdown)
+            max_dd = max_drawdown(returns_array)
             
             # Calmar Ratio
             annualized_return = np.mean(returns_array) * 252  # Assuming daily returns
-            calmar_ratio = annualized_return / abs(max_drawdown) if max_drawdown != 0 else 0
+            calmar_ratio = annualized_return / abs(max_dd) if max_dd != 0 else 0
             
             # Sortino Ratio
             downside_returns = returns_array[returns_array < 0]
@@ -468,8 +465,8 @@ class AdvancedAnalytics:
             # Relative metrics (if benchmark provided)
             beta = alpha = tracking_error = information_ratio = None
             
-            if benchmark_returns and len(benchmark_returns) == len(returns):
-                benchmark_array = np.array(benchmark_returns)
+            if benchmark_returns is not None and len(benchmark_returns) == len(returns_array):
+                benchmark_array = np.asarray(benchmark_returns, dtype=np.float64)
                 
                 # Beta
                 covariance = np.cov(returns_array, benchmark_array)[0, 1]
@@ -492,7 +489,7 @@ class AdvancedAnalytics:
                 var_99=var_99,
                 cvar_95=cvar_95,
                 cvar_99=cvar_99,
-                max_drawdown=max_drawdown,
+                max_drawdown=max_dd,
                 calmar_ratio=calmar_ratio,
                 sortino_ratio=sortino_ratio,
                 downside_deviation=downside_deviation,
@@ -509,6 +506,49 @@ class AdvancedAnalytics:
             logger.error(f"Error calculating risk metrics: {str(e)}")
             raise
     
+    def analyze_price_series(self, series: PriceSeries, window: int = 30) -> Dict[str, Any]:
+        """
+        Calculate rolling risk and regime analytics over a price series.
+        
+        Args:
+            series (PriceSeries): Price history (e.g. PriceSeries.load(position_id=...))
+            window (int): Trailing window length in periods
+        
+        Returns:
+            Dict[str, Any]: Summary risk metrics plus per-point timestamps, rolling volatility,
+                VaR/CVaR (95%), drawdown and regime labels
+        """
+        try:
+            if len(series) <= window:
+                raise ValueError(f"Insufficient data for rolling analytics (more than {window} data points required)")
+            
+            returns = series.simple_returns()
+            var_95, cvar_95 = rolling_var_cvar(returns, window, 0.95)
+            labels, confidences = regime_labels(series.prices, vol_window=window)
+            
+            def _to_list(values: np.ndarray) -> List[Optional[float]]:
+                # Leading points without a full window are None
+                return [None if np.isnan(v) else float(v) for v in values]
+            
+            analysis = {
+                'summary': self.calculate_risk_metrics(returns).__dict__,
+                'window': window,
+                'timestamps': series.timestamps[1:].tolist(),
+                'rolling_volatility': _to_list(rolling_volatility(series.log_returns(), window)),
+                'rolling_var_95': _to_list(var_95),
+                'rolling_cvar_95': _to_list(cvar_95),
+                'drawdown': drawdown_series(returns).tolist(),
+                'regimes': labels[1:].tolist(),
+                'regime_confidence': _to_list(confidences[1:])
+            }
+            
+            logger.info(f"Calculated rolling analytics over {len(series)} data points")
+            return analysis
+        
+        except Exception as e:
+            logger.error(f"Error analyzing price series: {str(e)}")
+            raise
+    
     def analyze_performance_attribution(self, position_data: Dict[str, Any],
                                       price_history: List[Dict[str, Any]],
                                       fee_history: List[Dict[str, Any]]) -> PerformanceAttribution:
@@ -578,13 +618,13 @@ class AdvancedAnalytics:
             logger.error(f"Error analyzing performance attribution: {str(e)}")
             raise
     
-    def detect_market_regime(self, price_data: List[Dict[str, Any]], 
+    def detect_market_regime(self, price_data: Union[List[Dict[str, Any]], PriceSeries], 
                            pair_symbol: str) -> MarketRegime:
         """
         Detect current market regime for a trading pair.
         
         Args:
-            price_data (List[Dict[str, Any]]): Historical price data
+            price_data (Union[List[Dict[str, Any]], PriceSeries]): Historical price data
             pair_symbol (str): Trading pair symbol
             
         Returns:
@@ -594,35 +634,18 @@ class AdvancedAnalytics:
             if len(price_data) < 30:
                 raise ValueError("Insufficient data for regime detection (minimum 30 data points)")
             
-            prices = [float(p['price']) for p in price_data]
-            returns = np.diff(np.log(prices))
+            series = price_data if isinstance(price_data, PriceSeries) else PriceSeries.from_records(price_data)
+            
+            returns = series.log_returns()
             
             # Calculate regime indicators
-            recent_returns = returns[-20:]  # Last 20 periods
-            volatility = np.std(returns) * np.sqrt(252)
-            trend = np.polyfit(range(len(prices[-30:])), prices[-30:], 1)[0]  # 30-period trend
-            
-            # Regime detection logic
-            avg_return = np.mean(recent_returns)
-            vol_threshold_high = 0.6
-            vol_threshold_low = 0.2
-            trend_threshold = 0.02
-            
-            if volatility > vol_threshold_high:
-                regime = MarketRegime.HIGH_VOLATILITY
-                confidence = min(0.95, volatility / vol_threshold_high)
-            elif volatility < vol_threshold_low:
-                regime = MarketRegime.LOW_VOLATILITY
-                confidence = min(0.95, vol_threshold_low / volatility)
-            elif trend > trend_threshold and avg_return > 0:
-                regime = MarketRegime.BULL_MARKET
-                confidence = min(0.9, abs(trend) / trend_threshold)
-            elif trend < -trend_threshold and avg_return < 0:
-                regime = MarketRegime.BEAR_MARKET
-                confidence = min(0.9, abs(trend) / trend_threshold)
-            else:
-                regime = MarketRegime.SIDEWAYS
-                confidence = 0.7
+            volatility = float(np.std(returns) * np.sqrt(252))
+            trend = float(np.polyfit(np.arange(30), series.prices[-30:], 1)[0])  # 30-period trend
+            avg_return = float(np.mean(returns[-20:]))  # Last 20 periods
+            
+            labels, confidences = classify_regimes(volatility, trend, avg_return)
+            regime = MarketRegime(labels.item())
+            confidence = float(confidences)
             
             # Save regime detection
             self._save_market_regime(pair_symbol, regime, confidence, {
@@ -640,14 +663,14 @@ class AdvancedAnalytics:
             raise
     
     def predict_il_and_fees(self, position_data: Dict[str, Any],
-                           historical_data: List[Dict[str, Any]],
+                           historical_data: Union[List[Dict[str, Any]], PriceSeries],
                            prediction_days: int = 30) -> Dict[str, Any]:
         """
         Predict impermanent loss and fee collection for a position.
         
         Args:
             position_data (Dict[str, Any]): Position data
-            historical_data (List[Dict[str, Any]]): Historical price and volume data
+            historical_data (Union[List[Dict[str, Any]], PriceSeries]): Historical price and volume data
             prediction_days (int): Number of days to predict
             
         Returns:
@@ -657,12 +680,15 @@ class AdvancedAnalytics:
             if len(historical_data) < 30:
                 raise ValueError("Insufficient historical data for prediction")
             
+            series = (historical_data if isinstance(historical_data, PriceSeries)
+                      else PriceSeries.from_records(historical_data))
+            
             # Prepare features
-            features = self._prepare_prediction_features(historical_data)
+            features = prediction_features(series)
             
             # Prepare targets (IL and fees)
-            il_targets = self._calculate_historical_il(position_data, historical_data)
-            fee_targets = self._calculate_historical_fees(position_data, historical_data)
+            il_targets = self._calculate_historical_il(position_data, series)
+            fee_targets = self._calculate_historical_fees(position_data, series)
             
             # Train models
             il_model = RandomForestRegressor(n_estimators=100, random_state=42)
@@ -737,92 +763,25 @@ class AdvancedAnalytics:
         fee_tier = position_data.get('fee_tier', 0.003)
         return (fee_tier - 0.003) * 10  # Relative to 0.3% baseline
     
-    def _prepare_prediction_features(self, historical_data: List[Dict[str, Any]]) -> np.ndarray:
-        """Prepare features for prediction models."""
-        features = []
-        
-        for i in range(len(historical_data)):
-            price = float(historical_data[i]['price'])
-            volume = float(historical_data[i].get('volume', 0))
-            
-            # Calculate technical indicators
-            if i >= 5:
-                prices_5d = [float(historical_data[j]['price']) for j in range(i-4, i+1)]
-                sma_5 = np.mean(prices_5d)
-                volatility_5d = np.std(prices_5d)
-            else:
-                sma_5 = price
-                volatility_5d = 0
-            
-            if i >= 20:
-                prices_20d = [float(historical_data[j]['price']) for j in range(i-19, i+1)]
-                sma_20 = np.mean(prices_20d)
-                volatility_20d = np.std(prices_20d)
-            else:
-                sma_20 = price
-                volatility_20d = 0
-            
-            feature_vector = [
-                price,
-                volume,
-                sma_5,
-                sma_20,
-                volatility_5d,
-                volatility_20d,
-                price / sma_5 if sma_5 > 0 else 1,
-                price / sma_20 if sma_20 > 0 else 1
-            ]
-            
-            features.append(feature_vector)
-        
-        return np.array(features)
-    
     def _calculate_historical_il(self, position_data: Dict[str, Any],
-                               historical_data: List[Dict[str, Any]]) -> List[float]:
+                               series: PriceSeries) -> np.ndarray:
         """Calculate historical impermanent loss values."""
-        il_values = []
-        
-        entry_price = position_data.get('entry_price', historical_data[0]['price'] if historical_data else 0)
-        range_min = position_data['price_range_min']
-        range_max = position_data['price_range_max']
-        
-        for data_point in historical_data:
-            current_price = float(data_point['price'])
-            
-            # Simplified IL calculation
-            if range_min <= current_price <= range_max:
-                # Price in range - minimal IL
-                il = abs(current_price - entry_price) / entry_price * 0.1
-            else:
-                # Price out of range - higher IL
-                il = abs(current_price - entry_price) / entry_price * 0.3
-            
-            il_values.append(il)
+        prices = series.prices
+        entry_price = position_data.get('entry_price', prices[0] if len(prices) else 0)
+        in_range = (prices >= position_data['price_range_min']) & (prices <= position_data['price_range_max'])
         
-        return il_values
+        # Simplified IL: minimal while in range, higher once out of range
+        return np.abs(prices - entry_price) / entry_price * np.where(in_range, 0.1, 0.3)
     
     def _calculate_historical_fees(self, position_data: Dict[str, Any],
-                                 historical_data: List[Dict[str, Any]]) -> List[float]:
+                                 series: PriceSeries) -> np.ndarray:
         """Calculate historical fee collection values."""
-        fee_values = []
-        
         fee_tier = position_data.get('fee_tier', 0.003)
-        range_min = position_data['price_range_min']
-        range_max = position_data['price_range_max']
-        
-        for data_point in historical_data:
-            current_price = float(data_point['price'])
-            volume = float(data_point.get('volume', 0))
-            
-            # Calculate fees based on whether price is in range
-            if range_min <= current_price <= range_max:
-                daily_fee = volume * fee_tier * 0.5  # 50% of volume when in range
-            else:
-                daily_fee = 0  # No fees when out of range
-            
-            fee_values.append(daily_fee)
+        prices = series.prices
+        in_range = (prices >= position_data['price_range_min']) & (prices <= position_data['price_range_max'])
         
-        return fee_values
+        # 50% of volume earns fees while in range, nothing out of range
+        return np.where(in_range, series.volumes * fee_tier * 0.5, 0.0)
     
     def _generate_future_features(self, historical_features: np.ndarray,
                                 prediction_days: int) -> np.ndarray:
@@ -833,28 +792,15 @@ class AdvancedAnalytics:
             last_features = historical_features[-1]
             return np.array([last_features] * prediction_days)
         
-        # Calculate trends for each feature
-        future_features = []
-        
-        for day in range(prediction_days):
-            feature_vector = []
-            
-            for feature_idx in range(historical_features.shape[1]):
-                feature_series = historical_features[-10:, feature_idx]
-                
-                # Simple linear trend extrapolation
-                x = np.arange(len(feature_series))
-                slope, intercept = np.polyfit(x, feature_series, 1)
-                
-                future_value = slope * (len(feature_series) + day) + intercept
-                feature_vector.append(future_value)
-            
-            future_features.append(feature_vector)
+        # Linear trend of each feature over the last 10 points, fitted in one call
+        recent = historical_features[-10:]
+        slopes, intercepts = np.polyfit(np.arange(len(recent)), recent, 1)
+        future_x = len(recent) + np.arange(prediction_days)
         
-        return np.array(future_features)
+        return future_x[:, None] * slopes + intercepts
     
-    def _simple_trend_prediction(self, il_targets: List[float],
-                                fee_targets: List[float],
+    def _simple_trend_prediction(self, il_targets: np.ndarray,
+                                fee_targets: np.ndarray,
                                 prediction_days: int) -> Dict[str, Any]:
         """Simple trend-based prediction fallback."""
         if len(il_targets) < 5 or len(fee_targets) < 5:
@@ -871,8 +817,9 @@ class AdvancedAnalytics:
         il_trend = (il_targets[-1] - il_targets[-5]) / 5
         fee_trend = (fee_targets[-1] - fee_targets[-5]) / 5
         
-        il_predictions = [il_targets[-1] + il_trend * (i + 1) for i in range(prediction_days)]
-        fee_predictions = [fee_targets[-1] + fee_trend * (i + 1) for i in range(prediction_days)]
+        steps = np.arange(1, prediction_days + 1)
+        il_predictions = (il_targets[-1] + il_trend * steps).tolist()
+        fee_predictions = (fee_targets[-1] + fee_trend * steps).tolist()
         
         return {
             'prediction_period_days': prediction_days,
@@ -0,0 +1,292 @@
+"""
+Alert Notification Dispatcher
+
+This module delivers alert notifications off the thread that raised the alert:
+- A bounded queue and worker threads per notification channel, so a hanging
+  webhook never holds up email or log delivery
+- Bursts of duplicate alerts (same rule and position) still waiting in a
+  channel's queue are coalesced into one notification
+- Workers drain their queue in batches and hand each batch to one send call
+- Failed deliveries are retried with jittered exponential backoff
+- Queue depth, drops, retries and enqueue-to-delivery latency are tracked
+"""
+
+import time
+import heapq
+import random
+import logging
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUE = 1000       # queued notifications per channel before new ones are dropped
+DEFAULT_BATCH_SIZE = 50        # notifications handed to one send call
+DEFAULT_WORKERS = 1            # worker threads per channel
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 1.0    # seconds before the first retry, doubling per attempt
+RETRY_BACKOFF_MAX = 60.0
+LATENCY_WINDOW = 1000          # recent deliveries kept for latency percentiles
+
+
+@dataclass
+class Notification:
+    """A queued notification for one channel, possibly standing for several duplicate alerts."""
+    channel: str
+    key: Hashable
+    alert: Any                  # the most recent alert for the key
+    rule: Any
+    alert_ids: List[str]
+    enqueued_at: float          # monotonic time the first alert was queued
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+
+@dataclass
+class _ChannelQueue:
+    """Queue state for one channel, guarded by its condition."""
+    condition: threading.Condition = field(default_factory=threading.Condition)
+    ready: deque = field(default_factory=deque)
+    delayed: List[Tuple[float, int, Notification]] = field(default_factory=list)
+    pending: Dict[Hashable, Notification] = field(default_factory=dict)
+    workers: List[threading.Thread] = field(default_factory=list)
+    in_flight: int = 0
+    counters: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(
+        ('enqueued', 'coalesced', 'dropped', 'delivered', 'failed', 'retried'), 0))
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def depth(self) -> int:
+        return len(self.ready) + len(self.delayed)
+
+
+class AlertDispatcher:
+    """
+    Asynchronous, per-channel notification delivery for the alert service.
+
+    submit() only appends to an in-memory queue; sending, retrying and recording
+    results all happen on the channel's worker threads.
+    """
+
+    def __init__(self, send_batch: Callable[[str, List[Notification]], List[Optional[Exception]]],
+                 record_results: Callable[[str, List[Tuple[Notification, str, Optional[str]]]], None],
+                 max_queue: int = DEFAULT_MAX_QUEUE, batch_size: int = DEFAULT_BATCH_SIZE,
+                 workers_per_channel: int = DEFAULT_WORKERS, max_retries: int = DEFAULT_MAX_RETRIES,
+                 retry_backoff: float = DEFAULT_RETRY_BACKOFF):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            send_batch: Sends a batch for a channel, returning None or the exception for each notification
+            record_results: Receives (notification, 'sent' or 'failed', error) for finished notifications
+            max_queue: Queued notifications per channel before new ones are dropped
+            batch_size: Most notifications handed to one send_batch call
+            workers_per_channel: Worker threads per channel
+            max_retries: Retries after the first failed attempt
+            retry_backoff: Seconds before the first retry, doubling per attempt
+        """
+        self.send_batch = send_batch
+        self.record_results = record_results
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.workers_per_channel = workers_per_channel
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._channels: Dict[str, _ChannelQueue] = {}
+        self._channels_lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._stopping = False
+
+    def submit(self, channel: str, alert: Any, rule: Any, key: Hashable) -> bool:
+        """
+        Queue a notification without waiting for delivery.
+
+        If a notification with the same key is still waiting in the channel's
+        queue, the alert is folded into it instead of queueing another one.
+
+        Args:
+            channel: Notification channel name
+            alert: The alert to deliver
+            rule: The rule that raised it
+            key: Duplicate key (e.g. rule and position)
+
+        Returns:
+            bool: False if the channel queue was full and the notification was dropped
+        """
+        queue = self._channel(channel)
+        with queue.condition:
+            queue.counters['enqueued'] += 1
+            waiting = queue.pending.get(key)
+            if waiting is not None:
+                waiting.alert = alert
+                waiting.alert_ids.append(alert.id)
+                queue.counters['coalesced'] += 1
+                return True
+
+            if queue.depth() >= self.max_queue:
+                queue.counters['dropped'] += 1
+                logger.warning(f"Alert dispatch queue for {channel} is full, dropping alert {alert.id}")
+                return False
+
+            notification = Notification(channel, key, alert, rule, [alert.id], time.monotonic())
+            queue.pending[key] = notification
+            queue.ready.append(notification)
+            queue.condition.notify()
+        return True
+
+    def _channel(self, channel: str) -> _ChannelQueue:
+        queue = self._channels.get(channel)
+        if queue is not None:
+            return queue
+
+        with self._channels_lock:
+            if channel not in self._channels:
+                queue = _ChannelQueue()
+                for i in range(self.workers_per_channel):
+                    worker = threading.Thread(target=self._worker_loop, args=(channel, queue), daemon=True,
+                                              name=f"AlertDispatch-{channel}-{i}")
+                    queue.workers.append(worker)
+                    worker.start()
+                self._channels[channel] = queue
+            return self._channels[channel]
+
+    def _next_batch(self, queue: _ChannelQueue) -> Optional[List[Notification]]:
+        """Wait for ready notifications and take a batch (None once stopped and drained)."""
+        with queue.condition:
+            while True:
+                now = time.monotonic()
+                while queue.delayed and (self._stopping or queue.delayed[0][0] <= now):
+                    queue.ready.append(heapq.heappop(queue.delayed)[2])
+                if queue.ready:
+                    break
+                if self._stopping:
+                    return None
+                queue.condition.wait(queue.delayed[0][0] - now if queue.delayed else None)
+
+            batch = [queue.ready.popleft() for _ in range(min(self.batch_size, len(queue.ready)))]
+            for notification in batch:
+                if queue.pending.get(notification.key) is notification:
+                    del queue.pending[notification.key]
+            queue.in_flight += len(batch)
+            return batch
+
+    def _worker_loop(self, channel: str, queue: _ChannelQueue):
+        while True:
+            batch = self._next_batch(queue)
+            if batch is None:
+                return
+
+            try:
+                errors = self.send_batch(channel, batch)
+            except Exception as e:
+                errors = [e] * len(batch)
+
+            finished = []
+            retries = []
+            now = time.monotonic()
+            for notification, error in zip(batch, errors):
+                if error is None:
+                    finished.append((notification, 'sent', None))
+                elif notification.attempts < self.max_retries and not self._stopping:
+                    notification.last_error = str(error)
+                    delay = min(RETRY_BACKOFF_MAX, self.retry_backoff * (2 ** notification.attempts))
+                    notification.attempts += 1
+                    retries.append((now + random.uniform(delay / 2, delay), next(self._sequence), notification))
+                else:
+                    logger.error(f"Giving up on {channel} notification for alert {notification.alert.id}: {error}")
+                    finished.append((notification, 'failed', str(error)))
+
+            if finished:
+                try:
+                    self.record_results(channel, finished)
+                except Exception as e:
+                    logger.error(f"Error recording {channel} notification results: {e}")
+
+            with queue.condition:
+                for retry in retries:
+                    heapq.heappush(queue.delayed, retry)
+                for notification, status, _ in finished:
+                    queue.counters['delivered' if status == 'sent' else 'failed'] += 1
+                    queue.latencies.append(now - notification.enqueued_at)
+                queue.counters['retried'] += len(retries)
+                queue.in_flight -= len(batch)
+                queue.condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued notification has been delivered or given up on.
+
+        Args:
+            timeout: Seconds to wait in total (None waits indefinitely)
+
+        Returns:
+            bool: True if all queues drained in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for queue in list(self._channels.values()):
+            with queue.condition:
+                while queue.depth() or queue.in_flight:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    queue.condition.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """
+        Deliver what is queued (retries without further backoff) and stop the workers.
+
+        Args:
+            timeout: Seconds to wait for each channel's workers
+        """
+        self._stopping = True
+        for queue in list(self._channels.values()):
+            with queue.condition:
+                queue.condition.notify_all()
+            for worker in queue.workers:
+                worker.join(timeout)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get backpressure and delivery metrics.
+
+        Returns:
+            Dict with total queue depth, in-flight count, enqueued/coalesced/dropped/
+            delivered/failed/retried counters, dispatch latency (avg/p95/max ms from
+            first enqueue to final result) and the same figures per channel
+        """
+        totals = dict.fromkeys(('enqueued', 'coalesced', 'dropped', 'delivered', 'failed', 'retried'), 0)
+        channels = {}
+        latencies = []
+        depth = in_flight = 0
+
+        for channel, queue in list(self._channels.items()):
+            with queue.condition:
+                counters = dict(queue.counters)
+                channel_latencies = list(queue.latencies)
+                channel_depth, channel_in_flight = queue.depth(), queue.in_flight
+
+            channels[channel] = {'queue_depth': channel_depth, 'in_flight': channel_in_flight, **counters,
+                                 'latency_ms': _latency_summary(channel_latencies)}
+            for name, value in counters.items():
+                totals[name] += value
+            latencies.extend(channel_latencies)
+            depth += channel_depth
+            in_flight += channel_in_flight
+
+        return {'queue_depth': depth, 'in_flight': in_flight, **totals,
+                'latency_ms': _latency_summary(latencies), 'channels': channels}
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {'avg': None, 'p95': None, 'max': None}
+    ordered = sorted(latencies)
+    return {
+        'avg': round(sum(ordered) / len(ordered) * 1000, 2),
+        'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+        'max': round(ordered[-1] * 1000, 2)
+    }
@@ -0,0 +1,280 @@
+"""
+Alert Rule Index
+
+This module compiles alert rule conditions into threshold predicates and
+indexes them so a monitoring sweep can be matched against every rule at once:
+- Rules are grouped by (alert_type, position_id or wildcard)
+- Within a group, rules sharing their first predicate's field and operator keep
+  their thresholds in a sorted array
+- A sweep builds one value column per field and finds each position's matching
+  rules with a binary search, so the work grows with the rules that match
+  rather than with rules x positions
+
+Conditions map a position field to operator/threshold pairs, all of which must
+hold, e.g. {"impermanent_loss": {"gt": 5}, "current_value": {"gte": 1000}}.
+Operators are gt, gte, lt, lte, eq and ne. The derived field out_of_range is 1
+when current_price is outside [price_range_min, price_range_max], else 0.
+"""
+
+import logging
+import operator
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple, Iterator
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = '*'
+
+OPERATORS = {
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'eq': operator.eq,
+    'ne': operator.ne,
+}
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """A single field/operator/threshold comparison."""
+    field: str
+    op: str
+    threshold: float
+
+    def check(self, value: float) -> bool:
+        return not np.isnan(value) and OPERATORS[self.op](value, self.threshold)
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """An alert rule reduced to what evaluation needs."""
+    rule_id: str
+    alert_type: str
+    position_id: Optional[str]
+    predicates: Tuple[Predicate, ...]
+
+
+def compile_conditions(conditions: Dict[str, Any]) -> Tuple[Predicate, ...]:
+    """
+    Compile a rule's conditions into predicates.
+
+    Args:
+        conditions (Dict[str, Any]): Field -> {operator: threshold} mapping
+
+    Returns:
+        Tuple[Predicate, ...]: Predicates in condition order (empty if the
+        conditions are not in the evaluable format)
+    """
+    predicates = []
+    for field, comparisons in (conditions or {}).items():
+        if not isinstance(comparisons, dict):
+            return ()
+        for op, threshold in comparisons.items():
+            if op not in OPERATORS or isinstance(threshold, bool) or not isinstance(threshold, (int, float)):
+                return ()
+            predicates.append(Predicate(field, op, float(threshold)))
+    return tuple(predicates)
+
+
+class _ThresholdGroup:
+    """Rules sharing a first predicate field and operator, sorted by threshold."""
+
+    def __init__(self, op: str, rules: List[CompiledRule]):
+        self.op = op
+        rules = sorted(rules, key=lambda rule: rule.predicates[0].threshold)
+        self.rules = rules
+        self.thresholds = np.array([rule.predicates[0].threshold for rule in rules], dtype=np.float64)
+
+    def ranges(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Index range [lo, hi) of rules whose first predicate holds for each value."""
+        n = len(self.thresholds)
+        left = np.searchsorted(self.thresholds, values, side='left')
+        right = np.searchsorted(self.thresholds, values, side='right')
+        zeros, full = np.zeros_like(left), np.full_like(left, n)
+        if self.op == 'gt':      # threshold < value
+            return zeros, left
+        if self.op == 'gte':     # threshold <= value
+            return zeros, right
+        if self.op == 'lt':      # threshold > value
+            return right, full
+        if self.op == 'lte':     # threshold >= value
+            return left, full
+        if self.op == 'eq':
+            return left, right
+        return zeros, full       # ne: every rule is a candidate, checked individually
+
+
+class AlertRuleIndex:
+    """Compiled rules indexed by (alert_type, position_id or wildcard) and first predicate."""
+
+    def __init__(self):
+        self._rules: Dict[str, CompiledRule] = {}
+        self._members: Dict[Tuple[str, str], Dict[str, CompiledRule]] = {}
+        self._groups: Dict[Tuple[str, str], Dict[Tuple[str, str], _ThresholdGroup]] = {}
+        self._scoped_keys: Dict[str, List[Tuple[str, str]]] = {}
+        self._wildcard_keys = set()
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self._rules
+
+    def add(self, rule_id: str, alert_type: str, position_id: Optional[str], conditions: Dict[str, Any]) -> bool:
+        """
+        Compile and index a rule, replacing any earlier version of it.
+
+        Args:
+            rule_id (str): Rule ID
+            alert_type (str): Alert type value
+            position_id (Optional[str]): Position the rule is limited to (None: every position)
+            conditions (Dict[str, Any]): Rule conditions
+
+        Returns:
+            bool: False if the rule has no evaluable conditions (it can still be triggered manually)
+        """
+        touched = self._remove(rule_id)
+        added = self._insert(rule_id, alert_type, position_id, conditions)
+        for key in touched | added:
+            self._rebuild(key)
+        return bool(added)
+
+    def load(self, rules: List[Tuple[str, str, Optional[str], Dict[str, Any]]]):
+        """Replace the index with (rule_id, alert_type, position_id, conditions) entries, building each group once."""
+        self._rules.clear()
+        self._members.clear()
+        self._groups.clear()
+        self._scoped_keys.clear()
+        self._wildcard_keys.clear()
+        touched = set()
+        for rule_id, alert_type, position_id, conditions in rules:
+            touched |= self._insert(rule_id, alert_type, position_id, conditions)
+        for key in touched:
+            self._rebuild(key)
+
+    def remove(self, rule_id: str):
+        """Drop a rule from the index."""
+        for key in self._remove(rule_id):
+            self._rebuild(key)
+
+    def _insert(self, rule_id: str, alert_type: str, position_id: Optional[str], conditions: Dict[str, Any]) -> set:
+        predicates = compile_conditions(conditions)
+        if not predicates:
+            return set()
+        rule = CompiledRule(rule_id, alert_type, position_id, predicates)
+        key = (alert_type, position_id or WILDCARD)
+        self._rules[rule_id] = rule
+        self._members.setdefault(key, {})[rule_id] = rule
+        return {key}
+
+    def _remove(self, rule_id: str) -> set:
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return set()
+        key = (rule.alert_type, rule.position_id or WILDCARD)
+        self._members[key].pop(rule_id, None)
+        if not self._members[key]:
+            del self._members[key]
+        return {key}
+
+    def _rebuild(self, key: Tuple[str, str]):
+        members: Dict[Tuple[str, str], List[CompiledRule]] = {}
+        for rule in self._members.get(key, {}).values():
+            first = rule.predicates[0]
+            members.setdefault((first.field, first.op), []).append(rule)
+
+        scope = key[1]
+        if members:
+            self._groups[key] = {group_key: _ThresholdGroup(group_key[1], rules)
+                                 for group_key, rules in members.items()}
+            if scope == WILDCARD:
+                self._wildcard_keys.add(key)
+            elif key not in self._scoped_keys.setdefault(scope, []):
+                self._scoped_keys[scope].append(key)
+        else:
+            self._groups.pop(key, None)
+            self._wildcard_keys.discard(key)
+            if scope != WILDCARD and key in self._scoped_keys.get(scope, []):
+                self._scoped_keys[scope].remove(key)
+                if not self._scoped_keys[scope]:
+                    del self._scoped_keys[scope]
+
+    def evaluate(self, positions: List[Dict[str, Any]]) -> List[Tuple[CompiledRule, int]]:
+        """
+        Match a sweep of positions against every indexed rule.
+
+        Wildcard rules are matched against all positions with one binary search
+        per threshold group; position-specific rules only against their position.
+
+        Args:
+            positions (List[Dict[str, Any]]): Position payloads (rules match on 'id')
+
+        Returns:
+            List[Tuple[CompiledRule, int]]: Matching rules with the index of the matching position
+        """
+        columns = _Columns(positions)
+        matches = []
+
+        for key in self._wildcard_keys:
+            matches.extend(self._match(self._groups[key], columns, None))
+
+        rows = {}
+        for row, position in enumerate(positions):
+            rows.setdefault(position.get('id'), []).append(row)
+        for position_id in rows.keys() & self._scoped_keys.keys():
+            position_rows = np.array(rows[position_id])
+            for key in self._scoped_keys[position_id]:
+                matches.extend(self._match(self._groups[key], columns, position_rows))
+
+        return matches
+
+    @staticmethod
+    def _match(groups: Dict[Tuple[str, str], _ThresholdGroup], columns: '_Columns',
+               rows: Optional[np.ndarray]) -> Iterator[Tuple[CompiledRule, int]]:
+        for (field, op), group in groups.items():
+            values = columns[field] if rows is None else columns[field][rows]
+            lo, hi = group.ranges(values)
+            hits = np.nonzero(~np.isnan(values) & (hi > lo))[0]
+            for i in hits:
+                row = int(i) if rows is None else int(rows[i])
+                for rule in group.rules[lo[i]:hi[i]]:
+                    if op == 'ne' and not rule.predicates[0].check(values[i]):
+                        continue
+                    if all(p.check(columns[p.field][row]) for p in rule.predicates[1:]):
+                        yield rule, row
+
+
+class _Columns:
+    """Float value columns of a sweep, built on first use per field (NaN where missing)."""
+
+    def __init__(self, positions: List[Dict[str, Any]]):
+        self.positions = positions
+        self._cache: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        column = self._cache.get(field)
+        if column is None:
+            if field == 'out_of_range':
+                column = self._out_of_range()
+            else:
+                column = np.fromiter((_number(p.get(field)) for p in self.positions),
+                                     dtype=np.float64, count=len(self.positions))
+            self._cache[field] = column
+        return column
+
+    def _out_of_range(self) -> np.ndarray:
+        price, low, high = self['current_price'], self['price_range_min'], self['price_range_max']
+        with np.errstate(invalid='ignore'):
+            outside = ((price < low) | (price > high)).astype(np.float64)
+        outside[np.isnan(price) | np.isnan(low) | np.isnan(high)] = np.nan
+        return outside
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
@@ -5,8 +5,9 @@ This module provides comprehensive alerting capabilities including:
 - Email notifications via SMTP
 - Browser push notifications
 - Webhook integrations
+- Asynchronous notification dispatch with batching, coalescing and retries
 - Alert escalation and acknowledgment workflows
-- Custom alert rules and thresholds
+- Custom alert rules and thresholds, evaluated per sweep through a compiled rule index
 - Alert analytics and reporting
 """
 
@@ -16,16 +17,21 @@ import json
 import uuid
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Callable
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 from threading import Lock
-import requests
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 
+from services.alert_dispatcher import AlertDispatcher, Notification
+from services.alert_rule_index import AlertRuleIndex
+from services.http_session_pool import get_http_pool
+
 logger = logging.getLogger(__name__)
 
+SECONDS_PER_DAY = 86400
+
 
 class AlertType(Enum):
     """Alert type enumeration."""
@@ -68,6 +74,7 @@ class AlertRule:
     notification_channels: List[str] = None
     escalation_delay_minutes: int = 30
     max_escalations: int = 3
+    cooldown_minutes: int = 60
 
 
 @dataclass
@@ -105,6 +112,8 @@ class AlertService:
         Args:
             db_path (Optional[str]): Path to SQLite database file
             config (Optional[Dict[str, Any]]): Configuration for SMTP, webhooks, etc.
+                A 'dispatch' dict is passed to AlertDispatcher (max_queue, batch_size,
+                workers_per_channel, max_retries, retry_backoff).
         """
         import os
         self.db_path = db_path or os.path.join(
@@ -113,7 +122,15 @@ class AlertService:
         self.db_lock = Lock()
         self.config = config or {}
         self.alert_rules: Dict[str, AlertRule] = {}
+        self.rules_lock = Lock()
+        self.rule_index = AlertRuleIndex()
+        self._cooldowns: Dict[Tuple[str, str], int] = {}
         self.notification_handlers: Dict[str, Callable] = {}
+        self.batch_notification_handlers: Dict[str, Callable] = {}
+        
+        # Notifications are delivered by background workers, not the triggering thread
+        self.dispatcher = AlertDispatcher(self._deliver_notifications, self._log_notifications,
+                                          **self.config.get('dispatch', {}))
         
         # Initialize database
         self._ensure_database()
@@ -189,6 +206,54 @@ class AlertService:
                     )
                 ''')
                 
+                # Create alert_cooldowns table (last time each rule fired for each position)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS alert_cooldowns (
+                        rule_id TEXT NOT NULL,
+                        position_key TEXT NOT NULL,
+                        last_triggered_at INTEGER NOT NULL,
+                        PRIMARY KEY (rule_id, position_key)
+                    )
+                ''')
+                
+                # Add cooldown_minutes field if it doesn't exist (migration)
+                try:
+                    cursor.execute('ALTER TABLE alert_rules ADD COLUMN cooldown_minutes INTEGER DEFAULT 60')
+                    logger.info("Added cooldown_minutes field to alert_rules table")
+                except sqlite3.OperationalError as e:
+                    if "duplicate column name" not in str(e).lower():
+                        logger.warning(f"Could not add cooldown_minutes field: {e}")
+                
+                # Create alert_daily_counts table (per UTC creation day, type, severity and status)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS alert_daily_counts (
+                        day INTEGER NOT NULL,
+                        alert_type TEXT NOT NULL,
+                        severity TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        alerts INTEGER NOT NULL DEFAULT 0,
+                        escalated INTEGER NOT NULL DEFAULT 0,
+                        acknowledged INTEGER NOT NULL DEFAULT 0,
+                        ack_seconds INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (day, alert_type, severity, status)
+                    )
+                ''')
+                
+                # Backfill counters for alerts saved before the table existed
+                cursor.execute('SELECT EXISTS (SELECT 1 FROM alert_daily_counts)')
+                if not cursor.fetchone()[0]:
+                    cursor.execute('''
+                        INSERT INTO alert_daily_counts (
+                            day, alert_type, severity, status, alerts, escalated, acknowledged, ack_seconds
+                        )
+                        SELECT created_at / ?, alert_type, severity, status, COUNT(*),
+                               SUM(CASE WHEN escalation_count > 0 THEN 1 ELSE 0 END),
+                               COUNT(acknowledged_at),
+                               COALESCE(SUM(acknowledged_at - created_at), 0)
+                        FROM alerts
+                        GROUP BY created_at / ?, alert_type, severity, status
+                    ''', (SECONDS_PER_DAY, SECONDS_PER_DAY))
+                
                 # Create indexes
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_status ON alerts(status)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_created_at ON alerts(created_at)')
@@ -210,6 +275,10 @@ class AlertService:
             'push': self._send_push_notification,
             'log': self._send_log_notification
         }
+        # Channels that can deliver a whole batch more cheaply than one alert at a time
+        self.batch_notification_handlers = {
+            'email': self._send_email_batch
+        }
     
     def _load_alert_rules(self):
         """Load alert rules from database."""
@@ -232,11 +301,20 @@ class AlertService:
                         position_id=row['position_id'],
                         notification_channels=json.loads(row['notification_channels']) if row['notification_channels'] else [],
                         escalation_delay_minutes=row['escalation_delay_minutes'],
-                        max_escalations=row['max_escalations']
+                        max_escalations=row['max_escalations'],
+                        cooldown_minutes=row['cooldown_minutes'] if row['cooldown_minutes'] is not None else 60
                     )
                     self.alert_rules[rule.id] = rule
                 
-                logger.info(f"Loaded {len(self.alert_rules)} alert rules")
+                self.rule_index.load([
+                    (rule.id, rule.alert_type.value, rule.position_id, rule.conditions)
+                    for rule in self.alert_rules.values()
+                ])
+                
+                cursor.execute('SELECT rule_id, position_key, last_triggered_at FROM alert_cooldowns')
+                self._cooldowns = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+                
+                logger.info(f"Loaded {len(self.alert_rules)} alert rules ({len(self.rule_index)} evaluable)")
                 
         except Exception as e:
             logger.error(f"Error loading alert rules: {str(e)}")
@@ -265,7 +343,8 @@ class AlertService:
                 position_id=rule_data.get('position_id'),
                 notification_channels=rule_data.get('notification_channels', ['log']),
                 escalation_delay_minutes=rule_data.get('escalation_delay_minutes', 30),
-                max_escalations=rule_data.get('max_escalations', 3)
+                max_escalations=rule_data.get('max_escalations', 3),
+                cooldown_minutes=rule_data.get('cooldown_minutes', 60)
             )
             
             with self.db_lock:
@@ -276,19 +355,22 @@ class AlertService:
                         INSERT INTO alert_rules (
                             id, name, alert_type, severity, conditions, enabled,
                             position_id, notification_channels, escalation_delay_minutes,
-                            max_escalations, created_at, updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            max_escalations, cooldown_minutes, created_at, updated_at
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     ''', (
                         rule_id, rule.name, rule.alert_type.value, rule.severity.value,
                         json.dumps(rule.conditions), int(rule.enabled), rule.position_id,
                         json.dumps(rule.notification_channels), rule.escalation_delay_minutes,
-                        rule.max_escalations, current_timestamp, current_timestamp
+                        rule.max_escalations, rule.cooldown_minutes, current_timestamp, current_timestamp
                     ))
                     
                     conn.commit()
                     
-            # Add to memory
-            self.alert_rules[rule_id] = rule
+            # Add to memory and the evaluation index
+            with self.rules_lock:
+                self.alert_rules[rule_id] = rule
+                if rule.enabled:
+                    self.rule_index.add(rule_id, rule.alert_type.value, rule.position_id, rule.conditions)
             
             logger.info(f"Created alert rule: {rule_id}")
             return rule_id
@@ -302,6 +384,9 @@ class AlertService:
         """
         Trigger an alert based on a rule.
         
+        The alert is saved before returning; its notifications are queued for
+        the dispatcher's workers, so slow channels never block the caller.
+        
         Args:
             rule_id (str): The alert rule ID
             position_data (Optional[Dict[str, Any]]): Position data for context
@@ -320,30 +405,13 @@ class AlertService:
                 logger.debug(f"Alert rule disabled: {rule_id}")
                 return None
             
-            alert_id = str(uuid.uuid4())
-            current_time = datetime.now()
-            
-            # Generate alert title and message
-            title, message = self._generate_alert_content(rule, position_data, custom_message)
-            
-            alert = Alert(
-                id=alert_id,
-                rule_id=rule_id,
-                position_id=rule.position_id or (position_data.get('id') if position_data else None),
-                alert_type=rule.alert_type,
-                severity=rule.severity,
-                title=title,
-                message=message,
-                status=AlertStatus.PENDING,
-                created_at=current_time,
-                updated_at=current_time,
-                metadata=position_data
-            )
+            alert = self._build_alert(rule, position_data, custom_message, datetime.now())
+            alert_id = alert.id
             
             # Save alert to database
             self._save_alert(alert)
             
-            # Send notifications
+            # Queue notifications
             self._send_notifications(alert, rule)
             
             logger.info(f"Triggered alert: {alert_id} for rule: {rule_id}")
@@ -353,6 +421,75 @@ class AlertService:
             logger.error(f"Error triggering alert: {str(e)}")
             raise
     
+    def evaluate_positions(self, positions: List[Dict[str, Any]]) -> List[str]:
+        """
+        Evaluate a monitoring sweep of positions against all alert rules at once.
+        
+        Rules are matched through the compiled rule index, so the cost follows
+        the number of matching rules rather than rules x positions. A rule fires
+        for a position at most once per cooldown_minutes; alerts and cooldowns
+        are written in one transaction per sweep and notifications are queued.
+        
+        Args:
+            positions (List[Dict[str, Any]]): Position payloads (rules match on 'id')
+            
+        Returns:
+            List[str]: IDs of the alerts created
+        """
+        try:
+            now = datetime.now()
+            now_timestamp = int(now.timestamp())
+            fired = []
+            cooldowns = []
+            
+            with self.rules_lock:
+                for compiled, row in self.rule_index.evaluate(positions):
+                    rule = self.alert_rules.get(compiled.rule_id)
+                    if rule is None or not rule.enabled:
+                        continue
+                    
+                    position = positions[row]
+                    cooldown_key = (rule.id, position.get('id') or '')
+                    last_triggered = self._cooldowns.get(cooldown_key)
+                    if last_triggered is not None and now_timestamp - last_triggered < rule.cooldown_minutes * 60:
+                        continue
+                    
+                    self._cooldowns[cooldown_key] = now_timestamp
+                    cooldowns.append((*cooldown_key, now_timestamp))
+                    fired.append((self._build_alert(rule, position, None, now), rule))
+            
+            if fired:
+                self._save_alerts([alert for alert, _ in fired], cooldowns)
+                for alert, rule in fired:
+                    self._send_notifications(alert, rule)
+            
+            logger.info(f"Evaluated {len(positions)} positions against {len(self.rule_index)} rules, "
+                        f"{len(fired)} alerts triggered")
+            return [alert.id for alert, _ in fired]
+            
+        except Exception as e:
+            logger.error(f"Error evaluating alert rules: {str(e)}")
+            raise
+    
+    def _build_alert(self, rule: AlertRule, position_data: Optional[Dict[str, Any]],
+                     custom_message: Optional[str], current_time: datetime) -> Alert:
+        """Create a pending alert for a rule."""
+        title, message = self._generate_alert_content(rule, position_data, custom_message)
+        
+        return Alert(
+            id=str(uuid.uuid4()),
+            rule_id=rule.id,
+            position_id=rule.position_id or (position_data.get('id') if position_data else None),
+            alert_type=rule.alert_type,
+            severity=rule.severity,
+            title=title,
+            message=message,
+            status=AlertStatus.PENDING,
+            created_at=current_time,
+            updated_at=current_time,
+            metadata=position_data
+        )
+    
     def acknowledge_alert(self, alert_id: str, acknowledged_by: str) -> bool:
         """
         Acknowledge an alert.
@@ -371,22 +508,36 @@ class AlertService:
                 with sqlite3.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
+                    cursor.execute('''
+                        SELECT created_at, alert_type, severity, status FROM alerts
+                        WHERE id = ? AND status IN ('pending', 'sent', 'escalated')
+                    ''', (alert_id,))
+                    previous = cursor.fetchone()
+                    
+                    if previous is None:
+                        logger.warning(f"Alert not found or already processed: {alert_id}")
+                        return False
+                    
                     cursor.execute('''
                         UPDATE alerts 
                         SET status = ?, acknowledged_at = ?, acknowledged_by = ?, updated_at = ?
-                        WHERE id = ? AND status IN ('pending', 'sent', 'escalated')
+                        WHERE id = ?
                     ''', (
                         AlertStatus.ACKNOWLEDGED.value, current_timestamp,
                         acknowledged_by, current_timestamp, alert_id
                     ))
                     
-                    if cursor.rowcount > 0:
-                        conn.commit()
-                        logger.info(f"Alert acknowledged: {alert_id} by {acknowledged_by}")
-                        return True
-                    else:
-                        logger.warning(f"Alert not found or already processed: {alert_id}")
-                        return False
+                    created_at, alert_type, severity, status = previous
+                    day = created_at // SECONDS_PER_DAY
+                    self._update_alert_counters(cursor, [
+                        (day, alert_type, severity, status, -1, 0, 0, 0),
+                        (day, alert_type, severity, AlertStatus.ACKNOWLEDGED.value, 1, 0, 1,
+                         current_timestamp - created_at)
+                    ])
+                    
+                    conn.commit()
+                    logger.info(f"Alert acknowledged: {alert_id} by {acknowledged_by}")
+                    return True
                         
         except Exception as e:
             logger.error(f"Error acknowledging alert {alert_id}: {str(e)}")
@@ -409,6 +560,15 @@ class AlertService:
                 with sqlite3.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
+                    cursor.execute('''
+                        SELECT created_at, alert_type, severity, status FROM alerts WHERE id = ?
+                    ''', (alert_id,))
+                    previous = cursor.fetchone()
+                    
+                    if previous is None:
+                        logger.warning(f"Alert not found: {alert_id}")
+                        return False
+                    
                     cursor.execute('''
                         UPDATE alerts 
                         SET status = ?, resolved_at = ?, updated_at = ?
@@ -418,13 +578,17 @@ class AlertService:
                         current_timestamp, alert_id
                     ))
                     
-                    if cursor.rowcount > 0:
-                        conn.commit()
-                        logger.info(f"Alert resolved: {alert_id}")
-                        return True
-                    else:
-                        logger.warning(f"Alert not found: {alert_id}")
-                        return False
+                    created_at, alert_type, severity, status = previous
+                    if status != AlertStatus.RESOLVED.value:
+                        day = created_at // SECONDS_PER_DAY
+                        self._update_alert_counters(cursor, [
+                            (day, alert_type, severity, status, -1, 0, 0, 0),
+                            (day, alert_type, severity, AlertStatus.RESOLVED.value, 1, 0, 0, 0)
+                        ])
+                    
+                    conn.commit()
+                    logger.info(f"Alert resolved: {alert_id}")
+                    return True
                         
         except Exception as e:
             logger.error(f"Error resolving alert {alert_id}: {str(e)}")
@@ -479,6 +643,9 @@ class AlertService:
         """
         Get alert analytics for the specified period.
         
+        Reads the daily alert counters, so the period covers whole UTC days:
+        from the start of the day `days` days ago through today.
+        
         Args:
             days (int): Number of days to analyze
             
@@ -486,98 +653,123 @@ class AlertService:
             Dict[str, Any]: Analytics data
         """
         try:
-            start_timestamp = int((datetime.now() - timedelta(days=days)).timestamp())
+            start_day = int((datetime.now() - timedelta(days=days)).timestamp()) // SECONDS_PER_DAY
             
             with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
-                # Total alerts by status
                 cursor.execute('''
-                    SELECT status, COUNT(*) as count
-                    FROM alerts
-                    WHERE created_at >= ?
-                    GROUP BY status
-                ''', (start_timestamp,))
-                status_counts = {row['status']: row['count'] for row in cursor.fetchall()}
-                
-                # Alerts by type
-                cursor.execute('''
-                    SELECT alert_type, COUNT(*) as count
-                    FROM alerts
-                    WHERE created_at >= ?
-                    GROUP BY alert_type
-                ''', (start_timestamp,))
-                type_counts = {row['alert_type']: row['count'] for row in cursor.fetchall()}
-                
-                # Alerts by severity
-                cursor.execute('''
-                    SELECT severity, COUNT(*) as count
-                    FROM alerts
-                    WHERE created_at >= ?
-                    GROUP BY severity
-                ''', (start_timestamp,))
-                severity_counts = {row['severity']: row['count'] for row in cursor.fetchall()}
-                
-                # Average response time (acknowledgment)
-                cursor.execute('''
-                    SELECT AVG(acknowledged_at - created_at) as avg_response_time
-                    FROM alerts
-                    WHERE created_at >= ? AND acknowledged_at IS NOT NULL
-                ''', (start_timestamp,))
-                avg_response_time = cursor.fetchone()['avg_response_time'] or 0
-                
-                # Escalation rate
-                cursor.execute('''
-                    SELECT 
-                        COUNT(*) as total_alerts,
-                        SUM(CASE WHEN escalation_count > 0 THEN 1 ELSE 0 END) as escalated_alerts
-                    FROM alerts
-                    WHERE created_at >= ?
-                ''', (start_timestamp,))
-                escalation_data = cursor.fetchone()
-                escalation_rate = (escalation_data['escalated_alerts'] / escalation_data['total_alerts'] * 100) if escalation_data['total_alerts'] > 0 else 0
-                
-                analytics = {
-                    'period_days': days,
-                    'total_alerts': sum(status_counts.values()),
-                    'status_breakdown': status_counts,
-                    'type_breakdown': type_counts,
-                    'severity_breakdown': severity_counts,
-                    'avg_response_time_seconds': avg_response_time,
-                    'escalation_rate_percent': escalation_rate
-                }
-                
-                return analytics
+                    SELECT status, alert_type, severity, SUM(alerts), SUM(escalated),
+                           SUM(acknowledged), SUM(ack_seconds)
+                    FROM alert_daily_counts
+                    WHERE day >= ?
+                    GROUP BY status, alert_type, severity
+                ''', (start_day,))
+                rows = cursor.fetchall()
+            
+            status_counts: Dict[str, int] = {}
+            type_counts: Dict[str, int] = {}
+            severity_counts: Dict[str, int] = {}
+            escalated = acknowledged = ack_seconds = 0
+            
+            for status, alert_type, severity, alerts, row_escalated, row_acknowledged, row_ack_seconds in rows:
+                if alerts:
+                    status_counts[status] = status_counts.get(status, 0) + alerts
+                    type_counts[alert_type] = type_counts.get(alert_type, 0) + alerts
+                    severity_counts[severity] = severity_counts.get(severity, 0) + alerts
+                escalated += row_escalated
+                acknowledged += row_acknowledged
+                ack_seconds += row_ack_seconds
+            
+            total_alerts = sum(status_counts.values())
+            
+            analytics = {
+                'period_days': days,
+                'total_alerts': total_alerts,
+                'status_breakdown': status_counts,
+                'type_breakdown': type_counts,
+                'severity_breakdown': severity_counts,
+                'avg_response_time_seconds': ack_seconds / acknowledged if acknowledged else 0,
+                'escalation_rate_percent': (escalated / total_alerts * 100) if total_alerts > 0 else 0
+            }
+            
+            return analytics
                 
         except Exception as e:
             logger.error(f"Error generating alert analytics: {str(e)}")
             raise
     
+    def _update_alert_counters(self, cursor: sqlite3.Cursor, deltas: List[Tuple[int, str, str, str, int, int, int, int]]):
+        """
+        Apply changes to the daily alert counters inside the caller's transaction.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the transaction that changed the alerts
+            deltas: (day, alert_type, severity, status, alerts, escalated, acknowledged, ack_seconds) changes
+        """
+        cursor.executemany('''
+            INSERT INTO alert_daily_counts (
+                day, alert_type, severity, status, alerts, escalated, acknowledged, ack_seconds
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(day, alert_type, severity, status) DO UPDATE SET
+                alerts = alerts + excluded.alerts,
+                escalated = escalated + excluded.escalated,
+                acknowledged = acknowledged + excluded.acknowledged,
+                ack_seconds = ack_seconds + excluded.ack_seconds
+        ''', deltas)
+    
     def _save_alert(self, alert: Alert):
         """Save alert to database."""
+        self._save_alerts([alert])
+    
+    def _save_alerts(self, alerts: List[Alert], cooldowns: Optional[List[Tuple[str, str, int]]] = None):
+        """
+        Save alerts, their daily counters and the cooldowns recorded for them, in one transaction.
+        
+        Args:
+            alerts (List[Alert]): Alerts to insert
+            cooldowns (Optional[List[Tuple[str, str, int]]]): (rule_id, position_key, last_triggered_at) rows
+        """
         try:
             with self.db_lock:
                 with sqlite3.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
-                    cursor.execute('''
+                    cursor.executemany('''
                         INSERT INTO alerts (
                             id, rule_id, position_id, alert_type, severity, title, message,
                             status, created_at, updated_at, escalation_count, metadata
                         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
+                    ''', [(
                         alert.id, alert.rule_id, alert.position_id,
                         alert.alert_type.value, alert.severity.value,
                         alert.title, alert.message, alert.status.value,
                         int(alert.created_at.timestamp()), int(alert.updated_at.timestamp()),
-                        alert.escalation_count, json.dumps(alert.metadata) if alert.metadata else None
-                    ))
+                        alert.escalation_count, json.dumps(alert.metadata, default=str) if alert.metadata else None
+                    ) for alert in alerts])
+                    
+                    counts: Dict[Tuple[int, str, str, str], List[int]] = {}
+                    for alert in alerts:
+                        key = (int(alert.created_at.timestamp()) // SECONDS_PER_DAY, alert.alert_type.value,
+                               alert.severity.value, alert.status.value)
+                        count = counts.setdefault(key, [0, 0])
+                        count[0] += 1
+                        count[1] += alert.escalation_count > 0
+                    self._update_alert_counters(cursor, [(*key, alerts_count, escalated, 0, 0)
+                                                         for key, (alerts_count, escalated) in counts.items()])
+                    
+                    if cooldowns:
+                        cursor.executemany('''
+                            INSERT INTO alert_cooldowns (rule_id, position_key, last_triggered_at)
+                            VALUES (?, ?, ?)
+                            ON CONFLICT(rule_id, position_key) DO UPDATE SET
+                                last_triggered_at = excluded.last_triggered_at
+                        ''', cooldowns)
                     
                     conn.commit()
                     
         except Exception as e:
-            logger.error(f"Error saving alert: {str(e)}")
+            logger.error(f"Error saving alerts: {str(e)}")
             raise
     
     def _generate_alert_content(self, rule: AlertRule, position_data: Optional[Dict[str, Any]],
@@ -614,49 +806,106 @@ class AlertService:
         return title, message
     
     def _send_notifications(self, alert: Alert, rule: AlertRule):
-        """Send notifications for an alert."""
+        """Queue notifications for an alert on each of the rule's channels."""
         for channel in rule.notification_channels:
             if channel in self.notification_handlers:
-                try:
-                    self.notification_handlers[channel](alert, rule)
-                    self._log_notification(alert.id, channel, 'sent')
-                except Exception as e:
-                    logger.error(f"Error sending {channel} notification: {str(e)}")
-                    self._log_notification(alert.id, channel, 'failed', str(e))
+                self.dispatcher.submit(channel, alert, rule, key=(rule.id, alert.position_id))
     
-    def _send_email_notification(self, alert: Alert, rule: AlertRule):
-        """Send email notification."""
-        if 'smtp' not in self.config:
-            logger.warning("SMTP configuration not found")
-            return
+    def _deliver_notifications(self, channel: str, notifications: List[Notification]) -> List[Optional[Exception]]:
+        """
+        Deliver a batch of queued notifications for one channel (runs on dispatcher workers).
+        
+        Args:
+            channel (str): Notification channel
+            notifications (List[Notification]): Notifications to deliver
+            
+        Returns:
+            List[Optional[Exception]]: None for each delivered notification, else the error
+        """
+        alerts = [(self._notification_alert(n), n.rule) for n in notifications]
+        
+        if channel in self.batch_notification_handlers:
+            return self.batch_notification_handlers[channel](alerts)
         
+        errors = []
+        for alert, rule in alerts:
+            try:
+                self.notification_handlers[channel](alert, rule)
+                errors.append(None)
+            except Exception as e:
+                logger.error(f"Error sending {channel} notification: {str(e)}")
+                errors.append(e)
+        return errors
+    
+    def _notification_alert(self, notification: Notification) -> Alert:
+        """The alert to send for a notification, noting how many duplicates it stands for."""
+        if len(notification.alert_ids) == 1:
+            return notification.alert
+        
+        metadata = dict(notification.alert.metadata or {})
+        metadata['coalesced_count'] = len(notification.alert_ids)
+        return replace(notification.alert, metadata=metadata)
+    
+    def _build_email_message(self, alert: Alert) -> MIMEMultipart:
+        """Build the email for an alert."""
         smtp_config = self.config['smtp']
         
-        msg = MimeMultipart()
+        msg = MIMEMultipart()
         msg['From'] = smtp_config['from_email']
         msg['To'] = smtp_config['to_email']
         msg['Subject'] = f"[{alert.severity.value.upper()}] {alert.title}"
         
+        coalesced = (alert.metadata or {}).get('coalesced_count')
         body = f"""
         Alert Details:
         - Type: {alert.alert_type.value}
         - Severity: {alert.severity.value}
         - Position: {alert.position_id or 'N/A'}
         - Time: {alert.created_at}
-        
+        {f'- Occurrences: {coalesced}' if coalesced else ''}
         Message: {alert.message}
         
         Alert ID: {alert.id}
         """
         
-        msg.attach(MimeText(body, 'plain'))
+        msg.attach(MIMEText(body, 'plain'))
+        return msg
+    
+    def _send_email_notification(self, alert: Alert, rule: AlertRule):
+        """Send email notification."""
+        error = self._send_email_batch([(alert, rule)])[0]
+        if error is not None:
+            raise error
+    
+    def _send_email_batch(self, alerts: List[Tuple[Alert, AlertRule]]) -> List[Optional[Exception]]:
+        """Send a batch of alert emails over one SMTP session."""
+        if 'smtp' not in self.config:
+            logger.warning("SMTP configuration not found")
+            return [None] * len(alerts)
+        
+        smtp_config = self.config['smtp']
+        errors = []
         
-        with smtplib.SMTP(smtp_config['host'], smtp_config['port']) as server:
-            if smtp_config.get('use_tls'):
-                server.starttls()
-            if smtp_config.get('username'):
-                server.login(smtp_config['username'], smtp_config['password'])
-            server.send_message(msg)
+        try:
+            with smtplib.SMTP(smtp_config['host'], smtp_config['port'],
+                              timeout=smtp_config.get('timeout', 30)) as server:
+                if smtp_config.get('use_tls'):
+                    server.starttls()
+                if smtp_config.get('username'):
+                    server.login(smtp_config['username'], smtp_config['password'])
+                
+                for alert, _ in alerts:
+                    try:
+                        server.send_message(self._build_email_message(alert))
+                        errors.append(None)
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                        errors.append(e)
+        except Exception as e:
+            logger.error(f"Error sending email notifications: {str(e)}")
+            # Messages not handed over before the session failed count as failed
+            errors.extend([e] * (len(alerts) - len(errors)))
+        
+        return errors
     
     def _send_webhook_notification(self, alert: Alert, rule: AlertRule):
         """Send webhook notification."""
@@ -676,10 +925,12 @@ class AlertService:
             'metadata': alert.metadata
         }
         
-        response = requests.post(
+        # The dispatcher retries failed deliveries, so the pool doesn't retry as well
+        response = get_http_pool().post(
             self.config['webhook_url'],
             json=payload,
-            timeout=30
+            timeout=self.config.get('webhook_timeout', 30),
+            retries=0
         )
         response.raise_for_status()
     
@@ -700,27 +951,68 @@ class AlertService:
         
         logger.log(log_level, f"ALERT [{alert.severity.value.upper()}] {alert.title}: {alert.message}")
     
-    def _log_notification(self, alert_id: str, channel: str, status: str, error_message: str = None):
-        """Log notification attempt."""
+    def _log_notifications(self, channel: str, results: List[Tuple[Notification, str, Optional[str]]]):
+        """Log finished notifications, one row per alert they covered, in one transaction."""
         try:
-            notification_id = str(uuid.uuid4())
             current_timestamp = int(datetime.now().timestamp())
+            rows = [
+                (str(uuid.uuid4()), alert_id, channel, status,
+                 current_timestamp if status == 'sent' else None, error_message, current_timestamp)
+                for notification, status, error_message in results
+                for alert_id in notification.alert_ids
+            ]
             
             with self.db_lock:
                 with sqlite3.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
-                    cursor.execute('''
+                    cursor.executemany('''
                         INSERT INTO alert_notifications (
                             id, alert_id, channel, status, sent_at, error_message, created_at
                         ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        notification_id, alert_id, channel, status,
-                        current_timestamp if status == 'sent' else None,
-                        error_message, current_timestamp
-                    ))
+                    ''', rows)
                     
                     conn.commit()
                     
         except Exception as e:
-            logger.error(f"Error logging notification: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error logging notifications: {str(e)}")
+    
+    def get_dispatch_metrics(self) -> Dict[str, Any]:
+        """
+        Get notification dispatch metrics.
+        
+        Returns:
+            Dict[str, Any]: Queue depth, delivery counters and dispatch latency (see AlertDispatcher.get_metrics)
+        """
+        return self.dispatcher.get_metrics()
+    
+    def flush_notifications(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued notifications to be delivered.
+        
+        Args:
+            timeout (Optional[float]): Seconds to wait (None waits indefinitely)
+            
+        Returns:
+            bool: True if every queue drained in time
+        """
+        return self.dispatcher.flush(timeout)
+    
+    def shutdown(self, timeout: Optional[float] = 5.0):
+        """Deliver queued notifications and stop the dispatcher workers."""
+        self.dispatcher.stop(timeout)
+
+
+# Global alert service instance, shared by the API routes and the monitoring sweep
+_alert_service = None
+_alert_service_lock = Lock()
+
+
+def get_alert_service() -> AlertService:
+    """Get the global alert service"""
+    global _alert_service
+    if _alert_service is None:
+        with _alert_service_lock:
+            if _alert_service is None:
+                _alert_service = AlertService()
+    return _alert_service
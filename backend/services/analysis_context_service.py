@@ -13,6 +13,7 @@ import json
 import os
 import requests
 from .active_trade_service import ActiveTradeService
+from .http_session_pool import get_http_pool
 
 logger = logging.getLogger(__name__)
 
@@ -309,7 +310,8 @@ class AnalysisContextService:
                 'current_price': current_price
             }
     
-    def _is_breakout_trade(self, entry_condition: str) -> bool:
+    @staticmethod
+    def _is_breakout_trade(entry_condition: str) -> bool:
         """
         Determine if this is a breakout trade based on the entry condition.
         
@@ -526,7 +528,7 @@ class AnalysisContextService:
             
             logger.info(f"🔍 Fetching candlestick data for {ticker} ({timeframe}) since {since_time}")
             
-            response = requests.get(api_url, params=params, timeout=10)
+            response = get_http_pool().get(api_url, params=params, timeout=10)
             
             if response.status_code != 200:
                 logger.warning(f"⚠️ Market data API returned status {response.status_code} for {ticker}")
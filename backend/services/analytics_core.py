@@ -0,0 +1,309 @@
+"""
+Vectorized Analytics Core
+
+This module provides the array-based building blocks used by the advanced
+analytics engine:
+- PriceSeries: a position's price/volume history as typed NumPy arrays
+- Rolling volatility, VaR/CVaR, drawdown and trend slope over trailing windows
+- Market regime labels for every point of a series
+
+Histories are converted to arrays once (epoch int64 timestamps, float64 prices)
+and every metric is computed with NumPy/pandas window operations instead of
+Python loops over lists of dicts.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+
+# Regime thresholds (annualized volatility and price slope per period)
+VOL_THRESHOLD_HIGH = 0.6
+VOL_THRESHOLD_LOW = 0.2
+TREND_THRESHOLD = 0.02
+
+
+def _parse_iso(value: str) -> int:
+    """Epoch seconds of an ISO-8601 timestamp (naive timestamps are UTC)."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+@dataclass
+class PriceSeries:
+    """Price and volume history as typed arrays, oldest first."""
+    timestamps: np.ndarray  # int64 epoch seconds
+    prices: np.ndarray      # float64
+    volumes: np.ndarray     # float64
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], price_key: str = 'price',
+                     time_key: str = 'timestamp', volume_key: str = 'volume') -> 'PriceSeries':
+        """
+        Convert a list of price dicts into a PriceSeries.
+
+        Timestamps may be epoch seconds or ISO-8601 strings; records are sorted by
+        time when every record has one and kept in the given order otherwise.
+
+        Args:
+            records (List[Dict[str, Any]]): Price records
+            price_key (str): Key of the price field
+            time_key (str): Key of the timestamp field
+            volume_key (str): Key of the (optional) volume field
+
+        Returns:
+            PriceSeries: The history as arrays
+        """
+        prices = np.array([r[price_key] for r in records], dtype=np.float64)
+        volumes = np.array([r.get(volume_key) or 0 for r in records], dtype=np.float64)
+
+        raw_times = [r.get(time_key) for r in records]
+        if records and all(t is not None for t in raw_times):
+            if isinstance(raw_times[0], str):
+                timestamps = np.array([_parse_iso(t) for t in raw_times], dtype=np.int64)
+            else:
+                timestamps = np.array(raw_times, dtype=np.float64).astype(np.int64)
+
+            if np.any(timestamps[1:] < timestamps[:-1]):
+                order = np.argsort(timestamps, kind='stable')
+                timestamps, prices, volumes = timestamps[order], prices[order], volumes[order]
+        else:
+            timestamps = np.arange(len(records), dtype=np.int64)
+
+        return cls(timestamps, prices, volumes)
+
+    @classmethod
+    def load(cls, position_id: Optional[str] = None, token_pair: Optional[str] = None,
+             start_time: Optional[int] = None, end_time: Optional[int] = None,
+             price_history=None) -> 'PriceSeries':
+        """
+        Load price history for a position or pair straight into arrays.
+
+        Args:
+            position_id (Optional[str]): Filter by position ID
+            token_pair (Optional[str]): Filter by token pair
+            start_time (Optional[int]): Start timestamp filter
+            end_time (Optional[int]): End timestamp filter
+            price_history (Optional[CLPriceHistory]): Price history model (default database if omitted)
+
+        Returns:
+            PriceSeries: The history as arrays (volumes are zero; the table stores none)
+        """
+        if price_history is None:
+            from models.cl_price_history import CLPriceHistory
+            price_history = CLPriceHistory()
+
+        timestamps, prices = price_history.get_price_arrays(
+            position_id=position_id, token_pair=token_pair, start_time=start_time, end_time=end_time
+        )
+        return cls(timestamps, prices, np.zeros(len(prices), dtype=np.float64))
+
+    def simple_returns(self) -> np.ndarray:
+        """Period-over-period simple returns (length n - 1)."""
+        return np.diff(self.prices) / self.prices[:-1]
+
+    def log_returns(self) -> np.ndarray:
+        """Period-over-period log returns (length n - 1)."""
+        return np.diff(np.log(self.prices))
+
+
+def _windows(values: np.ndarray, window: int) -> np.ndarray:
+    """Read-only (n - window + 1, window) view of every trailing window."""
+    return np.lib.stride_tricks.sliding_window_view(np.asarray(values, dtype=np.float64), window)
+
+
+def _align(window_values: np.ndarray, n: int, window: int) -> np.ndarray:
+    """Place per-window results at each window's last index, NaN before the first full window."""
+    aligned = np.full(n, np.nan)
+    aligned[window - 1:] = window_values
+    return aligned
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over window points (NaN until the window is full)."""
+    if len(values) < window:
+        return np.full(len(values), np.nan)
+    return _align(_windows(values, window).mean(axis=1), len(values), window)
+
+
+def rolling_std(values: np.ndarray, window: Optional[int]) -> np.ndarray:
+    """
+    Trailing population standard deviation (NaN until the window is full).
+
+    A window of None uses all points up to and including each index. Fixed
+    windows are computed directly over each window rather than with running
+    sums, so long histories don't accumulate rounding error.
+    """
+    if window is None:
+        return pd.Series(values).expanding().std(ddof=0).to_numpy()
+    if len(values) < window:
+        return np.full(len(values), np.nan)
+    return _align(_windows(values, window).std(axis=1), len(values), window)
+
+
+def rolling_volatility(returns: np.ndarray, window: Optional[int],
+                       periods_per_year: int = TRADING_DAYS) -> np.ndarray:
+    """Annualized trailing volatility of returns (window None: expanding)."""
+    return rolling_std(returns, window) * np.sqrt(periods_per_year)
+
+
+def rolling_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """Least-squares slope per period over the trailing window (NaN until full)."""
+    if len(values) < window:
+        return np.full(len(values), np.nan)
+    # With x = 0..window-1 the slope is a fixed weighting of each window's values
+    centered = np.arange(window) - (window - 1) / 2
+    return _align(_windows(values, window) @ (centered / np.sum(centered ** 2)), len(values), window)
+
+
+def value_at_risk(returns: np.ndarray, level: float = 0.95) -> Tuple[float, float]:
+    """
+    Historical VaR and CVaR of a return series.
+
+    Returns:
+        Tuple[float, float]: The (1 - level) return quantile and the mean of returns at or below it
+    """
+    var = np.percentile(returns, (1 - level) * 100)
+    return var, np.mean(returns[returns <= var])
+
+
+def rolling_var_cvar(returns: np.ndarray, window: int, level: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Historical VaR and CVaR over every trailing window of returns.
+
+    Args:
+        returns (np.ndarray): Return series
+        window (int): Window length
+        level (float): Confidence level
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: VaR and CVaR aligned with returns (NaN until the window is full)
+    """
+    if len(returns) < window:
+        return np.full(len(returns), np.nan), np.full(len(returns), np.nan)
+
+    windows = _windows(returns, window)
+    window_var = np.percentile(windows, (1 - level) * 100, axis=1)
+    tail = windows <= window_var[:, None]
+    window_cvar = (windows * tail).sum(axis=1) / tail.sum(axis=1)
+    return _align(window_var, len(returns), window), _align(window_cvar, len(returns), window)
+
+
+def drawdown_series(returns: np.ndarray) -> np.ndarray:
+    """Drawdown from the running peak of compounded returns (0 at new highs, negative below)."""
+    cumulative = np.cumprod(1 + returns)
+    peak = np.maximum.accumulate(cumulative)
+    return (cumulative - peak) / peak
+
+
+def max_drawdown(returns: np.ndarray) -> float:
+    """Deepest drawdown of compounded returns (a negative fraction, or 0)."""
+    return np.min(drawdown_series(returns))
+
+
+def classify_regimes(volatility: np.ndarray, trend: np.ndarray,
+                     avg_return: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classify regime indicators into MarketRegime values with confidences.
+
+    High and low volatility take precedence over trend; a trend only counts as
+    bull/bear when the average return agrees with it, otherwise it is sideways.
+
+    Args:
+        volatility (np.ndarray): Annualized volatility of log returns
+        trend (np.ndarray): Price slope per period
+        avg_return (np.ndarray): Mean recent log return
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: MarketRegime values (None where an indicator is NaN) and confidences
+    """
+    volatility, trend, avg_return = np.broadcast_arrays(
+        np.asarray(volatility, dtype=np.float64), np.asarray(trend, dtype=np.float64),
+        np.asarray(avg_return, dtype=np.float64)
+    )
+    labels = np.full(volatility.shape, None, dtype=object)
+    confidence = np.full(volatility.shape, np.nan)
+    ready = ~(np.isnan(volatility) | np.isnan(trend) | np.isnan(avg_return))
+
+    conditions = [
+        volatility > VOL_THRESHOLD_HIGH,
+        volatility < VOL_THRESHOLD_LOW,
+        (trend > TREND_THRESHOLD) & (avg_return > 0),
+        (trend < -TREND_THRESHOLD) & (avg_return < 0),
+    ]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        labels[ready] = np.select(
+            conditions, ['high_volatility', 'low_volatility', 'bull_market', 'bear_market'], 'sideways'
+        ).astype(object)[ready]
+        confidence[ready] = np.select(conditions, [
+            np.minimum(0.95, volatility / VOL_THRESHOLD_HIGH),
+            np.minimum(0.95, VOL_THRESHOLD_LOW / volatility),
+            np.minimum(0.9, np.abs(trend) / TREND_THRESHOLD),
+            np.minimum(0.9, np.abs(trend) / TREND_THRESHOLD),
+        ], 0.7)[ready]
+
+    return labels, confidence
+
+
+def regime_labels(prices: np.ndarray, vol_window: Optional[int] = 30, trend_window: int = 30,
+                  return_window: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Label the market regime at every point of a price series.
+
+    At each point the indicators are the annualized volatility of log returns
+    over vol_window (None: all returns so far), the price slope over
+    trend_window and the mean log return over return_window.
+
+    Args:
+        prices (np.ndarray): Prices, oldest first
+        vol_window (Optional[int]): Returns in the volatility window (None: expanding)
+        trend_window (int): Prices in the trend window
+        return_window (int): Returns in the average return window
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: MarketRegime values (None before enough history) and confidences
+    """
+    n = len(prices)
+    volatility = np.full(n, np.nan)
+    avg_return = np.full(n, np.nan)
+    if n >= 2:
+        returns = np.diff(np.log(prices))
+        volatility[1:] = rolling_volatility(returns, vol_window)
+        avg_return[1:] = pd.Series(returns).rolling(return_window, min_periods=1).mean().to_numpy()
+    return classify_regimes(volatility, rolling_slope(prices, trend_window), avg_return)
+
+
+def prediction_features(series: PriceSeries) -> np.ndarray:
+    """
+    Technical feature matrix for IL/fee prediction, one row per point.
+
+    Columns: price, volume, SMA5, SMA20, 5- and 20-period price standard deviation,
+    and price relative to each SMA. The 5-period statistics start at the sixth
+    point and the 20-period ones at the 21st; before that the SMA is the price and
+    the deviation is 0.
+    """
+    prices = series.prices
+    index = np.arange(len(prices))
+    columns = [prices, series.volumes]
+    smas, deviations = [], []
+    for window in (5, 20):
+        started = index >= window
+        smas.append(np.where(started, rolling_mean(prices, window), prices))
+        deviations.append(np.where(started, rolling_std(prices, window), 0.0))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = [np.where(sma > 0, prices / sma, 1.0) for sma in smas]
+
+    return np.column_stack(columns + smas + deviations + ratios)
@@ -28,6 +28,7 @@ except ImportError:
 
 from .price_updater import PriceUpdateService
 from .position_monitor import PositionMonitorService
+from .alert_service import get_alert_service
 from models.cl_position import CLPosition
 
 
@@ -61,12 +62,14 @@ class BackgroundTaskService:
     and other maintenance tasks with proper scheduling and error handling.
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, alert_service=None):
         """
         Initialize the background task service.
         
         Args:
             db_path (Optional[str]): Path to SQLite database file
+            alert_service: AlertService whose rules each monitoring sweep is evaluated
+                against (default: the global alert service)
         """
         self.db_path = db_path
         self.scheduler = None
@@ -81,6 +84,7 @@ class BackgroundTaskService:
         self.price_updater = PriceUpdateService(db_path)
         self.position_monitor = PositionMonitorService(db_path)
         self.position_model = CLPosition(db_path)
+        self.alert_service = alert_service or get_alert_service()
         
         # Load configuration
         try:
@@ -275,8 +279,7 @@ class BackgroundTaskService:
         """
         try:
             # Get active positions
-            positions = self.position_model.get_all_positions()
-            active_positions = [pos for pos in positions if pos.get('status') == 'active']
+            active_positions = self.position_model.get_positions(status='active')
             
             if not active_positions:
                 return {
@@ -288,9 +291,10 @@ class BackgroundTaskService:
             # Prepare position data with current prices
             positions_data = []
             for position in active_positions:
-                # Get latest price from price history
-                position_id = position.get('id')
-                latest_price = self.price_updater.price_history_model.get_latest_price(position_id)
+                # Get latest price from price history (recorded per token pair)
+                latest_price = self.price_updater.price_history_model.get_latest_price(
+                    position.get('pair_symbol', '')
+                )
                 
                 if latest_price:
                     positions_data.append({
@@ -306,6 +310,16 @@ class BackgroundTaskService:
             # Monitor positions
             results = self.position_monitor.monitor_all_positions(positions_data)
             
+            # Evaluate the whole sweep against the alert rules in one pass
+            try:
+                alert_ids = self.alert_service.evaluate_positions(
+                    self._alert_rule_payloads(positions_data, results.get('results', []))
+                )
+                results['rule_alerts_generated'] = len(alert_ids)
+            except Exception as e:
+                logger.error(f"Failed to evaluate alert rules: {str(e)}")
+                results['rule_alerts_error'] = str(e)
+            
             return results
             
         except Exception as e:
@@ -316,6 +330,36 @@ class BackgroundTaskService:
                 'alerts_generated': 0
             }
     
+    @staticmethod
+    def _alert_rule_payloads(positions_data: List[Dict[str, Any]],
+                             monitor_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Flatten a sweep's position data and monitoring metrics into alert rule payloads.
+        
+        Args:
+            positions_data (List[Dict[str, Any]]): Position data with prices, as monitored
+            monitor_results (List[Dict[str, Any]]): Per-position results from the monitor
+            
+        Returns:
+            List[Dict[str, Any]]: One payload per position, matched by rules on its fields
+        """
+        metrics = {result.get('position_id'): result for result in monitor_results}
+        payloads = []
+        for pos_data in positions_data:
+            position = pos_data.get('position', {})
+            result = metrics.get(position.get('id'), {})
+            # The monitor reports IL as a negative percentage; rules compare its magnitude
+            il_percent = result.get('impermanent_loss_percent')
+            payloads.append({
+                **position,
+                **pos_data.get('price_data', {}),
+                'current_price': pos_data.get('current_price'),
+                'impermanent_loss': abs(il_percent) if il_percent is not None else None,
+                'apr': result.get('fee_velocity_apr'),
+                'health_score': result.get('health_score')
+            })
+        return payloads
+    
     def cleanup_old_data_task(self) -> Dict[str, Any]:
         """
         Background task to clean up old data.
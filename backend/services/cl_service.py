@@ -7,7 +7,7 @@ for managing concentrated liquidity positions.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Iterator, Callable
 import uuid
 
 from models.cl_position import CLPosition
@@ -17,6 +17,73 @@ from models.cl_fee_history import CLFeeHistory
 logger = logging.getLogger(__name__)
 
 
+class PortfolioSummaryAccumulator:
+    """
+    Builds the portfolio summary one position at a time.
+    
+    Lets a streamed export compute the summary in the same pass that writes
+    the positions, instead of loading the portfolio a second time.
+    """
+    
+    def __init__(self, return_pct: Callable[[Dict[str, Any]], float]):
+        """
+        Args:
+            return_pct (Callable[[Dict[str, Any]], float]): Position return percentage calculation
+        """
+        self._return_pct = return_pct
+        self.total_positions = 0
+        self.active_positions = 0
+        self.closed_positions = 0
+        self.total_investment = 0
+        self.active_investment = 0
+        self.active_value = 0
+        self.total_fees_collected = 0
+        self._best: Optional[Tuple[float, str]] = None
+        self._worst: Optional[Tuple[float, str]] = None
+    
+    def add(self, position: Dict[str, Any]):
+        """Add an enriched position to the totals."""
+        self.total_positions += 1
+        self.total_investment += position['initial_investment']
+        self.total_fees_collected += position['fees_collected']
+        
+        if position['status'] == 'active':
+            self.active_positions += 1
+            self.active_investment += position['initial_investment']
+            self.active_value += position.get('current_value', position['initial_investment'])
+        elif position['status'] == 'closed':
+            self.closed_positions += 1
+        
+        # Ties keep the first best and the last worst position, as a stable sort would
+        return_pct = self._return_pct(position)
+        if self._best is None or return_pct > self._best[0]:
+            self._best = (return_pct, position['trade_name'])
+        if self._worst is None or return_pct <= self._worst[0]:
+            self._worst = (return_pct, position['trade_name'])
+    
+    def track(self, positions: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Pass positions through, adding each one to the totals."""
+        for position in positions:
+            self.add(position)
+            yield position
+    
+    def summary(self) -> Dict[str, Any]:
+        """Portfolio summary of the positions added so far."""
+        total_pnl = self.active_value - self.active_investment
+        return {
+            'total_positions': self.total_positions,
+            'active_positions': self.active_positions,
+            'closed_positions': self.closed_positions,
+            'total_investment': self.total_investment,
+            'current_value': self.active_value,
+            'total_fees_collected': self.total_fees_collected,
+            'total_pnl': total_pnl,
+            'total_return_pct': (total_pnl / self.active_investment * 100) if self.active_positions else 0,
+            'best_performing_position': self._best[1] if self._best else None,
+            'worst_performing_position': self._worst[1] if self._worst else None
+        }
+
+
 class CLService:
     """
     Service class for concentrated liquidity position management.
@@ -76,6 +143,52 @@ class CLService:
             logger.error(f"Error creating CL position: {str(e)}")
             raise
     
+    def bulk_create_positions(self, positions: List[Dict[str, Any]],
+                              allow_partial: bool = False) -> Dict[str, Any]:
+        """
+        Validate and create many CL positions in a single transaction.
+        
+        Every row is validated before anything is written. By default one
+        invalid row means nothing is imported; with allow_partial the valid
+        rows are imported and the invalid ones reported. Created positions
+        are not enriched with prices, which would cost a lookup per row.
+        
+        Args:
+            positions (List[Dict[str, Any]]): Position data for each position
+            allow_partial (bool): Import the valid rows even if some are invalid
+            
+        Returns:
+            Dict[str, Any]: Number imported, per-row results (index and position_id)
+                and per-row errors (index and error message)
+            
+        Raises:
+            Exception: If the insert fails (nothing is imported)
+        """
+        valid = []
+        errors = []
+        
+        for index, position_data in enumerate(positions):
+            try:
+                if not isinstance(position_data, dict):
+                    raise ValueError("Position must be an object")
+                position_data = self._auto_detect_token_addresses(position_data)
+                self._validate_position_data(position_data)
+                valid.append((index, position_data))
+            except Exception as e:
+                errors.append({'index': index, 'status': 'error', 'error': str(e)})
+        
+        if not valid or (errors and not allow_partial):
+            return {'imported': 0, 'results': [], 'errors': errors}
+        
+        position_ids = self.position_model.create_positions([position_data for _, position_data in valid])
+        results = [
+            {'index': index, 'status': 'success', 'position_id': position_id}
+            for (index, _), position_id in zip(valid, position_ids)
+        ]
+        
+        logger.info(f"Bulk created {len(results)} CL positions ({len(errors)} rejected)")
+        return {'imported': len(results), 'results': results, 'errors': errors}
+    
     def get_positions(self, status: Optional[str] = None, 
                      include_calculations: bool = True) -> List[Dict[str, Any]]:
         """
@@ -104,6 +217,39 @@ class CLService:
             logger.error(f"Error retrieving CL positions: {str(e)}")
             raise
     
+    def iter_positions(self, status: Optional[str] = None,
+                       include_calculations: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over CL positions, enriching each one as it is read.
+        
+        Args:
+            status (Optional[str]): Filter by status ('active' or 'closed')
+            include_calculations (bool): Whether to include calculated fields
+            
+        Yields:
+            Dict[str, Any]: Positions with optional calculations
+        """
+        for position in self.position_model.iter_positions(status=status):
+            yield self._enrich_position_data(position) if include_calculations else position
+    
+    def iter_price_history(self, status: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the price history of all positions, or of those with a status.
+        
+        Args:
+            status (Optional[str]): Only include positions with this status
+            
+        Yields:
+            Dict[str, Any]: Price history records, ordered by position then time
+        """
+        position_ids = None
+        if status:
+            position_ids = {p['id'] for p in self.position_model.iter_positions(status=status)}
+        
+        for record in self.price_history_model.iter_price_history():
+            if position_ids is None or record['position_id'] in position_ids:
+                yield record
+    
     def get_position_by_id(self, position_id: str, 
                           include_calculations: bool = True) -> Optional[Dict[str, Any]]:
         """
@@ -259,43 +405,11 @@ class CLService:
             Dict[str, Any]: Portfolio summary data
         """
         try:
-            all_positions = self.get_positions(include_calculations=True)
-            active_positions = [p for p in all_positions if p['status'] == 'active']
-            closed_positions = [p for p in all_positions if p['status'] == 'closed']
-            
-            # Calculate totals
-            total_investment = sum(p['initial_investment'] for p in all_positions)
-            total_current_value = sum(p.get('current_value', p['initial_investment']) for p in active_positions)
-            total_fees_collected = sum(p['fees_collected'] for p in all_positions)
-            
-            # Calculate performance metrics
-            total_pnl = total_current_value - sum(p['initial_investment'] for p in active_positions)
-            total_return_pct = (total_pnl / sum(p['initial_investment'] for p in active_positions) * 100) if active_positions else 0
-            
-            # Find best and worst performing positions
-            best_position = None
-            worst_position = None
-            
-            if all_positions:
-                positions_with_returns = [(p, self._calculate_position_return_pct(p)) for p in all_positions]
-                positions_with_returns.sort(key=lambda x: x[1], reverse=True)
-                
-                if positions_with_returns:
-                    best_position = positions_with_returns[0][0]['trade_name']
-                    worst_position = positions_with_returns[-1][0]['trade_name']
-            
-            summary = {
-                'total_positions': len(all_positions),
-                'active_positions': len(active_positions),
-                'closed_positions': len(closed_positions),
-                'total_investment': total_investment,
-                'current_value': total_current_value,
-                'total_fees_collected': total_fees_collected,
-                'total_pnl': total_pnl,
-                'total_return_pct': total_return_pct,
-                'best_performing_position': best_position,
-                'worst_performing_position': worst_position
-            }
+            totals = self.portfolio_summary_accumulator()
+            for position in self.iter_positions(include_calculations=True):
+                totals.add(position)
+            
+            summary = totals.summary()
             
             logger.debug(f"Generated portfolio summary: {summary}")
             return summary
@@ -304,6 +418,15 @@ class CLService:
             logger.error(f"Error generating portfolio summary: {str(e)}")
             raise
     
+    def portfolio_summary_accumulator(self) -> PortfolioSummaryAccumulator:
+        """
+        Create an accumulator that builds the portfolio summary from streamed positions.
+        
+        Returns:
+            PortfolioSummaryAccumulator: Empty accumulator using this service's return calculation
+        """
+        return PortfolioSummaryAccumulator(self._calculate_position_return_pct)
+    
     def _auto_detect_token_addresses(self, position_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Auto-detect token addresses for known pairs like LICKO/WHYPE.
@@ -360,7 +483,7 @@ class CLService:
                     logger.info("Auto-detected HYPE token1_address (default order, using HYPE for reliable pricing)")
         
         return data
-
+    
     def _validate_position_data(self, position_data: Dict[str, Any]) -> None:
         """
         Validate position data before creation.
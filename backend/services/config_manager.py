@@ -14,16 +14,25 @@ import logging
 import sqlite3
 import json
 import os
+import time
+import zlib
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Union
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Union, Mapping, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 from threading import Lock
 import uuid
-import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Rollout and A/B buckets are in basis points: 10000 buckets of 0.01%
+ROLLOUT_BUCKETS = 10000
+
+# Marks a snapshot entry as deleted when publishing changes
+_REMOVED = object()
+
 
 class Environment(Enum):
     """Environment enumeration."""
@@ -104,6 +113,118 @@ class SystemConfig:
     updated_at: datetime = None
 
 
+def _rollout_bucket(seed: int, user_id: str) -> int:
+    """Stable bucket in [0, ROLLOUT_BUCKETS) for a user, salted by a precomputed seed."""
+    return zlib.crc32(user_id.encode(), seed) % ROLLOUT_BUCKETS
+
+
+def _deserialize_value(value: str, value_type: str) -> Any:
+    """Deserialize a stored configuration value based on its type."""
+    if value_type == 'json':
+        return json.loads(value)
+    elif value_type == 'boolean':
+        return value.lower() == 'true'
+    elif value_type == 'number':
+        return float(value)
+    return value
+
+
+@dataclass(frozen=True)
+class CompiledFeatureFlag:
+    """Feature flag with targeting and rollout precomputed for one environment."""
+    flag: FeatureFlag
+    value: Any
+    target_users: frozenset
+    target_groups: frozenset
+    rollout_threshold: int
+    hash_seed: int
+    
+    @classmethod
+    def compile(cls, flag: FeatureFlag, environment: Environment) -> 'CompiledFeatureFlag':
+        env_value = flag.environment_values.get(environment.value)
+        return cls(
+            flag=flag,
+            value=env_value if env_value is not None else flag.default_value,
+            target_users=frozenset(flag.target_users or ()),
+            target_groups=frozenset(flag.target_groups or ()),
+            rollout_threshold=round(flag.rollout_percentage * ROLLOUT_BUCKETS / 100),
+            hash_seed=zlib.crc32(f"{flag.id}:".encode())
+        )
+    
+    def is_targeted(self, user_id: Optional[str], user_groups: Optional[List[str]]) -> bool:
+        """Check if a user is targeted (no targeting means every user)."""
+        if not self.target_users and not self.target_groups:
+            return True
+        if user_id in self.target_users:
+            return True
+        return bool(user_groups) and not self.target_groups.isdisjoint(user_groups)
+    
+    def in_rollout(self, user_id: Optional[str]) -> bool:
+        """Check if a user falls inside the rollout percentage."""
+        if self.rollout_threshold >= ROLLOUT_BUCKETS:
+            return True
+        if not user_id:
+            return False
+        return _rollout_bucket(self.hash_seed, user_id) < self.rollout_threshold
+
+
+@dataclass(frozen=True)
+class CompiledABTest:
+    """A/B test with its schedule and cumulative traffic buckets precomputed."""
+    test: ABTest
+    start: Optional[float]
+    end: Optional[float]
+    bucket_bounds: Tuple[int, ...]
+    variants: Tuple[str, ...]
+    hash_seed: int
+    
+    @classmethod
+    def compile(cls, test: ABTest) -> 'CompiledABTest':
+        bounds, cumulative_allocation = [], 0.0
+        for allocation in test.traffic_allocation.values():
+            cumulative_allocation += allocation
+            bounds.append(round(cumulative_allocation * ROLLOUT_BUCKETS))
+        return cls(
+            test=test,
+            start=test.start_date.timestamp() if test.start_date else None,
+            end=test.end_date.timestamp() if test.end_date else None,
+            bucket_bounds=tuple(bounds),
+            variants=tuple(test.traffic_allocation),
+            hash_seed=zlib.crc32(f"{test.id}:".encode())
+        )
+    
+    def variant_for(self, user_id: str, now: float) -> Optional[str]:
+        """Variant for a user, or None if the test is not running or the user is unallocated."""
+        if self.test.status != ABTestStatus.ACTIVE:
+            return None
+        if (self.start is not None and now < self.start) or (self.end is not None and now > self.end):
+            return None
+        index = bisect_right(self.bucket_bounds, _rollout_bucket(self.hash_seed, user_id))
+        return self.variants[index] if index < len(self.variants) else None
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    Immutable view of the feature flags, A/B tests and system configs.
+    
+    The manager swaps in a new snapshot whenever something changes, so a
+    reader holding one sees a consistent configuration without locking.
+    `key_versions` records the snapshot version in which each key
+    ('feature_flag:<name>', 'ab_test:<id>', 'system_config:<key>') last changed.
+    """
+    version: int
+    feature_flags: Mapping[str, CompiledFeatureFlag]
+    ab_tests: Mapping[str, CompiledABTest]
+    system_configs: Mapping[str, Any]
+    key_versions: Mapping[str, int]
+    expires_at: float
+    
+    def key_version(self, key: str) -> int:
+        """Version in which a key last changed (0 if it never did)."""
+        return self.key_versions.get(key, 0)
+
+
 class ConfigManager:
     """
     Comprehensive configuration management service.
@@ -129,14 +250,16 @@ class ConfigManager:
         # Determine environment
         self.environment = Environment(environment or os.getenv('ENVIRONMENT', 'development'))
         
-        # Configuration cache
-        self._config_cache: Dict[str, Any] = {}
-        self._feature_flags_cache: Dict[str, FeatureFlag] = {}
-        self._cache_expiry = datetime.now()
+        # Configuration snapshot (replaced, never mutated; reloaded after the TTL
+        # to pick up changes made by other processes)
+        self._snapshot_lock = Lock()
         self._cache_ttl = timedelta(minutes=5)
+        self._snapshot = ConfigSnapshot(0, MappingProxyType({}), MappingProxyType({}),
+                                        MappingProxyType({}), MappingProxyType({}), 0.0)
         
         # Initialize database
         self._ensure_database()
+        self._reload_snapshot()
         
         # Load default configurations
         self._load_default_configs()
@@ -375,8 +498,7 @@ class ConfigManager:
                     
                     conn.commit()
             
-            # Clear cache
-            self._clear_cache()
+            self._refresh_feature_flag(flag_id)
             
             # Log audit
             self._log_config_change('feature_flag', flag_id, 'create', None, asdict(flag))
@@ -402,32 +524,20 @@ class ConfigManager:
             Any: Feature flag value
         """
         try:
-            # Check cache first
-            if self._is_cache_valid() and flag_name in self._feature_flags_cache:
-                flag = self._feature_flags_cache[flag_name]
-            else:
-                flag = self._load_feature_flag(flag_name)
-                if not flag:
-                    return None
+            compiled = self._current_snapshot().feature_flags.get(flag_name)
+            if compiled is None:
+                return None
             
             # Check if flag is enabled
-            if not flag.enabled:
-                return flag.default_value
-            
-            # Check targeting
-            if not self._is_user_targeted(flag, user_id, user_groups):
-                return flag.default_value
+            if not compiled.flag.enabled:
+                return compiled.flag.default_value
             
-            # Check rollout percentage
-            if not self._is_user_in_rollout(flag, user_id):
-                return flag.default_value
+            # Check targeting and rollout percentage
+            if not compiled.is_targeted(user_id, user_groups) or not compiled.in_rollout(user_id):
+                return compiled.flag.default_value
             
-            # Get environment-specific value
-            env_value = flag.environment_values.get(self.environment.value)
-            if env_value is not None:
-                return env_value
-            
-            return flag.default_value
+            # Environment-specific value, resolved when the snapshot was built
+            return compiled.value
             
         except Exception as e:
             logger.error(f"Error getting feature flag {flag_name}: {str(e)}")
@@ -483,20 +593,20 @@ class ConfigManager:
                     query = f"UPDATE feature_flags SET {', '.join(set_clauses)} WHERE id = ?"
                     cursor.execute(query, params)
                     
-                    if cursor.rowcount > 0:
-                        conn.commit()
-                        
-                        # Clear cache
-                        self._clear_cache()
-                        
-                        # Log audit
-                        self._log_config_change('feature_flag', flag_id, 'update', asdict(old_flag), updates)
-                        
-                        logger.info(f"Updated feature flag: {flag_id}")
-                        return True
-                    else:
+                    if cursor.rowcount == 0:
                         return False
-                        
+                    
+                    conn.commit()
+            
+            # Outside db_lock: the audit log takes it again
+            self._refresh_feature_flag(flag_id)
+            
+            # Log audit
+            self._log_config_change('feature_flag', flag_id, 'update', asdict(old_flag), updates)
+            
+            logger.info(f"Updated feature flag: {flag_id}")
+            return True
+            
         except Exception as e:
             logger.error(f"Error updating feature flag {flag_id}: {str(e)}")
             raise
@@ -550,6 +660,8 @@ class ConfigManager:
                     
                     conn.commit()
             
+            self._refresh_ab_test(test_id)
+            
             logger.info(f"Created A/B test: {ab_test.name}")
             return test_id
             
@@ -569,29 +681,12 @@ class ConfigManager:
             Optional[str]: Variant name or None
         """
         try:
-            # Load A/B test
-            ab_test = self._load_ab_test(test_id)
-            if not ab_test or ab_test.status != ABTestStatus.ACTIVE:
-                return None
-            
-            # Check if test is active
-            now = datetime.now()
-            if ab_test.start_date and now < ab_test.start_date:
-                return None
-            if ab_test.end_date and now > ab_test.end_date:
+            compiled = self._current_snapshot().ab_tests.get(test_id)
+            if compiled is None:
                 return None
             
-            # Determine variant based on user hash
-            user_hash = hashlib.md5(f"{test_id}:{user_id}".encode()).hexdigest()
-            hash_value = int(user_hash[:8], 16) / 0xffffffff  # Normalize to 0-1
-            
-            cumulative_allocation = 0.0
-            for variant, allocation in ab_test.traffic_allocation.items():
-                cumulative_allocation += allocation
-                if hash_value <= cumulative_allocation:
-                    return variant
-            
-            return None
+            # Status, schedule and the user's traffic bucket
+            return compiled.variant_for(user_id, time.time())
             
         except Exception as e:
             logger.error(f"Error getting A/B test variant: {str(e)}")
@@ -698,30 +793,8 @@ class ConfigManager:
             Any: Configuration value or default
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT config_value, config_type
-                    FROM system_configs
-                    WHERE config_key = ? AND environment = ?
-                ''', (config_key, self.environment.value))
-                
-                row = cursor.fetchone()
-                if not row:
-                    return default_value
-                
-                # Deserialize value based on type
-                if row['config_type'] == 'json':
-                    return json.loads(row['config_value'])
-                elif row['config_type'] == 'boolean':
-                    return row['config_value'].lower() == 'true'
-                elif row['config_type'] == 'number':
-                    return float(row['config_value'])
-                else:
-                    return row['config_value']
-                    
+            return self._current_snapshot().system_configs.get(config_key, default_value)
+        
         except Exception as e:
             logger.error(f"Error getting system config: {str(e)}")
             return default_value
@@ -788,6 +861,9 @@ class ConfigManager:
                     
                     conn.commit()
             
+            if config.environment == self.environment:
+                self._refresh_system_config(config.config_key)
+            
             return True
             
         except Exception as e:
@@ -807,25 +883,7 @@ class ConfigManager:
                 if not row:
                     return None
                 
-                flag = FeatureFlag(
-                    id=row['id'],
-                    name=row['name'],
-                    description=row['description'],
-                    flag_type=FeatureFlagType(row['flag_type']),
-                    default_value=json.loads(row['default_value']),
-                    environment_values=json.loads(row['environment_values']) if row['environment_values'] else {},
-                    enabled=bool(row['enabled']),
-                    rollout_percentage=row['rollout_percentage'],
-                    target_users=json.loads(row['target_users']) if row['target_users'] else [],
-                    target_groups=json.loads(row['target_groups']) if row['target_groups'] else [],
-                    created_at=datetime.fromtimestamp(row['created_at']),
-                    updated_at=datetime.fromtimestamp(row['updated_at'])
-                )
-                
-                # Cache the flag
-                self._feature_flags_cache[flag_name] = flag
-                
-                return flag
+                return self._feature_flag_from_row(row)
                 
         except Exception as e:
             logger.error(f"Error loading feature flag {flag_name}: {str(e)}")
@@ -844,20 +902,7 @@ class ConfigManager:
                 if not row:
                     return None
                 
-                return FeatureFlag(
-                    id=row['id'],
-                    name=row['name'],
-                    description=row['description'],
-                    flag_type=FeatureFlagType(row['flag_type']),
-                    default_value=json.loads(row['default_value']),
-                    environment_values=json.loads(row['environment_values']) if row['environment_values'] else {},
-                    enabled=bool(row['enabled']),
-                    rollout_percentage=row['rollout_percentage'],
-                    target_users=json.loads(row['target_users']) if row['target_users'] else [],
-                    target_groups=json.loads(row['target_groups']) if row['target_groups'] else [],
-                    created_at=datetime.fromtimestamp(row['created_at']),
-                    updated_at=datetime.fromtimestamp(row['updated_at'])
-                )
+                return self._feature_flag_from_row(row)
                 
         except Exception as e:
             logger.error(f"Error loading feature flag by ID {flag_id}: {str(e)}")
@@ -876,67 +921,194 @@ class ConfigManager:
                 if not row:
                     return None
                 
-                return ABTest(
-                    id=row['id'],
-                    name=row['name'],
-                    description=row['description'],
-                    feature_flag_id=row['feature_flag_id'],
-                    variants=json.loads(row['variants']),
-                    traffic_allocation=json.loads(row['traffic_allocation']),
-                    status=ABTestStatus(row['status']),
-                    start_date=datetime.fromtimestamp(row['start_date']) if row['start_date'] else None,
-                    end_date=datetime.fromtimestamp(row['end_date']) if row['end_date'] else None,
-                    success_metrics=json.loads(row['success_metrics']) if row['success_metrics'] else [],
-                    results=json.loads(row['results']) if row['results'] else None,
-                    created_at=datetime.fromtimestamp(row['created_at'])
-                )
+                return self._ab_test_from_row(row)
                 
         except Exception as e:
             logger.error(f"Error loading A/B test {test_id}: {str(e)}")
             return None
     
-    def _is_user_targeted(self, flag: FeatureFlag, user_id: Optional[str],
-                         user_groups: Optional[List[str]]) -> bool:
-        """Check if user is targeted by feature flag."""
-        # If no targeting is specified, target all users
-        if not flag.target_users and not flag.target_groups:
-            return True
+    @staticmethod
+    def _feature_flag_from_row(row: sqlite3.Row) -> FeatureFlag:
+        """Build a FeatureFlag from a feature_flags row."""
+        return FeatureFlag(
+                id=row['id'],
+                name=row['name'],
+                description=row['description'],
+                flag_type=FeatureFlagType(row['flag_type']),
+                default_value=json.loads(row['default_value']),
+                environment_values=json.loads(row['environment_values']) if row['environment_values'] else {},
+                enabled=bool(row['enabled']),
+                rollout_percentage=row['rollout_percentage'],
+                target_users=json.loads(row['target_users']) if row['target_users'] else [],
+                target_groups=json.loads(row['target_groups']) if row['target_groups'] else [],
+                created_at=datetime.fromtimestamp(row['created_at']),
+                updated_at=datetime.fromtimestamp(row['updated_at'])
+            )
+    
+    @staticmethod
+    def _ab_test_from_row(row: sqlite3.Row) -> ABTest:
+        """Build an ABTest from an ab_tests row."""
+        return ABTest(
+                id=row['id'],
+                name=row['name'],
+                description=row['description'],
+                feature_flag_id=row['feature_flag_id'],
+                variants=json.loads(row['variants']),
+                traffic_allocation=json.loads(row['traffic_allocation']),
+                status=ABTestStatus(row['status']),
+                start_date=datetime.fromtimestamp(row['start_date']) if row['start_date'] else None,
+                end_date=datetime.fromtimestamp(row['end_date']) if row['end_date'] else None,
+                success_metrics=json.loads(row['success_metrics']) if row['success_metrics'] else [],
+                results=json.loads(row['results']) if row['results'] else None,
+                created_at=datetime.fromtimestamp(row['created_at'])
+            )
+    
+    def get_snapshot(self) -> ConfigSnapshot:
+        """
+        Get the current configuration snapshot.
         
-        # Check user targeting
-        if flag.target_users and user_id and user_id in flag.target_users:
-            return True
+        Returns:
+            ConfigSnapshot: Immutable flags, A/B tests and system configs
+        """
+        return self._current_snapshot()
+    
+    def get_config_version(self, key: Optional[str] = None) -> int:
+        """
+        Get the configuration version, overall or for one key.
         
-        # Check group targeting
-        if flag.target_groups and user_groups:
-            for group in user_groups:
-                if group in flag.target_groups:
-                    return True
+        Args:
+            key (Optional[str]): 'feature_flag:<name>', 'ab_test:<id>' or
+                'system_config:<key>'; None for the snapshot version
         
-        return False
+        Returns:
+            int: Version, which increases whenever the configuration (or key) changes
+        """
+        snapshot = self._current_snapshot()
+        return snapshot.version if key is None else snapshot.key_version(key)
     
-    def _is_user_in_rollout(self, flag: FeatureFlag, user_id: Optional[str]) -> bool:
-        """Check if user is in rollout percentage."""
-        if flag.rollout_percentage >= 100.0:
-            return True
-        
-        if not user_id:
-            return False
+    def _current_snapshot(self) -> ConfigSnapshot:
+        """Current snapshot; one reader reloads it after the TTL while the others keep reading."""
+        snapshot = self._snapshot
+        if time.monotonic() >= snapshot.expires_at and self._snapshot_lock.acquire(blocking=False):
+            try:
+                if self._snapshot is snapshot:
+                    self._reload_snapshot_locked()
+            finally:
+                self._snapshot_lock.release()
+            snapshot = self._snapshot
+        return snapshot
+    
+    def _reload_snapshot(self):
+        """Rebuild the snapshot from the database."""
+        with self._snapshot_lock:
+            self._reload_snapshot_locked()
+    
+    def _reload_snapshot_locked(self):
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                
+                cursor.execute('SELECT * FROM feature_flags')
+                feature_flags = {row['name']: CompiledFeatureFlag.compile(self._feature_flag_from_row(row),
+                                                                          self.environment)
+                                 for row in cursor.fetchall()}
+                
+                cursor.execute('SELECT * FROM ab_tests')
+                ab_tests = {row['id']: CompiledABTest.compile(self._ab_test_from_row(row))
+                            for row in cursor.fetchall()}
+                
+                cursor.execute('''
+                    SELECT config_key, config_value, config_type
+                    FROM system_configs
+                    WHERE environment = ?
+                ''', (self.environment.value,))
+                system_configs = {row['config_key']: _deserialize_value(row['config_value'], row['config_type'])
+                                  for row in cursor.fetchall()}
         
-        # Use consistent hash for rollout
-        user_hash = hashlib.md5(f"{flag.id}:{user_id}".encode()).hexdigest()
-        hash_value = int(user_hash[:8], 16) / 0xffffffff * 100  # Normalize to 0-100
+        except Exception as e:
+            # Keep serving the previous snapshot and retry after the TTL
+            logger.error(f"Error loading configuration snapshot: {str(e)}")
+            self._publish(self._snapshot, {}, {}, {})
+            return
         
-        return hash_value <= flag.rollout_percentage
+        current = self._snapshot
+        self._publish(
+            current,
+            self._changes(current.feature_flags, feature_flags),
+            self._changes(current.ab_tests, ab_tests),
+            self._changes(current.system_configs, system_configs)
+        )
     
-    def _is_cache_valid(self) -> bool:
-        """Check if cache is still valid."""
-        return datetime.now() < self._cache_expiry
+    @staticmethod
+    def _changes(current: Mapping[str, Any], loaded: Dict[str, Any]) -> Dict[str, Any]:
+        """Entries that differ between the snapshot and freshly loaded rows (_REMOVED: removed)."""
+        changes = {key: value for key, value in loaded.items() if current.get(key) != value}
+        changes.update({key: _REMOVED for key in current.keys() - loaded.keys()})
+        return changes
     
-    def _clear_cache(self):
-        """Clear configuration cache."""
-        self._config_cache.clear()
-        self._feature_flags_cache.clear()
-        self._cache_expiry = datetime.now() + self._cache_ttl
+    def _refresh_feature_flag(self, flag_id: str):
+        """Reload one feature flag into a new snapshot (handles renames)."""
+        with self._snapshot_lock:
+            flag = self._load_feature_flag_by_id(flag_id)
+            current = self._snapshot
+            changes = {name: _REMOVED for name, compiled in current.feature_flags.items() if compiled.flag.id == flag_id}
+            if flag:
+                changes[flag.name] = CompiledFeatureFlag.compile(flag, self.environment)
+            self._publish(current, changes, {}, {})
+    
+    def _refresh_ab_test(self, test_id: str):
+        """Reload one A/B test into a new snapshot."""
+        with self._snapshot_lock:
+            ab_test = self._load_ab_test(test_id)
+            self._publish(self._snapshot, {}, {test_id: CompiledABTest.compile(ab_test) if ab_test else _REMOVED}, {})
+    
+    def _refresh_system_config(self, config_key: str):
+        """Reload one system config into a new snapshot."""
+        with self._snapshot_lock:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT config_value, config_type
+                    FROM system_configs
+                    WHERE config_key = ? AND environment = ?
+                ''', (config_key, self.environment.value)).fetchone()
+            self._publish(self._snapshot, {}, {}, {config_key: _deserialize_value(*row) if row else _REMOVED})
+    
+    def _publish(self, current: ConfigSnapshot, feature_flags: Dict[str, Any],
+                 ab_tests: Dict[str, Any], system_configs: Dict[str, Any]):
+        """
+        Swap in a snapshot with the given entries replaced (_REMOVED drops an entry).
+        
+        Must be called with the snapshot lock held. Only the changed keys get
+        the new version; everything else is shared with the current snapshot.
+        """
+        version = current.version + 1
+        key_versions = dict(current.key_versions)
+        sections = []
+        for kind, entries, changes in (('feature_flag', current.feature_flags, feature_flags),
+                                       ('ab_test', current.ab_tests, ab_tests),
+                                       ('system_config', current.system_configs, system_configs)):
+            if not changes:
+                sections.append(entries)
+                continue
+            updated = dict(entries)
+            for key, value in changes.items():
+                if value is _REMOVED:
+                    updated.pop(key, None)
+                else:
+                    updated[key] = value
+                key_versions[f"{kind}:{key}"] = version
+            sections.append(MappingProxyType(updated))
+        
+        changed = bool(feature_flags or ab_tests or system_configs)
+        self._snapshot = ConfigSnapshot(
+            version=version if changed else current.version,
+            feature_flags=sections[0],
+            ab_tests=sections[1],
+            system_configs=sections[2],
+            key_versions=MappingProxyType(key_versions) if changed else current.key_versions,
+            expires_at=time.monotonic() + self._cache_ttl.total_seconds()
+        )
     
     def _log_config_change(self, config_type: str, config_id: str, action: str,
                           old_value: Any, new_value: Any, changed_by: str = 'system'):
@@ -0,0 +1,236 @@
+"""
+Return Correlation Engine for CL Positions
+
+This module computes how CL positions move together from their recorded
+price history:
+- Aligns every position's prices from cl_price_history onto a common time grid
+- Computes the full return correlation and covariance matrices with matrix products
+- Caches results per position set until the underlying history changes
+
+Each position's prices are bucketed to the grid (last price per bucket) and
+carried forward between observations, but not before its first or after its
+last observation. Pairs are compared over the periods both positions have
+returns for, so positions with shorter histories don't truncate everyone else.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOLUTION = 3600            # seconds per grid period
+DEFAULT_LOOKBACK = 30 * 24 * 3600    # seconds of history before the latest price
+DEFAULT_MIN_PERIODS = 10             # overlapping returns needed for a pair
+SECONDS_PER_YEAR = 365 * 24 * 3600   # crypto markets trade around the clock
+CACHE_SIZE = 64
+
+
+@dataclass
+class CorrelationResult:
+    """Return correlation and covariance of a set of positions."""
+    position_ids: List[str]
+    correlation: np.ndarray     # (n, n), NaN where a pair has too little overlap
+    covariance: np.ndarray      # (n, n) per-period return covariance, NaN likewise
+    observations: np.ndarray    # (n, n) overlapping return periods per pair
+    resolution: int
+    grid_start: Optional[int]
+    grid_end: Optional[int]
+    watermark: Tuple[int, int, int]
+    
+    def annualized_covariance(self) -> np.ndarray:
+        """Return covariance scaled from grid periods to a year."""
+        return self.covariance * (SECONDS_PER_YEAR / self.resolution)
+    
+    @property
+    def volatility(self) -> np.ndarray:
+        """Annualized return volatility of each position (NaN without enough history)."""
+        return np.sqrt(np.diag(self.annualized_covariance()))
+    
+    def correlation_dict(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Correlation matrix as nested dicts keyed by position ID (None where unknown)."""
+        values = np.where(np.isnan(self.correlation), None, self.correlation).tolist()
+        return {position_id: dict(zip(self.position_ids, row))
+                for position_id, row in zip(self.position_ids, values)}
+
+
+class CorrelationEngine:
+    """
+    Computes and caches return correlations between CL positions.
+    
+    Results are cached per (position set, resolution, lookback) and reused
+    until the price history watermark of those positions changes.
+    """
+    
+    def __init__(self, price_history=None, resolution: int = DEFAULT_RESOLUTION,
+                 lookback: int = DEFAULT_LOOKBACK, min_periods: int = DEFAULT_MIN_PERIODS):
+        """
+        Initialize the correlation engine.
+        
+        Args:
+            price_history (Optional[CLPriceHistory]): Price history model (default database if omitted)
+            resolution (int): Grid period in seconds
+            lookback (int): Seconds of history before the latest price to use
+            min_periods (int): Overlapping return periods required for a pair
+        """
+        self._price_history = price_history
+        self.resolution = resolution
+        self.lookback = lookback
+        self.min_periods = min_periods
+        self._cache: 'OrderedDict[Tuple, CorrelationResult]' = OrderedDict()
+        self._cache_lock = Lock()
+    
+    @property
+    def price_history(self):
+        """Price history model, created on first use."""
+        if self._price_history is None:
+            from models.cl_price_history import CLPriceHistory
+            self._price_history = CLPriceHistory()
+        return self._price_history
+    
+    def compute(self, position_ids: List[str], resolution: Optional[int] = None,
+                lookback: Optional[int] = None) -> CorrelationResult:
+        """
+        Get the return correlation of positions, from cache if their history is unchanged.
+        
+        Args:
+            position_ids (List[str]): Positions to correlate (duplicates are ignored)
+            resolution (Optional[int]): Grid period in seconds (engine default if omitted)
+            lookback (Optional[int]): Seconds of history to use (engine default if omitted)
+        
+        Returns:
+            CorrelationResult: Correlation and covariance in the order of position_ids
+        """
+        position_ids = list(dict.fromkeys(position_ids))
+        resolution = resolution or self.resolution
+        lookback = lookback or self.lookback
+        key = (tuple(position_ids), resolution, lookback)
+        
+        watermark = self.price_history.get_history_watermark(position_ids)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached.watermark == watermark:
+                self._cache.move_to_end(key)
+                return cached
+        
+        result = self._calculate(position_ids, resolution, lookback, watermark)
+        
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        
+        return result
+    
+    def clear_cache(self):
+        """Drop all cached results."""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def _calculate(self, position_ids: List[str], resolution: int, lookback: int,
+                   watermark: Tuple[int, int, int]) -> CorrelationResult:
+        """Load the positions' history and correlate their returns."""
+        n = len(position_ids)
+        latest = watermark[2]
+        if not watermark[0]:
+            empty = np.full((n, n), np.nan)
+            return CorrelationResult(position_ids, empty, empty.copy(), np.zeros((n, n), dtype=np.int64),
+                                     resolution, None, None, watermark)
+        
+        grid_start = (latest - lookback) // resolution * resolution
+        codes, timestamps, prices = self.price_history.get_position_price_arrays(
+            position_ids, start_time=grid_start, end_time=latest
+        )
+        grid = align_prices(codes, timestamps, prices, n, grid_start, latest, resolution)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(np.log(grid), axis=0)
+        correlation, covariance, observations = pairwise_correlation(returns, self.min_periods)
+        
+        logger.debug(f"Correlated {n} positions over {len(grid)} periods of {resolution}s")
+        return CorrelationResult(position_ids, correlation, covariance, observations,
+                                 resolution, grid_start, latest, watermark)
+
+
+def align_prices(codes: np.ndarray, timestamps: np.ndarray, prices: np.ndarray, n: int,
+                 grid_start: int, grid_end: int, resolution: int) -> np.ndarray:
+    """
+    Place price observations on a (periods, positions) grid.
+
+    Each cell holds the last price observed in that period, carried forward
+    to later periods up to the position's last observation; cells before the
+    first or after the last observation are NaN.
+
+    Args:
+        codes (np.ndarray): Column of each observation, sorted by column then time
+        timestamps (np.ndarray): Epoch seconds of each observation
+        prices (np.ndarray): Observed prices
+        n (int): Number of columns
+        grid_start (int): Epoch seconds of the first period
+        grid_end (int): Epoch seconds inside the last period
+        resolution (int): Seconds per period
+
+    Returns:
+        np.ndarray: Aligned float64 prices
+    """
+    periods = (grid_end - grid_start) // resolution + 1
+    grid = np.full((periods, n), np.nan)
+    if len(prices) == 0:
+        return grid
+
+    buckets = (timestamps - grid_start) // resolution
+    last_in_bucket = np.ones(len(prices), dtype=bool)
+    last_in_bucket[:-1] = (codes[1:] != codes[:-1]) | (buckets[1:] != buckets[:-1])
+    grid[buckets[last_in_bucket], codes[last_in_bucket]] = prices[last_in_bucket]
+
+    # Forward fill: index of the latest observed row at or before each row
+    observed = ~np.isnan(grid)
+    rows = np.arange(periods)[:, None]
+    source = np.maximum.accumulate(np.where(observed, rows, 0), axis=0)
+    filled = grid[source, np.arange(n)]
+
+    last_observed = np.where(observed.any(axis=0), periods - 1 - np.argmax(observed[::-1], axis=0), -1)
+    filled[rows > last_observed] = np.nan
+    return filled
+
+
+def pairwise_correlation(returns: np.ndarray, min_periods: int = DEFAULT_MIN_PERIODS
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pairwise-complete correlation and covariance of return columns.
+
+    Every statistic is taken over the periods both columns have returns for,
+    using masked matrix products instead of a loop over pairs.
+
+    Args:
+        returns (np.ndarray): (periods, columns) returns with NaN where missing
+        min_periods (int): Overlapping periods required for a pair
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Correlation, sample covariance and overlap counts
+    """
+    present = ~np.isnan(returns)
+    mask = present.astype(np.float64)
+    values = np.where(present, returns, 0.0)
+
+    counts = mask.T @ mask
+    sums = values.T @ mask               # sums[i, j]: sum of column i where j is also present
+    squares = (values * values).T @ mask
+    cross = values.T @ values
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = (cross - sums * sums.T / counts) / (counts - 1)
+        variance = (squares - sums * sums / counts) / (counts - 1)
+        variance = np.maximum(variance, 0.0)
+        correlation = covariance / np.sqrt(variance * variance.T)
+
+    insufficient = (counts < max(min_periods, 2)) | ~np.isfinite(correlation)
+    correlation = np.clip(correlation, -1.0, 1.0)
+    correlation[insufficient] = np.nan
+    covariance[counts < max(min_periods, 2)] = np.nan
+    return correlation, covariance, counts.astype(np.int64)
@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 import json
 from threading import Lock
 
+from services.http_session_pool import get_http_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -165,7 +167,7 @@ class DexScreenerService:
         
         try:
             logger.debug(f"Making request to: {url} with params: {params}")
-            response = requests.get(url, params=params, timeout=30)
+            response = get_http_pool().get(url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
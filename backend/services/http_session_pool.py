@@ -0,0 +1,323 @@
+"""
+HTTP Session Pool
+
+This module provides a shared keep-alive HTTP client for synchronous outbound calls
+(Hyperliquid, AlphaVantage, Claude, webhooks). Requests reuse pooled connections per
+host instead of doing a fresh TCP+TLS handshake on every call, retry transient failures
+with jittered exponential backoff and record connect/TTFB timings per request.
+"""
+
+import os
+import time
+import random
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from functools import partial
+from typing import Dict, Any, Optional, Callable, List
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504, 529})
+
+# Connect timings for the request currently running on this thread
+_timing_local = threading.local()
+
+
+def _record_connect(started: float):
+    _timing_local.connect_ms = getattr(_timing_local, 'connect_ms', 0.0) + (time.perf_counter() - started) * 1000
+    _timing_local.new_connections = getattr(_timing_local, 'new_connections', 0) + 1
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """HTTP connection that records how long opening it took (DNS + TCP connect)."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """HTTPS connection that records how long opening it took (DNS + TCP connect + TLS handshake)."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _record_connect(started)
+
+
+class PoolTimeout(requests.exceptions.Timeout):
+    """No pooled connection to the host became free within the pool timeout."""
+
+
+class _PoolTimeoutMixin:
+    """Bounds the wait for a free connection when the pool blocks (requests never passes one)."""
+
+    def __init__(self, *args, pool_timeout: Optional[float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_timeout = pool_timeout
+
+    def _get_conn(self, timeout=None):
+        return super()._get_conn(timeout=self.pool_timeout if timeout is None else timeout)
+
+
+class TimedHTTPConnectionPool(_PoolTimeoutMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(_PoolTimeoutMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Transport adapter whose connection pools use the timed connection classes."""
+
+    def __init__(self, *args, pool_timeout: Optional[float] = None, **kwargs):
+        # Set before super().__init__, which builds the pool manager
+        self.pool_timeout = pool_timeout
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # Assign a new dict; the default one is shared module state in urllib3
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': partial(TimedHTTPConnectionPool, pool_timeout=self.pool_timeout),
+            'https': partial(TimedHTTPSConnectionPool, pool_timeout=self.pool_timeout)
+        }
+
+    def send(self, request, *args, **kwargs):
+        try:
+            return super().send(request, *args, **kwargs)
+        except EmptyPoolError as e:
+            raise PoolTimeout(e, request=request)
+
+
+class HTTPSessionPool:
+    """
+    Thread-safe keep-alive HTTP client shared by all synchronous outbound callers.
+
+    One requests.Session is shared across threads. Its connection pools are capped per
+    host and block when all connections to a host are busy, so concurrent callers queue
+    for a warm connection instead of opening extra ones. The wait is bounded by
+    pool_timeout, after which the request fails with PoolTimeout.
+    """
+
+    def __init__(self, max_per_host: Optional[int] = None, max_hosts: int = 20,
+                 max_retries: Optional[int] = None, backoff_factor: float = 0.5,
+                 backoff_max: float = 10.0, default_timeout: float = 30,
+                 pool_timeout: Optional[float] = None):
+        """
+        Initialize the session pool.
+
+        Args:
+            max_per_host: Connections kept open per host (default HTTP_POOL_MAX_PER_HOST or 10)
+            max_hosts: Number of per-host connection pools to keep
+            max_retries: Default retries for failed requests (default HTTP_MAX_RETRIES or 2)
+            backoff_factor: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound for a single backoff delay in seconds
+            default_timeout: Timeout used when a caller does not pass one
+            pool_timeout: Seconds to wait for a free connection to a busy host
+                (default HTTP_POOL_TIMEOUT or 30)
+        """
+        self.max_per_host = max_per_host or int(os.getenv('HTTP_POOL_MAX_PER_HOST', '10'))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('HTTP_MAX_RETRIES', '2'))
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.default_timeout = default_timeout
+        self.pool_timeout = pool_timeout if pool_timeout is not None else float(os.getenv('HTTP_POOL_TIMEOUT', '30'))
+
+        self.session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_connections=max_hosts, pool_maxsize=self.max_per_host,
+                                   pool_block=True, max_retries=0, pool_timeout=self.pool_timeout)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'User-Agent': 'TradingStatsDashboard/1.0'})
+
+        self._timing_hooks: List[Callable[[Dict[str, Any]], None]] = []
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._stats_lock = threading.Lock()
+
+    def add_timing_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback that receives the timings of every completed request.
+
+        Args:
+            hook: Called with a dict of method, host, status, attempts, new_connections,
+                connect_ms, ttfb_ms and total_ms
+        """
+        self._timing_hooks.append(hook)
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Jittered exponential backoff delay, honouring a numeric Retry-After header."""
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(self.backoff_max, float(retry_after)))
+        return delay
+
+    def request(self, method: str, url: str, retries: Optional[int] = None,
+                before_request: Optional[Callable[[], None]] = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared session.
+
+        Connection errors and RETRY_STATUSES responses are retried with jittered
+        backoff. Read timeouts are not retried since the server may have acted on
+        the request, nor are pool timeouts, since the host is already saturated.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            retries: Retries after the first attempt (default max_retries)
+            before_request: Called before every attempt (e.g. a caller's rate limiter)
+            **kwargs: Passed to requests.Session.request
+
+        Returns:
+            requests.Response: The final response, with a `timings` dict attached
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt fails to get a response
+        """
+        retries = self.max_retries if retries is None else retries
+        kwargs.setdefault('timeout', self.default_timeout)
+        host = urlsplit(url).netloc
+
+        started = time.perf_counter()
+        _timing_local.connect_ms = 0.0
+        _timing_local.new_connections = 0
+        response = None
+        error = None
+        attempt = 0
+
+        while True:
+            if before_request:
+                before_request()
+            try:
+                response = self.session.request(method, url, **kwargs)
+                error = None
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    break
+                logger.warning(f"{method} {host} returned {response.status_code} (attempt {attempt + 1}), retrying")
+            except requests.exceptions.ConnectionError as e:
+                response = None
+                error = e
+                if attempt >= retries:
+                    break
+                logger.warning(f"{method} {host} connection failed (attempt {attempt + 1}): {e}")
+
+            time.sleep(self._backoff(attempt, response))
+            attempt += 1
+
+        total_ms = (time.perf_counter() - started) * 1000
+        connect_ms = _timing_local.connect_ms
+        timings = {
+            'method': method.upper(),
+            'host': host,
+            'status': response.status_code if error is None else None,
+            'attempts': attempt + 1,
+            'new_connections': _timing_local.new_connections,
+            'connect_ms': round(connect_ms, 2),
+            'ttfb_ms': round(max(0.0, response.elapsed.total_seconds() * 1000 - connect_ms), 2)
+            if error is None else None,
+            'total_ms': round(total_ms, 2)
+        }
+        self._record(timings)
+
+        if error is not None:
+            raise error
+
+        response.timings = timings
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request through the shared session."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request through the shared session."""
+        return self.request('POST', url, **kwargs)
+
+    def _record(self, timings: Dict[str, Any]):
+        with self._stats_lock:
+            stats = self._stats[timings['host']]
+            stats['requests'] += 1
+            stats['retries'] += timings['attempts'] - 1
+            stats['new_connections'] += timings['new_connections']
+            stats['connect_ms'] += timings['connect_ms']
+            stats['total_ms'] += timings['total_ms']
+            if timings['status'] is None:
+                stats['errors'] += 1
+            else:
+                stats['ttfb_ms'] += timings['ttfb_ms']
+
+        for hook in self._timing_hooks:
+            try:
+                hook(timings)
+            except Exception as e:
+                logger.error(f"Error in HTTP timing hook: {e}")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-host request statistics.
+
+        Returns:
+            Dict mapping host to request/retry/connection counts and average timings
+        """
+        with self._stats_lock:
+            result = {}
+            for host, stats in self._stats.items():
+                requests_count = int(stats['requests'])
+                responses = requests_count - int(stats['errors'])
+                result[host] = {
+                    'requests': requests_count,
+                    'errors': int(stats['errors']),
+                    'retries': int(stats['retries']),
+                    'new_connections': int(stats['new_connections']),
+                    'avg_connect_ms': round(stats['connect_ms'] / requests_count, 2),
+                    'avg_ttfb_ms': round(stats['ttfb_ms'] / responses, 2) if responses else None,
+                    'avg_total_ms': round(stats['total_ms'] / requests_count, 2)
+                }
+            return result
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+
+# Global pool instance
+_http_pool = None
+_http_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HTTPSessionPool:
+    """Get the global HTTP session pool"""
+    global _http_pool
+    if _http_pool is None:
+        with _http_pool_lock:
+            if _http_pool is None:
+                _http_pool = HTTPSessionPool()
+    return _http_pool
+
+
+def cleanup_http_pool():
+    """Cleanup function to close pooled connections on exit"""
+    if _http_pool is not None:
+        _http_pool.close()
+
+
+atexit.register(cleanup_http_pool)
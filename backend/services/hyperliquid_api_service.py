@@ -19,6 +19,8 @@ import hmac
 from eth_account import Account
 from eth_account.messages import encode_defunct
 
+from services.http_session_pool import get_http_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,11 +75,11 @@ class HyperliquidAPIService:
         """
         self.config = config
         self.rate_limiter = RateLimiter(config.rate_limit_requests_per_second)
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.http = get_http_pool()
+        self.headers = {
             'Content-Type': 'application/json',
             'User-Agent': 'TradingStatsDashboard/1.0'
-        })
+        }
         
         # Initialize account for signing if private key is provided
         self.account = None
@@ -103,7 +105,7 @@ class HyperliquidAPIService:
             Dict[str, Any]: API response
             
         Raises:
-            Exception: If request fails after all retries
+            requests.exceptions.RequestException: If request fails after all retries
         """
         if retries is None:
             retries = self.config.max_retries
@@ -114,39 +116,32 @@ class HyperliquidAPIService:
         if signed and self.account:
             data = self._sign_request(data)
         
-        for attempt in range(retries + 1):
-            try:
-                self.rate_limiter.wait_if_needed()
-                
-                logger.debug(f"Making request to {url} (attempt {attempt + 1})")
-                
-                response = self.session.post(
-                    url,
-                    json=data,
-                    timeout=self.config.timeout
-                )
-                
-                response.raise_for_status()
-                result = response.json()
-                
-                logger.debug(f"Request successful: {endpoint}")
-                return result
-                
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
-                
-                if attempt == retries:
-                    logger.error(f"Request failed after {retries + 1} attempts: {e}")
-                    raise
-                
-                # Exponential backoff
-                wait_time = 2 ** attempt
-                logger.info(f"Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
-            
-            except Exception as e:
-                logger.error(f"Unexpected error in API request: {e}")
-                raise
+        try:
+            logger.debug(f"Making request to {url}")
+            
+            # Retries and backoff are handled by the shared pool; the rate limit applies to every attempt
+            response = self.http.post(
+                url,
+                json=data,
+                headers=self.headers,
+                timeout=self.config.timeout,
+                retries=retries,
+                before_request=self.rate_limiter.wait_if_needed
+            )
+            
+            response.raise_for_status()
+            result = response.json()
+            
+            logger.debug(f"Request successful: {endpoint}")
+            return result
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request to {endpoint} failed: {e}")
+            raise
+        
+        except Exception as e:
+            logger.error(f"Unexpected error in API request: {e}")
+            raise
     
     def _format_timestamp(self, timestamp_ms: int) -> str:
         """Format timestamp in milliseconds to readable string"""
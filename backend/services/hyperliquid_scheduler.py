@@ -165,6 +165,7 @@ class HyperliquidScheduler:
         }
         
         if self.sync_service:
+            status['last_sync'] = self.sync_service.last_sync_metrics
             try:
                 sync_stats = self.sync_service.get_sync_statistics()
                 status['sync_statistics'] = sync_stats
@@ -8,6 +8,7 @@ and the local database, including deduplication, error handling, and scheduling.
 import logging
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass
@@ -29,6 +30,8 @@ class SyncConfig:
     enable_portfolio_sync: bool = True
     enable_vault_sync: bool = True
     historical_sync_days: int = 30
+    max_concurrent_accounts: int = 4
+    account_timeout_seconds: float = 300
 
 
 class HyperliquidSyncService:
@@ -60,6 +63,11 @@ class HyperliquidSyncService:
         self.sync_thread = None
         self.stop_event = threading.Event()
         
+        # Accounts with a sync still running (including ones that timed out)
+        self._accounts_in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        self.last_sync_metrics: Optional[Dict[str, Any]] = None
+        
         # Callbacks for sync events
         self.on_sync_start: Optional[Callable] = None
         self.on_sync_complete: Optional[Callable] = None
@@ -113,28 +121,14 @@ class HyperliquidSyncService:
             # Fetch trades from API
             fills = self.api_service.get_user_fills(wallet_address, start_time)
             
-            # Process and insert trades
-            new_trades = 0
-            updated_trades = 0
-            errors = []
+            # Insert new trades in one transaction (fills already stored are skipped)
+            batch = self.database.insert_trades(fills, account_type, wallet_address)
+            new_trades = batch['new_trades']
+            updated_trades = batch['existing_trades']
+            errors = batch['errors']
             
-            for fill in fills:
-                try:
-                    trade_id = fill.get('tid', '')
-                    if not trade_id:
-                        continue
-                    
-                    # Check if trade already exists using efficient method
-                    if not self.database.trade_exists(trade_id, account_type, wallet_address):
-                        self.database.insert_trade(fill, account_type, wallet_address)
-                        new_trades += 1
-                    else:
-                        updated_trades += 1
-                        
-                except Exception as e:
-                    error_msg = f"Error processing trade {fill.get('tid', 'unknown')}: {e}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+            for error_msg in errors:
+                logger.error(error_msg)
             
             # Update sync status
             if errors:
@@ -313,18 +307,64 @@ class HyperliquidSyncService:
                 'errors': [error_msg]
             }
     
+    def sync_account(self, account_config: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Sync trades, portfolio and vault equities for one account.
+        
+        Args:
+            account_config (Dict[str, str]): Account configuration with
+                'wallet_address' and 'account_type' keys
+                
+        Returns:
+            Dict[str, Any]: Per-sync-type results plus 'duration_ms'
+        """
+        started = time.time()
+        wallet_address = account_config.get('wallet_address', '')
+        account_type = AccountType(account_config.get('account_type', 'personal_wallet'))
+        
+        logger.info(f"Syncing account: {account_type.value} - {wallet_address}")
+        
+        account_results = {
+            'trades': None,
+            'portfolio': None,
+            'vault_equity': None
+        }
+        
+        # Sync trades
+        account_results['trades'] = self.sync_user_trades(wallet_address, account_type)
+        
+        # Sync portfolio if enabled
+        if self.config.enable_portfolio_sync:
+            account_results['portfolio'] = self.sync_user_portfolio(wallet_address, account_type)
+        
+        # Sync vault equities if enabled and account type is trading vault
+        if (self.config.enable_vault_sync and 
+            account_type == AccountType.TRADING_VAULT):
+            account_results['vault_equity'] = self.sync_vault_equities(wallet_address)
+        
+        account_results['duration_ms'] = round((time.time() - started) * 1000, 1)
+        return account_results
+    
     def sync_all_accounts(self, accounts: List[Dict[str, str]]) -> Dict[str, Any]:
         """
-        Sync all configured accounts.
+        Sync all configured accounts concurrently.
+        
+        Accounts run on up to config.max_concurrent_accounts threads and share the
+        API service's rate limiter, so wall time follows the slowest account rather
+        than the sum of all accounts. An account that raises or runs longer than
+        config.account_timeout_seconds is reported as failed without affecting the
+        others; a timed-out account keeps running in the background and is skipped
+        by later syncs until it finishes.
         
         Args:
             accounts (List[Dict[str, str]]): List of account configurations
                 Each dict should have 'wallet_address' and 'account_type' keys
                 
         Returns:
-            Dict[str, Any]: Overall sync results
+            Dict[str, Any]: Overall sync results with per-account 'duration_ms'
         """
         logger.info(f"Starting sync for {len(accounts)} accounts")
+        started = time.time()
         
         if self.on_sync_start:
             self.on_sync_start()
@@ -334,51 +374,96 @@ class HyperliquidSyncService:
             'accounts_synced': 0,
             'total_accounts': len(accounts),
             'results': {},
-            'errors': []
+            'errors': [],
+            'account_durations_ms': {},
+            'duration_ms': 0.0
         }
         
+        def record_failure(account_key: str, error_msg: str, duration_ms: Optional[float] = None):
+            logger.error(error_msg)
+            overall_results['errors'].append(error_msg)
+            overall_results['success'] = False
+            overall_results['results'][account_key] = {'success': False, 'error': error_msg,
+                                                       'duration_ms': duration_ms}
+            overall_results['account_durations_ms'][account_key] = duration_ms
+        
+        pending = {}
+        start_times: Dict[str, float] = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.config.max_concurrent_accounts, len(accounts) or 1)),
+                                      thread_name_prefix="HyperliquidAccountSync")
+        
+        def run_account(account_key: str, account_config: Dict[str, str]) -> Dict[str, Any]:
+            start_times[account_key] = time.time()
+            try:
+                return self.sync_account(account_config)
+            finally:
+                with self._in_flight_lock:
+                    self._accounts_in_flight.discard(account_key)
+        
         for account_config in accounts:
             wallet_address = account_config.get('wallet_address', '')
             account_type_str = account_config.get('account_type', 'personal_wallet')
+            account_key = f"{account_type_str}_{wallet_address}"
             
             try:
-                account_type = AccountType(account_type_str)
-                
-                logger.info(f"Syncing account: {account_type.value} - {wallet_address}")
-                
-                account_results = {
-                    'trades': None,
-                    'portfolio': None,
-                    'vault_equity': None
-                }
-                
-                # Sync trades
-                trade_result = self.sync_user_trades(wallet_address, account_type)
-                account_results['trades'] = trade_result
-                
-                # Sync portfolio if enabled
-                if self.config.enable_portfolio_sync:
-                    portfolio_result = self.sync_user_portfolio(wallet_address, account_type)
-                    account_results['portfolio'] = portfolio_result
-                
-                # Sync vault equities if enabled and account type is trading vault
-                if (self.config.enable_vault_sync and 
-                    account_type == AccountType.TRADING_VAULT):
-                    vault_result = self.sync_vault_equities(wallet_address)
-                    account_results['vault_equity'] = vault_result
+                AccountType(account_type_str)
+            except ValueError as e:
+                record_failure(account_key, f"Error syncing account {wallet_address}: {e}")
+                continue
+            
+            with self._in_flight_lock:
+                if account_key in self._accounts_in_flight:
+                    record_failure(account_key, f"Skipping account {wallet_address}: previous sync still running")
+                    continue
+                self._accounts_in_flight.add(account_key)
+            
+            pending[executor.submit(run_account, account_key, account_config)] = (account_key, wallet_address)
+        
+        timeout = self.config.account_timeout_seconds
+        while pending:
+            # Wake up for the next completion or the earliest running account's deadline
+            deadlines = [start_times[key] + timeout for key, _ in pending.values() if key in start_times]
+            poll = min([1.0] + [max(0.0, d - time.time()) for d in deadlines])
+            done, _ = wait(pending, timeout=poll, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                account_key, wallet_address = pending.pop(future)
+                try:
+                    account_results = future.result()
+                except Exception as e:
+                    duration = start_times.get(account_key)
+                    duration_ms = round((time.time() - duration) * 1000, 1) if duration else None
+                    record_failure(account_key, f"Error syncing account {wallet_address}: {e}", duration_ms)
+                    continue
                 
-                overall_results['results'][f"{account_type.value}_{wallet_address}"] = account_results
+                overall_results['results'][account_key] = account_results
+                overall_results['account_durations_ms'][account_key] = account_results['duration_ms']
                 overall_results['accounts_synced'] += 1
                 
                 # Check if any sync failed
-                if not trade_result.get('success', False):
+                if not account_results['trades'].get('success', False):
                     overall_results['success'] = False
-                
-            except Exception as e:
-                error_msg = f"Error syncing account {wallet_address}: {e}"
-                logger.error(error_msg)
-                overall_results['errors'].append(error_msg)
-                overall_results['success'] = False
+            
+            # Time out accounts that have been running too long (queued accounts have not started yet)
+            now = time.time()
+            for future, (account_key, wallet_address) in list(pending.items()):
+                account_started = start_times.get(account_key)
+                if account_started is not None and now - account_started >= timeout:
+                    del pending[future]
+                    record_failure(account_key, f"Sync for account {wallet_address} timed out after {timeout}s",
+                                   round((now - account_started) * 1000, 1))
+        
+        # Timed-out syncs finish on their own threads; don't block on them here
+        executor.shutdown(wait=False)
+        
+        overall_results['duration_ms'] = round((time.time() - started) * 1000, 1)
+        self.last_sync_metrics = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': overall_results['duration_ms'],
+            'accounts_synced': overall_results['accounts_synced'],
+            'total_accounts': overall_results['total_accounts'],
+            'account_durations_ms': dict(overall_results['account_durations_ms'])
+        }
         
         if self.on_sync_complete:
             self.on_sync_complete(overall_results)
@@ -386,7 +471,8 @@ class HyperliquidSyncService:
         if not overall_results['success'] and self.on_sync_error:
             self.on_sync_error(overall_results['errors'])
         
-        logger.info(f"Sync completed: {overall_results['accounts_synced']}/{overall_results['total_accounts']} accounts")
+        logger.info(f"Sync completed: {overall_results['accounts_synced']}/{overall_results['total_accounts']} accounts "
+                    f"in {overall_results['duration_ms']}ms")
         
         return overall_results
     
@@ -554,7 +640,9 @@ def create_sync_service() -> HyperliquidSyncService:
         batch_size=int(os.getenv('SYNC_BATCH_SIZE', '1000')),
         enable_portfolio_sync=os.getenv('ENABLE_PORTFOLIO_SYNC', 'true').lower() == 'true',
         enable_vault_sync=os.getenv('ENABLE_VAULT_SYNC', 'true').lower() == 'true',
-        historical_sync_days=int(os.getenv('HISTORICAL_SYNC_DAYS', '30'))
+        historical_sync_days=int(os.getenv('HISTORICAL_SYNC_DAYS', '30')),
+        max_concurrent_accounts=int(os.getenv('SYNC_MAX_CONCURRENT_ACCOUNTS', '4')),
+        account_timeout_seconds=float(os.getenv('SYNC_ACCOUNT_TIMEOUT_SECONDS', '300'))
     )
     
     return HyperliquidSyncService(api_service, database, config)
@@ -42,6 +42,9 @@ class MacroAIService:
     confidence scores, trend analysis, and trading recommendations.
     """
     
+    # Chart image sent to the model (the other charts are only stored for display)
+    AI_CHART_KEY = 'eth_btc_ratio_chart_image'
+    
     def __init__(self, db: Optional[MacroSentimentDatabase] = None):
         """
         Initialize AI service.
@@ -82,9 +85,12 @@ class MacroAIService:
             
             logger.info(f"Starting macro sentiment analysis with {days} days of data")
             
-            # Step 1: Generate charts
-            logger.debug("Generating macro charts for analysis")
-            chart_data = self.chart_service.generate_macro_charts(days)
+            # Step 1: Prepare charts (the AI chart renders first, the stored charts
+            # render in the background while the AI request is in flight)
+            logger.debug("Preparing macro charts for analysis")
+            chart_set = self.chart_service.prepare_macro_charts(days)
+            chart_set.prefetch([self.AI_CHART_KEY])
+            chart_set.prefetch()
             
             # Step 2: Get market data summary
             chart_summary = self.chart_service.get_chart_summary(days)
@@ -95,10 +101,11 @@ class MacroAIService:
             # Step 4: Perform AI analysis
             logger.debug(f"Performing AI analysis with model: {model_to_use}")
             ai_result = await self._perform_claude_analysis(
-                chart_data, chart_summary, model_to_use
+                chart_set.get_image(self.AI_CHART_KEY), chart_summary, model_to_use
             )
             
             # Step 5: Process and validate results
+            chart_data = chart_set.to_dict()
             processed_result = self._process_ai_result(ai_result, chart_data, analysis_timestamp)
             
             # Step 6: Store analysis in database
@@ -117,14 +124,14 @@ class MacroAIService:
             logger.error(f"Error in macro sentiment analysis: {e}")
             raise
     
-    async def _perform_claude_analysis(self, chart_data: Dict[str, Any], 
+    async def _perform_claude_analysis(self, eth_btc_ratio_chart_b64: str, 
                                      chart_summary: Dict[str, Any], 
                                      model: str) -> Dict[str, Any]:
         """
         Perform Claude API analysis of macro charts.
         
         Args:
-            chart_data (Dict[str, Any]): Generated chart data
+            eth_btc_ratio_chart_b64 (str): Base64 PNG of the ETH/BTC ratio chart
             chart_summary (Dict[str, Any]): Market data summary
             model (str): Claude model to use
             
@@ -140,9 +147,6 @@ class MacroAIService:
             # Prepare the analysis prompt
             prompt = self._build_analysis_prompt(chart_summary)
             
-            # Prepare image for analysis (ETH/BTC ratio chart)
-            eth_btc_ratio_chart_b64 = chart_data['eth_btc_ratio_chart_image']
-            
             # Make API request
             logger.debug(f"Making Claude API request with model: {model}")
             
@@ -385,9 +389,8 @@ async def trigger_macro_analysis(model: Optional[str] = None, days: int = 90) ->
 
 
 def get_latest_macro_sentiment() -> Optional[Dict[str, Any]]:
-    """Get latest macro sentiment analysis."""
-    service = MacroAIService()
-    return service.get_latest_analysis()
+    """Get latest macro sentiment analysis (reading stored results needs no AI client)."""
+    return get_macro_db().get_latest_sentiment()
 
 
 def get_macro_confidence_history(days: int = 7) -> List[Dict[str, Any]]:
@@ -31,6 +31,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Seconds a bootstrap status snapshot is served without a local market data write
+BOOTSTRAP_STATUS_MAX_AGE = 300
+
 
 class BootstrapError(Exception):
     """Custom exception for bootstrap errors"""
@@ -66,6 +69,23 @@ class MacroBootstrapService:
         if self.progress_callback:
             self.progress_callback(message, progress)
     
+    def get_bootstrap_status(self) -> Dict[str, Any]:
+        """
+        Get bootstrap status from the in-memory snapshot.
+        
+        The snapshot is refreshed when market data is written through the database
+        (scanner collections) or after BOOTSTRAP_STATUS_MAX_AGE seconds.
+        
+        Returns:
+            Dict[str, Any]: Bootstrap status information
+        """
+        try:
+            return dict(self.db.get_cached_snapshot(
+                'bootstrap_status', self._query_bootstrap_status, BOOTSTRAP_STATUS_MAX_AGE
+            ))
+        except Exception as e:
+            return self._bootstrap_status_error(e)
+    
     async def check_bootstrap_status(self) -> Dict[str, Any]:
         """
         Check if bootstrap has been completed by checking actual data in database.
@@ -74,45 +94,43 @@ class MacroBootstrapService:
             Dict[str, Any]: Bootstrap status information
         """
         try:
-            # Check if we have sufficient historical data
-            query = """
-                SELECT COUNT(*) as count,
-                       MIN(timestamp) as earliest_date,
-                       MAX(timestamp) as latest_date
-                FROM macro_market_data
-                WHERE timestamp >= datetime('now', '-90 days')
-            """
-            
-            result = self.db.execute_query(query)
-            if result:
-                count = result[0]['count']
-                earliest = result[0]['earliest_date']
-                latest = result[0]['latest_date']
-                
-                # Consider bootstrap complete if we have at least 80 data points in last 90 days
-                completed = count >= 80
-                
-                return {
-                    'completed': completed,
-                    'data_points': count,
-                    'earliest_date': earliest,
-                    'latest_date': latest,
-                    'reason': f"Bootstrap {'completed' if completed else 'incomplete'}: {count} data points available"
-                }
-            else:
-                return {
-                    'completed': False,
-                    'data_points': 0,
-                    'reason': 'No data found'
-                }
-                
+            return self._query_bootstrap_status()
         except Exception as e:
-            logger.error(f"Error checking bootstrap status: {e}")
+            return self._bootstrap_status_error(e)
+    
+    def _query_bootstrap_status(self) -> Dict[str, Any]:
+        """Query bootstrap status from the market data collected in the last 90 days."""
+        # Check if we have sufficient historical data
+        since_timestamp = int(datetime.now(timezone.utc).timestamp()) - (90 * 24 * 60 * 60)
+        stats = self.db.get_market_data_stats(since_timestamp)
+        count = stats['count']
+        
+        if count:
+            # Consider bootstrap complete if we have at least 80 data points in last 90 days
+            completed = count >= 80
+            
+            return {
+                'completed': completed,
+                'data_points': count,
+                'earliest_date': stats['earliest_date'],
+                'latest_date': stats['latest_date'],
+                'reason': f"Bootstrap {'completed' if completed else 'incomplete'}: {count} data points available"
+            }
+        else:
             return {
                 'completed': False,
-                'reason': f'Error checking status: {e}'
+                'data_points': 0,
+                'reason': 'No data found'
             }
     
+    def _bootstrap_status_error(self, error: Exception) -> Dict[str, Any]:
+        """Status reported when the bootstrap status query fails (never cached)."""
+        logger.error(f"Error checking bootstrap status: {error}")
+        return {
+            'completed': False,
+            'reason': f'Error checking status: {error}'
+        }
+    
     async def run_bootstrap(self, force: bool = False) -> Dict[str, Any]:
         """
         Run the bootstrap process to collect historical data.
@@ -385,6 +403,11 @@ async def check_bootstrap_status() -> Dict[str, Any]:
     return await service.check_bootstrap_status()
 
 
+def get_bootstrap_status() -> Dict[str, Any]:
+    """Get bootstrap completion status from the in-memory snapshot (no event loop needed)."""
+    return MacroBootstrapService().get_bootstrap_status()
+
+
 # Example usage and testing
 if __name__ == "__main__":
     import asyncio
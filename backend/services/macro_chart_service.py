@@ -3,14 +3,24 @@ Macro Chart Generation Service
 
 This service creates synchronized chart visualizations for AI analysis
 including BTC price, BTC dominance, and Alt strength ratio charts.
+
+Charts are rendered on demand on a background render thread, and rendered images
+are cached by the hash of the underlying market data so an unchanged data window is
+never rendered twice.
 """
 
 import logging
 import base64
 import io
+import os
+import time
+import atexit
 import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Iterable
 import json
 
 import matplotlib
@@ -18,6 +28,7 @@ matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
 import pandas as pd
 import numpy as np
 
@@ -26,13 +37,379 @@ try:
 except ImportError:
     # Fallback for when running from root directory
     import sys
-    import os
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     from models.macro_sentiment_models import get_macro_db, MacroSentimentDatabase
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_CHART_CONFIG = {
+    'figure_size': (16, 12),
+    'dpi': 100,
+    'style': 'seaborn-v0_8-darkgrid',
+    'colors': {
+        'btc_price': '#F7931A',      # Bitcoin orange
+        'eth_price': '#627EEA',      # Ethereum blue
+        'dominance': '#2E86AB',      # Blue
+        'alt_strength': '#A23B72',   # Purple
+        'background': '#1E1E1E',     # Dark background
+        'grid': '#404040',           # Grid color
+        'text': '#FFFFFF'            # White text
+    }
+}
+
+# Market data columns each chart needs (passed to the renderers with 'datetime')
+CHART_COLUMNS = {
+    'btc_chart_image': ['btc_price'],
+    'eth_chart_image': ['eth_price'],
+    'dominance_chart_image': ['btc_dominance'],
+    'alt_strength_chart_image': ['alt_strength_ratio'],
+    'eth_btc_ratio_chart_image': ['eth_market_cap', 'btc_market_cap'],
+}
+
+# Render pool configuration (0 workers renders in the calling thread)
+CHART_RENDER_WORKERS = int(os.getenv('MACRO_CHART_RENDER_WORKERS', '1'))
+CHART_CACHE_MAX_ENTRIES = 25
+
+
+def _new_chart_axes(config: Dict[str, Any], figsize: Tuple[int, int] = (12, 6)):
+    """Create a styled figure and axes without touching pyplot's global figure state."""
+    fig = Figure(figsize=figsize, facecolor=config['colors']['background'])
+    ax = fig.subplots()
+    ax.set_facecolor(config['colors']['background'])
+    return fig, ax
+
+
+def _style_chart_axes(ax, df: pd.DataFrame, config: Dict[str, Any], legend_loc: Optional[str] = None):
+    """Apply the shared date axis, grid and legend styling."""
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+    ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(df) // 10)))
+
+    ax.tick_params(colors=config['colors']['text'])
+    ax.grid(True, alpha=0.3, color=config['colors']['grid'])
+    legend_kwargs = {'loc': legend_loc} if legend_loc else {}
+    ax.legend(facecolor=config['colors']['background'],
+              edgecolor=config['colors']['text'], **legend_kwargs)
+
+
+def _figure_to_base64(fig: Figure, config: Dict[str, Any]) -> str:
+    """Render a figure to a base64 encoded PNG."""
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=config['dpi'],
+                facecolor=config['colors']['background'])
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def _render_btc_price_chart(df: pd.DataFrame, config: Dict[str, Any]) -> str:
+    """Render BTC price chart."""
+    fig, ax = _new_chart_axes(config)
+
+    # Plot BTC price
+    ax.plot(df['datetime'], df['btc_price'],
+            color=config['colors']['btc_price'],
+            linewidth=2, label='BTC Price')
+
+    # Formatting
+    ax.set_title('Bitcoin Price (USD)', fontsize=16, color=config['colors']['text'], pad=20)
+    ax.set_xlabel('Date', fontsize=12, color=config['colors']['text'])
+    ax.set_ylabel('Price (USD)', fontsize=12, color=config['colors']['text'])
+
+    # Format y-axis as currency
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
+
+    _style_chart_axes(ax, df, config)
+    return _figure_to_base64(fig, config)
+
+
+def _render_eth_price_chart(df: pd.DataFrame, config: Dict[str, Any]) -> str:
+    """Render ETH price chart."""
+    fig, ax = _new_chart_axes(config)
+
+    # Plot ETH price
+    ax.plot(df['datetime'], df['eth_price'],
+            color=config['colors']['eth_price'],
+            linewidth=2, label='ETH Price')
+
+    # Formatting
+    ax.set_title('Ethereum Price (USD)', fontsize=16, color=config['colors']['text'], pad=20)
+    ax.set_xlabel('Date', fontsize=12, color=config['colors']['text'])
+    ax.set_ylabel('Price (USD)', fontsize=12, color=config['colors']['text'])
+
+    # Format y-axis as currency
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
+
+    _style_chart_axes(ax, df, config)
+    return _figure_to_base64(fig, config)
+
+
+def _render_dominance_chart(df: pd.DataFrame, config: Dict[str, Any]) -> str:
+    """Render BTC dominance chart."""
+    fig, ax = _new_chart_axes(config)
+
+    # Plot BTC dominance
+    ax.plot(df['datetime'], df['btc_dominance'],
+            color=config['colors']['dominance'],
+            linewidth=2, label='BTC Dominance')
+
+    # Add horizontal reference lines
+    ax.axhline(y=50, color='gray', linestyle='--', alpha=0.5, label='50% Line')
+
+    # Formatting
+    ax.set_title('Bitcoin Market Dominance (%)', fontsize=16, color=config['colors']['text'], pad=20)
+    ax.set_xlabel('Date', fontsize=12, color=config['colors']['text'])
+    ax.set_ylabel('Dominance (%)', fontsize=12, color=config['colors']['text'])
+
+    # Format y-axis as percentage with dynamic scaling
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'{x:.1f}%'))
+    # Use tight y-axis limits to show variation clearly
+    dom_min, dom_max = df['btc_dominance'].min(), df['btc_dominance'].max()
+    dom_range = dom_max - dom_min
+    padding = max(0.5, dom_range * 0.05)  # Minimum 0.5% padding, max 5% of range
+    ax.set_ylim(dom_min - padding, dom_max + padding)
+
+    _style_chart_axes(ax, df, config)
+    return _figure_to_base64(fig, config)
+
+
+def _render_alt_strength_chart(df: pd.DataFrame, config: Dict[str, Any]) -> str:
+    """Render Alt strength ratio chart."""
+    fig, ax = _new_chart_axes(config)
+
+    # Plot Alt strength ratio
+    ax.plot(df['datetime'], df['alt_strength_ratio'],
+            color=config['colors']['alt_strength'],
+            linewidth=2, label='Alt Strength Ratio')
+
+    # Formatting
+    ax.set_title('Altcoin Strength Ratio (Alt Market Cap / BTC Price)',
+                 fontsize=16, color=config['colors']['text'], pad=20)
+    ax.set_xlabel('Date', fontsize=12, color=config['colors']['text'])
+    ax.set_ylabel('Ratio', fontsize=12, color=config['colors']['text'])
+
+    # Format y-axis with proper scaling for millions
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'{x/1000000:.1f}M'))
+
+    _style_chart_axes(ax, df, config)
+    return _figure_to_base64(fig, config)
+
+
+def _render_eth_btc_ratio_chart(df: pd.DataFrame, config: Dict[str, Any]) -> str:
+    """Render ETH/BTC market cap ratio chart to show ETH strength relative to BTC."""
+    # Calculate ETH/BTC ratio from market caps
+    eth_btc_ratio = df['eth_market_cap'] / df['btc_market_cap']
+
+    fig, ax = _new_chart_axes(config, figsize=(16, 8))
+
+    # Plot ETH/BTC ratio
+    ax.plot(df['datetime'], eth_btc_ratio,
+            color=config['colors']['eth_price'],
+            linewidth=2, label='ETH/BTC Ratio')
+
+    # Chart formatting
+    ax.set_title('ETH/BTC Market Cap Ratio', fontsize=16, color=config['colors']['text'], pad=20)
+    ax.set_xlabel('Date', fontsize=12, color=config['colors']['text'])
+    ax.set_ylabel('Ratio (ETH Market Cap / BTC Market Cap)', fontsize=12, color=config['colors']['text'])
+
+    # Format y-axis to show ratio values
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'{x:.3f}'))
+
+    _style_chart_axes(ax, df, config, legend_loc='upper left')
+
+    # Add annotation for current ratio
+    current_ratio = eth_btc_ratio.iloc[-1]
+    ax.annotate(f'Current: {current_ratio:.3f}',
+                xy=(df['datetime'].iloc[-1], current_ratio),
+                xytext=(10, 10), textcoords='offset points',
+                bbox=dict(boxstyle='round,pad=0.3', facecolor=config['colors']['eth_price'], alpha=0.7),
+                color='white', fontweight='bold')
+
+    return _figure_to_base64(fig, config)
+
+
+CHART_RENDERERS = {
+    'btc_chart_image': _render_btc_price_chart,
+    'eth_chart_image': _render_eth_price_chart,
+    'dominance_chart_image': _render_dominance_chart,
+    'alt_strength_chart_image': _render_alt_strength_chart,
+    'eth_btc_ratio_chart_image': _render_eth_btc_ratio_chart,
+}
+
+
+def _render_chart(chart_key: str, df: pd.DataFrame, config: Dict[str, Any]) -> Tuple[str, float]:
+    """
+    Render one chart (runs on a render thread or in the calling thread).
+
+    Returns:
+        Tuple of (base64 PNG, render time in ms)
+    """
+    # The style context swaps matplotlib's process-wide rcParams, so renders are serialized
+    with _render_lock:
+        started = time.time()
+        with plt.style.context(config['style']):
+            image_base64 = CHART_RENDERERS[chart_key](df, config)
+        return image_base64, (time.time() - started) * 1000
+
+
+# Render pool and rendered chart cache (shared by all MacroChartService instances)
+_render_lock = threading.Lock()
+_render_pool = None
+_render_pool_lock = threading.Lock()
+_chart_renders: 'OrderedDict[Tuple[str, str], Future]' = OrderedDict()
+_chart_renders_lock = threading.Lock()
+
+
+def _get_render_pool() -> Optional[ThreadPoolExecutor]:
+    """
+    Get the shared chart render pool, creating it on first use.
+
+    Renders run on threads rather than worker processes: forking the threaded
+    server can copy locks held by other threads into the child, and spawned
+    workers would re-import the application entry point.
+    """
+    global _render_pool
+    if CHART_RENDER_WORKERS <= 0:
+        return None
+
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ThreadPoolExecutor(max_workers=CHART_RENDER_WORKERS,
+                                              thread_name_prefix='macro-chart-render')
+            logger.info(f"Started macro chart render pool with {CHART_RENDER_WORKERS} threads")
+        return _render_pool
+
+
+def shutdown_render_pool():
+    """Shut down the chart render pool (registered with atexit)"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+
+
+atexit.register(shutdown_render_pool)
+
+
+def _submit_chart_render(data_hash: str, chart_key: str, df: pd.DataFrame,
+                         config: Dict[str, Any]) -> Tuple[Future, bool]:
+    """
+    Get the render future for a chart, reusing a cached or in-flight render of the same data.
+
+    Args:
+        data_hash: Hash of the market data the chart is drawn from
+        chart_key: Result key of the chart (see CHART_RENDERERS)
+        df: Cleaned market data
+        config: Chart configuration
+
+    Returns:
+        Tuple of the future resolving to (base64 PNG, render time in ms), and whether
+        this call started the render (False if it was reused)
+    """
+    key = (data_hash, chart_key)
+    with _chart_renders_lock:
+        future = _chart_renders.get(key)
+        if future is not None and not (future.done() and future.exception() is not None):
+            _chart_renders.move_to_end(key)
+            return future, False
+
+        chart_df = df[['datetime'] + CHART_COLUMNS[chart_key]]
+        pool = _get_render_pool()
+        if pool is not None:
+            try:
+                future = pool.submit(_render_chart, chart_key, chart_df, config)
+            except Exception as e:
+                logger.warning(f"Chart render pool unavailable, rendering in the calling thread: {e}")
+                shutdown_render_pool()
+                pool = None
+
+        if pool is None:
+            future = Future()
+            try:
+                future.set_result(_render_chart(chart_key, chart_df, config))
+            except Exception as e:
+                future.set_exception(e)
+
+        _chart_renders[key] = future
+        while len(_chart_renders) > CHART_CACHE_MAX_ENTRIES:
+            _chart_renders.popitem(last=False)
+
+    return future, True
+
+
+def clear_chart_cache():
+    """Drop all cached chart renders."""
+    with _chart_renders_lock:
+        _chart_renders.clear()
+
+
+class MacroChartSet:
+    """
+    Macro charts for one market data window, rendered lazily.
+
+    Images are only rendered when requested via get_image/prefetch (or to_dict),
+    and renders of identical data are shared through the chart cache.
+    """
+
+    def __init__(self, df: pd.DataFrame, data_hash: str, chart_config: Dict[str, Any],
+                 data_period_start: int, data_period_end: int, data_points: int, prepare_ms: float):
+        self.df = df
+        self.data_hash = data_hash
+        self.chart_config = chart_config
+        self.data_period_start = data_period_start
+        self.data_period_end = data_period_end
+        self.data_points = data_points
+        self.prepare_ms = prepare_ms
+        self._futures: Dict[str, Future] = {}
+        self._started: set = set()
+
+    def prefetch(self, chart_keys: Optional[Iterable[str]] = None):
+        """Start rendering charts in the background without waiting for them."""
+        for chart_key in (chart_keys or CHART_RENDERERS.keys()):
+            if chart_key not in self._futures:
+                self._futures[chart_key], started = _submit_chart_render(
+                    self.data_hash, chart_key, self.df, self.chart_config
+                )
+                if started:
+                    self._started.add(chart_key)
+
+    def get_image(self, chart_key: str) -> str:
+        """Get a base64 PNG chart image, rendering it if needed."""
+        self.prefetch([chart_key])
+        try:
+            return self._futures[chart_key].result()[0]
+        except Exception as e:
+            logger.error(f"Error generating {chart_key}: {e}")
+            raise
+
+    def to_dict(self, chart_keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Build the chart result dict returned by MacroChartService.generate_macro_charts.
+
+        Args:
+            chart_keys: Charts to include (default: all)
+        """
+        chart_keys = list(chart_keys or CHART_RENDERERS.keys())
+        self.prefetch(chart_keys)
+
+        result = {
+            'data_period_start': self.data_period_start,
+            'data_period_end': self.data_period_end,
+            'data_points': self.data_points,
+        }
+        for chart_key in chart_keys:
+            result[chart_key] = self.get_image(chart_key)
+
+        # Only renders this window started count; charts reused from the cache cost 0 ms
+        render_ms = sum(self._futures[k].result()[1] for k in chart_keys if k in self._started)
+        result.update({
+            'chart_data_hash': self.data_hash,
+            'processing_time_ms': int(self.prepare_ms + render_ms),
+            'chart_config': self.chart_config
+        })
+        return result
+
+
 class MacroChartService:
     """
     Chart generation service for macro market sentiment analysis.
@@ -51,30 +428,17 @@ class MacroChartService:
         self.db = db or get_macro_db()
         
         # Chart configuration
-        self.chart_config = {
-            'figure_size': (16, 12),
-            'dpi': 100,
-            'style': 'seaborn-v0_8-darkgrid',
-            'colors': {
-                'btc_price': '#F7931A',      # Bitcoin orange
-                'eth_price': '#627EEA',      # Ethereum blue
-                'dominance': '#2E86AB',      # Blue
-                'alt_strength': '#A23B72',   # Purple
-                'background': '#1E1E1E',     # Dark background
-                'grid': '#404040',           # Grid color
-                'text': '#FFFFFF'            # White text
-            }
-        }
+        self.chart_config = DEFAULT_CHART_CONFIG
     
-    def generate_macro_charts(self, days: int = 90) -> Dict[str, Any]:
+    def prepare_macro_charts(self, days: int = 90) -> MacroChartSet:
         """
-        Generate complete set of macro charts for AI analysis.
+        Load and validate market data for the macro charts without rendering them.
         
         Args:
             days (int): Number of days of data to include
             
         Returns:
-            Dict[str, Any]: Chart data and images
+            MacroChartSet: Chart set whose images render on demand
         """
         try:
             start_time = datetime.now()
@@ -101,296 +465,68 @@ class MacroChartService:
             
             logger.info(f"Using {len(df)} validated data points for chart generation")
             
-            # Generate individual charts
-            btc_chart = self._generate_btc_price_chart(df)
-            eth_chart = self._generate_eth_price_chart(df)  # ETH Integration: Add ETH chart
-            dominance_chart = self._generate_dominance_chart(df)
-            alt_strength_chart = self._generate_alt_strength_chart(df)
-            eth_btc_ratio_chart = self._generate_eth_btc_ratio_chart(df)  # ETH/BTC ratio chart
-            
             # Calculate data hash for caching
             data_hash = self._calculate_data_hash(market_data)
             
-            processing_time = (datetime.now() - start_time).total_seconds() * 1000
-            
-            result = {
-                'data_period_start': start_timestamp,
-                'data_period_end': end_timestamp,
-                'data_points': len(market_data),
-                'btc_chart_image': btc_chart,
-                'eth_chart_image': eth_chart,  # ETH Integration: Add ETH chart to result
-                'dominance_chart_image': dominance_chart,
-                'alt_strength_chart_image': alt_strength_chart,
-                'eth_btc_ratio_chart_image': eth_btc_ratio_chart,  # ETH/BTC ratio chart
-                'chart_data_hash': data_hash,
-                'processing_time_ms': int(processing_time),
-                'chart_config': self.chart_config
-            }
-            
-            logger.info(f"Generated macro charts in {processing_time:.1f}ms "
-                       f"({len(market_data)} data points)")
+            prepare_ms = (datetime.now() - start_time).total_seconds() * 1000
             
-            return result
+            return MacroChartSet(
+                df=df,
+                data_hash=data_hash,
+                chart_config=self.chart_config,
+                data_period_start=start_timestamp,
+                data_period_end=end_timestamp,
+                data_points=len(market_data),
+                prepare_ms=prepare_ms
+            )
             
         except Exception as e:
-            logger.error(f"Error generating macro charts: {e}")
+            logger.error(f"Error preparing macro charts: {e}")
             raise
     
-    def _generate_btc_price_chart(self, df: pd.DataFrame) -> str:
-        """Generate BTC price chart."""
-        try:
-            plt.style.use(self.chart_config['style'])
-            
-            fig, ax = plt.subplots(figsize=(12, 6), facecolor=self.chart_config['colors']['background'])
-            ax.set_facecolor(self.chart_config['colors']['background'])
-            
-            # Plot BTC price
-            ax.plot(df['datetime'], df['btc_price'], 
-                   color=self.chart_config['colors']['btc_price'], 
-                   linewidth=2, label='BTC Price')
-            
-            # Formatting
-            ax.set_title('Bitcoin Price (USD)', fontsize=16, color=self.chart_config['colors']['text'], pad=20)
-            ax.set_xlabel('Date', fontsize=12, color=self.chart_config['colors']['text'])
-            ax.set_ylabel('Price (USD)', fontsize=12, color=self.chart_config['colors']['text'])
-            
-            # Format y-axis as currency
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            
-            # Format x-axis dates
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(df) // 10)))
-            
-            # Style
-            ax.tick_params(colors=self.chart_config['colors']['text'])
-            ax.grid(True, alpha=0.3, color=self.chart_config['colors']['grid'])
-            ax.legend(facecolor=self.chart_config['colors']['background'], 
-                     edgecolor=self.chart_config['colors']['text'])
-            
-            plt.tight_layout()
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=self.chart_config['dpi'], 
-                       facecolor=self.chart_config['colors']['background'])
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            
-            plt.close(fig)
-            return image_base64
+    def generate_macro_charts(self, days: int = 90, charts: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Generate complete set of macro charts for AI analysis.
+        
+        Args:
+            days (int): Number of days of data to include
+            charts (Optional[Iterable[str]]): Chart image keys to render (default: all)
             
-        except Exception as e:
-            logger.error(f"Error generating BTC price chart: {e}")
-            raise
-    def _generate_eth_price_chart(self, df: pd.DataFrame) -> str:
-        """Generate ETH price chart."""
+        Returns:
+            Dict[str, Any]: Chart data and images
+        """
         try:
-            plt.style.use(self.chart_config['style'])
-            
-            fig, ax = plt.subplots(figsize=(12, 6), facecolor=self.chart_config['colors']['background'])
-            ax.set_facecolor(self.chart_config['colors']['background'])
-            
-            # Plot ETH price
-            ax.plot(df['datetime'], df['eth_price'], 
-                   color=self.chart_config['colors']['eth_price'], 
-                   linewidth=2, label='ETH Price')
-            
-            # Formatting
-            ax.set_title('Ethereum Price (USD)', fontsize=16, color=self.chart_config['colors']['text'], pad=20)
-            ax.set_xlabel('Date', fontsize=12, color=self.chart_config['colors']['text'])
-            ax.set_ylabel('Price (USD)', fontsize=12, color=self.chart_config['colors']['text'])
-            
-            # Format y-axis as currency
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            
-            # Format x-axis dates
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(df) // 10)))
+            chart_set = self.prepare_macro_charts(days)
+            result = chart_set.to_dict(charts)
             
-            # Style
-            ax.tick_params(colors=self.chart_config['colors']['text'])
-            ax.grid(True, alpha=0.3, color=self.chart_config['colors']['grid'])
-            ax.legend(facecolor=self.chart_config['colors']['background'], 
-                     edgecolor=self.chart_config['colors']['text'])
+            logger.info(f"Generated macro charts in {result['processing_time_ms']}ms "
+                       f"({result['data_points']} data points)")
             
-            plt.tight_layout()
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=self.chart_config['dpi'], 
-                       facecolor=self.chart_config['colors']['background'])
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            
-            plt.close(fig)
-            return image_base64
+            return result
             
         except Exception as e:
-            logger.error(f"Error generating ETH price chart: {e}")
+            logger.error(f"Error generating macro charts: {e}")
             raise
     
+    def _generate_btc_price_chart(self, df: pd.DataFrame) -> str:
+        """Generate BTC price chart."""
+        return _render_chart('btc_chart_image', df, self.chart_config)[0]
+    
+    def _generate_eth_price_chart(self, df: pd.DataFrame) -> str:
+        """Generate ETH price chart."""
+        return _render_chart('eth_chart_image', df, self.chart_config)[0]
     
     def _generate_dominance_chart(self, df: pd.DataFrame) -> str:
         """Generate BTC dominance chart."""
-        try:
-            plt.style.use(self.chart_config['style'])
-            
-            fig, ax = plt.subplots(figsize=(12, 6), facecolor=self.chart_config['colors']['background'])
-            ax.set_facecolor(self.chart_config['colors']['background'])
-            
-            # Plot BTC dominance
-            ax.plot(df['datetime'], df['btc_dominance'], 
-                   color=self.chart_config['colors']['dominance'], 
-                   linewidth=2, label='BTC Dominance')
-            
-            # Add horizontal reference lines
-            ax.axhline(y=50, color='gray', linestyle='--', alpha=0.5, label='50% Line')
-            
-            # Formatting
-            ax.set_title('Bitcoin Market Dominance (%)', fontsize=16, color=self.chart_config['colors']['text'], pad=20)
-            ax.set_xlabel('Date', fontsize=12, color=self.chart_config['colors']['text'])
-            ax.set_ylabel('Dominance (%)', fontsize=12, color=self.chart_config['colors']['text'])
-            
-            # Format y-axis as percentage with dynamic scaling
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:.1f}%'))
-            # Use tight y-axis limits to show variation clearly
-            dom_min, dom_max = df['btc_dominance'].min(), df['btc_dominance'].max()
-            dom_range = dom_max - dom_min
-            padding = max(0.5, dom_range * 0.05)  # Minimum 0.5% padding, max 5% of range
-            ax.set_ylim(dom_min - padding, dom_max + padding)
-            
-            # Format x-axis dates
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(df) // 10)))
-            
-            # Style
-            ax.tick_params(colors=self.chart_config['colors']['text'])
-            ax.grid(True, alpha=0.3, color=self.chart_config['colors']['grid'])
-            ax.legend(facecolor=self.chart_config['colors']['background'], 
-                     edgecolor=self.chart_config['colors']['text'])
-            
-            plt.tight_layout()
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=self.chart_config['dpi'], 
-                       facecolor=self.chart_config['colors']['background'])
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            
-            plt.close(fig)
-            return image_base64
-            
-        except Exception as e:
-            logger.error(f"Error generating dominance chart: {e}")
-            raise
+        return _render_chart('dominance_chart_image', df, self.chart_config)[0]
     
     def _generate_alt_strength_chart(self, df: pd.DataFrame) -> str:
         """Generate Alt strength ratio chart."""
-        try:
-            plt.style.use(self.chart_config['style'])
-            
-            fig, ax = plt.subplots(figsize=(12, 6), facecolor=self.chart_config['colors']['background'])
-            ax.set_facecolor(self.chart_config['colors']['background'])
-            
-            # Plot Alt strength ratio
-            ax.plot(df['datetime'], df['alt_strength_ratio'], 
-                   color=self.chart_config['colors']['alt_strength'], 
-                   linewidth=2, label='Alt Strength Ratio')
-            
-            # Formatting
-            ax.set_title('Altcoin Strength Ratio (Alt Market Cap / BTC Price)', 
-                        fontsize=16, color=self.chart_config['colors']['text'], pad=20)
-            ax.set_xlabel('Date', fontsize=12, color=self.chart_config['colors']['text'])
-            ax.set_ylabel('Ratio', fontsize=12, color=self.chart_config['colors']['text'])
-            
-            # Format y-axis with proper scaling for millions
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x/1000000:.1f}M'))
-            
-            # Format x-axis dates
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(df) // 10)))
-            
-            # Style
-            ax.tick_params(colors=self.chart_config['colors']['text'])
-            ax.grid(True, alpha=0.3, color=self.chart_config['colors']['grid'])
-            ax.legend(facecolor=self.chart_config['colors']['background'], 
-                     edgecolor=self.chart_config['colors']['text'])
-            
-            plt.tight_layout()
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=self.chart_config['dpi'], 
-                       facecolor=self.chart_config['colors']['background'])
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            
-            plt.close(fig)
-            return image_base64
-            
-        except Exception as e:
-            logger.error(f"Error generating alt strength chart: {e}")
-            raise
+        return _render_chart('alt_strength_chart_image', df, self.chart_config)[0]
     
     def _generate_eth_btc_ratio_chart(self, df: pd.DataFrame) -> str:
         """Generate ETH/BTC market cap ratio chart to show ETH strength relative to BTC."""
-        try:
-            plt.style.use(self.chart_config['style'])
-            
-            # Calculate ETH/BTC ratio from market caps
-            df['eth_btc_ratio'] = df['eth_market_cap'] / df['btc_market_cap']
-            
-            fig, ax = plt.subplots(figsize=(16, 8),
-                                  facecolor=self.chart_config['colors']['background'])
-            ax.set_facecolor(self.chart_config['colors']['background'])
-            
-            # Plot ETH/BTC ratio
-            ax.plot(df['datetime'], df['eth_btc_ratio'],
-                   color=self.chart_config['colors']['eth_price'],
-                   linewidth=2, label='ETH/BTC Ratio')
-            
-            # Chart formatting
-            ax.set_title('ETH/BTC Market Cap Ratio', fontsize=16, color=self.chart_config['colors']['text'], pad=20)
-            ax.set_xlabel('Date', fontsize=12, color=self.chart_config['colors']['text'])
-            ax.set_ylabel('Ratio (ETH Market Cap / BTC Market Cap)', fontsize=12, color=self.chart_config['colors']['text'])
-            
-            # Format y-axis to show ratio values
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:.3f}'))
-            
-            # Format x-axis dates
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(df) // 10)))
-            
-            # Styling
-            ax.tick_params(colors=self.chart_config['colors']['text'])
-            ax.grid(True, alpha=0.3, color=self.chart_config['colors']['grid'])
-            ax.legend(loc='upper left', facecolor=self.chart_config['colors']['background'],
-                     edgecolor=self.chart_config['colors']['text'])
-            
-            # Add annotation for current ratio
-            current_ratio = df['eth_btc_ratio'].iloc[-1]
-            ax.annotate(f'Current: {current_ratio:.3f}',
-                       xy=(df['datetime'].iloc[-1], current_ratio),
-                       xytext=(10, 10), textcoords='offset points',
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor=self.chart_config['colors']['eth_price'], alpha=0.7),
-                       color='white', fontweight='bold')
-            
-            plt.tight_layout()
-            
-            # Convert to base64
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=self.chart_config['dpi'],
-                       facecolor=self.chart_config['colors']['background'])
-            buffer.seek(0)
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            
-            plt.close(fig)
-            return image_base64
-            
-        except Exception as e:
-            logger.error(f"Error generating combined chart: {e}")
-            raise
+        return _render_chart('eth_btc_ratio_chart_image', df, self.chart_config)[0]
     
     def _calculate_data_hash(self, market_data: List[Dict[str, Any]]) -> str:
         """Calculate hash of market data for caching."""
@@ -402,7 +538,9 @@ class MacroChartService:
                     'btc_price': item['btc_price'],
                     'eth_price': item['eth_price'],
                     'btc_dominance': item['btc_dominance'],
-                    'alt_strength_ratio': item['alt_strength_ratio']
+                    'alt_strength_ratio': item['alt_strength_ratio'],
+                    'btc_market_cap': item.get('btc_market_cap'),
+                    'eth_market_cap': item.get('eth_market_cap')
                 }
                 for item in market_data
             ], sort_keys=True)
@@ -21,6 +21,8 @@ import json
 import uuid
 from threading import Lock
 
+from services.correlation_engine import CorrelationEngine, CorrelationResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,18 +82,22 @@ class PositionOptimizer:
     for improving position performance and portfolio efficiency.
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None,
+                 correlation_engine: Optional[CorrelationEngine] = None):
         """
         Initialize the position optimizer.
         
         Args:
             db_path (Optional[str]): Path to SQLite database file
+            correlation_engine (Optional[CorrelationEngine]): Return correlation engine
+                (one over the default price history database if omitted)
         """
         import os
         self.db_path = db_path or os.path.join(
             os.path.dirname(__file__), '..', 'instance', 'optimizer.db'
         )
         self.db_lock = Lock()
+        self.correlation_engine = correlation_engine or CorrelationEngine()
         
         # Initialize database
         self._ensure_database()
@@ -390,6 +396,7 @@ class PositionOptimizer:
             
             # Suggest optimal allocation using risk-adjusted returns
             optimal_weights = self._calculate_optimal_allocation(position_metrics)
+            correlation = self._get_return_correlation(positions)
             
             # Generate suggestions for significant reallocation opportunities
             for position_id, current_weight in position_weights.items():
@@ -419,7 +426,8 @@ class PositionOptimizer:
                     expected_improvement = {
                         'portfolio_sharpe_improvement': self._estimate_sharpe_improvement(position_metrics, optimal_weights),
                         'expected_return_improvement': abs(capital_change) * position_metrics[position_id]['apr'] / 100,
-                        'risk_reduction': self._estimate_risk_reduction(position_metrics, optimal_weights)
+                        'risk_reduction': self._estimate_risk_reduction(position_metrics, optimal_weights,
+                                                                        correlation)
                     }
                     
                     suggestion = OptimizationSuggestion(
@@ -575,11 +583,10 @@ class PositionOptimizer:
             # Calculate VaR (95% confidence)
             var_95 = np.percentile(returns, 5) if len(returns) > 0 else 0
             
-            # Calculate diversification ratio
-            diversification_ratio = self._calculate_diversification_ratio(positions)
-            
-            # Calculate correlation matrix
-            correlation_matrix = self._calculate_correlation_matrix(positions)
+            # Calculate diversification ratio and correlation matrix from position returns
+            correlation = self._get_return_correlation(positions)
+            diversification_ratio = self._calculate_diversification_ratio(positions, correlation)
+            correlation_matrix = self._calculate_correlation_matrix(positions, correlation)
             
             metrics = PortfolioMetrics(
                 total_value=total_value,
@@ -760,9 +767,19 @@ class PositionOptimizer:
         return optimal_sharpe - current_sharpe
     
     def _estimate_risk_reduction(self, position_metrics: Dict[str, Dict[str, Any]],
-                               optimal_weights: Dict[str, float]) -> float:
+                               optimal_weights: Dict[str, float],
+                               correlation: Optional[CorrelationResult] = None) -> float:
         """Estimate portfolio risk reduction."""
-        # Simplified risk reduction estimate
+        covariance = self._covariance_for(correlation, list(position_metrics))
+        if covariance is not None:
+            # Reduction in annualized portfolio volatility from return covariance
+            current = np.array([metrics['current_weight'] for metrics in position_metrics.values()])
+            optimal = np.array([optimal_weights.get(pos_id, 0) for pos_id in position_metrics])
+            current_vol = np.sqrt(max(current @ covariance @ current, 0))
+            optimal_vol = np.sqrt(max(optimal @ covariance @ optimal, 0))
+            return float(max(0, current_vol - optimal_vol))
+        
+        # Simplified risk reduction estimate when return history is missing
         current_risk = sum(metrics['risk_score'] * metrics['current_weight']
                           for metrics in position_metrics.values())
         optimal_risk = sum(position_metrics[pos_id]['risk_score'] * weight
@@ -779,13 +796,52 @@ class PositionOptimizer:
         # Estimate increased fee collection from better range positioning
         return daily_volume * fee_tier * 0.2 * 365  # 20% improvement estimate
     
-    def _calculate_diversification_ratio(self, positions: List[Dict[str, Any]]) -> float:
-        """Calculate portfolio diversification ratio."""
+    def _get_return_correlation(self, positions: List[Dict[str, Any]]) -> Optional[CorrelationResult]:
+        """Return correlation of the positions' price histories, or None if unavailable."""
+        if len(positions) < 2:
+            return None
+        
+        try:
+            return self.correlation_engine.compute([p['id'] for p in positions])
+        except Exception as e:
+            logger.warning(f"Return correlation unavailable, using pair heuristics: {str(e)}")
+            return None
+    
+    def _covariance_for(self, correlation: Optional[CorrelationResult],
+                        position_ids: List[str]) -> Optional[np.ndarray]:
+        """Annualized return covariance in position_ids order, if known for every pair."""
+        if correlation is None:
+            return None
+        
+        index = {pos_id: i for i, pos_id in enumerate(correlation.position_ids)}
+        if any(pos_id not in index for pos_id in position_ids):
+            return None
+        
+        order = [index[pos_id] for pos_id in position_ids]
+        covariance = correlation.annualized_covariance()[np.ix_(order, order)]
+        return None if np.isnan(covariance).any() else covariance
+    
+    def _calculate_diversification_ratio(self, positions: List[Dict[str, Any]],
+                                         correlation: Optional[CorrelationResult] = None) -> float:
+        """
+        Calculate portfolio diversification ratio.
+        
+        With return history for every position this is the weighted average
+        volatility over portfolio volatility (1 when positions move together,
+        higher the less they do); otherwise it falls back to pair/protocol variety.
+        """
         if len(positions) <= 1:
             return 1.0
         
-        # Simplified diversification calculation
-        # In practice, this would use correlation matrix and volatilities
+        covariance = self._covariance_for(correlation, [p['id'] for p in positions])
+        if covariance is not None:
+            weights = np.array([p.get('current_value', p['initial_investment']) for p in positions], dtype=float)
+            weights = weights / weights.sum() if weights.sum() > 0 else np.full(len(positions), 1 / len(positions))
+            portfolio_vol = np.sqrt(max(weights @ covariance @ weights, 0))
+            if portfolio_vol > 0:
+                return float(weights @ np.sqrt(np.diag(covariance)) / portfolio_vol)
+        
+        # Simplified diversification calculation without return history
         unique_pairs = set(p['pair_symbol'] for p in positions)
         unique_protocols = set(p.get('protocol', 'Unknown') for p in positions)
         
@@ -794,32 +850,43 @@ class PositionOptimizer:
         
         return (pair_diversification + protocol_diversification) / 2
     
-    def _calculate_correlation_matrix(self, positions: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
-        """Calculate correlation matrix between positions."""
-        # Simplified correlation matrix
-        # In practice, this would use historical return data
+    def _calculate_correlation_matrix(self, positions: List[Dict[str, Any]],
+                                      correlation: Optional[CorrelationResult] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Calculate correlation matrix between positions.
+        
+        Uses the correlation of historical returns where both positions have
+        enough overlapping price history, and a pair-similarity estimate otherwise.
+        """
         correlation_matrix = {}
+        measured = correlation.correlation_dict() if correlation is not None else {}
         
         for i, pos1 in enumerate(positions):
             pos1_id = pos1['id']
             correlation_matrix[pos1_id] = {}
+            row = measured.get(pos1_id, {})
             
             for j, pos2 in enumerate(positions):
                 pos2_id = pos2['id']
+                value = row.get(pos2_id)
                 
                 if i == j:
                     correlation_matrix[pos1_id][pos2_id] = 1.0
+                elif value is not None:
+                    correlation_matrix[pos1_id][pos2_id] = value
                 else:
-                    # Estimate correlation based on pair similarity
-                    if pos1['pair_symbol'] == pos2['pair_symbol']:
-                        correlation_matrix[pos1_id][pos2_id] = 0.8
-                    elif any(token in pos1['pair_symbol'] for token in pos2['pair_symbol'].split('/')):
-                        correlation_matrix[pos1_id][pos2_id] = 0.4
-                    else:
-                        correlation_matrix[pos1_id][pos2_id] = 0.1
+                    correlation_matrix[pos1_id][pos2_id] = self._estimate_pair_correlation(pos1, pos2)
         
         return correlation_matrix
     
+    def _estimate_pair_correlation(self, pos1: Dict[str, Any], pos2: Dict[str, Any]) -> float:
+        """Estimate correlation from pair similarity when return history is missing."""
+        if pos1['pair_symbol'] == pos2['pair_symbol']:
+            return 0.8
+        elif any(token in pos1['pair_symbol'] for token in pos2['pair_symbol'].split('/')):
+            return 0.4
+        return 0.1
+    
     def _save_suggestion(self, suggestion: OptimizationSuggestion):
         """Save optimization suggestion to database."""
         try:
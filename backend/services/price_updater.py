@@ -65,8 +65,7 @@ class PriceUpdateService:
             List[Dict[str, Any]]: List of active positions
         """
         try:
-            positions = self.position_model.get_all_positions()
-            active_positions = [pos for pos in positions if pos.get('status') == 'active']
+            active_positions = self.position_model.get_positions(status='active')
             
             logger.debug(f"Found {len(active_positions)} active positions for price updates")
             return active_positions
@@ -0,0 +1,247 @@
+"""
+SQLite Query Statistics
+
+This module provides cheap, genuine database statistics for monitoring:
+- Per-statement execution latency (count, avg, p50/p95/p99, max, slow count)
+  recorded by connections opened through QueryStats.connect
+- EXPLAIN QUERY PLAN sampling of registered hot queries to detect full table
+  scans and report which indexes they use
+- Table and file sizes from sqlite_stat1, dbstat and page pragmas instead of
+  COUNT(*) over every table
+"""
+
+import re
+import time
+import sqlite3
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+LATENCY_WINDOW = 512           # recent executions kept per statement for percentiles
+MAX_STATEMENTS = 500           # distinct statements tracked before the rest share one entry
+OTHER_STATEMENTS = '<other>'
+STATEMENT_KEY_LENGTH = 200
+
+_WHITESPACE = re.compile(r'\s+')
+# "SCAN t" / "SCAN TABLE t" (the alias, if any, on newer SQLite) without an index;
+# index scans read "SCAN t USING [COVERING] INDEX i"
+_FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+_INDEX_USE = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+
+@dataclass
+class _StatementStats:
+    """Latency counters for one normalized statement."""
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    slow_count: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+
+def statement_key(sql: str) -> str:
+    """Normalize a statement (collapsed whitespace, truncated) for grouping."""
+    return _WHITESPACE.sub(' ', sql).strip()[:STATEMENT_KEY_LENGTH]
+
+
+class QueryStats:
+    """
+    Thread-safe per-statement latency recorder.
+
+    Parameters are bound rather than formatted into the SQL throughout the
+    repo, so grouping by statement text keeps the number of entries small.
+    """
+
+    def __init__(self, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self._lock = threading.Lock()
+        self._statements: Dict[str, _StatementStats] = {}
+
+    def connect(self, db_path: str, **kwargs) -> sqlite3.Connection:
+        """
+        Open a connection whose execute/executemany calls are timed.
+
+        Args:
+            db_path (str): Path to SQLite database file
+            **kwargs: Further sqlite3.connect arguments
+
+        Returns:
+            sqlite3.Connection: Connection recording into these statistics
+        """
+        conn = sqlite3.connect(db_path, factory=_TimedConnection, **kwargs)
+        conn.query_stats = self
+        return conn
+
+    def record(self, sql: str, seconds: float):
+        """Record one execution of a statement."""
+        key = statement_key(sql)
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                if len(self._statements) >= MAX_STATEMENTS:
+                    key = OTHER_STATEMENTS
+                stats = self._statements.setdefault(key, _StatementStats())
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.latencies.append(seconds)
+            if seconds >= self.slow_query_seconds:
+                stats.slow_count += 1
+
+    def totals(self) -> Tuple[int, float, int]:
+        """Cumulative (executions, seconds, slow executions) over all statements."""
+        with self._lock:
+            return (sum(s.count for s in self._statements.values()),
+                    sum(s.total_seconds for s in self._statements.values()),
+                    sum(s.slow_count for s in self._statements.values()))
+
+    def snapshot(self, limit: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latency statistics per statement.
+
+        Args:
+            limit (Optional[int]): Only the statements with the most total time
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Statement -> count, slow_count and
+                avg/p50/p95/p99/max latency in ms (percentiles over the recent window)
+        """
+        with self._lock:
+            statements = [(key, s.count, s.total_seconds, s.max_seconds, s.slow_count, list(s.latencies))
+                          for key, s in self._statements.items()]
+
+        statements.sort(key=lambda item: item[2], reverse=True)
+        result = {}
+        for key, count, total_seconds, max_seconds, slow_count, latencies in statements[:limit]:
+            ordered = sorted(latencies)
+            result[key] = {
+                'count': count,
+                'slow_count': slow_count,
+                'avg_ms': round(total_seconds / count * 1000, 3),
+                'p50_ms': _percentile_ms(ordered, 0.50),
+                'p95_ms': _percentile_ms(ordered, 0.95),
+                'p99_ms': _percentile_ms(ordered, 0.99),
+                'max_ms': round(max_seconds * 1000, 3)
+            }
+        return result
+
+
+def _percentile_ms(ordered: List[float], fraction: float) -> float:
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """Cursor that records how long each statement takes to execute (rows fetched later are not included)."""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.connection.query_stats.record(sql, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self.connection.query_stats.record(sql, time.perf_counter() - started)
+
+
+class _TimedConnection(sqlite3.Connection):
+    """Connection whose cursors are timed; execute shortcuts go through a timed cursor too."""
+
+    query_stats: QueryStats
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, parameters=()) -> Dict[str, Any]:
+    """
+    Plan a statement without running it.
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        sql (str): Statement to plan
+        parameters: Sample parameters for the statement
+
+    Returns:
+        Dict[str, Any]: 'plan' steps, tables read by 'full_scans' and 'indexes' used
+    """
+    steps = [row[-1] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', parameters)]
+    full_scans = sorted({match.group(1) for match in map(_FULL_SCAN.match, steps) if match})
+    indexes = sorted({index for step in steps for index in _INDEX_USE.findall(step)})
+    return {'plan': steps, 'full_scans': full_scans, 'indexes': indexes}
+
+
+def database_file_stats(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Database and free-list size in bytes from the page pragmas."""
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+    freelist_count = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    return {'database_size': page_count * page_size, 'free_bytes': freelist_count * page_size}
+
+
+def analyze(conn: sqlite3.Connection, analysis_limit: int = 1000):
+    """
+    Refresh sqlite_stat1 with a bounded ANALYZE.
+
+    PRAGMA analysis_limit caps the rows ANALYZE visits per index, so the
+    resulting row counts are estimates that never cost a full scan.
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        analysis_limit (int): Rows ANALYZE may visit per index
+    """
+    conn.execute(f'PRAGMA analysis_limit = {int(analysis_limit)}')
+    conn.execute('ANALYZE')
+    conn.commit()
+
+
+def table_row_estimates(conn: sqlite3.Connection) -> Optional[Dict[str, int]]:
+    """
+    Row counts per table from sqlite_stat1 (tables ANALYZE found empty count as 0).
+
+    Returns:
+        Optional[Dict[str, int]]: Table name -> estimated rows, or None if the database was never analyzed
+    """
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is None:
+        return None
+
+    rows = {name: 0 for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")}
+    for table, stat in conn.execute('SELECT tbl, stat FROM sqlite_stat1'):
+        if table in rows and stat:
+            rows[table] = max(rows[table], int(stat.split()[0]))
+    return rows
+
+
+def table_byte_sizes(conn: sqlite3.Connection) -> Optional[Dict[str, int]]:
+    """
+    Bytes used per table, including its indexes, from the dbstat virtual table.
+
+    dbstat walks every page, so callers should refresh this infrequently.
+
+    Returns:
+        Optional[Dict[str, int]]: Table name -> bytes, or None if SQLite was built without dbstat
+    """
+    try:
+        object_bytes = dict(conn.execute('SELECT name, pgsize FROM dbstat WHERE aggregate = TRUE'))
+    except sqlite3.OperationalError:
+        return None
+
+    sizes = {}
+    for name, table in conn.execute("SELECT name, tbl_name FROM sqlite_master WHERE type IN ('table', 'index')"):
+        if not table.startswith('sqlite_'):
+            sizes[table] = sizes.get(table, 0) + object_bytes.get(name, 0)
+    return sizes
+
@@ -12,8 +12,14 @@ This module provides comprehensive reporting capabilities including:
 
 import logging
 import sqlite3
+import csv
+import os
+import time
+import tempfile
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Iterable, Iterator, Callable, Tuple, IO
 from dataclasses import dataclass
 from enum import Enum
 import json
@@ -24,19 +30,20 @@ import base64
 
 # PDF generation
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.linecharts import HorizontalLineChart
 from reportlab.graphics.charts.piecharts import Pie
+from reportlab.pdfgen import canvas
 
 # Excel generation
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.chart import LineChart, PieChart, Reference
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 
 logger = logging.getLogger(__name__)
@@ -86,6 +93,158 @@ class ReportTemplate:
     created_at: datetime = None
 
 
+REPORT_FILES = {
+    ExportFormat.PDF: ('pdf', 'application/pdf'),
+    ExportFormat.EXCEL: ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    ExportFormat.CSV: ('csv', 'text/csv'),
+    ExportFormat.JSON: ('json', 'application/json'),
+}
+
+# Formats each report can be rendered to by a background job
+REPORT_JOB_FORMATS = {
+    ReportType.POSITION_DETAIL: (ExportFormat.CSV,),
+    ReportType.PORTFOLIO_SUMMARY: (ExportFormat.PDF, ExportFormat.EXCEL),
+    ReportType.TAX_REPORT: (ExportFormat.JSON, ExportFormat.CSV),
+}
+
+POSITION_CSV_HEADERS = [
+    'Position Name', 'Pair Symbol', 'Status', 'Protocol', 'Chain',
+    'Entry Date', 'Exit Date', 'Price Range Min', 'Price Range Max',
+    'Initial Investment', 'Current Value', 'Fees Collected', 'P&L',
+    'Return %', 'APR %', 'Current Price', 'In Range', 'Notes'
+]
+
+# (header, column width) of the Excel position details sheet
+POSITION_EXCEL_COLUMNS = [
+    ('Position Name', 30), ('Pair Symbol', 14), ('Status', 10), ('Protocol', 14), ('Entry Date', 22),
+    ('Exit Date', 22), ('Price Range Min', 16), ('Price Range Max', 16), ('Initial Investment', 18),
+    ('Current Value', 16), ('Fees Collected', 16), ('P&L', 14), ('Return %', 12), ('APR %', 12),
+    ('Current Price', 14), ('In Range', 10), ('Notes', 50)
+]
+
+PRICE_HISTORY_EXCEL_COLUMNS = [
+    ('Position ID', 38), ('Token Pair', 14), ('Timestamp', 14), ('Price', 16),
+    ('Volume 24h', 16), ('Liquidity', 16), ('Source', 14)
+]
+
+TAX_EVENT_FIELDS = ['date', 'type', 'position', 'amount', 'description']
+
+TAX_DISCLAIMER = "This report is for informational purposes only. Consult a tax professional for official tax advice."
+
+# Positions (or their history) can be an iterator; the metrics can be a callable
+# evaluated once every position has been written, e.g. a running accumulator
+PortfolioMetrics = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
+
+def _position_returns(pos: Dict[str, Any]) -> Tuple[float, float, float, float]:
+    """Current value, fees, P&L and return % of a position."""
+    current_value = pos.get('current_value', pos['initial_investment'])
+    fees = pos.get('fees_collected', 0)
+    pnl = current_value + fees - pos['initial_investment']
+    return_pct = (pnl / pos['initial_investment'] * 100) if pos['initial_investment'] > 0 else 0
+    return current_value, fees, pnl, return_pct
+
+
+def _resolve_metrics(portfolio_metrics: PortfolioMetrics) -> Dict[str, Any]:
+    return portfolio_metrics() if callable(portfolio_metrics) else portfolio_metrics
+
+
+class _PdfWriter:
+    """
+    Flowing PDF layout drawn straight onto a reportlab canvas.
+    
+    Pages are compressed and handed to the document as soon as they are full,
+    so long tables cost one page of drawing state at a time rather than one
+    flowable per row.
+    """
+    
+    HEADER_BACKGROUND = colors.grey
+    BODY_BACKGROUND = colors.beige
+    
+    def __init__(self, output: Union[str, IO[bytes]], pagesize=letter, margin: float = inch):
+        self.canvas = canvas.Canvas(output, pagesize=pagesize, pageCompression=1)
+        self.width, self.height = pagesize
+        self.margin = margin
+        self.y = self.height - margin
+    
+    def _reserve(self, height: float) -> bool:
+        """Start a new page if `height` does not fit; returns True on a page break."""
+        if self.y - height < self.margin:
+            self.canvas.showPage()
+            self.y = self.height - self.margin
+            return True
+        return False
+    
+    def space(self, height: float):
+        if not self._reserve(height):
+            self.y -= height
+    
+    def text(self, text: str, size: float = 10, font: str = 'Helvetica', centered: bool = False):
+        leading = size * 1.2
+        self._reserve(leading)
+        self.y -= leading
+        self.canvas.setFont(font, size)
+        if centered:
+            self.canvas.drawCentredString(self.width / 2, self.y, text)
+        else:
+            self.canvas.drawString(self.margin, self.y, text)
+    
+    def heading(self, text: str, size: float = 14):
+        self.space(size * 0.5)
+        self.text(text, size=size, font='Helvetica-Bold')
+        self.space(size * 0.5)
+    
+    def field(self, label: str, value: Any, size: float = 10):
+        """A bold label followed by its value on one line."""
+        leading = size * 1.2
+        self._reserve(leading)
+        self.y -= leading
+        label = f"{label}: "
+        self.canvas.setFont('Helvetica-Bold', size)
+        self.canvas.drawString(self.margin, self.y, label)
+        self.canvas.setFont('Helvetica', size)
+        self.canvas.drawString(self.margin + self.canvas.stringWidth(label, 'Helvetica-Bold', size),
+                               self.y, str(value))
+    
+    def table(self, header: List[str], rows: Iterable[List[str]], col_widths: List[float],
+              font_size: float = 8, header_font_size: Optional[float] = None, centered: bool = True):
+        """Grid table drawn row by row; the header is repeated on every page."""
+        header_font_size = header_font_size or font_size
+        header_height = header_font_size + 16
+        row_height = font_size + 6
+        left = (self.width - sum(col_widths)) / 2
+        self._reserve(header_height + row_height)
+        self._table_row(header, left, col_widths, header_height, 'Helvetica-Bold', header_font_size,
+                        self.HEADER_BACKGROUND, colors.whitesmoke, centered)
+        for row in rows:
+            if self._reserve(row_height):
+                self._table_row(header, left, col_widths, header_height, 'Helvetica-Bold', header_font_size,
+                                self.HEADER_BACKGROUND, colors.whitesmoke, centered)
+            self._table_row(row, left, col_widths, row_height, 'Helvetica', font_size,
+                            self.BODY_BACKGROUND, colors.black, centered)
+    
+    def _table_row(self, values: List[str], left: float, col_widths: List[float], height: float,
+                   font: str, size: float, background, text_color, centered: bool):
+        c = self.canvas
+        c.setFont(font, size)
+        bottom = self.y - height
+        baseline = bottom + (height - size) / 2 + size * 0.2
+        x = left
+        for value, width in zip(values, col_widths):
+            c.setFillColor(background)
+            c.rect(x, bottom, width, height, stroke=1, fill=1)
+            c.setFillColor(text_color)
+            if centered:
+                c.drawCentredString(x + width / 2, baseline, value)
+            else:
+                c.drawString(x + 6, baseline, value)
+            x += width
+        self.y = bottom
+    
+    def close(self):
+        self.canvas.save()
+
+
 class ReportingService:
     """
     Comprehensive reporting service for CL position tracking.
@@ -94,19 +253,28 @@ class ReportingService:
     and scheduled reporting functionality.
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, reports_dir: Optional[str] = None,
+                 report_workers: int = 2, report_retention_hours: float = 24):
         """
         Initialize the reporting service.
         
         Args:
             db_path (Optional[str]): Path to SQLite database file
+            reports_dir (Optional[str]): Directory for rendered report files
+                (default: 'reports' next to the database)
+            report_workers (int): Background threads rendering report jobs
+            report_retention_hours (float): Hours rendered report files are kept
         """
-        import os
         self.db_path = db_path or os.path.join(
             os.path.dirname(__file__), '..', 'instance', 'reports.db'
         )
         self.db_lock = Lock()
         
+        # Report jobs render into reports_dir on a small worker pool
+        self.reports_dir = reports_dir or os.path.join(os.path.dirname(self.db_path), 'reports')
+        self.report_retention_hours = report_retention_hours
+        self._job_executor = ThreadPoolExecutor(max_workers=report_workers, thread_name_prefix="ReportJob")
+        
         # Initialize database
         self._ensure_database()
         
@@ -118,8 +286,8 @@ class ReportingService:
     def _ensure_database(self):
         """Ensure the database and tables exist."""
         try:
-            import os
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            os.makedirs(self.reports_dir, exist_ok=True)
             
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -181,7 +349,7 @@ class ReportingService:
             logger.error(f"Error initializing reporting database: {str(e)}")
             raise
     
-    def generate_portfolio_summary_pdf(self, positions: List[Dict[str, Any]], 
+    def generate_portfolio_summary_pdf(self, positions: List[Dict[str, Any]],
                                      portfolio_metrics: Dict[str, Any]) -> bytes:
         """
         Generate a comprehensive portfolio summary PDF report.
@@ -189,75 +357,40 @@ class ReportingService:
         Args:
             positions (List[Dict[str, Any]]): List of positions
             portfolio_metrics (Dict[str, Any]): Portfolio metrics
-            
+        
         Returns:
             bytes: PDF file content
         """
+        buffer = io.BytesIO()
+        self.write_portfolio_summary_pdf(buffer, positions, portfolio_metrics)
+        return buffer.getvalue()
+    
+    def write_portfolio_summary_pdf(self, output: Union[str, IO[bytes]], positions: Iterable[Dict[str, Any]],
+                                    portfolio_metrics: PortfolioMetrics) -> int:
+        """
+        Render the portfolio summary PDF report to a file.
+        
+        Position rows are spooled to a temporary file while the positions are
+        consumed, so the executive summary can come first without holding the
+        portfolio in memory.
+        
+        Args:
+            output (Union[str, IO[bytes]]): File path or binary file object
+            positions (Iterable[Dict[str, Any]]): Positions, e.g. a streaming iterator
+            portfolio_metrics (PortfolioMetrics): Portfolio metrics, or a callable
+                evaluated after all positions have been read
+        
+        Returns:
+            int: Number of positions written
+        """
         try:
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=1  # Center alignment
-            )
-            story.append(Paragraph("Concentrated Liquidity Portfolio Report", title_style))
-            story.append(Spacer(1, 20))
-            
-            # Report metadata
-            report_date = datetime.now().strftime("%B %d, %Y")
-            story.append(Paragraph(f"<b>Report Date:</b> {report_date}", styles['Normal']))
-            story.append(Paragraph(f"<b>Total Positions:</b> {len(positions)}", styles['Normal']))
-            story.append(Spacer(1, 20))
-            
-            # Executive Summary
-            story.append(Paragraph("Executive Summary", styles['Heading2']))
-            
-            summary_data = [
-                ['Metric', 'Value'],
-                ['Total Portfolio Value', f"${portfolio_metrics.get('current_value', 0):,.2f}"],
-                ['Total Investment', f"${portfolio_metrics.get('total_investment', 0):,.2f}"],
-                ['Total Fees Collected', f"${portfolio_metrics.get('total_fees_collected', 0):,.2f}"],
-                ['Total P&L', f"${portfolio_metrics.get('total_pnl', 0):,.2f}"],
-                ['Total Return %', f"{portfolio_metrics.get('total_return_pct', 0):.2f}%"],
-                ['Active Positions', str(portfolio_metrics.get('active_positions', 0))],
-                ['Closed Positions', str(portfolio_metrics.get('closed_positions', 0))]
-            ]
-            
-            summary_table = Table(summary_data, colWidths=[2.5*inch, 2*inch])
-            summary_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(summary_table)
-            story.append(Spacer(1, 30))
-            
-            # Position Details
-            story.append(Paragraph("Position Details", styles['Heading2']))
-            
-            if positions:
-                position_data = [['Position', 'Pair', 'Status', 'Investment', 'Current Value', 'Fees', 'P&L', 'Return %']]
+            with tempfile.TemporaryFile('w+', newline='', encoding='utf-8') as spool:
+                spool_writer = csv.writer(spool)
+                position_count = 0
                 
                 for pos in positions:
-                    current_value = pos.get('current_value', pos['initial_investment'])
-                    fees = pos.get('fees_collected', 0)
-                    pnl = current_value + fees - pos['initial_investment']
-                    return_pct = (pnl / pos['initial_investment'] * 100) if pos['initial_investment'] > 0 else 0
-                    
-                    position_data.append([
+                    current_value, fees, pnl, return_pct = _position_returns(pos)
+                    spool_writer.writerow([
                         pos['trade_name'][:20],  # Truncate long names
                         pos['pair_symbol'],
                         pos['status'].title(),
@@ -267,66 +400,74 @@ class ReportingService:
                         f"${pnl:,.0f}",
                         f"{return_pct:.1f}%"
                     ])
+                    position_count += 1
                 
-                position_table = Table(position_data, colWidths=[1.2*inch, 0.8*inch, 0.7*inch, 0.8*inch, 0.8*inch, 0.6*inch, 0.7*inch, 0.6*inch])
-                position_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
+                portfolio_metrics = _resolve_metrics(portfolio_metrics)
+                pdf = _PdfWriter(output)
                 
-                story.append(position_table)
-            else:
-                story.append(Paragraph("No positions found.", styles['Normal']))
-            
-            story.append(Spacer(1, 30))
-            
-            # Performance Analysis
-            story.append(Paragraph("Performance Analysis", styles['Heading2']))
-            
-            best_position = portfolio_metrics.get('best_performing_position', 'N/A')
-            worst_position = portfolio_metrics.get('worst_performing_position', 'N/A')
-            
-            story.append(Paragraph(f"<b>Best Performing Position:</b> {best_position}", styles['Normal']))
-            story.append(Paragraph(f"<b>Worst Performing Position:</b> {worst_position}", styles['Normal']))
-            story.append(Spacer(1, 10))
-            
-            # Risk Metrics (if available)
-            if 'risk_metrics' in portfolio_metrics:
-                risk_metrics = portfolio_metrics['risk_metrics']
-                story.append(Paragraph("Risk Metrics", styles['Heading3']))
-                story.append(Paragraph(f"<b>Maximum Drawdown:</b> {risk_metrics.get('max_drawdown', 0):.2%}", styles['Normal']))
-                story.append(Paragraph(f"<b>Sharpe Ratio:</b> {risk_metrics.get('sharpe_ratio', 0):.2f}", styles['Normal']))
-                story.append(Paragraph(f"<b>Volatility:</b> {risk_metrics.get('volatility', 0):.2%}", styles['Normal']))
-            
-            # Footer
-            story.append(Spacer(1, 50))
-            footer_style = ParagraphStyle(
-                'Footer',
-                parent=styles['Normal'],
-                fontSize=8,
-                alignment=1
-            )
-            story.append(Paragraph("Generated by CL Position Tracking System", footer_style))
-            story.append(Paragraph(f"Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", footer_style))
-            
-            # Build PDF
-            doc.build(story)
-            buffer.seek(0)
-            
-            logger.info("Generated portfolio summary PDF report")
-            return buffer.getvalue()
+                # Title
+                pdf.text("Concentrated Liquidity Portfolio Report", size=24, font='Helvetica-Bold', centered=True)
+                pdf.space(30)
+                
+                # Report metadata
+                pdf.field("Report Date", datetime.now().strftime("%B %d, %Y"))
+                pdf.field("Total Positions", position_count)
+                pdf.space(20)
+                
+                # Executive Summary
+                pdf.heading("Executive Summary")
+                summary_rows = [
+                    ['Total Portfolio Value', f"${portfolio_metrics.get('current_value', 0):,.2f}"],
+                    ['Total Investment', f"${portfolio_metrics.get('total_investment', 0):,.2f}"],
+                    ['Total Fees Collected', f"${portfolio_metrics.get('total_fees_collected', 0):,.2f}"],
+                    ['Total P&L', f"${portfolio_metrics.get('total_pnl', 0):,.2f}"],
+                    ['Total Return %', f"{portfolio_metrics.get('total_return_pct', 0):.2f}%"],
+                    ['Active Positions', str(portfolio_metrics.get('active_positions', 0))],
+                    ['Closed Positions', str(portfolio_metrics.get('closed_positions', 0))]
+                ]
+                pdf.table(['Metric', 'Value'], summary_rows, [2.5*inch, 2*inch],
+                          font_size=10, header_font_size=12, centered=False)
+                pdf.space(30)
+                
+                # Position Details
+                pdf.heading("Position Details")
+                if position_count:
+                    spool.seek(0)
+                    pdf.table(['Position', 'Pair', 'Status', 'Investment', 'Current Value', 'Fees', 'P&L', 'Return %'],
+                              csv.reader(spool),
+                              [1.2*inch, 0.8*inch, 0.7*inch, 0.8*inch, 0.8*inch, 0.6*inch, 0.7*inch, 0.6*inch])
+                else:
+                    pdf.text("No positions found.")
+                pdf.space(30)
+                
+                # Performance Analysis
+                pdf.heading("Performance Analysis")
+                pdf.field("Best Performing Position", portfolio_metrics.get('best_performing_position', 'N/A'))
+                pdf.field("Worst Performing Position", portfolio_metrics.get('worst_performing_position', 'N/A'))
+                pdf.space(10)
+                
+                # Risk Metrics (if available)
+                if 'risk_metrics' in portfolio_metrics:
+                    risk_metrics = portfolio_metrics['risk_metrics']
+                    pdf.heading("Risk Metrics", size=12)
+                    pdf.field("Maximum Drawdown", f"{risk_metrics.get('max_drawdown', 0):.2%}")
+                    pdf.field("Sharpe Ratio", f"{risk_metrics.get('sharpe_ratio', 0):.2f}")
+                    pdf.field("Volatility", f"{risk_metrics.get('volatility', 0):.2%}")
+                
+                # Footer
+                pdf.space(50)
+                pdf.text("Generated by CL Position Tracking System", size=8, centered=True)
+                pdf.text(f"Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", size=8, centered=True)
+                pdf.close()
             
+            logger.info(f"Generated portfolio summary PDF report ({position_count} positions)")
+            return position_count
+        
         except Exception as e:
             logger.error(f"Error generating portfolio summary PDF: {str(e)}")
             raise
     
-    def generate_portfolio_summary_excel(self, positions: List[Dict[str, Any]], 
+    def generate_portfolio_summary_excel(self, positions: List[Dict[str, Any]],
                                        portfolio_metrics: Dict[str, Any]) -> bytes:
         """
         Generate a comprehensive portfolio summary Excel report.
@@ -334,118 +475,119 @@ class ReportingService:
         Args:
             positions (List[Dict[str, Any]]): List of positions
             portfolio_metrics (Dict[str, Any]): Portfolio metrics
-            
+        
         Returns:
             bytes: Excel file content
         """
+        buffer = io.BytesIO()
+        self.write_portfolio_summary_excel(buffer, positions, portfolio_metrics)
+        return buffer.getvalue()
+    
+    def write_portfolio_summary_excel(self, output: Union[str, IO[bytes]], positions: Iterable[Dict[str, Any]],
+                                      portfolio_metrics: PortfolioMetrics,
+                                      price_history: Optional[Iterable[Dict[str, Any]]] = None) -> int:
+        """
+        Render the portfolio summary Excel report to a file.
+        
+        Uses an openpyxl write-only workbook: rows go straight to the sheet's
+        temporary XML as they are appended, so memory does not grow with the
+        number of positions or history records. Only header rows are styled.
+        
+        Args:
+            output (Union[str, IO[bytes]]): File path or binary file object
+            positions (Iterable[Dict[str, Any]]): Positions, e.g. a streaming iterator
+            portfolio_metrics (PortfolioMetrics): Portfolio metrics, or a callable
+                evaluated after all positions have been read
+            price_history (Optional[Iterable[Dict[str, Any]]]): Price history records
+                for a 'Price History' sheet
+        
+        Returns:
+            int: Number of positions written
+        """
+        workbook = Workbook(write_only=True)
+        
         try:
-            buffer = io.BytesIO()
-            
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                # Portfolio Summary Sheet
-                summary_data = {
-                    'Metric': [
-                        'Total Portfolio Value',
-                        'Total Investment',
-                        'Total Fees Collected',
-                        'Total P&L',
-                        'Total Return %',
-                        'Active Positions',
-                        'Closed Positions'
-                    ],
-                    'Value': [
-                        portfolio_metrics.get('current_value', 0),
-                        portfolio_metrics.get('total_investment', 0),
-                        portfolio_metrics.get('total_fees_collected', 0),
-                        portfolio_metrics.get('total_pnl', 0),
-                        portfolio_metrics.get('total_return_pct', 0),
-                        portfolio_metrics.get('active_positions', 0),
-                        portfolio_metrics.get('closed_positions', 0)
-                    ]
-                }
-                
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='Portfolio Summary', index=False)
-                
-                # Position Details Sheet
-                if positions:
-                    position_data = []
-                    for pos in positions:
-                        current_value = pos.get('current_value', pos['initial_investment'])
-                        fees = pos.get('fees_collected', 0)
-                        pnl = current_value + fees - pos['initial_investment']
-                        return_pct = (pnl / pos['initial_investment'] * 100) if pos['initial_investment'] > 0 else 0
-                        
-                        position_data.append({
-                            'Position Name': pos['trade_name'],
-                            'Pair Symbol': pos['pair_symbol'],
-                            'Status': pos['status'].title(),
-                            'Protocol': pos.get('protocol', 'Unknown'),
-                            'Entry Date': pos['entry_date'],
-                            'Exit Date': pos.get('exit_date', ''),
-                            'Price Range Min': pos['price_range_min'],
-                            'Price Range Max': pos['price_range_max'],
-                            'Initial Investment': pos['initial_investment'],
-                            'Current Value': current_value,
-                            'Fees Collected': fees,
-                            'P&L': pnl,
-                            'Return %': return_pct,
-                            'APR %': pos.get('apr', 0),
-                            'Current Price': pos.get('current_price', ''),
-                            'In Range': pos.get('is_in_range', ''),
-                            'Notes': pos.get('notes', '')
-                        })
-                    
-                    positions_df = pd.DataFrame(position_data)
-                    positions_df.to_excel(writer, sheet_name='Position Details', index=False)
-                
-                # Performance Analysis Sheet
-                perf_data = {
-                    'Analysis': [
-                        'Best Performing Position',
-                        'Worst Performing Position',
-                        'Average Position Return',
-                        'Win Rate',
-                        'Total Trades'
-                    ],
-                    'Value': [
-                        portfolio_metrics.get('best_performing_position', 'N/A'),
-                        portfolio_metrics.get('worst_performing_position', 'N/A'),
-                        f"{portfolio_metrics.get('avg_return_pct', 0):.2f}%",
-                        f"{portfolio_metrics.get('win_rate', 0):.1f}%",
-                        len(positions)
-                    ]
-                }
-                
-                perf_df = pd.DataFrame(perf_data)
-                perf_df.to_excel(writer, sheet_name='Performance Analysis', index=False)
-                
-                # Format the Excel file
-                workbook = writer.book
-                
-                # Format Portfolio Summary sheet
-                summary_sheet = workbook['Portfolio Summary']
-                self._format_excel_sheet(summary_sheet, 'Portfolio Summary')
-                
-                # Format Position Details sheet
-                if 'Position Details' in workbook.sheetnames:
-                    details_sheet = workbook['Position Details']
-                    self._format_excel_sheet(details_sheet, 'Position Details')
-                
-                # Format Performance Analysis sheet
-                perf_sheet = workbook['Performance Analysis']
-                self._format_excel_sheet(perf_sheet, 'Performance Analysis')
+            # Sheets are created up front so they keep their order while rows are streamed
+            summary_sheet = workbook.create_sheet('Portfolio Summary')
+            details_sheet = workbook.create_sheet('Position Details')
+            perf_sheet = workbook.create_sheet('Performance Analysis')
+            history_sheet = workbook.create_sheet('Price History') if price_history is not None else None
+            
+            self._write_excel_header(summary_sheet, [('Metric', 24), ('Value', 20)])
+            self._write_excel_header(details_sheet, POSITION_EXCEL_COLUMNS)
+            self._write_excel_header(perf_sheet, [('Analysis', 28), ('Value', 30)])
+            
+            # Position Details Sheet
+            position_count = 0
+            for pos in positions:
+                current_value, fees, pnl, return_pct = _position_returns(pos)
+                details_sheet.append([
+                    pos['trade_name'],
+                    pos['pair_symbol'],
+                    pos['status'].title(),
+                    pos.get('protocol', 'Unknown'),
+                    pos['entry_date'],
+                    pos.get('exit_date', ''),
+                    pos['price_range_min'],
+                    pos['price_range_max'],
+                    pos['initial_investment'],
+                    current_value,
+                    fees,
+                    pnl,
+                    return_pct,
+                    pos.get('apr', 0),
+                    pos.get('current_price', ''),
+                    pos.get('is_in_range', ''),
+                    pos.get('notes', '')
+                ])
+                position_count += 1
+            
+            # Price History Sheet
+            if history_sheet is not None:
+                self._write_excel_header(history_sheet, PRICE_HISTORY_EXCEL_COLUMNS)
+                for record in price_history:
+                    history_sheet.append([
+                        record.get('position_id'),
+                        record.get('token_pair'),
+                        record.get('timestamp'),
+                        record.get('price'),
+                        record.get('volume_24h'),
+                        record.get('liquidity'),
+                        record.get('source')
+                    ])
+            
+            # Portfolio Summary Sheet
+            portfolio_metrics = _resolve_metrics(portfolio_metrics)
+            for metric, key in [('Total Portfolio Value', 'current_value'),
+                                ('Total Investment', 'total_investment'),
+                                ('Total Fees Collected', 'total_fees_collected'),
+                                ('Total P&L', 'total_pnl'),
+                                ('Total Return %', 'total_return_pct'),
+                                ('Active Positions', 'active_positions'),
+                                ('Closed Positions', 'closed_positions')]:
+                summary_sheet.append([metric, portfolio_metrics.get(key, 0)])
             
-            buffer.seek(0)
+            # Performance Analysis Sheet
+            perf_sheet.append(['Best Performing Position', portfolio_metrics.get('best_performing_position', 'N/A')])
+            perf_sheet.append(['Worst Performing Position', portfolio_metrics.get('worst_performing_position', 'N/A')])
+            perf_sheet.append(['Average Position Return', f"{portfolio_metrics.get('avg_return_pct', 0):.2f}%"])
+            perf_sheet.append(['Win Rate', f"{portfolio_metrics.get('win_rate', 0):.1f}%"])
+            perf_sheet.append(['Total Trades', position_count])
             
-            logger.info("Generated portfolio summary Excel report")
-            return buffer.getvalue()
+            workbook.save(output)
             
+            logger.info(f"Generated portfolio summary Excel report ({position_count} positions)")
+            return position_count
+        
         except Exception as e:
             logger.error(f"Error generating portfolio summary Excel: {str(e)}")
+            # Finish the sheets' temporary XML streams so an abandoned workbook cleans up
+            for sheet in workbook.worksheets:
+                if not sheet.closed:
+                    sheet.close()
             raise
     
-    def generate_tax_report(self, positions: List[Dict[str, Any]], 
+    def generate_tax_report(self, positions: List[Dict[str, Any]],
                           tax_year: int) -> Dict[str, Any]:
         """
         Generate tax report for a specific year.
@@ -453,204 +595,243 @@ class ReportingService:
         Args:
             positions (List[Dict[str, Any]]): List of positions
             tax_year (int): Tax year
-            
+        
         Returns:
             Dict[str, Any]: Tax report data
         """
         try:
-            # Filter positions for the tax year
-            year_start = datetime(tax_year, 1, 1)
-            year_end = datetime(tax_year, 12, 31)
-            
-            relevant_positions = []
-            for pos in positions:
-                entry_date = datetime.fromisoformat(pos['entry_date'].replace('Z', '+00:00'))
-                exit_date = None
-                
-                if pos.get('exit_date'):
-                    exit_date = datetime.fromisoformat(pos['exit_date'].replace('Z', '+00:00'))
-                
-                # Include if opened or closed in tax year
-                if (year_start <= entry_date <= year_end) or (exit_date and year_start <= exit_date <= year_end):
-                    relevant_positions.append(pos)
-            
-            # Calculate tax implications
-            total_fees_income = 0
-            realized_gains = 0
-            realized_losses = 0
-            unrealized_gains = 0
-            
-            taxable_events = []
-            
-            for pos in relevant_positions:
-                fees = pos.get('fees_collected', 0)
-                total_fees_income += fees
-                
-                # Add fee income as taxable event
-                if fees > 0:
-                    taxable_events.append({
-                        'date': pos.get('exit_date', pos['entry_date']),
-                        'type': 'Fee Income',
-                        'position': pos['trade_name'],
-                        'amount': fees,
-                        'description': f"Liquidity provision fees for {pos['pair_symbol']}"
-                    })
-                
-                # Calculate gains/losses for closed positions
-                if pos['status'] == 'closed' and pos.get('exit_date'):
-                    exit_date = datetime.fromisoformat(pos['exit_date'].replace('Z', '+00:00'))
-                    
-                    if year_start <= exit_date <= year_end:
-                        current_value = pos.get('current_value', pos['initial_investment'])
-                        capital_gain = current_value - pos['initial_investment']
-                        
-                        if capital_gain > 0:
-                            realized_gains += capital_gain
-                        else:
-                            realized_losses += abs(capital_gain)
-                        
-                        taxable_events.append({
-                            'date': pos['exit_date'],
-                            'type': 'Capital Gain/Loss',
-                            'position': pos['trade_name'],
-                            'amount': capital_gain,
-                            'description': f"Position closure for {pos['pair_symbol']}"
-                        })
-                
-                # Calculate unrealized gains for open positions
-                elif pos['status'] == 'active':
-                    current_value = pos.get('current_value', pos['initial_investment'])
-                    unrealized_gain = current_value - pos['initial_investment']
-                    unrealized_gains += unrealized_gain
+            totals = {}
+            taxable_events = list(self._iter_tax_events(positions, tax_year, totals))
             
             tax_report = {
                 'tax_year': tax_year,
-                'summary': {
-                    'total_fee_income': total_fees_income,
-                    'realized_capital_gains': realized_gains,
-                    'realized_capital_losses': realized_losses,
-                    'net_realized_gains': realized_gains - realized_losses,
-                    'unrealized_gains': unrealized_gains,
-                    'total_taxable_income': total_fees_income + realized_gains - realized_losses
-                },
+                'summary': self._tax_summary(totals),
                 'taxable_events': sorted(taxable_events, key=lambda x: x['date']),
-                'positions_analyzed': len(relevant_positions),
+                'positions_analyzed': totals['positions_analyzed'],
                 'generated_at': datetime.now().isoformat(),
-                'disclaimer': "This report is for informational purposes only. Consult a tax professional for official tax advice."
+                'disclaimer': TAX_DISCLAIMER
             }
             
             logger.info(f"Generated tax report for year {tax_year}")
             return tax_report
+        
+        except Exception as e:
+            logger.error(f"Error generating tax report: {str(e)}")
+            raise
+    
+    def write_tax_report(self, output: IO[str], positions: Iterable[Dict[str, Any]], tax_year: int,
+                         export_format: ExportFormat = ExportFormat.JSON) -> int:
+        """
+        Render a tax report to a text file.
+        
+        Taxable events are spooled into a temporary SQLite database and read
+        back in date order, so sorting does not need every event in memory.
+        JSON output has the same fields as generate_tax_report; CSV output is
+        the taxable events ledger.
+        
+        Args:
+            output (IO[str]): Text file object
+            positions (Iterable[Dict[str, Any]]): Positions, e.g. a streaming iterator
+            tax_year (int): Tax year
+            export_format (ExportFormat): JSON or CSV
+        
+        Returns:
+            int: Number of taxable events written
+        """
+        try:
+            totals = {}
+            
+            # An empty filename gives a private on-disk database removed on close
+            with closing(sqlite3.connect('')) as spool:
+                spool.execute('''
+                    CREATE TABLE events (
+                        seq INTEGER PRIMARY KEY, date TEXT, type TEXT,
+                        position TEXT, amount REAL, description TEXT
+                    )
+                ''')
+                spool.executemany(
+                    'INSERT INTO events (date, type, position, amount, description) VALUES (?, ?, ?, ?, ?)',
+                    ([event[field] for field in TAX_EVENT_FIELDS]
+                     for event in self._iter_tax_events(positions, tax_year, totals))
+                )
+                events = spool.execute('SELECT date, type, position, amount, description FROM events ORDER BY date, seq')
+                
+                event_count = 0
+                if export_format == ExportFormat.CSV:
+                    writer = csv.writer(output, lineterminator='\n')
+                    writer.writerow(TAX_EVENT_FIELDS)
+                    for event in events:
+                        writer.writerow(event)
+                        event_count += 1
+                else:
+                    output.write(f'{{"tax_year": {json.dumps(tax_year)}, "taxable_events": [')
+                    for event in events:
+                        output.write((', ' if event_count else '') + json.dumps(dict(zip(TAX_EVENT_FIELDS, event))))
+                        event_count += 1
+                    output.write('], ')
+                    output.write(json.dumps({
+                        'summary': self._tax_summary(totals),
+                        'positions_analyzed': totals['positions_analyzed'],
+                        'generated_at': datetime.now().isoformat(),
+                        'disclaimer': TAX_DISCLAIMER
+                    })[1:])
             
+            logger.info(f"Generated tax report for year {tax_year} ({event_count} taxable events)")
+            return event_count
+        
         except Exception as e:
             logger.error(f"Error generating tax report: {str(e)}")
             raise
     
+    def _iter_tax_events(self, positions: Iterable[Dict[str, Any]], tax_year: int,
+                         totals: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield the taxable events of positions opened or closed in the tax year, accumulating totals."""
+        year_start = datetime(tax_year, 1, 1)
+        year_end = datetime(tax_year, 12, 31)
+        totals.update(positions_analyzed=0, fee_income=0, realized_gains=0, realized_losses=0, unrealized_gains=0)
+        
+        for pos in positions:
+            entry_date = datetime.fromisoformat(pos['entry_date'].replace('Z', '+00:00'))
+            exit_date = None
+            
+            if pos.get('exit_date'):
+                exit_date = datetime.fromisoformat(pos['exit_date'].replace('Z', '+00:00'))
+            
+            # Include if opened or closed in tax year
+            if not ((year_start <= entry_date <= year_end) or (exit_date and year_start <= exit_date <= year_end)):
+                continue
+            
+            totals['positions_analyzed'] += 1
+            fees = pos.get('fees_collected', 0)
+            totals['fee_income'] += fees
+            
+            # Add fee income as taxable event
+            if fees > 0:
+                yield {
+                    'date': pos.get('exit_date') or pos['entry_date'],
+                    'type': 'Fee Income',
+                    'position': pos['trade_name'],
+                    'amount': fees,
+                    'description': f"Liquidity provision fees for {pos['pair_symbol']}"
+                }
+            
+            # Calculate gains/losses for closed positions
+            if pos['status'] == 'closed' and exit_date:
+                if year_start <= exit_date <= year_end:
+                    current_value = pos.get('current_value', pos['initial_investment'])
+                    capital_gain = current_value - pos['initial_investment']
+                    
+                    if capital_gain > 0:
+                        totals['realized_gains'] += capital_gain
+                    else:
+                        totals['realized_losses'] += abs(capital_gain)
+                    
+                    yield {
+                        'date': pos['exit_date'],
+                        'type': 'Capital Gain/Loss',
+                        'position': pos['trade_name'],
+                        'amount': capital_gain,
+                        'description': f"Position closure for {pos['pair_symbol']}"
+                    }
+            
+            # Calculate unrealized gains for open positions
+            elif pos['status'] == 'active':
+                current_value = pos.get('current_value', pos['initial_investment'])
+                totals['unrealized_gains'] += current_value - pos['initial_investment']
+    
+    @staticmethod
+    def _tax_summary(totals: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'total_fee_income': totals['fee_income'],
+            'realized_capital_gains': totals['realized_gains'],
+            'realized_capital_losses': totals['realized_losses'],
+            'net_realized_gains': totals['realized_gains'] - totals['realized_losses'],
+            'unrealized_gains': totals['unrealized_gains'],
+            'total_taxable_income': totals['fee_income'] + totals['realized_gains'] - totals['realized_losses']
+        }
+    
     def export_positions_csv(self, positions: List[Dict[str, Any]]) -> str:
         """
         Export positions to CSV format.
         
         Args:
             positions (List[Dict[str, Any]]): List of positions
-            
+        
         Returns:
             str: CSV content
         """
+        if not positions:
+            return "No positions to export"
+        
+        buffer = io.StringIO()
+        self.write_positions_csv(buffer, positions)
+        return buffer.getvalue()
+    
+    def write_positions_csv(self, output: IO[str], positions: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write positions as CSV, one row at a time.
+        
+        Args:
+            output (IO[str]): Text file object (opened with newline='')
+            positions (Iterable[Dict[str, Any]]): Positions, e.g. a streaming iterator
+        
+        Returns:
+            int: Number of positions written
+        """
         try:
-            if not positions:
-                return "No positions to export"
-            
-            # Prepare data for CSV
-            csv_data = []
-            headers = [
-                'Position Name', 'Pair Symbol', 'Status', 'Protocol', 'Chain',
-                'Entry Date', 'Exit Date', 'Price Range Min', 'Price Range Max',
-                'Initial Investment', 'Current Value', 'Fees Collected', 'P&L',
-                'Return %', 'APR %', 'Current Price', 'In Range', 'Notes'
-            ]
-            
-            csv_data.append(','.join(headers))
+            writer = csv.writer(output, lineterminator='\n')
+            writer.writerow(POSITION_CSV_HEADERS)
             
+            position_count = 0
             for pos in positions:
-                current_value = pos.get('current_value', pos['initial_investment'])
-                fees = pos.get('fees_collected', 0)
-                pnl = current_value + fees - pos['initial_investment']
-                return_pct = (pnl / pos['initial_investment'] * 100) if pos['initial_investment'] > 0 else 0
-                
-                row = [
-                    f'"{pos["trade_name"]}"',
+                current_value, fees, pnl, return_pct = _position_returns(pos)
+                writer.writerow([
+                    pos['trade_name'],
                     pos['pair_symbol'],
                     pos['status'],
                     pos.get('protocol', ''),
                     pos.get('chain', ''),
                     pos['entry_date'],
                     pos.get('exit_date', ''),
-                    str(pos['price_range_min']),
-                    str(pos['price_range_max']),
-                    str(pos['initial_investment']),
-                    str(current_value),
-                    str(fees),
-                    str(pnl),
+                    pos['price_range_min'],
+                    pos['price_range_max'],
+                    pos['initial_investment'],
+                    current_value,
+                    fees,
+                    pnl,
                     f"{return_pct:.2f}",
-                    str(pos.get('apr', 0)),
-                    str(pos.get('current_price', '')),
-                    str(pos.get('is_in_range', '')),
-                    f'"{pos.get("notes", "")}"'
-                ]
-                
-                csv_data.append(','.join(row))
-            
-            csv_content = '\n'.join(csv_data)
-            
-            logger.info(f"Exported {len(positions)} positions to CSV")
-            return csv_content
+                    pos.get('apr', 0),
+                    pos.get('current_price', ''),
+                    pos.get('is_in_range', ''),
+                    pos.get('notes', '')
+                ])
+                position_count += 1
             
+            logger.info(f"Exported {position_count} positions to CSV")
+            return position_count
+        
         except Exception as e:
             logger.error(f"Error exporting positions to CSV: {str(e)}")
             raise
     
-    def _format_excel_sheet(self, sheet, sheet_name: str):
-        """Format Excel sheet with styling."""
-        try:
-            # Header formatting
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            
-            # Apply header formatting to first row
-            for cell in sheet[1]:
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Auto-adjust column widths
-            for column in sheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 50)
-                sheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Add borders
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            for row in sheet.iter_rows():
-                for cell in row:
-                    cell.border = thin_border
-            
-        except Exception as e:
-            logger.error(f"Error formatting Excel sheet {sheet_name}: {str(e)}")
+    def _write_excel_header(self, sheet, columns: List[Tuple[str, int]]):
+        """Set column widths and append a styled header row to a write-only sheet."""
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        thin_side = Side(style='thin')
+        header_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+        
+        header = []
+        for index, (title, width) in enumerate(columns, start=1):
+            sheet.column_dimensions[get_column_letter(index)].width = width
+            cell = WriteOnlyCell(sheet, value=title)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.border = header_border
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            header.append(cell)
+        
+        sheet.append(header)
     
     def _create_default_templates(self):
         """Create default report templates."""
@@ -861,4 +1042,181 @@ class ReportingService:
             
         except Exception as e:
             logger.error(f"Error logging report generation: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    def submit_report_job(self, report_type: ReportType, export_format: ExportFormat,
+                          positions: Iterable[Dict[str, Any]],
+                          portfolio_metrics: Optional[PortfolioMetrics] = None,
+                          price_history: Optional[Iterable[Dict[str, Any]]] = None,
+                          parameters: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Queue a report to be rendered to a file by a background worker.
+        
+        Sources are consumed on the worker thread, so lazy iterators (e.g.
+        CLService.iter_positions) are read in batches while the file is written.
+        
+        Args:
+            report_type (ReportType): POSITION_DETAIL, PORTFOLIO_SUMMARY or TAX_REPORT
+            export_format (ExportFormat): Output format (see REPORT_JOB_FORMATS)
+            positions (Iterable[Dict[str, Any]]): Positions to report on
+            portfolio_metrics (Optional[PortfolioMetrics]): Metrics for portfolio summaries,
+                or a callable evaluated after all positions have been read
+            price_history (Optional[Iterable[Dict[str, Any]]]): Price history for Excel summaries
+            parameters (Optional[Dict[str, Any]]): Report parameters ('tax_year' for tax reports)
+        
+        Returns:
+            str: Job ID (the report history record ID)
+        
+        Raises:
+            ValueError: If the report type cannot be rendered in the format
+        """
+        if export_format not in REPORT_JOB_FORMATS.get(report_type, ()):
+            raise ValueError(f"{report_type.value} reports cannot be exported as {export_format.value}")
+        
+        self.cleanup_report_files()
+        
+        job_id = self.log_report_generation(report_type.value, export_format.value, status='queued')
+        self._job_executor.submit(self._run_report_job, job_id, report_type, export_format, positions,
+                                  portfolio_metrics or {}, price_history, parameters or {})
+        
+        logger.info(f"Queued {report_type.value} report job {job_id} ({export_format.value})")
+        return job_id
+    
+    def get_report_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status of a report job.
+        
+        Args:
+            job_id (str): Job ID
+        
+        Returns:
+            Optional[Dict[str, Any]]: Job record with 'mimetype' and 'download_name', or None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute('SELECT * FROM report_history WHERE id = ?', (job_id,)).fetchone()
+            
+            if not row:
+                return None
+            
+            job = dict(row)
+            extension, mimetype = REPORT_FILES[ExportFormat(job['export_format'])]
+            created = datetime.fromtimestamp(job['created_at']).strftime('%Y%m%d_%H%M%S')
+            job['mimetype'] = mimetype
+            job['download_name'] = f"{job['report_type']}_{created}.{extension}"
+            return job
+        
+        except Exception as e:
+            logger.error(f"Error retrieving report job {job_id}: {str(e)}")
+            raise
+    
+    def wait_for_report_job(self, job_id: str, timeout: float = 30.0, poll_interval: float = 0.05) -> Optional[Dict[str, Any]]:
+        """
+        Wait until a report job has finished.
+        
+        Args:
+            job_id (str): Job ID
+            timeout (float): Seconds to wait
+            poll_interval (float): Seconds between status checks
+        
+        Returns:
+            Optional[Dict[str, Any]]: Final job record, or the current one on timeout
+        """
+        deadline = time.time() + timeout
+        job = self.get_report_job(job_id)
+        while job and job['status'] in ('queued', 'running') and time.time() < deadline:
+            time.sleep(poll_interval)
+            job = self.get_report_job(job_id)
+        return job
+    
+    def cleanup_report_files(self, max_age_hours: Optional[float] = None) -> int:
+        """
+        Delete rendered report files older than the retention period.
+        
+        Args:
+            max_age_hours (Optional[float]): Retention in hours (default: report_retention_hours)
+        
+        Returns:
+            int: Number of files removed
+        """
+        try:
+            max_age_hours = self.report_retention_hours if max_age_hours is None else max_age_hours
+            cutoff = int((datetime.now() - timedelta(hours=max_age_hours)).timestamp())
+            
+            with self.db_lock:
+                with sqlite3.connect(self.db_path) as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute('''
+                        SELECT id, file_path FROM report_history
+                        WHERE status = 'completed' AND file_path IS NOT NULL AND created_at < ?
+                    ''', (cutoff,))
+                    expired = cursor.fetchall()
+                    
+                    for _, file_path in expired:
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+                    
+                    cursor.executemany('''
+                        UPDATE report_history SET status = 'expired', file_path = NULL WHERE id = ?
+                    ''', [(history_id,) for history_id, _ in expired])
+                    
+                    conn.commit()
+            
+            return len(expired)
+        
+        except Exception as e:
+            logger.error(f"Error cleaning up report files: {str(e)}")
+            return 0
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the report job workers."""
+        self._job_executor.shutdown(wait=wait)
+    
+    def _run_report_job(self, job_id: str, report_type: ReportType, export_format: ExportFormat,
+                        positions: Iterable[Dict[str, Any]], portfolio_metrics: PortfolioMetrics,
+                        price_history: Optional[Iterable[Dict[str, Any]]], parameters: Dict[str, Any]):
+        """Render a queued report to a partial file and move it into place when complete."""
+        started = time.time()
+        extension, _ = REPORT_FILES[export_format]
+        file_path = os.path.join(self.reports_dir, f"{job_id}.{extension}")
+        partial_path = f"{file_path}.part"
+        self._update_report_job(job_id, status='running')
+        
+        try:
+            if export_format in (ExportFormat.CSV, ExportFormat.JSON):
+                with open(partial_path, 'w', newline='', encoding='utf-8') as output:
+                    if report_type == ReportType.TAX_REPORT:
+                        self.write_tax_report(output, positions, parameters['tax_year'], export_format)
+                    else:
+                        self.write_positions_csv(output, positions)
+            else:
+                with open(partial_path, 'wb') as output:
+                    if export_format == ExportFormat.PDF:
+                        self.write_portfolio_summary_pdf(output, positions, portfolio_metrics)
+                    else:
+                        self.write_portfolio_summary_excel(output, positions, portfolio_metrics, price_history)
+            
+            os.replace(partial_path, file_path)
+            self._update_report_job(job_id, status='completed', file_path=file_path,
+                                    file_size=os.path.getsize(file_path),
+                                    generation_time_ms=int((time.time() - started) * 1000))
+            logger.info(f"Report job {job_id} completed")
+        
+        except Exception as e:
+            logger.error(f"Report job {job_id} failed: {str(e)}")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            self._update_report_job(job_id, status='failed', error_message=str(e),
+                                    generation_time_ms=int((time.time() - started) * 1000))
+    
+    def _update_report_job(self, job_id: str, **fields):
+        """Update columns of a report history record."""
+        with self.db_lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    f"UPDATE report_history SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ?",
+                    (*fields.values(), job_id)
+                )
+                conn.commit()
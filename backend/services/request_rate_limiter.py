@@ -0,0 +1,209 @@
+"""
+Per-Client Request Rate Limiter
+
+This module limits how often each client may call an endpoint:
+- GCRA (generic cell rate algorithm): one "theoretical arrival time" per
+  client, so every check is O(1) in time and state, and a client may burst
+  up to the full limit and then continues at the steady rate
+- An in-memory store bounded by LRU eviction, so memory stays flat however
+  many distinct clients appear
+- An optional SQLite store, so several worker processes share one limit
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CLIENTS = 100000   # client keys kept in memory before the least recently seen is evicted
+DEFAULT_PRUNE_INTERVAL = 60.0  # seconds between deletions of fully recovered keys from the SQLite store
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float          # seconds until the next request would be allowed (0 if allowed)
+    reset_after: float          # seconds until the client is back to its full burst
+
+
+def _gcra(tat: Optional[float], now: float, limit: int, period: float) -> Tuple[RateLimitDecision, float]:
+    """
+    Apply one request to a client's theoretical arrival time (TAT).
+
+    Each request pushes the TAT one emission interval (period / limit) past
+    max(TAT, now); the request is allowed while the TAT stays within one
+    period of now.
+
+    Returns:
+        Tuple[RateLimitDecision, float]: The decision and the TAT to store (unchanged if rejected)
+    """
+    interval = period / limit
+    base = now if tat is None or tat < now else tat
+    new_tat = base + interval
+
+    if new_tat - now > period + 1e-9:
+        return RateLimitDecision(False, limit, 0, new_tat - period - now, base - now), tat
+
+    remaining = int((period - (new_tat - now)) / interval + 1e-9)
+    return RateLimitDecision(True, limit, remaining, 0.0, new_tat - now), new_tat
+
+
+class MemoryRateLimitStore:
+    """Process-local TAT store with least-recently-seen eviction."""
+
+    def __init__(self, max_clients: int = DEFAULT_MAX_CLIENTS):
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._tats: OrderedDict = OrderedDict()
+        self._evictions = 0
+
+    def hit(self, key: str, now: float, limit: int, period: float) -> RateLimitDecision:
+        with self._lock:
+            tat = self._tats.get(key)
+            decision, new_tat = _gcra(tat, now, limit, period)
+
+            if tat is not None:
+                self._tats.move_to_end(key)
+            if new_tat is not None:
+                self._tats[key] = new_tat
+                if len(self._tats) > self.max_clients:
+                    # The oldest entry is the client seen least recently; dropping it at
+                    # worst lets that client start over with a full burst
+                    self._tats.popitem(last=False)
+                    self._evictions += 1
+
+        return decision
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'store': 'memory', 'clients': len(self._tats), 'max_clients': self.max_clients,
+                    'evictions': self._evictions}
+
+
+class SQLiteRateLimitStore:
+    """
+    TAT store shared by every process using the same database file.
+
+    Each check is one short IMMEDIATE transaction, so concurrent workers
+    serialize on SQLite's write lock and never both spend the last request.
+    Keys whose TAT has passed are fully recovered and are pruned periodically.
+    """
+
+    def __init__(self, db_path: str, prune_interval: float = DEFAULT_PRUNE_INTERVAL, timeout: float = 5.0):
+        self.db_path = db_path
+        self.prune_interval = prune_interval
+        self.timeout = timeout
+        self._local = threading.local()
+        self._last_prune = 0.0  # first check also clears keys left over from earlier runs
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limit_state (
+                    key TEXT PRIMARY KEY,
+                    tat REAL NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, kept open so a check does not pay for connecting."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, now: float, limit: int, period: float) -> RateLimitDecision:
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tat FROM rate_limit_state WHERE key = ?', (key,)).fetchone()
+            decision, new_tat = _gcra(row[0] if row else None, now, limit, period)
+            if decision.allowed:
+                conn.execute('''
+                    INSERT INTO rate_limit_state (key, tat) VALUES (?, ?)
+                    ON CONFLICT(key) DO UPDATE SET tat = excluded.tat
+                ''', (key, new_tat))
+
+            if now - self._last_prune >= self.prune_interval:
+                conn.execute('DELETE FROM rate_limit_state WHERE tat < ?', (now,))
+                self._last_prune = now
+
+            conn.execute('COMMIT')
+            return decision
+
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def get_metrics(self) -> Dict[str, Any]:
+        clients = self._connection().execute('SELECT COUNT(*) FROM rate_limit_state').fetchone()[0]
+        return {'store': 'sqlite', 'clients': clients, 'db_path': self.db_path}
+
+
+class RequestRateLimiter:
+    """
+    Checks requests against per-key limits in a pluggable store.
+
+    If the store fails (e.g. the shared database stays locked past its
+    timeout) the request is allowed, so rate limiting never takes the API down.
+    """
+
+    def __init__(self, store=None):
+        """
+        Initialize the limiter.
+
+        Args:
+            store: MemoryRateLimitStore (default) or SQLiteRateLimitStore
+        """
+        self.store = store or MemoryRateLimitStore()
+        self._counters = {'allowed': 0, 'limited': 0, 'store_errors': 0}
+        self._counters_lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, period: float = 60.0, now: Optional[float] = None) -> RateLimitDecision:
+        """
+        Count one request for a key.
+
+        Args:
+            key (str): Client key, e.g. endpoint and client address
+            limit (int): Requests allowed per period
+            period (float): Period in seconds
+            now (Optional[float]): Current Unix time (default: time.time())
+
+        Returns:
+            RateLimitDecision: Whether the request is allowed, and when to retry if not
+        """
+        now = time.time() if now is None else now
+        try:
+            decision = self.store.hit(key, now, limit, period)
+        except Exception as e:
+            logger.warning(f"Rate limit store error, allowing request: {str(e)}")
+            decision = RateLimitDecision(True, limit, limit, 0.0, 0.0)
+            counter = 'store_errors'
+        else:
+            counter = 'allowed' if decision.allowed else 'limited'
+
+        with self._counters_lock:
+            self._counters[counter] += 1
+        return decision
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get limiter metrics.
+
+        Returns:
+            Dict[str, Any]: Allowed/limited/store error counts and the store's client count
+        """
+        with self._counters_lock:
+            counters = dict(self._counters)
+        return {**counters, **self.store.get_metrics()}
@@ -0,0 +1,255 @@
+"""
+Server-Sent Events Broadcast Hub
+
+This module fans one periodically computed payload out to many SSE clients:
+- A single producer thread computes the payload once per tick, however many
+  clients are connected, and serializes it to an SSE frame once
+- Each subscriber gets a small bounded queue of pre-serialized frames; a
+  client that falls a full queue behind is dropped instead of buffering
+- The number of subscribers is capped
+- The producer only runs while someone is subscribed
+- New subscribers receive the latest frame immediately
+"""
+
+import json
+import time
+import queue
+import logging
+import threading
+from typing import Dict, Any, Optional, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 5.0         # seconds between payloads
+DEFAULT_MAX_SUBSCRIBERS = 100
+DEFAULT_QUEUE_SIZE = 4         # frames a subscriber may fall behind before it is dropped
+DEFAULT_KEEPALIVE = 15.0       # seconds of silence before a keep-alive comment is sent
+
+KEEPALIVE_FRAME = b': keepalive\n\n'
+_CLOSED = None                 # queue sentinel telling a subscriber to stop
+
+
+class HubFullError(Exception):
+    """Raised when a hub already has its maximum number of subscribers."""
+    pass
+
+
+def sse_frame(payload: Dict[str, Any], event: Optional[str] = None) -> bytes:
+    """Serialize a payload as one SSE frame."""
+    frame = f"event: {event}\n" if event else ""
+    return f"{frame}data: {json.dumps(payload, default=str)}\n\n".encode('utf-8')
+
+
+class Subscription:
+    """
+    One client's view of a hub: iterate it to receive SSE frames.
+
+    Iteration ends when the hub drops or closes the subscription; the owner
+    should call close() when the client goes away (e.g. in a finally block).
+    """
+
+    def __init__(self, hub: 'BroadcastHub', queue_size: int, keepalive_seconds: float):
+        self.hub = hub
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.keepalive_seconds = keepalive_seconds
+        self.dropped = False
+        self.closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        while not self.closed:
+            try:
+                frame = self.queue.get(timeout=self.keepalive_seconds)
+            except queue.Empty:
+                # Writing something lets the server notice clients that went away
+                yield KEEPALIVE_FRAME
+                continue
+            if frame is _CLOSED:
+                break
+            yield frame
+
+    def close(self):
+        """Unsubscribe from the hub."""
+        self.hub.unsubscribe(self)
+
+    def _offer(self, frame: bytes) -> bool:
+        """Queue a frame without blocking; False if the subscriber is a full queue behind."""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except queue.Full:
+            return False
+
+    def _end(self, dropped: bool = False):
+        """Stop iteration, making room in the queue for the close sentinel if needed."""
+        self.dropped = dropped
+        self.closed = True
+        while True:
+            try:
+                self.queue.put_nowait(_CLOSED)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class BroadcastHub:
+    """
+    Publish/subscribe hub that computes a payload once per tick for all subscribers.
+
+    The tick's cost is one produce() call and one serialization; fan-out is a
+    non-blocking put of the same bytes into each subscriber queue.
+    """
+
+    def __init__(self, produce: Callable[[], Dict[str, Any]], interval_seconds: float = DEFAULT_INTERVAL,
+                 max_subscribers: int = DEFAULT_MAX_SUBSCRIBERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 keepalive_seconds: float = DEFAULT_KEEPALIVE, event: Optional[str] = None,
+                 name: str = 'sse-hub'):
+        """
+        Initialize the hub.
+
+        Args:
+            produce (Callable[[], Dict[str, Any]]): Computes one payload
+            interval_seconds (float): Seconds between payloads
+            max_subscribers (int): Subscribers allowed at once
+            queue_size (int): Frames a subscriber may fall behind before it is dropped
+            keepalive_seconds (float): Idle seconds before a subscriber yields a keep-alive comment
+            event (Optional[str]): SSE event name for the frames
+            name (str): Producer thread name
+        """
+        self.produce = produce
+        self.interval_seconds = interval_seconds
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds
+        self.event = event
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._latest_frame: Optional[bytes] = None
+        self._producer: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._stats = {'ticks': 0, 'errors': 0, 'frames_sent': 0, 'dropped': 0, 'rejected': 0,
+                       'last_tick_ms': 0.0}
+
+    def subscribe(self) -> Subscription:
+        """
+        Add a subscriber, starting the producer if it is not running.
+
+        Returns:
+            Subscription: Iterable of SSE frames, starting with the latest frame if there is one
+
+        Raises:
+            HubFullError: If max_subscribers are already connected
+        """
+        subscription = Subscription(self, self.queue_size, self.keepalive_seconds)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self._stats['rejected'] += 1
+                raise HubFullError(f"{self.name} already has {self.max_subscribers} subscribers")
+
+            self._subscribers.add(subscription)
+            if self._latest_frame is not None:
+                subscription._offer(self._latest_frame)
+
+            if self._producer is None or not self._producer.is_alive():
+                self._wakeup.clear()
+                self._producer = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._producer.start()
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber; the producer stops at its next tick once none are left."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+            if not self._subscribers:
+                self._wakeup.set()
+        subscription.closed = True
+
+    def close(self):
+        """End every subscription and stop the producer."""
+        with self._lock:
+            subscribers, self._subscribers = list(self._subscribers), set()
+            producer = self._producer
+            self._wakeup.set()
+
+        for subscription in subscribers:
+            subscription._end()
+        if producer is not None and producer is not threading.current_thread():
+            producer.join(timeout=self.interval_seconds + 1)
+
+    def publish(self, payload: Dict[str, Any]) -> int:
+        """
+        Serialize a payload once and offer it to every subscriber, dropping those a full queue behind.
+
+        Args:
+            payload (Dict[str, Any]): Payload to broadcast
+
+        Returns:
+            int: Number of subscribers the frame was queued for
+        """
+        frame = sse_frame(payload, self.event)
+        with self._lock:
+            self._latest_frame = frame
+            subscribers = list(self._subscribers)
+
+        slow = [subscription for subscription in subscribers if not subscription._offer(frame)]
+        if slow:
+            with self._lock:
+                self._subscribers.difference_update(slow)
+                self._stats['dropped'] += len(slow)
+            for subscription in slow:
+                subscription._end(dropped=True)
+            logger.warning(f"{self.name}: dropped {len(slow)} slow subscriber(s)")
+
+        delivered = len(subscribers) - len(slow)
+        with self._lock:
+            self._stats['frames_sent'] += delivered
+        return delivered
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get hub metrics.
+
+        Returns:
+            Dict[str, Any]: Subscriber count and limit, producer state, ticks, producer
+                errors, frames sent, dropped/rejected subscribers and the last tick's cost in ms
+        """
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'max_subscribers': self.max_subscribers,
+                'producer_running': self._producer is not None and self._producer.is_alive(),
+                **self._stats
+            }
+
+    def _run(self):
+        """Producer loop: one payload per tick while anyone is subscribed."""
+        next_tick = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    # Don't greet a later subscriber with a frame from before the idle period
+                    self._producer = None
+                    self._latest_frame = None
+                    return
+
+            started = time.perf_counter()
+            try:
+                self.publish(self.produce())
+            except Exception as e:
+                logger.error(f"{self.name}: error producing payload: {str(e)}")
+                with self._lock:
+                    self._stats['errors'] += 1
+
+            with self._lock:
+                self._stats['ticks'] += 1
+                self._stats['last_tick_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+            next_tick = max(next_tick + self.interval_seconds, time.monotonic())
+            # Woken early when the last subscriber leaves or the hub is closed
+            self._wakeup.wait(next_tick - time.monotonic())
+            self._wakeup.clear()
@@ -16,7 +16,7 @@ import psutil
 import time
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Iterable
 from dataclasses import dataclass
 from enum import Enum
 import json
@@ -25,6 +25,12 @@ from threading import Lock
 import os
 import gc
 from collections import defaultdict, deque
+from itertools import takewhile
+
+from services.query_stats import (
+    QueryStats, DEFAULT_SLOW_QUERY_MS, explain_query_plan, database_file_stats,
+    analyze, table_row_estimates, table_byte_sizes
+)
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +76,10 @@ class DatabaseMetrics:
     database_size: int
     table_sizes: Dict[str, int]
     index_usage: Dict[str, float]
+    free_bytes: int = 0
+    table_bytes: Dict[str, int] = None
+    statements: Dict[str, Dict[str, Any]] = None
+    hot_queries: Dict[str, Dict[str, Any]] = None
 
 
 @dataclass
@@ -95,6 +105,143 @@ class HealthCheck:
     metadata: Dict[str, Any] = None
 
 
+# (name, bucket seconds, capacity) of the in-memory system metric rings:
+# one hour of samples, one day of minutes and thirty days of hours
+METRIC_RESOLUTIONS = [('1s', 1, 3600), ('1m', 60, 1440), ('1h', 3600, 720)]
+
+# Minute rollups are what gets written to system_metrics
+PERSISTED_RESOLUTION = '1m'
+
+# Fields averaged when samples are rolled up; network_io and uptime_seconds
+# are cumulative and keep the last value of the bucket instead
+GAUGE_FIELDS = ('cpu_usage', 'memory_usage', 'disk_usage', 'process_count')
+
+
+class MetricHistory:
+    """
+    Fixed-size in-memory system metric history at several resolutions.
+    
+    Samples land in the finest ring; each coarser ring receives the
+    sample-weighted mean of every completed bucket of the ring below it.
+    Rings are bounded deques, so memory stays constant and history queries
+    never touch the database.
+    """
+    
+    def __init__(self, resolutions: List[tuple] = METRIC_RESOLUTIONS):
+        self.resolutions = resolutions
+        self.lock = Lock()
+        self.rings = {name: deque(maxlen=capacity) for name, _, capacity in resolutions}
+        self.latest: Optional[SystemMetrics] = None
+        self._open: Dict[str, Optional[Dict[str, Any]]] = {name: None for name, _, _ in resolutions}
+    
+    def record(self, point: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Add a sample to the finest ring and roll it up into coarser buckets.
+        
+        Args:
+            point (Dict[str, Any]): Sample point (see _sample_point)
+            
+        Returns:
+            Optional[Dict[str, Any]]: The PERSISTED_RESOLUTION rollup completed by this sample, if any
+        """
+        with self.lock:
+            self.rings[self.resolutions[0][0]].append(point)
+            return self._accumulate(1, point) if len(self.resolutions) > 1 else None
+    
+    def load(self, points: Iterable[Dict[str, Any]]):
+        """Rebuild the PERSISTED_RESOLUTION ring and the rings above it from stored rollups."""
+        level = self._level(PERSISTED_RESOLUTION)
+        with self.lock:
+            for point in points:
+                self._accumulate(level, point)
+            if self._open[PERSISTED_RESOLUTION] is not None:
+                self._close(level)
+    
+    def query(self, since: int, resolution: str) -> List[Dict[str, Any]]:
+        """
+        Points of a resolution from `since` onwards, including the bucket still being filled.
+        
+        Args:
+            since (int): Unix timestamp
+            resolution (str): Resolution name
+            
+        Returns:
+            List[Dict[str, Any]]: Points in timestamp order
+        """
+        with self.lock:
+            points = list(takewhile(lambda p: p['timestamp'] >= since, reversed(self.rings[resolution])))
+            points.reverse()
+            if self._open[resolution] is not None:
+                points.append(self._rollup(self._open[resolution]))
+        return points
+    
+    def resolution_for(self, seconds: float) -> str:
+        """The finest resolution whose ring covers a window of `seconds`."""
+        for name, bucket_seconds, capacity in self.resolutions:
+            if bucket_seconds * capacity >= seconds:
+                return name
+        return self.resolutions[-1][0]
+    
+    def _level(self, resolution: str) -> int:
+        return [name for name, _, _ in self.resolutions].index(resolution)
+    
+    def _accumulate(self, level: int, point: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fold a point into the open bucket of a level; returns the PERSISTED_RESOLUTION point it closed."""
+        name, bucket_seconds, _ = self.resolutions[level]
+        bucket = point['timestamp'] - point['timestamp'] % bucket_seconds
+        closed = None
+        
+        current = self._open[name]
+        if current is not None and current['timestamp'] != bucket:
+            closed = self._close(level)
+        
+        if self._open[name] is None:
+            self._open[name] = {
+                'timestamp': bucket,
+                'samples': 0,
+                'sums': dict.fromkeys(GAUGE_FIELDS, 0.0),
+                'load_sums': [0.0, 0.0, 0.0],
+                'cpu_usage_max': 0.0
+            }
+        
+        bucket_state = self._open[name]
+        weight = point['samples']
+        bucket_state['samples'] += weight
+        for field in GAUGE_FIELDS:
+            bucket_state['sums'][field] += point[field] * weight
+        for i, value in enumerate(point['load_average'][:3]):
+            bucket_state['load_sums'][i] += value * weight
+        bucket_state['cpu_usage_max'] = max(bucket_state['cpu_usage_max'], point['cpu_usage_max'])
+        bucket_state['network_io'] = point['network_io']
+        bucket_state['uptime_seconds'] = point['uptime_seconds']
+        
+        return closed
+    
+    def _close(self, level: int) -> Optional[Dict[str, Any]]:
+        """Move the open bucket of a level into its ring and cascade it upwards."""
+        name = self.resolutions[level][0]
+        point = self._rollup(self._open[name])
+        self._open[name] = None
+        self.rings[name].append(point)
+        
+        closed_above = self._accumulate(level + 1, point) if level + 1 < len(self.resolutions) else None
+        return point if name == PERSISTED_RESOLUTION else closed_above
+    
+    @staticmethod
+    def _rollup(bucket_state: Dict[str, Any]) -> Dict[str, Any]:
+        samples = bucket_state['samples']
+        point = {field: total / samples for field, total in bucket_state['sums'].items()}
+        point.update(
+            timestamp=bucket_state['timestamp'],
+            samples=samples,
+            load_average=[total / samples for total in bucket_state['load_sums']],
+            cpu_usage_max=bucket_state['cpu_usage_max'],
+            network_io=bucket_state['network_io'],
+            uptime_seconds=bucket_state['uptime_seconds']
+        )
+        return point
+
+
 class SystemMonitor:
     """
     Comprehensive system monitoring service.
@@ -121,10 +268,22 @@ class SystemMonitor:
         # Monitoring state
         self.is_monitoring = False
         self.monitor_thread = None
+        self.sampler_thread = None
+        self._stop_event = threading.Event()
         self.start_time = datetime.now()
         
         # Metrics storage
-        self.metrics_buffer = deque(maxlen=1000)
+        self.sample_interval_seconds = self.config.get('sample_interval_seconds', 1)
+        self.metric_history = MetricHistory()
+        self._pending_rollups: List[Dict[str, Any]] = []
+        self._sampler_stats = {'samples': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                               'max_seconds': 0.0, 'last_seconds': 0.0, 'started_at': None}
+        self.query_stats = QueryStats(self.config.get('slow_query_ms', DEFAULT_SLOW_QUERY_MS))
+        self.table_stats_refresh_seconds = self.config.get('table_stats_refresh_seconds', 3600)
+        self.hot_queries: Dict[str, tuple] = {}
+        self._table_stats: Optional[Dict[str, Any]] = None
+        self._query_totals = (0, 0.0, 0)
+        self._full_scan_queries: set = set()
         self.api_metrics = defaultdict(list)
         self.error_counts = defaultdict(int)
         
@@ -133,9 +292,14 @@ class SystemMonitor:
         
         # Initialize database
         self._ensure_database()
+        self._load_metric_history()
+        
+        # Prime psutil so later non-blocking cpu_percent calls measure the time since the previous call
+        psutil.cpu_percent(interval=None)
         
         # Register default health checks
         self._register_default_health_checks()
+        self._register_default_hot_queries()
         
         logger.info("System Monitor initialized")
     
@@ -145,7 +309,7 @@ class SystemMonitor:
             import os
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self.query_stats.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Create system_metrics table
@@ -180,6 +344,14 @@ class SystemMonitor:
                     )
                 ''')
                 
+                # Add query_stats field if it doesn't exist (migration)
+                try:
+                    cursor.execute('ALTER TABLE database_metrics ADD COLUMN query_stats TEXT')
+                    logger.info("Added query_stats field to database_metrics table")
+                except sqlite3.OperationalError as e:
+                    if "duplicate column name" not in str(e).lower():
+                        logger.warning(f"Could not add query_stats field: {e}")
+                
                 # Create api_metrics table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS api_metrics (
@@ -263,30 +435,61 @@ class SystemMonitor:
             return
         
         self.is_monitoring = True
+        self._stop_event.clear()
+        self.sampler_thread = threading.Thread(
+            target=self._sampling_loop,
+            args=(self.sample_interval_seconds,),
+            daemon=True
+        )
         self.monitor_thread = threading.Thread(
             target=self._monitoring_loop,
             args=(interval_seconds,),
             daemon=True
         )
+        self.sampler_thread.start()
         self.monitor_thread.start()
         
-        logger.info(f"Started system monitoring with {interval_seconds}s interval")
+        logger.info(f"Started system monitoring with {interval_seconds}s interval "
+                    f"({self.sample_interval_seconds}s sampling)")
     
     def stop_monitoring(self):
-        """Stop continuous system monitoring."""
+        """Stop continuous system monitoring and persist pending metric rollups."""
         self.is_monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+        self._stop_event.set()
+        for thread in (self.sampler_thread, self.monitor_thread):
+            if thread:
+                thread.join(timeout=5)
+        
+        self._persist_metric_rollups()
         
-        logger.info("Stopped system monitoring")
+        stats = self.get_sampler_stats()
+        logger.info(f"Stopped system monitoring ({stats['samples']} samples, "
+                    f"avg {stats['avg_sample_ms']:.2f}ms, overhead {stats['overhead_pct']:.3f}% CPU)")
+    
+    def _sampling_loop(self, interval_seconds: float):
+        """Take a system metrics sample every interval, on a fixed schedule."""
+        next_sample = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                self._collect_system_metrics()
+            except Exception as e:
+                logger.error(f"Error in metric sampler: {str(e)}")
+            
+            next_sample += interval_seconds
+            delay = next_sample - time.monotonic()
+            if delay < 0:
+                # Fell behind (e.g. the process was suspended); skip the missed samples
+                next_sample = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
     
     def _monitoring_loop(self, interval_seconds: int):
         """Main monitoring loop."""
         while self.is_monitoring:
             try:
-                # Collect system metrics
-                system_metrics = self._collect_system_metrics()
-                self._save_system_metrics(system_metrics)
+                # Latest sample from the sampler, and minute rollups completed since the last cycle
+                system_metrics = self.metric_history.latest or self._collect_system_metrics()
+                self._persist_metric_rollups()
                 
                 # Collect database metrics
                 db_metrics = self._collect_database_metrics()
@@ -301,17 +504,25 @@ class SystemMonitor:
                 # Perform maintenance tasks
                 self._perform_maintenance_tasks()
                 
-                time.sleep(interval_seconds)
+                self._stop_event.wait(interval_seconds)
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {str(e)}")
-                time.sleep(interval_seconds)
+                self._stop_event.wait(interval_seconds)
     
     def _collect_system_metrics(self) -> SystemMetrics:
-        """Collect current system metrics."""
+        """
+        Collect current system metrics without blocking and record them in the metric history.
+        
+        CPU usage is the utilisation since the previous call (cpu_percent with
+        interval=None), so sampling costs only the time to read the counters.
+        """
         try:
+            started = time.perf_counter()
+            cpu_started = time.thread_time()
+            
             # CPU usage
-            cpu_usage = psutil.cpu_percent(interval=1)
+            cpu_usage = psutil.cpu_percent(interval=None)
             
             # Memory usage
             memory = psutil.virtual_memory()
@@ -353,8 +564,7 @@ class SystemMonitor:
                 load_average=load_average
             )
             
-            # Add to buffer for real-time access
-            self.metrics_buffer.append(metrics)
+            self._record_sample(metrics, time.perf_counter() - started, time.thread_time() - cpu_started)
             
             return metrics
             
@@ -362,42 +572,107 @@ class SystemMonitor:
             logger.error(f"Error collecting system metrics: {str(e)}")
             raise
     
+    @staticmethod
+    def _sample_point(metrics: SystemMetrics) -> Dict[str, Any]:
+        """Metric history point of a single sample."""
+        return {
+            'timestamp': int(metrics.timestamp.timestamp()),
+            'samples': 1,
+            'cpu_usage': metrics.cpu_usage,
+            'cpu_usage_max': metrics.cpu_usage,
+            'memory_usage': metrics.memory_usage,
+            'disk_usage': metrics.disk_usage,
+            'process_count': metrics.process_count,
+            'load_average': metrics.load_average,
+            'network_io': metrics.network_io,
+            'uptime_seconds': metrics.uptime_seconds
+        }
+    
+    def _record_sample(self, metrics: SystemMetrics, wall_seconds: float, cpu_seconds: float):
+        """Add a sample to the metric history and the sampler overhead statistics."""
+        rollup = self.metric_history.record(self._sample_point(metrics))
+        
+        with self.metric_history.lock:
+            self.metric_history.latest = metrics
+            if rollup is not None:
+                self._pending_rollups.append(rollup)
+            
+            stats = self._sampler_stats
+            if stats['started_at'] is None:
+                stats['started_at'] = time.monotonic()
+            stats['samples'] += 1
+            stats['wall_seconds'] += wall_seconds
+            stats['cpu_seconds'] += cpu_seconds
+            stats['max_seconds'] = max(stats['max_seconds'], wall_seconds)
+            stats['last_seconds'] = wall_seconds
+    
+    def get_sampler_stats(self) -> Dict[str, Any]:
+        """
+        Get the measured cost of metric sampling.
+        
+        Returns:
+            Dict[str, Any]: Sample count, average/max/last sample time in ms, and
+                overhead_pct (sampler CPU time as a percentage of elapsed time)
+        """
+        with self.metric_history.lock:
+            stats = dict(self._sampler_stats)
+        
+        samples = stats['samples']
+        elapsed = time.monotonic() - stats['started_at'] if stats['started_at'] is not None else 0
+        return {
+            'samples': samples,
+            'sample_interval_seconds': self.sample_interval_seconds,
+            'avg_sample_ms': stats['wall_seconds'] / samples * 1000 if samples else 0.0,
+            'max_sample_ms': stats['max_seconds'] * 1000,
+            'last_sample_ms': stats['last_seconds'] * 1000,
+            'cpu_ms_per_sample': stats['cpu_seconds'] / samples * 1000 if samples else 0.0,
+            'overhead_pct': stats['cpu_seconds'] / elapsed * 100 if elapsed > 0 else 0.0
+        }
+    
     def _collect_database_metrics(self) -> DatabaseMetrics:
-        """Collect database performance metrics."""
+        """
+        Collect database performance metrics.
+        
+        Sizes come from the page pragmas and sqlite_stat1 rather than counting
+        rows; sqlite_stat1 (via a bounded ANALYZE) and per-table bytes (via
+        dbstat) are refreshed every table_stats_refresh_seconds. Query counts
+        and latencies are those recorded by this monitor's connections since
+        the previous collection, and every registered hot query is planned
+        with EXPLAIN QUERY PLAN to detect full table scans.
+        """
         try:
-            # Get database file size
-            db_size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
-            
-            # Query database for additional metrics
+            # A plain connection, so the collector's own statements are not counted as workload
             with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get table sizes
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = cursor.fetchall()
-                
-                table_sizes = {}
-                for (table_name,) in tables:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    count = cursor.fetchone()[0]
-                    table_sizes[table_name] = count
-                
-                # Simulate other metrics (would be more complex in real implementation)
-                connection_count = 1  # SQLite doesn't have connection pooling
-                query_count = sum(table_sizes.values())  # Simplified
-                avg_query_time = 0.1  # Placeholder
-                slow_queries = 0  # Placeholder
-                index_usage = {}  # Placeholder
+                file_stats = database_file_stats(conn)
+                table_stats = self._refresh_table_stats(conn)
+                hot_queries = self._explain_hot_queries(conn)
+            
+            # Executions, time and slow executions since the previous collection
+            totals = self.query_stats.totals()
+            query_count, query_seconds, slow_queries = (
+                now - before for now, before in zip(totals, self._query_totals)
+            )
+            self._query_totals = totals
+            
+            # Share of hot queries whose plan uses each index
+            index_usage = defaultdict(float)
+            for plan in hot_queries.values():
+                for index in plan['indexes']:
+                    index_usage[index] += 1 / len(hot_queries)
             
             metrics = DatabaseMetrics(
                 timestamp=datetime.now(),
-                connection_count=connection_count,
+                connection_count=1,  # SQLite doesn't have connection pooling
                 query_count=query_count,
-                avg_query_time=avg_query_time,
+                avg_query_time=query_seconds / query_count * 1000 if query_count else 0.0,
                 slow_queries=slow_queries,
-                database_size=db_size,
-                table_sizes=table_sizes,
-                index_usage=index_usage
+                database_size=file_stats['database_size'],
+                table_sizes=table_stats['rows'],
+                index_usage=dict(index_usage),
+                free_bytes=file_stats['free_bytes'],
+                table_bytes=table_stats['bytes'],
+                statements=self.query_stats.snapshot(limit=20),
+                hot_queries=hot_queries
             )
             
             return metrics
@@ -416,6 +691,79 @@ class SystemMonitor:
                 index_usage={}
             )
     
+    def _refresh_table_stats(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        """Row estimates and byte sizes per table, refreshed when older than table_stats_refresh_seconds."""
+        now = time.time()
+        if self._table_stats is None or now - self._table_stats['refreshed_at'] >= self.table_stats_refresh_seconds:
+            analyze(conn)
+            self._table_stats = {
+                'rows': table_row_estimates(conn) or {},
+                'bytes': table_byte_sizes(conn),
+                'refreshed_at': now
+            }
+        return self._table_stats
+    
+    def _explain_hot_queries(self, conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+        """Plan every registered hot query, warning once when one starts scanning a whole table."""
+        plans = {}
+        for name, (sql, params) in list(self.hot_queries.items()):
+            try:
+                plans[name] = explain_query_plan(conn, sql, params)
+            except sqlite3.Error as e:
+                plans[name] = {'plan': [], 'full_scans': [], 'indexes': [], 'error': str(e)}
+            
+            if plans[name]['full_scans'] and name not in self._full_scan_queries:
+                logger.warning(f"Hot query '{name}' does a full scan of {', '.join(plans[name]['full_scans'])}")
+                self._full_scan_queries.add(name)
+            elif not plans[name]['full_scans']:
+                self._full_scan_queries.discard(name)
+        return plans
+    
+    def register_hot_query(self, name: str, sql: str, params: tuple = ()) -> bool:
+        """
+        Register a frequently run query whose plan is checked on every database metrics collection.
+        
+        Args:
+            name (str): Query name
+            sql (str): Statement, with ? placeholders
+            params (tuple): Representative parameters
+            
+        Returns:
+            bool: True if successful
+        """
+        self.hot_queries[name] = (sql, tuple(params))
+        logger.info(f"Registered hot query: {name}")
+        return True
+    
+    def _register_default_hot_queries(self):
+        """Register the monitor's own read queries."""
+        self.register_hot_query('active_alerts', '''
+            SELECT * FROM monitoring_alerts WHERE status = 'active' ORDER BY created_at DESC
+        ''')
+        self.register_hot_query('latest_health_checks', '''
+            SELECT component, status, message, timestamp, response_time_ms
+            FROM health_checks h1
+            WHERE timestamp = (SELECT MAX(timestamp) FROM health_checks h2 WHERE h2.component = h1.component)
+            ORDER BY component
+        ''')
+        self.register_hot_query('system_metrics_history', '''
+            SELECT timestamp, cpu_usage, memory_usage, disk_usage, network_io,
+                   process_count, uptime_seconds, load_average, custom_data
+            FROM system_metrics WHERE metric_type = ? AND timestamp >= ? ORDER BY timestamp ASC
+        ''', (MetricType.SYSTEM.value, 0))
+    
+    def get_query_stats(self, limit: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-statement latency statistics of this monitor's database.
+        
+        Args:
+            limit (Optional[int]): Only the statements with the most total time
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Statement -> count, slow_count and avg/p50/p95/p99/max ms
+        """
+        return self.query_stats.snapshot(limit)
+    
     def _register_default_health_checks(self):
         """Register default health check functions."""
         self.health_checks = {
@@ -463,7 +811,7 @@ class SystemMonitor:
     def _check_database_health(self) -> Dict[str, Any]:
         """Check database health."""
         try:
-            with sqlite3.connect(self.db_path, timeout=5) as conn:
+            with self.query_stats.connect(self.db_path, timeout=5) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT 1")
                 cursor.fetchone()
@@ -546,7 +894,8 @@ class SystemMonitor:
     def _check_cpu_usage(self) -> Dict[str, Any]:
         """Check CPU usage."""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            latest = self.metric_history.latest
+            cpu_percent = latest.cpu_usage if latest else psutil.cpu_percent(interval=None)
             
             if cpu_percent > 90:
                 status = HealthStatus.CRITICAL
@@ -700,7 +1049,7 @@ class SystemMonitor:
             cutoff_timestamp = int((datetime.now() - timedelta(days=30)).timestamp())
             
             with self.db_lock:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.query_stats.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Clean up old system metrics
@@ -725,7 +1074,7 @@ class SystemMonitor:
             start_time = time.time()
             
             with self.db_lock:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.query_stats.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Analyze tables
@@ -749,7 +1098,7 @@ class SystemMonitor:
             start_time = time.time()
             
             with self.db_lock:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.query_stats.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     cursor.execute('VACUUM')
                     conn.commit()
@@ -781,32 +1130,88 @@ class SystemMonitor:
         except Exception as e:
             logger.error(f"Error archiving old data: {str(e)}")
     
-    def _save_system_metrics(self, metrics: SystemMetrics):
-        """Save system metrics to database."""
+    def _persist_metric_rollups(self) -> int:
+        """
+        Save the minute rollups completed since the last call to the database.
+        
+        Only one row per minute is written, in a single batch, rather than a
+        row per sample.
+        
+        Returns:
+            int: Number of rollups saved
+        """
+        with self.metric_history.lock:
+            rollups, self._pending_rollups = self._pending_rollups, []
+        
+        if not rollups:
+            return 0
+        
         try:
-            metrics_id = str(uuid.uuid4())
-            
             with self.db_lock:
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.cursor()
-                    
-                    cursor.execute('''
+                with self.query_stats.connect(self.db_path) as conn:
+                    conn.executemany('''
                         INSERT INTO system_metrics (
                             id, timestamp, metric_type, cpu_usage, memory_usage,
                             disk_usage, network_io, process_count, uptime_seconds,
-                            load_average
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        metrics_id, int(metrics.timestamp.timestamp()), MetricType.SYSTEM.value,
-                        metrics.cpu_usage, metrics.memory_usage, metrics.disk_usage,
-                        json.dumps(metrics.network_io), metrics.process_count,
-                        metrics.uptime_seconds, json.dumps(metrics.load_average)
-                    ))
+                            load_average, custom_data
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', [(
+                        str(uuid.uuid4()), point['timestamp'], MetricType.SYSTEM.value,
+                        point['cpu_usage'], point['memory_usage'], point['disk_usage'],
+                        json.dumps(point['network_io']), point['process_count'],
+                        point['uptime_seconds'], json.dumps(point['load_average']),
+                        json.dumps({'samples': point['samples'], 'cpu_usage_max': point['cpu_usage_max']})
+                    ) for point in rollups])
                     
                     conn.commit()
-                    
+            
+            return len(rollups)
+            
         except Exception as e:
             logger.error(f"Error saving system metrics: {str(e)}")
+            # Keep the rollups for the next attempt
+            with self.metric_history.lock:
+                self._pending_rollups[:0] = rollups
+            return 0
+    
+    def _load_metric_history(self):
+        """Rebuild the in-memory minute and hour history from persisted rollups."""
+        try:
+            _, bucket_seconds, capacity = METRIC_RESOLUTIONS[-1]
+            since = int(time.time()) - bucket_seconds * capacity
+            
+            with self.query_stats.connect(self.db_path) as conn:
+                cursor = conn.execute('''
+                    SELECT timestamp, cpu_usage, memory_usage, disk_usage, network_io,
+                           process_count, uptime_seconds, load_average, custom_data
+                    FROM system_metrics
+                    WHERE metric_type = ? AND timestamp >= ?
+                    ORDER BY timestamp ASC
+                ''', (MetricType.SYSTEM.value, since))
+                
+                self.metric_history.load(self._stored_point(row) for row in cursor)
+                
+        except Exception as e:
+            logger.error(f"Error loading metric history: {str(e)}")
+    
+    @staticmethod
+    def _stored_point(row: tuple) -> Dict[str, Any]:
+        """Metric history point of a system_metrics row (rows from before rollups count as one sample)."""
+        timestamp, cpu_usage, memory_usage, disk_usage, network_io, process_count, uptime_seconds, \
+            load_average, custom_data = row
+        extra = json.loads(custom_data) if custom_data else {}
+        return {
+            'timestamp': timestamp,
+            'samples': extra.get('samples', 1),
+            'cpu_usage': cpu_usage or 0.0,
+            'cpu_usage_max': extra.get('cpu_usage_max', cpu_usage or 0.0),
+            'memory_usage': memory_usage or 0.0,
+            'disk_usage': disk_usage or 0.0,
+            'process_count': process_count or 0,
+            'load_average': json.loads(load_average) if load_average else [0.0, 0.0, 0.0],
+            'network_io': json.loads(network_io) if network_io else {},
+            'uptime_seconds': uptime_seconds or 0
+        }
     
     def _save_database_metrics(self, metrics: DatabaseMetrics):
         """Save database metrics to database."""
@@ -814,19 +1219,25 @@ class SystemMonitor:
             metrics_id = str(uuid.uuid4())
             
             with self.db_lock:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.query_stats.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute('''
                         INSERT INTO database_metrics (
                             id, timestamp, connection_count, query_count, avg_query_time,
-                            slow_queries, database_size, table_sizes, index_usage
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            slow_queries, database_size, table_sizes, index_usage, query_stats
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     ''', (
                         metrics_id, int(metrics.timestamp.timestamp()),
                         metrics.connection_count, metrics.query_count, metrics.avg_query_time,
                         metrics.slow_queries, metrics.database_size,
-                        json.dumps(metrics.table_sizes), json.dumps(metrics.index_usage)
+                        json.dumps(metrics.table_sizes), json.dumps(metrics.index_usage),
+                        json.dumps({
+                            'free_bytes': metrics.free_bytes,
+                            'table_bytes': metrics.table_bytes,
+                            'statements': metrics.statements,
+                            'hot_queries': metrics.hot_queries
+                        })
                     ))
                     
                     conn.commit()
@@ -840,7 +1251,7 @@ class SystemMonitor:
             check_id = str(uuid.uuid4())
             
             with self.db_lock:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.query_stats.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute('''
@@ -866,7 +1277,7 @@ class SystemMonitor:
             current_timestamp = int(datetime.now().timestamp())
             
             with self.db_lock:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.query_stats.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute('''
@@ -893,7 +1304,7 @@ class SystemMonitor:
             current_timestamp = int(datetime.now().timestamp())
             
             with self.db_lock:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.query_stats.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute('''
@@ -919,8 +1330,9 @@ class SystemMonitor:
             Dict[str, Any]: Current system metrics
         """
         try:
-            if self.metrics_buffer:
-                latest_metrics = self.metrics_buffer[-1]
+            # Without the sampler running the latest sample would be stale; sampling on demand is cheap
+            latest_metrics = self.metric_history.latest if self.is_monitoring else None
+            if latest_metrics:
                 return {
                     'timestamp': latest_metrics.timestamp.isoformat(),
                     'cpu_usage': latest_metrics.cpu_usage,
@@ -932,7 +1344,7 @@ class SystemMonitor:
                     'load_average': latest_metrics.load_average
                 }
             else:
-                # Collect metrics on demand if buffer is empty
+                # Collect metrics on demand if the sampler is not running
                 metrics = self._collect_system_metrics()
                 return {
                     'timestamp': metrics.timestamp.isoformat(),
@@ -957,7 +1369,7 @@ class SystemMonitor:
             Dict[str, Any]: Health status summary
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.query_stats.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
@@ -1016,7 +1428,7 @@ class SystemMonitor:
             List[Dict[str, Any]]: List of active alerts
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.query_stats.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
@@ -1047,7 +1459,7 @@ class SystemMonitor:
             current_timestamp = int(datetime.now().timestamp())
             
             with self.db_lock:
-                with sqlite3.connect(self.db_path) as conn:
+                with self.query_stats.connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute('''
@@ -1068,13 +1480,21 @@ class SystemMonitor:
             logger.error(f"Error resolving alert {alert_id}: {str(e)}")
             raise
     
-    def get_metrics_history(self, metric_type: str, hours: int = 24) -> List[Dict[str, Any]]:
+    def get_metrics_history(self, metric_type: str, hours: int = 24,
+                            resolution: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get metrics history for a specified period.
         
+        System metrics are served from the in-memory rings: per-sample points
+        for the last hour, minute rollups for the last day and hourly rollups
+        for the last 30 days. Rollups hold the mean of each gauge plus
+        'cpu_usage_max' and the number of 'samples'.
+        
         Args:
             metric_type (str): Type of metrics to retrieve
             hours (int): Number of hours of history to retrieve
+            resolution (Optional[str]): '1s', '1m' or '1h' for system metrics
+                (default: the finest resolution covering the period)
             
         Returns:
             List[Dict[str, Any]]: Historical metrics data
@@ -1082,17 +1502,21 @@ class SystemMonitor:
         try:
             start_timestamp = int((datetime.now() - timedelta(hours=hours)).timestamp())
             
-            with sqlite3.connect(self.db_path) as conn:
+            if metric_type == 'system':
+                resolution = resolution or self.metric_history.resolution_for(hours * 3600)
+                if resolution not in self.metric_history.rings:
+                    raise ValueError(f"Unknown resolution: {resolution}")
+                
+                return [
+                    {**point, 'metric_type': MetricType.SYSTEM.value, 'resolution': resolution}
+                    for point in self.metric_history.query(start_timestamp, resolution)
+                ]
+            
+            with self.query_stats.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
-                if metric_type == 'system':
-                    cursor.execute('''
-                        SELECT * FROM system_metrics
-                        WHERE timestamp >= ?
-                        ORDER BY timestamp ASC
-                    ''', (start_timestamp,))
-                elif metric_type == 'database':
+                if metric_type == 'database':
                     cursor.execute('''
                         SELECT * FROM database_metrics
                         WHERE timestamp >= ?
@@ -1113,7 +1537,7 @@ class SystemMonitor:
                 for row in rows:
                     metric_dict = dict(row)
                     # Parse JSON fields
-                    for field in ['network_io', 'load_average', 'table_sizes', 'index_usage',
+                    for field in ['network_io', 'load_average', 'table_sizes', 'index_usage', 'query_stats',
                                 'response_times', 'status_codes', 'endpoint_usage']:
                         if field in metric_dict and metric_dict[field]:
                             try:
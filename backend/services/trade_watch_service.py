@@ -0,0 +1,399 @@
+"""
+Trade Watch Service
+
+This module provides a background watch engine for AI trades. Each cycle it loads all
+waiting/active trades, fetches live prices for their tickers in one batched request per
+market, evaluates entry triggers and target/stop hits for every trade at once and
+records the results in a single transaction.
+
+Exit latency is bounded by the poll interval instead of by how often charts are
+analyzed. The same batched download supplies each ticker's high/low since the trades
+were last watched, so wicks between polls are caught too and the historical candle
+replay in ActiveTradeService only has to cover time the watcher has not.
+"""
+
+import logging
+import threading
+import time
+import os
+import atexit
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+import numpy as np
+import pandas as pd
+
+from services.active_trade_service import ActiveTradeService, TradeStatus
+from services.analysis_context_service import AnalysisContextService
+from services.http_session_pool import get_http_pool
+
+logger = logging.getLogger(__name__)
+
+HYPERLIQUID_INFO_URL = 'https://api.hyperliquid.xyz/info'
+
+
+def _bars_since(series, since: datetime):
+    """Bars of a 1-minute series that end after since (bars are labelled by their start)."""
+    start = pd.Timestamp(since.astimezone()) - pd.Timedelta(minutes=1)
+    if series.index.tz is None:
+        start = start.tz_localize(None)
+    return series[series.index > start]
+
+
+def fetch_live_quotes(tickers: List[str], since: Optional[Dict[str, datetime]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Fetch the latest price, and the high/low since a given time, for every ticker with
+    one request per market.
+
+    Crypto symbols are priced from a single Hyperliquid allMids snapshot; stocks and any
+    crypto symbols Hyperliquid does not list are priced from one batched yfinance download
+    of 1-minute bars. The same download supplies the highs/lows for tickers in since, so
+    wicks between polls are seen without replaying candles per trade.
+
+    Args:
+        tickers: Ticker symbols as stored on trades (e.g. 'ETHUSD', 'AAPL')
+        since: Per-ticker time from which to take the high/low
+
+    Returns:
+        Dict mapping ticker to {'price', and 'high'/'low' when bars since that time were
+        found} (tickers without a price are omitted)
+    """
+    from app.market_data_routes import is_crypto_symbol, convert_to_hyperliquid_symbol, convert_to_yfinance_symbol
+
+    since = since or {}
+    quotes = {}
+    crypto = [t for t in tickers if is_crypto_symbol(t)]
+
+    if crypto:
+        try:
+            response = get_http_pool().post(HYPERLIQUID_INFO_URL, json={"type": "allMids"},
+                                     headers={'Content-Type': 'application/json'}, timeout=10)
+            if response.ok:
+                mids = response.json()
+                for ticker in crypto:
+                    mid = mids.get(convert_to_hyperliquid_symbol(ticker))
+                    if mid is not None:
+                        quotes[ticker] = {'price': float(mid)}
+            else:
+                logger.warning(f"Hyperliquid allMids error: {response.status_code} {response.text}")
+        except Exception as e:
+            logger.warning(f"Hyperliquid allMids fetch failed: {str(e)}")
+
+    remaining = [t for t in tickers if t not in quotes or t in since]
+    if remaining:
+        try:
+            import yfinance as yf
+
+            symbol_map = {(convert_to_yfinance_symbol(t) if is_crypto_symbol(t) else t): t for t in remaining}
+            data = yf.download(list(symbol_map.keys()), period='1d', interval='1m',
+                               progress=False, group_by='column', threads=True)
+            if data is not None and not data.empty:
+                def column(field, symbol):
+                    values = data[field]
+                    series = values[symbol] if symbol in getattr(values, 'columns', []) else values
+                    return series.dropna() if hasattr(series, 'dropna') else series
+
+                for symbol, ticker in symbol_map.items():
+                    closes = column('Close', symbol)
+                    if not hasattr(closes, 'iloc') or len(closes) == 0:
+                        continue
+                    quote = quotes.setdefault(ticker, {'price': float(closes.iloc[-1])})
+
+                    if ticker in since:
+                        highs = _bars_since(column('High', symbol), since[ticker])
+                        lows = _bars_since(column('Low', symbol), since[ticker])
+                        if len(highs) > 0 and len(lows) > 0:
+                            quote['high'] = float(highs.max())
+                            quote['low'] = float(lows.min())
+        except Exception as e:
+            logger.warning(f"Batched yfinance price fetch failed: {str(e)}")
+
+    return quotes
+
+
+def evaluate_trades(trades: List[Dict[str, Any]], prices: Dict[str, float],
+                    ranges: Optional[Dict[str, Tuple[float, float]]] = None) -> Tuple[
+        List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Evaluate entry triggers and target/stop hits for all trades at once.
+
+    Trigger rules mirror AnalysisContextService._check_entry_trigger_hit and exit rules
+    mirror ActiveTradeService: a waiting trade whose entry triggers this cycle is checked
+    for exits at the same price, a waiting trade that hits its stop before triggering is
+    invalidated, and the stop wins when target and stop are both hit.
+
+    A ticker's high/low since the last poll also counts: a wick through the stop closes
+    the trade at the stop, and a wick through the target closes a trade that was already
+    active at the target (the order of a same-cycle trigger and wick is unknown).
+
+    Args:
+        trades: Open trades from ActiveTradeService.get_open_trades
+        prices: Latest price per ticker
+        ranges: (high, low) per ticker since the trades were last watched
+
+    Returns:
+        Tuple of (price_updates, triggers, exits) for ActiveTradeService.record_watch_cycle
+    """
+    priced = [t for t in trades if prices.get(t['ticker']) is not None]
+    if not priced:
+        return [], [], []
+
+    def column(key):
+        return np.array([t.get(key) if t.get(key) is not None else np.nan for t in priced], dtype=float)
+
+    ranges = ranges or {}
+    price = np.array([prices[t['ticker']] for t in priced], dtype=float)
+    high = np.array([ranges.get(t['ticker'], (np.nan, np.nan))[0] for t in priced], dtype=float)
+    low = np.array([ranges.get(t['ticker'], (np.nan, np.nan))[1] for t in priced], dtype=float)
+    entry = column('entry_price')
+    target = column('target_price')
+    stop = column('stop_loss')
+    is_buy = np.array([str(t['action']).lower() == 'buy' for t in priced])
+    is_sell = np.array([str(t['action']).lower() == 'sell' for t in priced])
+    waiting = np.array([t['status'] == TradeStatus.WAITING.value for t in priced])
+    breakout = np.array([AnalysisContextService._is_breakout_trade(t.get('entry_condition')) for t in priced])
+
+    # NaN comparisons are False, so missing targets/stops never hit
+    with np.errstate(invalid='ignore'):
+        triggered = waiting & (
+            (is_buy & breakout & (price >= entry)) |
+            (is_buy & ~breakout & (price <= entry)) |
+            (is_sell & (price <= entry))
+        )
+        active = (~waiting) | triggered
+
+        target_hit = (is_buy & (price >= target)) | (is_sell & (price <= target))
+        stop_hit = (is_buy & (price <= stop)) | (is_sell & (price >= stop))
+        target_wick = ~waiting & ((is_buy & (high >= target)) | (is_sell & (low <= target)))
+        stop_wick = (is_buy & (low <= stop)) | (is_sell & (high >= stop))
+
+        # Stops apply to waiting trades too (invalidation before entry)
+        stop_exit = stop_hit | stop_wick
+        target_exit = ((target_hit & active) | target_wick) & ~stop_exit
+
+    # Hits at the live price exit there; hits only seen in a wick exit at the level
+    exit_price = np.where(stop_exit & ~stop_hit, stop, np.where(target_exit & ~target_hit, target, price))
+    pnl = np.where(is_buy, price - entry, entry - price)
+    exit_pnl = np.where(is_buy, exit_price - entry, entry - exit_price)
+    prev_favorable = column('max_favorable_price')
+    prev_favorable = np.where(np.isnan(prev_favorable), entry, prev_favorable)
+    prev_adverse = column('max_adverse_price')
+    prev_adverse = np.where(np.isnan(prev_adverse), entry, prev_adverse)
+    # Wicks only count for trades that were already active when they happened
+    best = np.where(~waiting & is_buy, np.fmax(price, high), np.where(~waiting, np.fmin(price, low), price))
+    worst = np.where(~waiting & is_buy, np.fmin(price, low), np.where(~waiting, np.fmax(price, high), price))
+    max_favorable = np.where(is_buy, np.maximum(prev_favorable, best), np.minimum(prev_favorable, best))
+    max_adverse = np.where(is_buy, np.minimum(prev_adverse, worst), np.maximum(prev_adverse, worst))
+
+    price_updates, triggers, exits = [], [], []
+    for i, trade in enumerate(priced):
+        price_updates.append({
+            'trade_id': trade['id'],
+            'price': float(price[i]),
+            'unrealized_pnl': float(pnl[i]) if active[i] else 0.0,
+            'max_favorable_price': float(max_favorable[i]) if active[i] else trade.get('max_favorable_price'),
+            'max_adverse_price': float(max_adverse[i]) if active[i] else trade.get('max_adverse_price'),
+            'wicks_checked': trade['ticker'] in ranges
+        })
+
+        if triggered[i]:
+            triggers.append({'trade_id': trade['id'], 'price': float(price[i])})
+
+        if stop_exit[i] or target_exit[i]:
+            exits.append({
+                'trade_id': trade['id'],
+                'ticker': trade['ticker'],
+                'exit_price': float(exit_price[i]),
+                'exit_reason': "STOP_LOSS_HIT" if stop_exit[i] else "PROFIT_TARGET_HIT",
+                'exit_type': "LOSS" if stop_exit[i] else "WIN",
+                'realized_pnl': float(exit_pnl[i]) if active[i] else 0.0,
+                'waiting_trade': bool(waiting[i] and not triggered[i])
+            })
+
+    return price_updates, triggers, exits
+
+
+class TradeWatchService:
+    """
+    Background watch engine for waiting/active AI trades.
+
+    Runs in a separate thread and checks all open trades against live prices
+    every poll interval.
+    """
+
+    def __init__(self, db_path: Optional[str] = None,
+                 quote_fetcher: Optional[Callable[[List[str], Dict[str, datetime]], Dict[str, Dict[str, float]]]] = None):
+        """
+        Initialize the watch engine.
+
+        Args:
+            db_path: Path to the chart analysis database
+            quote_fetcher: Callable returning latest quotes for a list of tickers, with the
+                high/low since each ticker's given time (see fetch_live_quotes)
+        """
+        self.trade_service = ActiveTradeService(db_path)
+        self.quote_fetcher = quote_fetcher or fetch_live_quotes
+        self.is_running = False
+        self.watch_thread = None
+        self.stop_event = threading.Event()
+
+        # Configuration
+        self.poll_interval_seconds = int(os.getenv('TRADE_WATCH_INTERVAL_SECONDS', '30'))
+        self.auto_start = os.getenv('AUTO_START_TRADE_WATCH', 'true').lower() == 'true'
+
+        # Cycle statistics
+        self.cycles_run = 0
+        self.last_cycle = None
+
+        logger.info(f"Trade watch service initialized with {self.poll_interval_seconds}s intervals")
+
+    def _wick_windows(self, trades: List[Dict[str, Any]]) -> Dict[str, datetime]:
+        """Per ticker, the earliest time since which its open trades' highs/lows are unchecked."""
+        windows = {}
+        for trade in trades:
+            since = (self.trade_service._safe_parse_datetime(trade.get('last_watched_at')) or
+                     self.trade_service._safe_parse_datetime(trade.get('created_at')))
+            if since is not None and (trade['ticker'] not in windows or since < windows[trade['ticker']]):
+                windows[trade['ticker']] = since
+        return windows
+
+    def run_cycle(self) -> Dict[str, Any]:
+        """
+        Run one watch cycle over all open trades.
+
+        Returns:
+            Summary of the cycle
+        """
+        started = time.time()
+        trades = self.trade_service.get_open_trades()
+        summary = {
+            'trades_checked': 0,
+            'tickers': 0,
+            'triggers': 0,
+            'exits': 0,
+            'missing_prices': [],
+            'duration_ms': 0.0,
+            'timestamp': datetime.now().isoformat()
+        }
+
+        if trades:
+            tickers = sorted({t['ticker'] for t in trades})
+            quotes = self.quote_fetcher(tickers, self._wick_windows(trades))
+            watch_time = datetime.now()
+            prices = {ticker: quote['price'] for ticker, quote in quotes.items()}
+            ranges = {ticker: (quote['high'], quote['low']) for ticker, quote in quotes.items()
+                      if quote.get('high') is not None and quote.get('low') is not None}
+
+            price_updates, triggers, exits = evaluate_trades(trades, prices, ranges)
+            if price_updates:
+                self.trade_service.record_watch_cycle(watch_time, price_updates, triggers, exits)
+
+            summary.update({
+                'trades_checked': len(price_updates),
+                'tickers': len(tickers),
+                'triggers': len(triggers),
+                'exits': len(exits),
+                'missing_prices': [t for t in tickers if t not in prices],
+                'timestamp': watch_time.isoformat()
+            })
+
+            if summary['missing_prices']:
+                logger.warning(f"Trade watch: no live price for {', '.join(summary['missing_prices'])}")
+
+        summary['duration_ms'] = round((time.time() - started) * 1000, 1)
+        self.cycles_run += 1
+        self.last_cycle = summary
+        return summary
+
+    def start(self):
+        """Start the background watch loop"""
+        if self.is_running:
+            logger.warning("Trade watch is already running")
+            return False
+
+        self.is_running = True
+        self.stop_event.clear()
+
+        def watch_loop():
+            """Main watch loop"""
+            logger.info(f"Starting trade watch with {self.poll_interval_seconds}s intervals")
+
+            while not self.stop_event.is_set():
+                try:
+                    summary = self.run_cycle()
+                    if summary['triggers'] or summary['exits']:
+                        logger.info(f"Trade watch cycle: {summary['triggers']} triggers, "
+                                    f"{summary['exits']} exits across {summary['tickers']} tickers")
+                except Exception as e:
+                    logger.error(f"Error in trade watch cycle: {e}")
+
+                if self.stop_event.wait(self.poll_interval_seconds):
+                    break  # Stop event was set
+
+            logger.info("Trade watch stopped")
+
+        self.watch_thread = threading.Thread(target=watch_loop, daemon=True, name="TradeWatch")
+        self.watch_thread.start()
+
+        logger.info("Trade watch started")
+        return True
+
+    def stop(self):
+        """Stop the background watch loop"""
+        if not self.is_running:
+            logger.warning("Trade watch is not running")
+            return
+
+        logger.info("Stopping trade watch...")
+        self.stop_event.set()
+
+        if self.watch_thread and self.watch_thread.is_alive():
+            self.watch_thread.join(timeout=30)
+
+            if self.watch_thread.is_alive():
+                logger.warning("Trade watch thread did not stop gracefully")
+
+        self.is_running = False
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get watch engine status"""
+        return {
+            'is_running': self.is_running,
+            'poll_interval_seconds': self.poll_interval_seconds,
+            'cycles_run': self.cycles_run,
+            'last_cycle': self.last_cycle
+        }
+
+
+# Global watch instance
+_trade_watch = None
+
+
+def get_trade_watch() -> TradeWatchService:
+    """Get the global trade watch instance"""
+    global _trade_watch
+    if _trade_watch is None:
+        _trade_watch = TradeWatchService()
+    return _trade_watch
+
+
+def cleanup_trade_watch():
+    """Cleanup function to stop the trade watch on exit"""
+    global _trade_watch
+    if _trade_watch and _trade_watch.is_running:
+        logger.info("Cleaning up trade watch...")
+        _trade_watch.stop()
+
+
+atexit.register(cleanup_trade_watch)
+
+
+def auto_start_trade_watch():
+    """Auto-start the trade watch if configured"""
+    trade_watch = get_trade_watch()
+    if trade_watch.auto_start:
+        logger.info("Auto-starting trade watch...")
+        if trade_watch.start():
+            logger.info("Trade watch auto-started successfully")
+        else:
+            logger.error("Failed to auto-start trade watch")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the queries behind the /active-trades list endpoints: stored reasoning
+projection, keyset pagination and the invalidate-on-write read cache.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.active_trade_service import ActiveTradeService
+
+
+def _analysis(action, reasoning):
+    return {
+        "currentPrice": 100.0,
+        "recommendations": {
+            "action": action,
+            "entryPrice": 100.0,
+            "targetPrice": 110.0 if action == "buy" else 90.0,
+            "stopLoss": 95.0 if action == "buy" else 105.0,
+            "reasoning": reasoning
+        }
+    }
+
+
+def test_open_trades_reasoning_and_cache():
+    """Reasoning comes from the stored column and cached results drop on write."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = ActiveTradeService(os.path.join(tmp_dir, 'chart_analysis.db'))
+        service.create_trade_from_analysis('AAA', '1h', 1, _analysis('buy', 'Bounce off support'))
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return service.get_open_trades_overview()
+
+        trades, etag = service.get_cached_trade_query('all-active', loader)
+        assert [t['reasoning'] for t in trades] == ['Bounce off support']
+
+        cached, cached_etag = service.get_cached_trade_query('all-active', loader)
+        assert cached == trades and cached_etag == etag
+        assert len(loads) == 1
+
+        # A write through any service on the same database invalidates the cache
+        ActiveTradeService(service.db_path).create_trade_from_analysis(
+            'BBB', '1h', 2, _analysis('sell', 'Rejected at resistance'))
+        changed, changed_etag = service.get_cached_trade_query('all-active', loader)
+        assert len(changed) == 2
+        assert changed_etag != etag
+        assert len(loads) == 2
+
+
+def test_trade_history_keyset_pagination():
+    """Pages follow (updated_at, id) order without gaps or duplicates."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'chart_analysis.db')
+        service = ActiveTradeService(db_path)
+        for i in range(7):
+            service.create_trade_from_analysis(f'T{i}', '1h', i + 1, _analysis('buy', f'Setup {i}'))
+        with sqlite3.connect(db_path) as conn:
+            # Ties on updated_at must be broken by id
+            conn.execute("UPDATE active_trades SET updated_at = '2024-01-01 00:00:00' WHERE id IN (2, 3, 4)")
+            conn.commit()
+
+        seen = []
+        cursor = None
+        while True:
+            page = service.get_trades_page(limit=3, cursor=cursor)
+            seen.extend(t['id'] for t in page['trades'])
+            cursor = page['next_cursor']
+            if not page['has_more']:
+                break
+
+        assert sorted(seen) == list(range(1, 8))
+        assert len(seen) == len(set(seen))
+        assert seen[-3:] == [4, 3, 2]
+
+        try:
+            service.get_trades_page(cursor='not-a-cursor')
+            assert False, "invalid cursor should raise"
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_open_trades_reasoning_and_cache()
+    test_trade_history_keyset_pagination()
+    print("✅ Active trades list query tests passed")
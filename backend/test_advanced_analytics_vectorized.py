@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized analytics core: results must match the per-row
+reference calculations the advanced analytics engine used before.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from models.cl_price_history import CLPriceHistory
+from services.advanced_analytics import AdvancedAnalytics, MarketRegime
+from services.analytics_core import (
+    PriceSeries, prediction_features, regime_labels, rolling_slope, rolling_var_cvar, rolling_volatility
+)
+
+
+def _records(prices, volumes=None, start=datetime(2024, 1, 1, tzinfo=timezone.utc)):
+    return [{'timestamp': (start + timedelta(days=i)).isoformat().replace('+00:00', 'Z'),
+             'price': float(p), 'volume': float(volumes[i]) if volumes is not None else 0.0}
+            for i, p in enumerate(prices)]
+
+
+def _reference_features(data):
+    """Feature rows as the engine used to build them, one dict at a time."""
+    features = []
+    for i in range(len(data)):
+        price = float(data[i]['price'])
+        volume = float(data[i].get('volume', 0))
+        prices_5d = [float(data[j]['price']) for j in range(i - 4, i + 1)] if i >= 5 else None
+        prices_20d = [float(data[j]['price']) for j in range(i - 19, i + 1)] if i >= 20 else None
+        sma_5, vol_5 = (np.mean(prices_5d), np.std(prices_5d)) if prices_5d else (price, 0)
+        sma_20, vol_20 = (np.mean(prices_20d), np.std(prices_20d)) if prices_20d else (price, 0)
+        features.append([price, volume, sma_5, sma_20, vol_5, vol_20, price / sma_5, price / sma_20])
+    return np.array(features)
+
+
+def _reference_regime(prices):
+    """Regime detection as the engine used to compute it."""
+    returns = np.diff(np.log(prices))
+    volatility = np.std(returns) * np.sqrt(252)
+    trend = np.polyfit(range(30), prices[-30:], 1)[0]
+    avg_return = np.mean(returns[-20:])
+    if volatility > 0.6:
+        return MarketRegime.HIGH_VOLATILITY
+    if volatility < 0.2:
+        return MarketRegime.LOW_VOLATILITY
+    if trend > 0.02 and avg_return > 0:
+        return MarketRegime.BULL_MARKET
+    if trend < -0.02 and avg_return < 0:
+        return MarketRegime.BEAR_MARKET
+    return MarketRegime.SIDEWAYS
+
+
+def test_rolling_metrics_match_window_loops():
+    """Rolling volatility, VaR/CVaR and slope equal the per-window calculations."""
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0, 0.02, 300)
+    prices = 1000 * np.cumprod(1 + returns)
+    window = 30
+
+    volatility = rolling_volatility(returns, window)
+    var_95, cvar_95 = rolling_var_cvar(returns, window)
+    slope = rolling_slope(prices, window)
+    assert np.isnan(volatility[window - 2]) and np.isnan(var_95[window - 2]) and np.isnan(slope[window - 2])
+
+    for end in (window, 100, 300):
+        chunk = returns[end - window:end]
+        assert np.isclose(volatility[end - 1], np.std(chunk) * np.sqrt(252))
+        var = np.percentile(chunk, 5)
+        assert np.isclose(var_95[end - 1], var)
+        assert np.isclose(cvar_95[end - 1], np.mean(chunk[chunk <= var]))
+        assert np.isclose(slope[end - 1], np.polyfit(range(window), prices[end - window:end], 1)[0])
+
+
+def test_features_and_targets_match_reference():
+    """Prediction features, IL and fee targets equal the per-row versions."""
+    rng = np.random.default_rng(5)
+    prices = 2000 + np.cumsum(rng.normal(0, 20, 120))
+    volumes = rng.uniform(1e5, 1e6, 120)
+    records = _records(prices, volumes)
+    series = PriceSeries.from_records(records[::-1])  # out of order input is sorted once
+
+    assert series.timestamps.dtype == np.int64 and series.prices.dtype == np.float64
+    assert np.all(np.diff(series.timestamps) == 86400)
+    assert np.allclose(prediction_features(series), _reference_features(records))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        analytics = AdvancedAnalytics(os.path.join(tmp_dir, 'analytics.db'))
+        position = {'entry_price': 2000.0, 'price_range_min': 1950.0, 'price_range_max': 2100.0, 'fee_tier': 0.003}
+        il = analytics._calculate_historical_il(position, series)
+        fees = analytics._calculate_historical_fees(position, series)
+        in_range = (prices >= 1950) & (prices <= 2100)
+        assert np.allclose(il, np.abs(prices - 2000) / 2000 * np.where(in_range, 0.1, 0.3))
+        assert np.allclose(fees, np.where(in_range, volumes * 0.003 * 0.5, 0))
+
+        predictions = analytics.predict_il_and_fees(position, records, prediction_days=10)
+        assert len(predictions['il_predictions']['daily_values']) == 10
+
+
+def test_regime_detection_matches_reference():
+    """detect_market_regime agrees with the previous logic and the rolling labels."""
+    rng = np.random.default_rng(9)
+    scenarios = {
+        'bull': 100 * np.exp(np.cumsum(rng.normal(0.004, 0.02, 90))),
+        'bear': 100 * np.exp(np.cumsum(rng.normal(-0.004, 0.02, 90))),
+        'volatile': 100 * np.exp(np.cumsum(rng.normal(0, 0.06, 90))),
+        'calm': 100 * np.exp(np.cumsum(rng.normal(0, 0.002, 90))),
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        analytics = AdvancedAnalytics(os.path.join(tmp_dir, 'analytics.db'))
+        for name, prices in scenarios.items():
+            expected = _reference_regime(prices)
+            assert analytics.detect_market_regime(_records(prices), name) == expected, name
+
+            labels, confidence = regime_labels(prices, vol_window=None)
+            assert labels[-1] == expected.value
+            assert labels[0] is None and 0 < confidence[-1] <= 0.95
+
+
+def test_price_series_load_and_analysis():
+    """Histories load straight from cl_price_history into arrays for rolling analytics."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'cl_positions.db')
+        history = CLPriceHistory(db_path)
+        for i, price in enumerate(100 + np.sin(np.arange(60) / 5)):
+            history.add_price_record({'position_id': 'pos-1', 'token_pair': 'ETH/USDC',
+                                      'price': float(price), 'timestamp': 1700000000 + 3600 * (59 - i)})
+
+        series = PriceSeries.load(position_id='pos-1', price_history=history)
+        assert len(series) == 60 and np.all(np.diff(series.timestamps) > 0)
+        assert len(PriceSeries.load(position_id='missing', price_history=history)) == 0
+
+        analytics = AdvancedAnalytics(os.path.join(tmp_dir, 'analytics.db'))
+        analysis = analytics.analyze_price_series(series, window=20)
+        assert len(analysis['rolling_var_95']) == len(analysis['timestamps']) == 59
+        assert analysis['rolling_var_95'][18] is None and analysis['rolling_var_95'][19] is not None
+        assert analysis['summary']['max_drawdown'] == min(analysis['drawdown'])
+        assert analysis['regimes'][-1] in {regime.value for regime in MarketRegime}
+
+
+if __name__ == "__main__":
+    test_rolling_metrics_match_window_loops()
+    test_features_and_targets_match_reference()
+    test_regime_detection_matches_reference()
+    test_price_series_load_and_analysis()
+    print("✅ Vectorized analytics tests passed")
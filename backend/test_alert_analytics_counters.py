@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the materialized daily alert counters behind get_alert_analytics.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.alert_service import AlertService
+
+
+def _reference_analytics(db_path, start_timestamp):
+    """Analytics computed straight from the alerts table."""
+    with sqlite3.connect(db_path) as conn:
+        def breakdown(column):
+            return dict(conn.execute(f'SELECT {column}, COUNT(*) FROM alerts WHERE created_at >= ? GROUP BY {column}',
+                                     (start_timestamp,)).fetchall())
+        avg_response = conn.execute('''
+            SELECT AVG(acknowledged_at - created_at) FROM alerts
+            WHERE created_at >= ? AND acknowledged_at IS NOT NULL
+        ''', (start_timestamp,)).fetchone()[0] or 0
+        total, escalated = conn.execute('''
+            SELECT COUNT(*), SUM(CASE WHEN escalation_count > 0 THEN 1 ELSE 0 END) FROM alerts WHERE created_at >= ?
+        ''', (start_timestamp,)).fetchone()
+    return {
+        'total_alerts': total,
+        'status_breakdown': breakdown('status'),
+        'type_breakdown': breakdown('alert_type'),
+        'severity_breakdown': breakdown('severity'),
+        'avg_response_time_seconds': avg_response,
+        'escalation_rate_percent': escalated / total * 100 if total else 0
+    }
+
+
+def _populate(service):
+    """Alerts across types, severities, days and lifecycle states; returns the old alert's ID."""
+    rules = [service.create_alert_rule({'name': f'rule {i}', 'alert_type': alert_type, 'severity': severity,
+                                        'conditions': {}, 'notification_channels': []})
+             for i, (alert_type, severity) in enumerate([('high_impermanent_loss', 'high'),
+                                                         ('price_out_of_range', 'medium'), ('custom', 'low')])]
+    alert_ids = [service.trigger_alert(rules[i % 3], {'id': f'pos-{i}'}) for i in range(12)]
+
+    old = service._build_alert(service.alert_rules[rules[0]], None, None, datetime.now() - timedelta(days=40))
+    old.escalation_count = 1
+    service._save_alerts([old])
+
+    for alert_id in alert_ids[:5]:
+        assert service.acknowledge_alert(alert_id, 'ops')
+    for alert_id in alert_ids[3:8]:
+        assert service.resolve_alert(alert_id)
+    assert service.resolve_alert(alert_ids[3])          # already resolved: no double count
+    assert not service.acknowledge_alert(alert_ids[7], 'ops')
+    assert not service.resolve_alert('missing')
+    return old.id
+
+
+def test_counters_match_alert_table():
+    """Counter-based analytics equal the per-query aggregates over the alerts table."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = AlertService(os.path.join(tmp_dir, 'alerts.db'))
+        _populate(service)
+
+        for days in (30, 60):
+            analytics = service.get_alert_analytics(days)
+            start = int((datetime.now() - timedelta(days=days)).timestamp())
+            expected = _reference_analytics(service.db_path, start)
+            for key, value in expected.items():
+                assert analytics[key] == value, (days, key, analytics[key], value)
+
+        assert service.get_alert_analytics(30)['total_alerts'] == 12
+        assert service.get_alert_analytics(60)['status_breakdown'] == {'pending': 5, 'acknowledged': 3, 'resolved': 5}
+        service.shutdown()
+
+
+def test_counters_backfill_existing_alerts():
+    """Databases with alerts from before the counters existed are backfilled on startup."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'alerts.db')
+        service = AlertService(db_path)
+        _populate(service)
+        expected = service.get_alert_analytics(60)
+        service.shutdown()
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute('DROP TABLE alert_daily_counts')
+
+        restarted = AlertService(db_path)
+        assert restarted.get_alert_analytics(60) == expected
+        restarted.shutdown()
+
+
+if __name__ == "__main__":
+    test_counters_match_alert_table()
+    test_counters_backfill_existing_alerts()
+    print("✅ Alert analytics counter tests passed")
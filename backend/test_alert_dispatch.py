@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Tests for asynchronous alert notification dispatch, using local HTTP and SMTP
+stub servers.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.alert_service import AlertService
+
+
+class WebhookStub:
+    """HTTP server recording webhook payloads; can hang or fail on demand."""
+
+    def __init__(self, fail_first=0):
+        self.payloads = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail_remaining = fail_first
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                stub.release.wait(10)
+                if stub.fail_remaining > 0:
+                    stub.fail_remaining -= 1
+                    self.send_response(500)
+                else:
+                    stub.payloads.append(json.loads(body))
+                    self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/hook'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class SMTPStub:
+    """Minimal SMTP server counting sessions and messages."""
+
+    def __init__(self):
+        self.sessions = 0
+        self.messages = []
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                stub.sessions += 1
+                self.wfile.write(b'220 stub ready\r\n')
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode().strip().upper()
+                    if command.startswith(('EHLO', 'HELO')):
+                        self.wfile.write(b'250 stub\r\n')
+                    elif command == 'DATA':
+                        self.wfile.write(b'354 go ahead\r\n')
+                        data = b''.join(iter(self.rfile.readline, b'.\r\n'))
+                        stub.messages.append(data.decode())
+                        self.wfile.write(b'250 queued\r\n')
+                    elif command == 'QUIT':
+                        self.wfile.write(b'221 bye\r\n')
+                        return
+                    else:
+                        self.wfile.write(b'250 ok\r\n')
+
+        self.server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _service(tmp_dir, **config):
+    config.setdefault('dispatch', {'retry_backoff': 0.01})
+    return AlertService(os.path.join(tmp_dir, 'alerts.db'), config)
+
+
+def _rule(service, channels, position_id=None):
+    return service.create_alert_rule({'name': 'Out of range', 'alert_type': 'price_out_of_range',
+                                      'severity': 'high', 'conditions': {}, 'position_id': position_id,
+                                      'notification_channels': channels})
+
+
+def _notification_rows(service):
+    with sqlite3.connect(service.db_path) as conn:
+        return conn.execute('SELECT channel, status FROM alert_notifications').fetchall()
+
+
+def test_trigger_returns_while_webhook_hangs():
+    """Triggering stays fast with a hung webhook, and other channels keep flowing."""
+    webhook = WebhookStub()
+    webhook.release.clear()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = _service(tmp_dir, webhook_url=webhook.url)
+        rule_id = _rule(service, ['webhook', 'log'])
+        try:
+            started = time.perf_counter()
+            alert_id = service.trigger_alert(rule_id, {'id': 'pos-1', 'trade_name': 'ETH/USDC'})
+            assert time.perf_counter() - started < 0.1
+            assert service.get_alerts()[0]['id'] == alert_id
+
+            deadline = time.time() + 5
+            while service.get_dispatch_metrics()['channels']['log']['delivered'] < 1 and time.time() < deadline:
+                time.sleep(0.01)
+            metrics = service.get_dispatch_metrics()
+            assert metrics['channels']['log']['delivered'] == 1
+            assert metrics['channels']['webhook']['in_flight'] == 1
+
+            webhook.release.set()
+            assert service.flush_notifications(timeout=5)
+            assert webhook.payloads[0]['alert_id'] == alert_id
+            assert sorted(_notification_rows(service)) == [('log', 'sent'), ('webhook', 'sent')]
+            assert service.get_dispatch_metrics()['latency_ms']['max'] is not None
+        finally:
+            service.shutdown()
+            webhook.close()
+
+
+def test_duplicate_bursts_are_coalesced():
+    """Duplicates waiting behind a slow delivery collapse into one notification."""
+    webhook = WebhookStub()
+    webhook.release.clear()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = _service(tmp_dir, webhook_url=webhook.url)
+        rule_id = _rule(service, ['webhook'], position_id='pos-1')
+        other_rule = _rule(service, ['webhook'], position_id='pos-2')
+        try:
+            first = service.trigger_alert(rule_id)
+            deadline = time.time() + 5
+            while service.get_dispatch_metrics()['in_flight'] < 1 and time.time() < deadline:
+                time.sleep(0.01)
+
+            burst = [service.trigger_alert(rule_id) for _ in range(20)]
+            service.trigger_alert(other_rule)
+            metrics = service.get_dispatch_metrics()
+            assert metrics['queue_depth'] == 2 and metrics['coalesced'] == 19
+
+            webhook.release.set()
+            assert service.flush_notifications(timeout=5)
+            assert len(webhook.payloads) == 3
+            coalesced = next(p for p in webhook.payloads if p['alert_id'] == burst[-1])
+            assert coalesced['metadata']['coalesced_count'] == 20
+            assert webhook.payloads[0]['alert_id'] == first
+            assert len(_notification_rows(service)) == 22
+        finally:
+            service.shutdown()
+            webhook.close()
+
+
+def test_failed_webhook_is_retried_with_backoff():
+    """Transient webhook failures are retried until delivered, and give up after max_retries."""
+    webhook = WebhookStub(fail_first=2)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = _service(tmp_dir, webhook_url=webhook.url,
+                           dispatch={'retry_backoff': 0.01, 'max_retries': 3})
+        rule_id = _rule(service, ['webhook'])
+        try:
+            service.trigger_alert(rule_id)
+            assert service.flush_notifications(timeout=5)
+            metrics = service.get_dispatch_metrics()
+            assert metrics['retried'] == 2 and metrics['delivered'] == 1
+            assert _notification_rows(service) == [('webhook', 'sent')]
+
+            webhook.fail_remaining = 10
+            service.trigger_alert(rule_id)
+            assert service.flush_notifications(timeout=5)
+            assert service.get_dispatch_metrics()['failed'] == 1
+            assert ('webhook', 'failed') in _notification_rows(service)
+        finally:
+            service.shutdown()
+            webhook.close()
+
+
+def test_email_batches_share_one_smtp_session():
+    """Queued emails for different rules go out over a single SMTP connection."""
+    smtp = SMTPStub()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = _service(tmp_dir, smtp={'host': '127.0.0.1', 'port': smtp.port, 'from_email': 'a@example.com',
+                                          'to_email': 'b@example.com'})
+        rules = [_rule(service, ['email'], position_id=f'pos-{i}') for i in range(5)]
+        try:
+            # Hold the worker so all five are queued before the first batch is taken
+            queue = service.dispatcher._channel('email')
+            with queue.condition:
+                for rule_id in rules:
+                    service.trigger_alert(rule_id)
+            assert service.flush_notifications(timeout=5)
+            assert smtp.sessions == 1 and len(smtp.messages) == 5
+            assert _notification_rows(service) == [('email', 'sent')] * 5
+        finally:
+            service.shutdown()
+            smtp.close()
+
+
+def test_full_queue_drops_new_notifications():
+    """A channel queue at capacity drops new notifications and counts them."""
+    webhook = WebhookStub()
+    webhook.release.clear()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = _service(tmp_dir, webhook_url=webhook.url, dispatch={'max_queue': 2, 'retry_backoff': 0.01})
+        rules = [_rule(service, ['webhook'], position_id=f'pos-{i}') for i in range(5)]
+        try:
+            queue = service.dispatcher._channel('webhook')
+            with queue.condition:
+                for rule_id in rules:
+                    service.trigger_alert(rule_id)
+            metrics = service.get_dispatch_metrics()
+            assert metrics['dropped'] == 3 and metrics['enqueued'] == 5
+
+            webhook.release.set()
+            assert service.flush_notifications(timeout=5)
+            assert len(webhook.payloads) == 2
+        finally:
+            service.shutdown()
+            webhook.close()
+
+
+if __name__ == "__main__":
+    test_trigger_returns_while_webhook_hangs()
+    test_duplicate_bursts_are_coalesced()
+    test_failed_webhook_is_retried_with_backoff()
+    test_email_batches_share_one_smtp_session()
+    test_full_queue_drops_new_notifications()
+    print("✅ Alert dispatch tests passed")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled alert rule index and sweep evaluation in AlertService.
+"""
+
+import os
+import sys
+import random
+import sqlite3
+import tempfile
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.alert_rule_index import AlertRuleIndex, OPERATORS, compile_conditions
+from services.alert_service import AlertService
+
+FIELDS = ['impermanent_loss', 'apr', 'current_value']
+
+
+def _brute_force(rules, positions):
+    """Every rule checked against every position."""
+    matches = set()
+    for rule_id, _, position_id, conditions in rules:
+        for row, position in enumerate(positions):
+            if position_id and position.get('id') != position_id:
+                continue
+            values = dict(position)
+            if None not in (position.get('current_price'), position.get('price_range_min'),
+                            position.get('price_range_max')):
+                values['out_of_range'] = float(not (position['price_range_min'] <= position['current_price']
+                                                    <= position['price_range_max']))
+            if all(values.get(field) is not None and OPERATORS[op](values[field], threshold)
+                   for field, comparisons in conditions.items() for op, threshold in comparisons.items()):
+                matches.add((rule_id, row))
+    return matches
+
+
+def test_index_matches_brute_force():
+    """Indexed evaluation finds exactly the rule/position pairs a full scan finds."""
+    rng = random.Random(4)
+    positions = [{'id': f'pos-{i % 40}', 'current_price': rng.uniform(80, 120), 'price_range_min': 90,
+                  'price_range_max': 110, **{f: rng.choice([None, rng.randint(0, 20)]) for f in FIELDS}}
+                 for i in range(60)]
+    rules = []
+    for i in range(500):
+        conditions = {rng.choice(FIELDS): {rng.choice(list(OPERATORS)): rng.randint(0, 20)}}
+        if i % 3 == 0:
+            conditions[rng.choice(FIELDS)] = {rng.choice(['gt', 'lte']): rng.randint(0, 20)}
+        if i % 7 == 0:
+            conditions = {'out_of_range': {'eq': 1}}
+        position_id = f'pos-{rng.randint(0, 50)}' if i % 2 else None
+        rules.append((f'rule-{i}', rng.choice(['high_impermanent_loss', 'custom']), position_id, conditions))
+
+    index = AlertRuleIndex()
+    index.load(rules)
+    assert {(rule.rule_id, row) for rule, row in index.evaluate(positions)} == _brute_force(rules, positions)
+
+    # Incremental updates keep the index consistent
+    index.remove('rule-0')
+    index.add('rule-1', 'custom', None, {'apr': {'gte': 0}})
+    updated = [r for r in rules if r[0] not in ('rule-0', 'rule-1')] + [('rule-1', 'custom', None, {'apr': {'gte': 0}})]
+    assert {(rule.rule_id, row) for rule, row in index.evaluate(positions)} == _brute_force(updated, positions)
+
+    assert compile_conditions({'threshold': 5}) == ()
+    assert compile_conditions({'apr': {'between': 5}}) == ()
+
+
+def test_sweep_triggers_alerts_with_cooldown():
+    """A sweep creates alerts for matching rules only, once per cooldown, across restarts."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'alerts.db')
+        service = AlertService(db_path)
+        il_rule = service.create_alert_rule({'name': 'High IL', 'alert_type': 'high_impermanent_loss',
+                                             'severity': 'high', 'conditions': {'impermanent_loss': {'gt': 5}}})
+        range_rule = service.create_alert_rule({'name': 'Out of range', 'alert_type': 'price_out_of_range',
+                                                'severity': 'medium', 'position_id': 'pos-2', 'cooldown_minutes': 0,
+                                                'conditions': {'out_of_range': {'eq': 1}}})
+        service.create_alert_rule({'name': 'Manual only', 'alert_type': 'custom', 'severity': 'low',
+                                   'conditions': {'note': 'free-form'}})
+        assert len(service.rule_index) == 2
+
+        positions = [
+            {'id': 'pos-1', 'trade_name': 'ETH/USDC', 'impermanent_loss': 7.5,
+             'current_price': 150, 'price_range_min': 100, 'price_range_max': 140},
+            {'id': 'pos-2', 'trade_name': 'BTC/USDC', 'impermanent_loss': 2.0,
+             'current_price': 150, 'price_range_min': 100, 'price_range_max': 140},
+            {'id': 'pos-3', 'trade_name': 'SOL/USDC', 'impermanent_loss': 12.0},
+        ]
+        alert_ids = service.evaluate_positions(positions)
+        alerts = {a['id']: a for a in service.get_alerts()}
+        assert sorted((alerts[i]['rule_id'], alerts[i]['position_id']) for i in alert_ids) == sorted(
+            [(il_rule, 'pos-1'), (il_rule, 'pos-3'), (range_rule, 'pos-2')])
+
+        # The IL rule is cooling down for both positions; the range rule has no cooldown
+        second = service.evaluate_positions(positions)
+        assert [alerts_row['rule_id'] for alerts_row in service.get_alerts() if alerts_row['id'] in second] == [range_rule]
+
+        restarted = AlertService(db_path)
+        assert len(restarted.rule_index) == 2
+        third = restarted.evaluate_positions(positions)
+        assert len(third) == 1
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute('SELECT COUNT(*) FROM alert_cooldowns').fetchone()[0] == 3
+        service.shutdown()
+        restarted.shutdown()
+
+
+def test_monitoring_sweep_evaluates_rules():
+    """The background monitoring sweep evaluates its positions against the alert rules."""
+    from services.background_tasks import BackgroundTaskService
+    from services.cl_service import CLService
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cl_db = os.path.join(tmp_dir, 'cl.db')
+        alert_service = AlertService(os.path.join(tmp_dir, 'alerts.db'))
+        rule_id = alert_service.create_alert_rule({'name': 'Out of range', 'alert_type': 'price_out_of_range',
+                                                   'severity': 'medium', 'conditions': {'out_of_range': {'eq': 1}}})
+        position_id = CLService(cl_db).create_position({
+            'trade_name': 'ETH LP', 'pair_symbol': 'ETH/USDC', 'price_range_min': 1500.0, 'price_range_max': 2500.0,
+            'liquidity_amount': 1000.0, 'initial_investment': 5000.0, 'entry_date': '2025-01-15T00:00:00'
+        })['id']
+
+        tasks = BackgroundTaskService(cl_db, alert_service=alert_service)
+        tasks.price_updater.price_history_model.add_price_record(
+            {'position_id': position_id, 'token_pair': 'ETH/USDC', 'price': 3000.0})
+        results = tasks.monitor_all_positions_task()
+
+        assert results['positions_monitored'] == 1 and results['rule_alerts_generated'] == 1
+        alert = alert_service.get_alerts()[0]
+        assert (alert['rule_id'], alert['position_id']) == (rule_id, position_id)
+        alert_service.shutdown()
+
+
+if __name__ == "__main__":
+    test_index_matches_brute_force()
+    test_sweep_triggers_alerts_with_cooldown()
+    test_monitoring_sweep_evaluates_rules()
+    print("✅ Alert rule index tests passed")
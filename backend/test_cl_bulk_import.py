@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for transactional bulk import of CL positions.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+import jwt
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.cl_service import CLService
+
+
+def _position(i, **overrides):
+    position = {
+        'trade_name': f'Position {i}',
+        'pair_symbol': 'ETH/USDC',
+        'price_range_min': 1500.0,
+        'price_range_max': 2500.0,
+        'liquidity_amount': 1000.0 + i,
+        'initial_investment': 5000.0,
+        'entry_date': '2025-01-15T00:00:00'
+    }
+    position.update(overrides)
+    return position
+
+
+def _count(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT COUNT(*) FROM cl_positions').fetchone()[0]
+
+
+def test_bulk_create_positions():
+    """Valid rows are inserted together with defaults applied and per-row ids returned."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = CLService(os.path.join(tmp_dir, 'cl.db'))
+        outcome = service.bulk_create_positions([_position(i) for i in range(100)] + [_position(100, status='closed')])
+
+        assert outcome['imported'] == 101 and outcome['errors'] == []
+        assert [r['index'] for r in outcome['results']] == list(range(101))
+        stored = service.position_model.get_position_by_id(outcome['results'][5]['position_id'])
+        assert stored['trade_name'] == 'Position 5' and stored['protocol'] == 'HyperSwap'
+        assert stored['status'] == 'active' and stored['fees_collected'] == 0
+        assert service.position_model.get_position_by_id(outcome['results'][100]['position_id'])['status'] == 'closed'
+
+
+def test_invalid_rows_reject_whole_import():
+    """Any invalid row means nothing is imported, unless partial imports are allowed."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = CLService(os.path.join(tmp_dir, 'cl.db'))
+        positions = [_position(0), _position(1, price_range_min=3000.0), 'not a position',
+                     _position(3, entry_date=20250115), _position(4)]
+
+        outcome = service.bulk_create_positions(positions)
+        assert outcome['imported'] == 0 and outcome['results'] == []
+        assert [e['index'] for e in outcome['errors']] == [1, 2, 3]
+        assert 'price_range_min' in outcome['errors'][0]['error']
+        assert _count(service.position_model.db_path) == 0
+
+        outcome = service.bulk_create_positions(positions, allow_partial=True)
+        assert [r['index'] for r in outcome['results']] == [0, 4]
+        assert _count(service.position_model.db_path) == 2
+
+
+def test_insert_failure_rolls_back():
+    """A database error part-way through the insert leaves no rows behind."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = CLService(os.path.join(tmp_dir, 'cl.db'))
+        with sqlite3.connect(service.position_model.db_path) as conn:
+            conn.execute('''
+                CREATE TRIGGER fail_insert BEFORE INSERT ON cl_positions WHEN NEW.trade_name = 'Position 50'
+                BEGIN SELECT RAISE(ABORT, 'insert failed'); END
+            ''')
+
+        try:
+            service.bulk_create_positions([_position(i) for i in range(100)])
+            assert False, "expected the insert to fail"
+        except sqlite3.IntegrityError:
+            pass
+        assert _count(service.position_model.db_path) == 0
+
+
+def test_bulk_import_route():
+    """The bulk import endpoint returns 400 with per-row errors when rejecting an import."""
+    from flask import Flask
+    from routes import integration_routes
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        integration_routes.cl_service = CLService(os.path.join(tmp_dir, 'cl.db'))
+        app = Flask(__name__)
+        app.register_blueprint(integration_routes.integration_bp)
+        client = app.test_client()
+        token = jwt.encode({'user_id': 'test', 'permissions': ['read', 'write']},
+                           integration_routes.API_CONFIG['jwt_secret'], algorithm='HS256')
+        headers = {'Authorization': f'Bearer {token}'}
+
+        response = client.post('/api/v1/integration/positions/bulk', headers=headers,
+                               json={'positions': [_position(0), {'trade_name': 'incomplete'}]})
+        assert response.status_code == 400
+        assert response.get_json()['errors'][0]['index'] == 1
+
+        response = client.post('/api/v1/integration/positions/bulk', headers=headers,
+                               json={'positions': [_position(0), _position(1)]})
+        assert response.status_code == 200
+        assert len(response.get_json()['results']) == 2 and response.get_json()['errors'] == []
+
+
+if __name__ == "__main__":
+    test_bulk_create_positions()
+    test_invalid_rows_reject_whole_import()
+    test_insert_failure_rolls_back()
+    test_bulk_import_route()
+    print("✅ CL bulk import tests passed")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned configuration snapshot in ConfigManager.
+"""
+
+import os
+import sys
+import dataclasses
+import tempfile
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.config_manager import ConfigManager
+
+
+def _flag(name, **overrides):
+    flag = {'name': name, 'description': name, 'flag_type': 'boolean', 'default_value': False,
+            'environment_values': {'development': True}}
+    flag.update(overrides)
+    return flag
+
+
+def _expire(manager):
+    """Simulate the snapshot TTL running out."""
+    manager._snapshot = dataclasses.replace(manager._snapshot, expires_at=0.0)
+
+
+def test_flags_rollout_and_targeting():
+    """Flag values, rollout buckets and targeting come from the snapshot and are stable."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'config.db')
+        manager = ConfigManager(db_path, 'development')
+        manager.create_feature_flag(_flag('new_dashboard', rollout_percentage=25.0))
+        manager.create_feature_flag(_flag('beta_only', target_groups=['beta']))
+
+        users = [f'user-{i}' for i in range(10000)]
+        enabled = [user for user in users if manager.get_feature_flag('new_dashboard', user)]
+        assert 2200 < len(enabled) < 2800
+        assert manager.get_feature_flag('new_dashboard') is False
+        assert manager.get_feature_flag('missing') is None
+
+        assert manager.get_feature_flag('beta_only', 'u1', ['beta']) is True
+        assert manager.get_feature_flag('beta_only', 'u1', ['staff']) is False
+
+        restarted = ConfigManager(db_path, 'development')
+        assert [user for user in users if restarted.get_feature_flag('new_dashboard', user)] == enabled
+
+
+def test_versions_change_per_key():
+    """Writes bump the snapshot version and only the changed key's version."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = ConfigManager(os.path.join(tmp_dir, 'config.db'), 'development')
+        flag_id = manager.create_feature_flag(_flag('dark_mode'))
+        manager.create_feature_flag(_flag('other'))
+        snapshot = manager.get_snapshot()
+        other_version = manager.get_config_version('feature_flag:other')
+
+        manager.update_feature_flag(flag_id, {'name': 'dark_theme', 'enabled': False})
+        assert manager.get_config_version() > snapshot.version
+        assert manager.get_config_version('feature_flag:dark_theme') == manager.get_config_version()
+        assert manager.get_config_version('feature_flag:other') == other_version
+        assert manager.get_feature_flag('dark_mode') is None
+        assert manager.get_feature_flag('dark_theme') is False
+
+        # Readers holding the old snapshot still see a consistent view
+        assert 'dark_mode' in snapshot.feature_flags and 'dark_theme' not in snapshot.feature_flags
+
+        manager.set_system_config('max_positions_per_user', 25, 'number', 'Max positions')
+        assert manager.get_system_config('max_positions_per_user') == 25.0
+        assert manager.get_system_config('missing', 'fallback') == 'fallback'
+
+
+def test_ab_test_variants():
+    """Variants follow the traffic allocation and only while the test is active."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = ConfigManager(os.path.join(tmp_dir, 'config.db'), 'development')
+        flag_id = manager.create_feature_flag(_flag('checkout'))
+        active = manager.create_ab_test({'name': 'checkout', 'description': 'checkout', 'feature_flag_id': flag_id,
+                                         'variants': {'a': {}, 'b': {}}, 'status': 'active',
+                                         'traffic_allocation': {'a': 0.5, 'b': 0.5}})
+        draft = manager.create_ab_test({'name': 'draft', 'description': 'draft', 'feature_flag_id': flag_id,
+                                        'variants': {'a': {}}, 'traffic_allocation': {'a': 1.0}})
+
+        variants = [manager.get_ab_test_variant(active, f'user-{i}') for i in range(4000)]
+        assert set(variants) == {'a', 'b'} and 1800 < variants.count('a') < 2200
+        assert manager.get_ab_test_variant(draft, 'user-1') is None
+        assert manager.get_ab_test_variant('missing', 'user-1') is None
+
+
+def test_changes_from_other_processes_after_ttl():
+    """Another manager's writes are picked up when the snapshot expires."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'config.db')
+        reader = ConfigManager(db_path, 'development')
+        writer = ConfigManager(db_path, 'development')
+        unchanged_version = reader.get_config_version('system_config:api_rate_limit_per_minute')
+
+        writer.set_system_config('max_positions_per_user', 42, 'number', 'Max positions')
+        writer.create_feature_flag(_flag('remote'))
+        assert reader.get_system_config('max_positions_per_user') == 10.0
+        assert reader.get_feature_flag('remote') is None
+
+        _expire(reader)
+        assert reader.get_system_config('max_positions_per_user') == 42.0
+        assert reader.get_feature_flag('remote') is True
+        assert reader.get_config_version('system_config:api_rate_limit_per_minute') == unchanged_version
+
+
+if __name__ == "__main__":
+    test_flags_rollout_and_targeting()
+    test_versions_change_per_key()
+    test_ab_test_variants()
+    test_changes_from_other_processes_after_ttl()
+    print("✅ Config snapshot tests passed")
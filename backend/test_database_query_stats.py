@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for SQLite query statistics and SystemMonitor database metrics.
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services import query_stats as query_stats_module
+from services.query_stats import QueryStats, explain_query_plan, OTHER_STATEMENTS
+from services.system_monitor import SystemMonitor
+
+
+def test_latency_percentiles_and_slow_queries():
+    """Latencies are grouped per normalized statement with percentiles and a slow count."""
+    stats = QueryStats(slow_query_ms=50)
+    for ms in range(1, 101):
+        stats.record('SELECT *\n   FROM t  WHERE id = ?', ms / 1000)
+    stats.record('DELETE FROM t', 0.2)
+
+    snapshot = stats.snapshot()
+    select = snapshot['SELECT * FROM t WHERE id = ?']
+    assert list(snapshot) == ['SELECT * FROM t WHERE id = ?', 'DELETE FROM t']
+    assert select['count'] == 100 and select['slow_count'] == 51
+    assert (select['p50_ms'], select['p95_ms'], select['p99_ms'], select['max_ms']) == (51.0, 96.0, 100.0, 100.0)
+    assert select['avg_ms'] == 50.5
+    assert list(stats.snapshot(limit=1)) == ['SELECT * FROM t WHERE id = ?']
+    assert stats.totals()[0] == 101 and stats.totals()[2] == 52
+
+
+def test_statement_cap():
+    """Statements beyond the cap share one entry instead of growing without bound."""
+    stats = QueryStats()
+    for i in range(query_stats_module.MAX_STATEMENTS + 10):
+        stats.record(f'SELECT {i}', 0.001)
+    snapshot = stats.snapshot()
+    assert len(snapshot) == query_stats_module.MAX_STATEMENTS + 1
+    assert snapshot[OTHER_STATEMENTS]['count'] == 10
+
+
+def test_timed_connections_and_plans():
+    """Connections record every execute path, and plans show full scans and index use."""
+    stats = QueryStats()
+    with stats.connect(':memory:') as conn:
+        conn.execute('CREATE TABLE t (id INTEGER PRIMARY KEY, a INTEGER, b INTEGER)')
+        conn.execute('CREATE INDEX idx_t_a ON t(a)')
+        conn.executemany('INSERT INTO t (a, b) VALUES (?, ?)', [(i, i) for i in range(100)])
+        cursor = conn.cursor()
+        cursor.execute('SELECT b FROM t WHERE a = ?', (5,))
+        assert cursor.fetchall() == [(5,)]
+
+        indexed = explain_query_plan(conn, 'SELECT b FROM t WHERE a = ?', (5,))
+        scan = explain_query_plan(conn, 'SELECT a FROM t WHERE b = ?', (5,))
+    assert indexed['full_scans'] == [] and indexed['indexes'] == ['idx_t_a']
+    assert scan['full_scans'] == ['t'] and scan['indexes'] == []
+
+    snapshot = stats.snapshot()
+    assert snapshot['INSERT INTO t (a, b) VALUES (?, ?)']['count'] == 1
+    assert snapshot['SELECT b FROM t WHERE a = ?']['count'] == 1
+
+
+def test_monitor_database_metrics():
+    """Database metrics use cached table statistics, real query counts and hot query plans."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monitor = SystemMonitor(os.path.join(tmp_dir, 'monitoring.db'))
+        for i in range(30):
+            monitor._log_maintenance('test', 'system', f'entry {i}')
+        monitor.register_hot_query('maintenance_by_component',
+                                   'SELECT * FROM maintenance_logs WHERE component = ?', ('system',))
+
+        metrics = monitor._collect_database_metrics()
+        assert metrics.table_sizes['maintenance_logs'] == 30
+        assert metrics.database_size > 0 and metrics.table_bytes['maintenance_logs'] > 0
+        assert metrics.hot_queries['maintenance_by_component']['full_scans'] == ['maintenance_logs']
+        assert metrics.hot_queries['active_alerts']['full_scans'] == []
+        assert metrics.index_usage['idx_alerts_status'] > 0
+        assert metrics.query_count >= 30 and metrics.avg_query_time > 0
+        assert not any('COUNT(*)' in statement for statement in metrics.statements)
+
+        # Counts are per collection; table statistics are cached until they are due for a refresh
+        for i in range(5):
+            monitor._log_maintenance('test', 'system', f'later {i}')
+        metrics = monitor._collect_database_metrics()
+        assert metrics.query_count == 5
+        assert metrics.table_sizes['maintenance_logs'] == 30
+
+        monitor.table_stats_refresh_seconds = 0
+        assert monitor._collect_database_metrics().table_sizes['maintenance_logs'] == 35
+
+        monitor._save_database_metrics(metrics)
+        stored = monitor.get_metrics_history('database', hours=1)[-1]
+        assert stored['query_stats']['hot_queries']['maintenance_by_component']['full_scans'] == ['maintenance_logs']
+        assert monitor.get_query_stats(limit=1)
+
+
+if __name__ == "__main__":
+    test_latency_percentiles_and_slow_queries()
+    test_statement_cap()
+    test_timed_connections_and_plans()
+    test_monitor_database_metrics()
+    print("✅ Database query stats tests passed")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent earnings history store and the vectorized
+post-earnings performance calculation.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from app.earnings_history import calculate_post_earnings_performance
+from app.earnings_history_store import EarningsHistoryStore
+
+
+class FakeProvider:
+    """Market data provider that serves a fixed business-day price series and records calls."""
+
+    def __init__(self, end_date):
+        self.index = pd.bdate_range(end=end_date, periods=400)
+        self.prices = pd.DataFrame({'Close': [100.0 + i for i in range(len(self.index))]}, index=self.index)
+        self.price_calls = []
+        self.earnings_calls = []
+
+    def get_historical_prices(self, ticker, start_date, end_date):
+        self.price_calls.append((start_date, end_date))
+        window = self.prices[(self.prices.index >= start_date.strftime('%Y-%m-%d')) &
+                             (self.prices.index < end_date.strftime('%Y-%m-%d'))]
+        return None if window.empty else window
+
+    def get_historical_earnings_dates(self, ticker, start_date):
+        self.earnings_calls.append(start_date)
+        dates = [self.index[-200].strftime('%Y-%m-%d'), self.index[-100].strftime('%Y-%m-%d')]
+        return [d for d in dates if d >= start_date.strftime('%Y-%m-%d')]
+
+
+class ScheduledEarningsProvider(FakeProvider):
+    """Provider whose earnings list ends with the next scheduled (future) date."""
+
+    def __init__(self, end_date, dates):
+        super().__init__(end_date)
+        self.dates = dates
+
+    def get_historical_earnings_dates(self, ticker, start_date):
+        self.earnings_calls.append(start_date)
+        return [d for d in self.dates if d >= start_date.strftime('%Y-%m-%d')]
+
+
+def test_post_earnings_performance_matches_trading_days():
+    """Next/previous trading days are resolved across weekends and gaps."""
+    index = pd.to_datetime(['2024-01-04', '2024-01-05', '2024-01-08', '2024-01-09', '2024-03-01'])
+    prices = pd.DataFrame({'Close': [100.0, 110.0, 99.0, 101.0, 120.0]}, index=index)
+
+    result = calculate_post_earnings_performance(
+        ['2024-01-05', '2024-01-06', '2024-02-15', 'not-a-date'], prices
+    )
+
+    assert result == [
+        # Friday announcement: Friday close -> Monday close
+        {"earnings_date": "2024-01-05", "next_trading_day": "2024-01-08", "percent_change": -10.0},
+        # Saturday announcement: Friday close -> Monday close
+        {"earnings_date": "2024-01-06", "next_trading_day": "2024-01-08", "percent_change": -10.0},
+    ]
+
+
+def test_store_fetches_incrementally():
+    """Repeat lookups are served locally and only new days are fetched."""
+    end_date = datetime(2024, 6, 28)
+    provider = FakeProvider(end_date)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = EarningsHistoryStore(
+            db_path=os.path.join(tmp_dir, 'earnings_history.db'),
+            provider=provider,
+            price_refresh_interval=timedelta(0),
+            earnings_refresh_interval=timedelta(hours=24),
+        )
+        start_date = end_date - timedelta(days=365)
+
+        earnings_dates, closes = store.get_history('test', start_date, end_date)
+        assert len(earnings_dates) == 2
+        assert closes is not None and not closes.empty
+        assert len(provider.price_calls) == 1
+        assert provider.price_calls[0][0] == start_date
+        assert len(provider.earnings_calls) == 1
+
+        # Same window again: nothing newer to fetch
+        store.get_history('TEST', start_date, end_date)
+        assert len(provider.price_calls) == 1
+
+        # A later window only asks for days after the last stored close
+        last_stored = closes.index[-1]
+        end_date = end_date + timedelta(days=3)
+        earnings_dates, closes = store.get_history('TEST', start_date, end_date)
+        assert len(provider.price_calls) == 2
+        assert provider.price_calls[1][0] == last_stored.to_pydatetime() + timedelta(days=1)
+        assert closes.index[-1] == pd.Timestamp('2024-06-28')
+        # Earnings dates are still fresh
+        assert len(provider.earnings_calls) == 1
+
+        # A fresh store on the same database serves from disk without refetching
+        cached_store = EarningsHistoryStore(
+            db_path=os.path.join(tmp_dir, 'earnings_history.db'),
+            provider=provider,
+        )
+        cached_dates, cached_closes = cached_store.get_history('TEST', start_date, end_date)
+        assert cached_dates == earnings_dates
+        assert cached_closes['Close'].tolist() == closes['Close'].tolist()
+        assert len(provider.price_calls) == 2
+        assert len(provider.earnings_calls) == 1
+
+
+def test_scheduled_earnings_dates_are_replaced():
+    """A stored upcoming date neither hides later-reported quarters nor outlives a reschedule."""
+    end_date = datetime(2024, 6, 28)
+    provider = ScheduledEarningsProvider(end_date, ['2024-02-01', '2024-08-01'])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = EarningsHistoryStore(
+            db_path=os.path.join(tmp_dir, 'earnings_history.db'),
+            provider=provider,
+            earnings_refresh_interval=timedelta(0),
+        )
+        start_date = end_date - timedelta(days=365)
+        assert store.get_history('TEST', start_date, end_date)[0] == ['2024-02-01', '2024-08-01']
+
+        # The next report lands before the stored future date, which is then pushed back
+        provider.dates = ['2024-02-01', '2024-05-01', '2024-08-08']
+        assert store.get_history('TEST', start_date, end_date)[0] == ['2024-02-01', '2024-05-01', '2024-08-08']
+        assert provider.earnings_calls[-1] == start_date
+
+
+if __name__ == "__main__":
+    test_post_earnings_performance_matches_trading_days()
+    test_store_fetches_incrementally()
+    test_scheduled_earnings_dates_are_replaced()
+    print("✅ Earnings history store tests passed")
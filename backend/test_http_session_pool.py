@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared keep-alive HTTP session pool: connection reuse,
+retries with backoff and per-request timings.
+"""
+
+import os
+import sys
+import json
+import socket
+import time
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.http_session_pool import HTTPSessionPool, PoolTimeout
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    connections = 0
+    failures_left = 0
+    delay = 0.0
+
+    def setup(self):
+        StubHandler.connections += 1
+        super().setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(StubHandler.delay)
+        if StubHandler.failures_left > 0:
+            StubHandler.failures_left -= 1
+            status, body = 503, b'{}'
+        else:
+            status, body = 200, json.dumps({'path': self.path}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def stub_server():
+    StubHandler.connections = 0
+    StubHandler.failures_left = 0
+    StubHandler.delay = 0.0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused():
+    """Sequential requests to one host share a single keep-alive connection."""
+    pool = HTTPSessionPool(max_retries=0)
+    hook_calls = []
+    pool.add_timing_hook(hook_calls.append)
+
+    with stub_server() as stub_url:
+        responses = [pool.post(f'{stub_url}/info', json={'i': i}) for i in range(5)]
+
+    assert [r.json()['path'] for r in responses] == ['/info'] * 5
+    assert StubHandler.connections == 1
+    assert responses[0].timings['new_connections'] == 1
+    assert all(r.timings['new_connections'] == 0 and r.timings['connect_ms'] == 0 for r in responses[1:])
+    assert all(r.timings['ttfb_ms'] >= 0 for r in responses)
+    assert len(hook_calls) == 5
+
+    host = stub_url.split('//')[1]
+    stats = pool.get_stats()[host]
+    assert stats['requests'] == 5
+    assert stats['new_connections'] == 1
+    pool.close()
+
+
+def test_retryable_status_is_retried():
+    """503 responses are retried until success, up to the retry budget."""
+    pool = HTTPSessionPool(max_retries=2, backoff_factor=0.01)
+
+    with stub_server() as stub_url:
+        StubHandler.failures_left = 2
+        response = pool.post(f'{stub_url}/info', json={})
+        assert response.status_code == 200
+        assert response.timings['attempts'] == 3
+
+        StubHandler.failures_left = 5
+        response = pool.post(f'{stub_url}/info', json={}, retries=1)
+        assert response.status_code == 503
+        assert response.timings['attempts'] == 2
+    pool.close()
+
+
+def test_connection_errors_raise_after_retries():
+    """Connection failures are retried, then raised; the failure is still recorded."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    pool = HTTPSessionPool(max_retries=1, backoff_factor=0.01)
+    attempts = []
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        pool.get(f'http://127.0.0.1:{port}/', before_request=lambda: attempts.append(1))
+
+    assert len(attempts) == 2
+    stats = pool.get_stats()[f'127.0.0.1:{port}']
+    assert stats['errors'] == 1
+    assert stats['retries'] == 1
+    pool.close()
+
+
+def test_busy_pool_wait_is_bounded():
+    """With every connection to a host busy, a caller waits at most pool_timeout."""
+    pool = HTTPSessionPool(max_per_host=1, max_retries=0, pool_timeout=0.2)
+
+    with stub_server() as stub_url:
+        StubHandler.delay = 1.0
+        slow = threading.Thread(target=pool.post, args=(f'{stub_url}/slow',), kwargs={'json': {}})
+        slow.start()
+        time.sleep(0.2)
+
+        started = time.perf_counter()
+        with pytest.raises(PoolTimeout):
+            pool.post(f'{stub_url}/info', json={})
+        assert time.perf_counter() - started < 0.8
+        slow.join()
+    pool.close()
+
+
+if __name__ == "__main__":
+    test_connections_are_reused()
+    test_retryable_status_is_retried()
+    test_connection_errors_raise_after_retries()
+    test_busy_pool_wait_is_bounded()
+    print("✅ HTTP session pool tests passed")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent multi-account Hyperliquid sync: parallel wall time,
+per-account failure isolation and timeouts.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from models.hyperliquid_models import HyperliquidDatabase
+from services.hyperliquid_sync_service import HyperliquidSyncService, SyncConfig
+
+
+class FakeAPIService:
+    """API stand-in with a per-wallet delay for fills."""
+
+    def __init__(self, delays, failing=()):
+        self.delays = delays
+        self.failing = set(failing)
+        self.release = threading.Event()
+
+    def get_user_fills(self, wallet_address, start_time=None):
+        if wallet_address in self.failing:
+            raise RuntimeError("API unavailable")
+        delay = self.delays.get(wallet_address, 0)
+        if delay is None:
+            self.release.wait(5)  # hangs until the test releases it
+        else:
+            time.sleep(delay)
+        return [{'tid': f'{wallet_address}-1', 'coin': 'ETH', 'side': 'B', 'px': '3000',
+                 'sz': '1', 'time': 1700000000000}]
+
+    def get_user_portfolio(self, wallet_address):
+        return {'accountValue': 100}
+
+
+def _make_service(tmp_dir, api, **config):
+    database = HyperliquidDatabase(os.path.join(tmp_dir, 'hyperliquid.db'))
+    return HyperliquidSyncService(api, database, SyncConfig(**config))
+
+
+def _accounts(*wallets):
+    return [{'wallet_address': w, 'account_type': 'personal_wallet'} for w in wallets]
+
+
+def test_accounts_sync_in_parallel():
+    """Wall time follows the slowest account, with per-account durations reported."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        api = FakeAPIService({'0xa': 0.3, '0xb': 0.3, '0xc': 0.3})
+        service = _make_service(tmp_dir, api, max_concurrent_accounts=3)
+
+        started = time.time()
+        results = service.sync_all_accounts(_accounts('0xa', '0xb', '0xc'))
+        elapsed = time.time() - started
+
+        assert results['success'], results['errors']
+        assert results['accounts_synced'] == 3
+        assert elapsed < 0.8
+        for wallet in ('0xa', '0xb', '0xc'):
+            key = f'personal_wallet_{wallet}'
+            assert results['results'][key]['trades']['new_trades'] == 1
+            assert results['account_durations_ms'][key] >= 300
+        assert service.last_sync_metrics['accounts_synced'] == 3
+
+
+def test_failures_and_timeouts_are_isolated():
+    """A failing or hung account does not hold up or break the others."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        api = FakeAPIService({'0xok': 0, '0xhung': None}, failing=['0xbad'])
+        service = _make_service(tmp_dir, api, account_timeout_seconds=0.3)
+        accounts = _accounts('0xok', '0xbad', '0xhung') + [{'wallet_address': '0xz', 'account_type': 'nope'}]
+
+        started = time.time()
+        results = service.sync_all_accounts(accounts)
+        elapsed = time.time() - started
+
+        assert elapsed < 2
+        assert not results['success']
+        assert results['results']['personal_wallet_0xok']['trades']['success']
+        assert not results['results']['personal_wallet_0xbad']['trades']['success']
+        assert 'timed out' in results['results']['personal_wallet_0xhung']['error']
+        assert 'nope_0xz' in results['results']
+        assert results['accounts_synced'] == 2
+
+        # The hung account is skipped until its previous sync finishes
+        again = service.sync_all_accounts(_accounts('0xhung'))
+        assert 'still running' in again['errors'][0]
+
+        api.release.set()
+        deadline = time.time() + 5
+        while service._accounts_in_flight and time.time() < deadline:
+            time.sleep(0.05)
+        assert service.sync_all_accounts(_accounts('0xhung'))['success']
+
+
+if __name__ == "__main__":
+    test_accounts_sync_in_parallel()
+    test_failures_and_timeouts_are_isolated()
+    print("✅ Hyperliquid concurrent sync tests passed")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for precomputed equity buckets and the downsampled portfolio/vault
+equity series served to charts.
+"""
+
+import os
+import sys
+import math
+import sqlite3
+import tempfile
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from flask import Flask
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+import models.hyperliquid_models as hyperliquid_models
+import routes.hyperliquid_routes as hyperliquid_routes
+from models.hyperliquid_models import HyperliquidDatabase, AccountType, lttb_downsample
+
+WALLET = '0xabc'
+VAULT = '0xvault'
+START = 1700000000  # seconds
+SAMPLES = 1000
+
+
+class _Clock:
+    """Stands in for datetime in the models module so snapshots get chosen timestamps."""
+    now_ts = START
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.fromtimestamp(cls.now_ts, tz=timezone.utc)
+
+
+def _value(i):
+    return 10000 + 500 * math.sin(i / 50) + (i % 7)
+
+
+def _populate(db):
+    """One portfolio snapshot and vault equity per minute, with one rewritten snapshot."""
+    with patch.object(hyperliquid_models, 'datetime', _Clock):
+        for i in range(SAMPLES):
+            _Clock.now_ts = START + 60 * i
+            db.insert_portfolio_snapshot({'accountValue': str(_value(i))}, AccountType.PERSONAL_WALLET, WALLET)
+            if i % 10 == 0:
+                db.insert_vault_equity({'equity': str(_value(i) / 10)}, VAULT, WALLET)
+        # Same timestamp again replaces the snapshot; buckets must not double count it
+        _Clock.now_ts = START + 60 * 100
+        db.insert_portfolio_snapshot({'accountValue': '20000'}, AccountType.PERSONAL_WALLET, WALLET)
+
+
+def _bucket_table(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return sorted(conn.execute(
+            'SELECT series, owner, scope, resolution, bucket_start, ROUND(open, 6), ROUND(high, 6), '
+            'ROUND(low, 6), ROUND(close, 6), sample_count, first_time, last_time FROM hyperliquid_equity_buckets'
+        ).fetchall())
+
+
+def test_lttb_downsample():
+    """LTTB keeps the endpoints and spikes within the point budget."""
+    points = [(i, 100.0) for i in range(1000)]
+    points[437] = (437, 500.0)
+    sampled = lttb_downsample(points, 20)
+    assert len(sampled) == 20
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (437, 500.0) in sampled
+    assert lttb_downsample(points[:10], 20) == points[:10]
+
+
+def test_buckets_track_inserts():
+    """Incrementally maintained buckets match a full rebuild, including replaced samples."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = HyperliquidDatabase(os.path.join(tmp_dir, 'hl.db'), archive_raw_fills=False)
+        _populate(db)
+
+        incremental = _bucket_table(db)
+        db.rebuild_equity_buckets()
+        assert _bucket_table(db) == incremental
+
+        weekly = [row for row in incremental if row[0] == 'portfolio' and row[3] == 7 * 24 * 3600]
+        assert sum(row[9] for row in weekly) == SAMPLES
+        assert max(row[6] for row in weekly) == 20000
+
+
+def test_series_respects_point_budget():
+    """Long ranges come from coarser buckets; short ranges return raw snapshots."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = HyperliquidDatabase(os.path.join(tmp_dir, 'hl.db'), archive_raw_fills=False)
+        _populate(db)
+
+        hourly = db.get_portfolio_equity_series(AccountType.PERSONAL_WALLET, WALLET, max_points=50)
+        assert hourly['resolution'] == 3600
+        assert len(hourly['points']) <= 50
+        assert max(p['high'] for p in hourly['points']) == 20000
+        times = [p['time'] for p in hourly['points']]
+        assert times == sorted(times)
+
+        lttb = db.get_portfolio_equity_series(AccountType.PERSONAL_WALLET, WALLET, max_points=50, method='lttb')
+        assert len(lttb['points']) <= 50
+
+        raw = db.get_portfolio_equity_series(AccountType.PERSONAL_WALLET, WALLET,
+                                             start_time=START + 60 * 10, end_time=START + 60 * 19)
+        assert raw['resolution'] == 0
+        assert [p['value'] for p in raw['points']] == [_value(i) for i in range(10, 20)]
+
+        vault = db.get_vault_equity_series(VAULT, WALLET, max_points=500)
+        assert vault['resolution'] == 0 and len(vault['points']) == SAMPLES // 10
+
+        assert db.get_vault_equity_series('0xnone', WALLET)['points'] == []
+
+
+def test_equity_endpoints():
+    """Equity routes validate parameters and feed the performance chart."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = HyperliquidDatabase(os.path.join(tmp_dir, 'hl.db'), archive_raw_fills=False)
+        _populate(db)
+
+        app = Flask(__name__)
+        app.register_blueprint(hyperliquid_routes.hyperliquid_bp)
+        original = hyperliquid_routes.database
+        hyperliquid_routes.database = db
+        try:
+            client = app.test_client()
+            query = f'account_type=personal_wallet&wallet_address={WALLET}'
+
+            response = client.get(f'/api/hyperliquid/portfolio/equity?{query}&max_points=40')
+            body = response.get_json()
+            assert response.status_code == 200
+            assert body['count'] <= 40 and body['resolution'] == 3600
+
+            vault = client.get(f'/api/hyperliquid/vault/equity?vault_address={VAULT}&user_address={WALLET}'
+                               f'&start_time={START}&end_time={START + 3600}').get_json()
+            assert vault['count'] == 7
+
+            assert client.get(f'/api/hyperliquid/portfolio/equity?{query}&method=avg').status_code == 400
+            assert client.get(f'/api/hyperliquid/portfolio/equity?{query}&range=2w').status_code == 400
+            assert client.get('/api/hyperliquid/vault/equity').status_code == 400
+
+            performance = client.get(f'/api/hyperliquid/performance?{query}').get_json()['performance_data']
+            dates = [p['date'] for p in performance['account_value_over_time']]
+            assert 0 < len(dates) <= hyperliquid_routes.DEFAULT_EQUITY_POINTS
+            assert dates == sorted(dates)
+        finally:
+            hyperliquid_routes.database = original
+
+
+if __name__ == "__main__":
+    test_lttb_downsample()
+    test_buckets_track_inserts()
+    test_series_respects_point_budget()
+    test_equity_endpoints()
+    print("✅ Hyperliquid equity downsampling tests passed")
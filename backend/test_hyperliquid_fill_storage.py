@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar Hyperliquid fill storage: typed reads without JSON decoding,
+batched inserts, the compressed raw payload archive and legacy raw_data migration.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from models.hyperliquid_models import HyperliquidDatabase, AccountType, TRADE_COLUMNS
+
+WALLET = '0xabc'
+
+
+def _fill(tid, coin='ETH', time_ms=1700000000000, **extra):
+    fill = {'tid': tid, 'coin': coin, 'side': 'B', 'px': '3000.5', 'sz': '0.1', 'time': time_ms,
+            'dir': 'Open Long', 'closedPnl': '0.0', 'hash': f'0x{tid}', 'oid': 42,
+            'crossed': True, 'fee': '0.12', 'feeToken': 'USDC'}
+    fill.update(extra)
+    return fill
+
+
+def test_insert_and_read_typed_columns():
+    """Batched inserts skip duplicates and reads return typed columns only."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = HyperliquidDatabase(os.path.join(tmp_dir, 'hl.db'), archive_raw_fills=False)
+        fills = [_fill(1), _fill(2, coin='BTC', time_ms=1700000001000), _fill(3, time_ms=1700000002000),
+                 _fill(4, px='not-a-number'), {'coin': 'ETH'}]
+
+        result = db.insert_trades(fills, AccountType.PERSONAL_WALLET, WALLET)
+        assert result['new_trades'] == 3
+        assert result['existing_trades'] == 0
+        assert len(result['errors']) == 1
+
+        again = db.insert_trades(fills[:3], AccountType.PERSONAL_WALLET, WALLET)
+        assert (again['new_trades'], again['existing_trades']) == (0, 3)
+
+        trades = db.get_trades(AccountType.PERSONAL_WALLET, WALLET)
+        assert [t['trade_id'] for t in trades] == ['3', '2', '1']
+        assert tuple(trades[0]) == TRADE_COLUMNS
+        assert trades[0]['px'] == 3000.5 and trades[0]['fee_token'] == 'USDC'
+
+        eth = db.get_trades(AccountType.PERSONAL_WALLET, WALLET, coin='ETH', start_time=1700000001000)
+        assert [t['trade_id'] for t in eth] == ['3']
+
+        # Nothing archived unless enabled
+        assert db.get_archived_fill(trades[0]['id']) is None
+
+
+def test_archive_and_composite_index():
+    """Archived payloads round-trip and coin/time reads use the composite index."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = HyperliquidDatabase(os.path.join(tmp_dir, 'hl.db'), archive_raw_fills=True)
+        db.insert_trades([_fill(1)], AccountType.PERSONAL_WALLET, WALLET)
+        row_id = db.insert_trade(_fill(2, coin='SOL'), AccountType.PERSONAL_WALLET, WALLET)
+
+        trades = db.get_trades(AccountType.PERSONAL_WALLET, WALLET)
+        archived = {t['trade_id']: db.get_archived_fill(t['id']) for t in trades}
+        assert archived['1'] == _fill(1)
+        assert db.get_archived_fill(row_id) == _fill(2, coin='SOL')
+
+        with sqlite3.connect(db.db_path) as conn:
+            plan = ' '.join(str(r) for r in conn.execute(
+                'EXPLAIN QUERY PLAN SELECT id FROM hyperliquid_trades '
+                'WHERE account_type = ? AND wallet_address = ? AND coin = ? AND time >= ? ORDER BY time DESC',
+                ('personal_wallet', WALLET, 'ETH', 0)
+            ))
+        assert 'idx_hyperliquid_trades_account_coin_time' in plan
+
+
+def test_legacy_raw_data_migration():
+    """raw_data written by older versions is promoted, archived and cleared on open, even with archiving off."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'hl.db')
+        with sqlite3.connect(db_path) as conn:
+            conn.execute('''
+                CREATE TABLE hyperliquid_trades (
+                    id TEXT PRIMARY KEY, account_type TEXT NOT NULL, wallet_address TEXT NOT NULL,
+                    trade_id TEXT NOT NULL, coin TEXT NOT NULL, side TEXT NOT NULL, px REAL NOT NULL,
+                    sz REAL NOT NULL, time INTEGER NOT NULL, start_position REAL, dir TEXT,
+                    closed_pnl REAL, hash TEXT, oid INTEGER, crossed BOOLEAN, fee REAL,
+                    liquidation_markup REAL, raw_data TEXT, created_at INTEGER NOT NULL,
+                    updated_at INTEGER NOT NULL, UNIQUE(trade_id, account_type, wallet_address)
+                )
+            ''')
+            conn.execute(
+                "INSERT INTO hyperliquid_trades VALUES ('row-1', 'personal_wallet', ?, '7', 'ETH', 'B', 1, 1, 5, "
+                "NULL, '', NULL, '', NULL, 0, NULL, NULL, ?, 1, 1)",
+                (WALLET, json.dumps(_fill(7, feeToken='HYPE')))
+            )
+
+        db = HyperliquidDatabase(db_path, archive_raw_fills=False)
+
+        trade = db.get_trades(AccountType.PERSONAL_WALLET, WALLET)[0]
+        assert trade['fee_token'] == 'HYPE'
+        assert db.get_archived_fill('row-1') == _fill(7, feeToken='HYPE')
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute('SELECT COUNT(*) FROM hyperliquid_trades WHERE raw_data IS NOT NULL').fetchone()[0] == 0
+
+
+if __name__ == "__main__":
+    test_insert_and_read_typed_columns()
+    test_archive_and_composite_index()
+    test_legacy_raw_data_migration()
+    print("✅ Hyperliquid fill storage tests passed")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental Hyperliquid trade rollups and the performance
+endpoints that read them.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+from flask import Flask
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+import routes.hyperliquid_routes as hyperliquid_routes
+from models.hyperliquid_models import HyperliquidDatabase, AccountType
+
+WALLET = '0xabc'
+DAY_MS = 24 * 60 * 60 * 1000
+DAY0 = 1700006400000  # 2023-11-15 00:00 UTC
+
+
+def _fill(tid, coin, time_ms, px, sz, pnl, fee='0.5'):
+    return {'tid': tid, 'coin': coin, 'side': 'B', 'px': str(px), 'sz': str(sz), 'time': time_ms,
+            'closedPnl': str(pnl), 'fee': fee, 'hash': f'0x{tid}'}
+
+
+FILLS = [
+    _fill(1, 'ETH', DAY0 + 1000, 2000, 1, 0),
+    _fill(2, 'ETH', DAY0 + 3 * 3600 * 1000, 2100, 1, 100),
+    _fill(3, 'BTC', DAY0 + 5000, 40000, 0.1, -50),
+    _fill(4, 'BTC', DAY0 + DAY_MS + 10, 41000, 0.1, 25),
+]
+
+
+def _rollup_table(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return sorted(conn.execute(
+            'SELECT account_type, wallet_address, bucket, bucket_start, coin, trade_count, '
+            'ROUND(volume, 6), ROUND(fees, 6), ROUND(realized_pnl, 6), win_count, loss_count '
+            'FROM hyperliquid_trade_rollups WHERE trade_count > 0'
+        ).fetchall())
+
+
+def test_rollups_track_inserts():
+    """Rollups are updated incrementally and match a full rebuild."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = HyperliquidDatabase(os.path.join(tmp_dir, 'hl.db'), archive_raw_fills=False)
+        db.insert_trades(FILLS[:2], AccountType.PERSONAL_WALLET, WALLET)
+        db.insert_trades(FILLS, AccountType.PERSONAL_WALLET, WALLET)  # duplicates are not counted twice
+        db.insert_trade(FILLS[3], AccountType.PERSONAL_WALLET, WALLET)  # replacing a trade keeps counts
+
+        daily = db.get_trade_rollups(AccountType.PERSONAL_WALLET, WALLET, bucket='day')
+        assert [(r['bucket_start'], r['trade_count']) for r in daily] == [(DAY0, 3), (DAY0 + DAY_MS, 1)]
+        assert daily[0]['realized_pnl'] == 50
+        assert daily[0]['win_count'] == 1 and daily[0]['loss_count'] == 1
+        assert daily[0]['volume'] == 2000 + 2100 + 4000
+
+        hourly = db.get_trade_rollups(AccountType.PERSONAL_WALLET, WALLET, bucket='hour', coin='ETH')
+        assert [r['bucket_start'] for r in hourly] == [DAY0, DAY0 + 3 * 3600 * 1000]
+
+        stats = db.get_trade_statistics(AccountType.PERSONAL_WALLET, WALLET)
+        assert stats['total_trades'] == 4
+        assert stats['unique_coins'] == 2
+        assert stats['total_pnl'] == 75
+        assert stats['total_fees'] == 2
+        assert stats['win_rate'] == 50
+
+        incremental = _rollup_table(db)
+        db.rebuild_trade_rollups()
+        assert _rollup_table(db) == incremental
+
+
+def test_performance_endpoint_reads_rollups():
+    """Performance periods, cumulative PnL and coin totals come from the rollups."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = HyperliquidDatabase(os.path.join(tmp_dir, 'hl.db'), archive_raw_fills=False)
+        db.insert_trades(FILLS, AccountType.PERSONAL_WALLET, WALLET)
+
+        app = Flask(__name__)
+        app.register_blueprint(hyperliquid_routes.hyperliquid_bp)
+        original = hyperliquid_routes.database
+        hyperliquid_routes.database = db
+        try:
+            client = app.test_client()
+            query = f'account_type=personal_wallet&wallet_address={WALLET}'
+
+            daily = client.get(f'/api/hyperliquid/performance?{query}&timeframe=daily').get_json()
+            data = daily['performance_data']
+            assert [p['count'] for p in data['trades_over_time']] == [3, 1]
+            assert [p['cumulative_pnl'] for p in data['pnl_over_time']] == [50, 75]
+            assert data['coin_performance']['BTC']['total_trades'] == 2
+
+            monthly = client.get(f'/api/hyperliquid/performance?{query}').get_json()['performance_data']
+            assert monthly['trades_over_time'] == [
+                {'date': '2023-11-01T00:00:00+00:00', 'count': 4, 'pnl': 75, 'volume': 12200, 'fees': 2}
+            ]
+
+            stats = client.get(f'/api/hyperliquid/statistics?{query}').get_json()
+            assert stats['statistics']['total_trades'] == 4
+            assert client.get('/api/hyperliquid/statistics').status_code == 400
+        finally:
+            hyperliquid_routes.database = original
+
+
+def test_rollups_follow_direct_sql_writes():
+    """Trades deleted or updated with plain SQL (e.g. cleanup scripts) keep the rollups in step."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = HyperliquidDatabase(os.path.join(tmp_dir, 'hl.db'), archive_raw_fills=False)
+        db.insert_trades(FILLS, AccountType.PERSONAL_WALLET, WALLET)
+
+        with sqlite3.connect(db.db_path) as conn:
+            conn.execute('DELETE FROM hyperliquid_trades')
+        assert _rollup_table(db) == []
+
+        # A re-sync after the cleanup counts each trade once
+        db.insert_trades(FILLS, AccountType.PERSONAL_WALLET, WALLET)
+        with sqlite3.connect(db.db_path) as conn:
+            conn.execute("UPDATE hyperliquid_trades SET closed_pnl = 0 WHERE trade_id = '3'")
+        assert db.get_trade_statistics(AccountType.PERSONAL_WALLET, WALLET)['total_trades'] == 4
+
+        incremental = _rollup_table(db)
+        db.rebuild_trade_rollups()
+        assert _rollup_table(db) == incremental
+
+
+def test_rollups_rebuilt_when_triggers_installed():
+    """Rollups that drifted before the triggers existed are rebuilt on open."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'hl.db')
+        db = HyperliquidDatabase(db_path, archive_raw_fills=False)
+        db.insert_trades(FILLS, AccountType.PERSONAL_WALLET, WALLET)
+        expected = _rollup_table(db)
+
+        with sqlite3.connect(db_path) as conn:
+            for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+                conn.execute(f'DROP TRIGGER {name}')
+            conn.execute('UPDATE hyperliquid_trade_rollups SET trade_count = trade_count * 2')
+
+        db = HyperliquidDatabase(db_path, archive_raw_fills=False)
+        assert _rollup_table(db) == expected
+
+
+if __name__ == "__main__":
+    test_rollups_track_inserts()
+    test_performance_endpoint_reads_rollups()
+    test_rollups_follow_direct_sql_writes()
+    test_rollups_rebuilt_when_triggers_installed()
+    print("✅ Hyperliquid rollup tests passed")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the array-based technical level engine in LevelDetector.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+import app.level_detector as level_detector_module
+from app.level_detector import LevelDetector
+
+
+def _make_history(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 1, n)), 1)
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=n, tz='America/New_York')
+    return pd.DataFrame({
+        'High': close + np.round(rng.random(n), 1),
+        'Low': close - np.round(rng.random(n), 1),
+        'Close': close,
+        'Volume': rng.integers(1_000, 100_000, n).astype(float),
+    }, index=index)
+
+
+def test_pivots_match_window_extremes():
+    """Every pivot equals the min/max of the 11-bar window centred on it."""
+    hist = _make_history()
+    pivots = LevelDetector()._find_pivot_points(hist)
+
+    lows = hist['Low'].to_numpy()
+    highs = hist['High'].to_numpy()
+    expected_support = [lows[i] for i in range(5, len(lows) - 5) if lows[i] == lows[i - 5:i + 6].min()]
+    expected_resistance = [highs[i] for i in range(5, len(highs) - 5) if highs[i] == highs[i - 5:i + 6].max()]
+
+    assert pivots['support'] == expected_support
+    assert pivots['resistance'] == expected_resistance
+
+
+def test_cluster_levels_sweep():
+    """Nearby levels collapse into their running average."""
+    clustered = LevelDetector()._cluster_levels([100.0, 101.0, 150.0, 100.5, 151.0], tolerance=0.02)
+    assert clustered == [100.5, 150.5]
+    assert LevelDetector()._cluster_levels([]) == []
+
+
+def test_levels_memoized_per_ticker_and_period(monkeypatch):
+    """Repeated level lookups reuse a single history download."""
+    hist = _make_history()
+    calls = []
+
+    class FakeTicker:
+        def __init__(self, ticker):
+            self.ticker = ticker
+
+        def history(self, period):
+            calls.append((self.ticker, period))
+            return hist
+
+    monkeypatch.setattr(level_detector_module.yf, 'Ticker', FakeTicker)
+    detector = LevelDetector()
+
+    first = detector.detect_technical_levels('TEST')
+    first['support'].append(-1.0)  # callers get copies, not the cached lists
+    second = detector.detect_technical_levels('test')
+    detector.get_levels_near_price('TEST', float(hist['Close'].iloc[-1]))
+    strength = detector.calculate_level_strength('TEST', float(hist['Low'].min()), 'support')
+
+    assert -1.0 not in second['support']
+    assert 0.1 <= strength <= 1.0
+    assert calls == [('TEST', '6mo'), ('TEST', '3mo')]
+
+    detector.clear_cache('TEST')
+    detector.detect_technical_levels('TEST')
+    assert len(calls) == 3
+
+
+if __name__ == "__main__":
+    test_pivots_match_window_extremes()
+    test_cluster_levels_sweep()
+    print("✅ Level detector tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy, cached macro chart rendering.
+"""
+
+import os
+import sys
+import base64
+from datetime import datetime, timezone
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+import services.macro_chart_service as macro_chart_service
+from services.macro_chart_service import MacroChartService, CHART_RENDERERS
+
+PNG_SIGNATURE = b'\x89PNG'
+
+
+class FakeMacroDB:
+    """Macro database returning a fixed hourly market data window."""
+
+    def __init__(self, points=48, btc_start=100000.0):
+        now = int(datetime.now(timezone.utc).timestamp())
+        self.rows = []
+        for i in range(points):
+            btc_price = btc_start + i * 100
+            self.rows.append({
+                'timestamp': now - (points - i) * 3600,
+                'btc_price': btc_price,
+                'eth_price': 3500.0 + i,
+                'btc_market_cap': btc_price * 19_700_000,
+                'eth_market_cap': (3500.0 + i) * 120_000_000,
+                'btc_dominance': 55.0 + i * 0.01,
+                'alt_strength_ratio': 10_000_000.0 + i * 1000,
+            })
+
+    def get_market_data_range(self, start_timestamp, end_timestamp):
+        return [r for r in self.rows if start_timestamp <= r['timestamp'] <= end_timestamp]
+
+
+def test_charts_render_lazily_and_cache_by_data_hash(monkeypatch):
+    """Only requested charts render, and identical data never re-renders."""
+    monkeypatch.setattr(macro_chart_service, 'CHART_RENDER_WORKERS', 0)
+    macro_chart_service.clear_chart_cache()
+
+    rendered = []
+    original = macro_chart_service._render_chart
+
+    def counting_render(chart_key, df, config):
+        rendered.append(chart_key)
+        image, _ = original(chart_key, df, config)
+        return image, 10000.0   # fixed render cost, so processing times are predictable
+
+    monkeypatch.setattr(macro_chart_service, '_render_chart', counting_render)
+    service = MacroChartService(FakeMacroDB())
+
+    chart_set = service.prepare_macro_charts(days=7)
+    assert rendered == []
+
+    image = chart_set.get_image('eth_btc_ratio_chart_image')
+    assert base64.b64decode(image).startswith(PNG_SIGNATURE)
+    assert rendered == ['eth_btc_ratio_chart_image']
+
+    # Same data window: the ratio chart comes from the cache
+    result = service.generate_macro_charts(days=7)
+    assert set(CHART_RENDERERS) <= set(result)
+    assert result['chart_data_hash'] == chart_set.data_hash
+    assert sorted(rendered) == sorted(CHART_RENDERERS)
+    # Only the charts this window rendered count towards its processing time
+    assert 10000 * (len(CHART_RENDERERS) - 1) <= result['processing_time_ms'] < 10000 * len(CHART_RENDERERS)
+
+    cached = service.generate_macro_charts(days=7)
+    assert len(rendered) == len(CHART_RENDERERS)
+    assert cached['processing_time_ms'] < 10000
+
+    # New data renders again
+    MacroChartService(FakeMacroDB(btc_start=101000.0)).generate_macro_charts(
+        days=7, charts=['btc_chart_image'])
+    assert len(rendered) == len(CHART_RENDERERS) + 1
+    macro_chart_service.clear_chart_cache()
+
+
+def test_charts_render_in_pool():
+    """Charts rendered on the render pool threads match renders in the calling thread."""
+    macro_chart_service.clear_chart_cache()
+    service = MacroChartService(FakeMacroDB(btc_start=120000.0))
+    try:
+        result = service.generate_macro_charts(days=7)
+        assert macro_chart_service._render_pool is not None
+        for chart_key in CHART_RENDERERS:
+            assert base64.b64decode(result[chart_key]).startswith(PNG_SIGNATURE)
+
+        chart_set = service.prepare_macro_charts(days=7)
+        in_process = service._generate_dominance_chart(chart_set.df)
+        assert result['dominance_chart_image'] == in_process
+    finally:
+        macro_chart_service.shutdown_render_pool()
+        macro_chart_service.clear_chart_cache()
+
+
+if __name__ == "__main__":
+    test_charts_render_in_pool()
+    print("✅ Macro chart rendering tests passed")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory bootstrap status and latest sentiment snapshots used by the
+macro sentiment status endpoints.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from models.macro_sentiment_models import MacroSentimentDatabase
+from services.macro_bootstrap_service import MacroBootstrapService
+
+
+def _market_data(timestamp):
+    return {
+        'timestamp': timestamp,
+        'total_market_cap': 2500000000000,
+        'btc_market_cap': 1000000000000,
+        'eth_market_cap': 400000000000,
+        'btc_price': 50000,
+        'eth_price': 3000,
+    }
+
+
+def _analysis(confidence):
+    now = int(datetime.now(timezone.utc).timestamp())
+    return {
+        'analysis_timestamp': now + confidence,
+        'data_period_start': now - 86400,
+        'data_period_end': now,
+        'overall_confidence': confidence,
+        'btc_trend_direction': 'UP',
+        'btc_trend_strength': 80,
+        'eth_trend_direction': 'UP',
+        'eth_trend_strength': 70,
+        'alt_trend_direction': 'SIDEWAYS',
+        'alt_trend_strength': 45,
+        'trade_permission': 'ACTIVE',
+        'market_regime': 'BTC_SEASON',
+        'ai_reasoning': 'Test analysis reasoning',
+        'chart_data_hash': 'test_hash_123',
+        'processing_time_ms': 5000,
+        'model_used': 'test-model'
+    }
+
+
+def test_bootstrap_status_snapshot_invalidated_by_writes():
+    """Status polls are answered from memory until the scanner writes new data."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = MacroSentimentDatabase(os.path.join(tmp_dir, 'chart_analysis.db'))
+        service = MacroBootstrapService(db)
+        now = int(datetime.now(timezone.utc).timestamp())
+
+        # Data older than 90 days does not count towards bootstrap
+        db.insert_market_data(_market_data(now - 100 * 86400))
+        for i in range(79):
+            db.insert_market_data(_market_data(now - i * 3600))
+
+        queries = []
+        original = db.get_market_data_stats
+
+        def counting_stats(since_timestamp):
+            queries.append(since_timestamp)
+            return original(since_timestamp)
+
+        db.get_market_data_stats = counting_stats
+
+        status = service.get_bootstrap_status()
+        assert status['completed'] is False
+        assert status['data_points'] == 79
+        assert status['latest_date'] == now
+
+        for _ in range(5):
+            assert service.get_bootstrap_status() == status
+        assert len(queries) == 1
+
+        # A new scan invalidates the snapshot
+        db.insert_market_data(_market_data(now + 60))
+        status = service.get_bootstrap_status()
+        assert status['completed'] is True
+        assert status['data_points'] == 80
+        assert len(queries) == 2
+
+
+def test_latest_sentiment_snapshot():
+    """The latest analysis is cached until a new analysis is stored."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = MacroSentimentDatabase(os.path.join(tmp_dir, 'chart_analysis.db'))
+        assert db.get_latest_sentiment() is None
+
+        db.insert_sentiment_analysis(_analysis(60))
+        latest = db.get_latest_sentiment()
+        assert latest['overall_confidence'] == 60
+
+        # Callers get copies of the snapshot
+        latest['overall_confidence'] = 0
+        assert db.get_latest_sentiment()['overall_confidence'] == 60
+
+        db.insert_sentiment_analysis(_analysis(75))
+        assert db.get_latest_sentiment()['overall_confidence'] == 75
+
+
+def test_failed_loads_are_not_cached():
+    """A failing status query is reported, then retried on the next poll once it recovers."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = MacroSentimentDatabase(os.path.join(tmp_dir, 'chart_analysis.db'))
+        service = MacroBootstrapService(db)
+        original = db.get_market_data_stats
+
+        def failing_query(*args):
+            raise RuntimeError('database is locked')
+
+        db.get_market_data_stats = failing_query
+        status = service.get_bootstrap_status()
+        assert status['completed'] is False and 'database is locked' in status['reason']
+
+        db.get_market_data_stats = original
+        assert service.get_bootstrap_status()['reason'] == 'No data found'
+
+        db.insert_sentiment_analysis(_analysis(60))
+        original_query = db._query_latest_sentiment
+        db._query_latest_sentiment = failing_query
+        assert db.get_latest_sentiment() is None
+
+        db._query_latest_sentiment = original_query
+        assert db.get_latest_sentiment()['overall_confidence'] == 60
+
+
+if __name__ == "__main__":
+    test_bootstrap_status_snapshot_invalidated_by_writes()
+    test_latest_sentiment_snapshot()
+    test_failed_loads_are_not_cached()
+    print("✅ Macro status snapshot tests passed")
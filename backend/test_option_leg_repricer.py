@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for batched option leg repricing across trades.
+"""
+
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from app.option_leg_repricer import ChainSideIndex, OptionLegRepricer
+
+
+def _side(strikes, bids, asks, last):
+    return pd.DataFrame({'strike': strikes, 'bid': bids, 'ask': asks, 'lastPrice': last})
+
+
+class FakeTicker:
+    """yfinance Ticker stand-in serving fixed chains and counting downloads."""
+
+    fetches = []
+    lock = threading.Lock()
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def option_chain(self, expiration):
+        with FakeTicker.lock:
+            FakeTicker.fetches.append((self.ticker, expiration))
+        if expiration == '2099-01-01':
+            raise ValueError("Expiration not found")
+        calls = _side([100.0, 105.0, 110.0], [2.0, 0.0, 0.0], [2.4, 1.0, 0.0], [2.1, 0.8, 0.0])
+        puts = _side([95.0, 100.0], [1.0, 3.0], [1.2, 3.2], [1.1, 3.1])
+        return SimpleNamespace(calls=calls, puts=puts)
+
+
+def _contract(option_type, strike, expiration):
+    return {'optionType': option_type, 'strike': strike, 'expiration': expiration,
+            'quantity': 1, 'isLong': True}
+
+
+def test_batch_reprices_with_one_fetch_per_chain():
+    """Chains are fetched once per (ticker, expiration) and reused within the cache window."""
+    FakeTicker.fetches = []
+    repricer = OptionLegRepricer(cache_ttl=60, max_concurrent_fetches=4, ticker_factory=FakeTicker)
+    spreads = [
+        {'id': 'a', 'ticker': 'aapl', 'contracts': [_contract('call', 100, '2025-07-18'),
+                                                    _contract('call', 105, '2025-08-15')]},
+        {'id': 'b', 'ticker': 'AAPL', 'contracts': [_contract('put', 100, '2025-07-18'),
+                                                    _contract('call', 110, '2025-07-18')]},
+        {'id': 'c', 'ticker': 'MSFT', 'contracts': [_contract('put', 97.5, '2025-07-18'),
+                                                    _contract('put', 95, '2099-01-01')]},
+    ]
+
+    results = repricer.reprice_spreads(spreads)
+
+    assert sorted(FakeTicker.fetches) == [('AAPL', '2025-07-18'), ('AAPL', '2025-08-15'),
+                                          ('MSFT', '2025-07-18'), ('MSFT', '2099-01-01')]
+    # Mid price, then last price fallback
+    assert results['a']['prices'] == {'leg_0': 2.2, 'leg_1': 0.8}
+    assert results['a']['errors'] == []
+    # Unpriced strike is stored as 0 with an error
+    assert results['b']['prices'] == {'leg_0': 3.1, 'leg_1': 0.0}
+    assert results['b']['errors'] == ["No valid price data for call $110.0 2025-07-18"]
+    # Missing strike and failed chain fetch leave no prices
+    assert results['c']['success'] is False
+    assert results['c']['errors'][0] == "No put option found for strike $97.5 on 2025-07-18"
+    assert results['c']['errors'][1].startswith("Error fetching option chain for 2099-01-01")
+
+    repricer.reprice_spreads(spreads[:2])
+    assert len(FakeTicker.fetches) == 4
+    assert repricer.get_stats()['cache_hits'] == 2
+
+    repricer.clear_cache()
+    repricer.reprice_spreads(spreads[:1])
+    assert len(FakeTicker.fetches) == 6
+
+
+def test_strike_index_matches_tolerance_mask():
+    """Binary-search lookup finds the same strike as the original tolerance mask."""
+    rng = np.random.default_rng(3)
+    strikes = np.round(rng.choice(np.arange(50, 150, 2.5), 30, replace=False), 2)
+    side = _side(strikes, rng.random(30), rng.random(30) + 1, rng.random(30))
+    index = ChainSideIndex(side)
+
+    for strike in list(strikes) + [51.0, 200.0, 49.995, strikes[0] + 0.009]:
+        matching = side[abs(side['strike'] - strike) < 0.01]
+        expected = None
+        if len(matching):
+            row = matching.iloc[0]
+            expected = (row['bid'] + row['ask']) / 2 if row['bid'] > 0 and row['ask'] > 0 else row['lastPrice']
+        found = index.lookup(strike)
+        assert (found is None and expected is None) or np.isclose(found, expected)
+
+
+def test_batch_rejects_invalid_trades_individually():
+    """Malformed trades get error entries while the valid trades are still priced."""
+    from app import option_price_fetcher
+
+    FakeTicker.fetches = []
+    original = option_price_fetcher.option_leg_repricer
+    option_price_fetcher.option_leg_repricer = OptionLegRepricer(cache_ttl=60, ticker_factory=FakeTicker)
+    try:
+        batch = option_price_fetcher.fetch_option_prices_batch([
+            {'id': 1, 'ticker': 'AAPL', 'contracts': [_contract('call', 100, '2025-07-18')]},
+            {'id': 2, 'ticker': 'AAPL', 'contracts': [_contract('call', -5, '2025-07-18')]},
+            {'id': 3, 'ticker': 'MSFT', 'contracts': []},
+            {'ticker': 'TSLA', 'contracts': [_contract('put', 100, '2025-07-18')]},
+        ])
+    finally:
+        option_price_fetcher.option_leg_repricer = original
+
+    assert batch['success'] is True
+    assert batch['results']['1']['prices'] == {'leg_0': 2.2}
+    assert batch['results']['2']['success'] is False
+    assert batch['results']['2']['errors'] == ["Contract 0: Strike price must be positive"]
+    assert batch['results']['3']['errors'] == ["No option contracts provided"]
+    assert batch['validation_errors'] == ["Trade 3: Missing 'id' or 'ticker'"]
+    assert FakeTicker.fetches == [('AAPL', '2025-07-18')]
+
+
+if __name__ == "__main__":
+    test_batch_reprices_with_one_fetch_per_chain()
+    test_strike_index_matches_tolerance_mask()
+    test_batch_rejects_invalid_trades_individually()
+    print("✅ Option leg repricer tests passed")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the return correlation engine and the position optimizer metrics
+built on it.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from models.cl_price_history import CLPriceHistory
+from services.correlation_engine import CorrelationEngine
+from services.position_optimizer import PositionOptimizer
+
+HOUR = 3600
+START = 1700000000
+
+
+def _seed_history(history, rng):
+    """Five positions with correlated, gappy and short histories; returns their raw series."""
+    market = rng.normal(0, 0.01, 400)
+    series = {
+        'eth-a': (np.arange(400) * HOUR, 2000 * np.exp(np.cumsum(market + rng.normal(0, 0.002, 400)))),
+        'eth-b': (np.arange(400) * HOUR + 900, 2000 * np.exp(np.cumsum(market + rng.normal(0, 0.004, 400)))),
+        'inverse': (np.arange(400) * HOUR, 50 * np.exp(np.cumsum(-market + rng.normal(0, 0.003, 400)))),
+        'short': (np.arange(300, 400) * HOUR, 10 * np.exp(np.cumsum(rng.normal(0, 0.02, 100)))),
+        'gappy': (np.sort(rng.choice(np.arange(0, 400 * HOUR, 600), 500, replace=False)),
+                  5 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))),
+    }
+    with sqlite3.connect(history.db_path) as conn:
+        conn.executemany(
+            'INSERT INTO cl_price_history (position_id, token_pair, price, timestamp) VALUES (?, ?, ?, ?)',
+            [(pid, 'X/USDC', float(p), START + int(t)) for pid, (times, prices) in series.items()
+             for t, p in zip(times, prices)]
+        )
+    return {pid: (START + times, prices) for pid, (times, prices) in series.items()}
+
+
+def _reference(series, grid_start, grid_end, min_periods):
+    """Pairwise-complete correlation and covariance computed with pandas."""
+    grid = np.arange(grid_start, grid_end + 1, HOUR) // HOUR * HOUR
+    columns = {}
+    for pid, (times, prices) in series.items():
+        keep = (times >= grid_start) & (times <= grid_end)
+        bucketed = pd.Series(prices[keep], index=(times[keep] - grid_start) // HOUR * HOUR + grid_start)
+        bucketed = bucketed.groupby(level=0).last()
+        aligned = bucketed.reindex(grid).ffill()
+        aligned[grid > bucketed.index.max()] = np.nan
+        columns[pid] = aligned
+    returns = np.log(pd.DataFrame(columns)).diff().iloc[1:]
+    return returns.corr(min_periods=min_periods), returns.cov(min_periods=min_periods)
+
+
+def test_correlation_matches_pairwise_reference():
+    """Aligned return correlation/covariance equals pandas pairwise-complete statistics."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = CLPriceHistory(os.path.join(tmp_dir, 'cl_positions.db'))
+        series = _seed_history(history, np.random.default_rng(11))
+        engine = CorrelationEngine(history, lookback=250 * HOUR)
+
+        ids = ['eth-a', 'eth-b', 'inverse', 'short', 'gappy', 'no-history']
+        result = engine.compute(ids)
+        assert result.position_ids == ids
+
+        expected_corr, expected_cov = _reference({k: series[k] for k in ids[:-1]}, result.grid_start,
+                                                 result.grid_end, engine.min_periods)
+        assert np.allclose(result.correlation[:5, :5], expected_corr.to_numpy(), equal_nan=True)
+        assert np.allclose(result.covariance[:5, :5], expected_cov.to_numpy(), equal_nan=True)
+        assert np.isnan(result.correlation[5]).all()
+
+        assert result.correlation[0, 1] > 0.8 and result.correlation[0, 2] < -0.8
+        assert 80 <= result.observations[0, 3] < 100
+        assert result.correlation_dict()['eth-a']['no-history'] is None
+
+
+def test_cache_follows_history_watermark():
+    """Results are reused until the positions' price history changes."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = CLPriceHistory(os.path.join(tmp_dir, 'cl_positions.db'))
+        _seed_history(history, np.random.default_rng(12))
+        engine = CorrelationEngine(history)
+
+        first = engine.compute(['eth-a', 'eth-b'])
+        assert engine.compute(['eth-a', 'eth-b', 'eth-a']) is first
+        assert engine.compute(['eth-a', 'gappy']) is not first
+
+        # A new price for an unrelated position keeps the cached result
+        history.add_price_record({'position_id': 'inverse', 'token_pair': 'X/USDC',
+                                  'price': 50.0, 'timestamp': START + 500 * HOUR})
+        assert engine.compute(['eth-a', 'eth-b']) is first
+
+        history.add_price_record({'position_id': 'eth-b', 'token_pair': 'X/USDC',
+                                  'price': 2100.0, 'timestamp': START + 400 * HOUR})
+        refreshed = engine.compute(['eth-a', 'eth-b'])
+        assert refreshed is not first and refreshed.grid_end == START + 400 * HOUR
+
+
+def test_optimizer_metrics_use_return_correlation():
+    """Portfolio metrics use measured correlations and fall back to pair heuristics."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = CLPriceHistory(os.path.join(tmp_dir, 'cl_positions.db'))
+        _seed_history(history, np.random.default_rng(13))
+        optimizer = PositionOptimizer(os.path.join(tmp_dir, 'optimizer.db'), CorrelationEngine(history))
+
+        def position(pid, pair, value):
+            return {'id': pid, 'pair_symbol': pair, 'initial_investment': value, 'current_value': value,
+                    'price_range_min': 1, 'price_range_max': 2, 'trade_name': pid, 'apr': 20}
+
+        hedged = [position('eth-a', 'ETH/USDC', 1000), position('inverse', 'USDC/ETH', 1000)]
+        metrics = optimizer.calculate_portfolio_metrics(hedged)
+        assert metrics.correlation_matrix['eth-a']['inverse'] < -0.8
+        assert metrics.diversification_ratio > 2
+
+        correlated = [position('eth-a', 'ETH/USDC', 1000), position('eth-b', 'ETH/USDC', 3000)]
+        assert 1 <= optimizer.calculate_portfolio_metrics(correlated).diversification_ratio < 1.1
+
+        mixed = correlated + [position('no-history', 'BTC/USDC', 500)]
+        metrics = optimizer.calculate_portfolio_metrics(mixed)
+        assert metrics.correlation_matrix['eth-a']['eth-b'] > 0.8
+        assert metrics.correlation_matrix['eth-a']['no-history'] == 0.4  # shares USDC
+        assert metrics.diversification_ratio == (2 / 3 + 1 / 3) / 2
+
+
+if __name__ == "__main__":
+    test_correlation_matches_pairwise_reference()
+    test_cache_follows_history_watermark()
+    test_optimizer_metrics_use_return_correlation()
+    print("✅ Position correlation tests passed")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming report writers and background report jobs.
+"""
+
+import os
+import io
+import csv
+import sys
+import json
+import random
+import tempfile
+import tracemalloc
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from openpyxl import load_workbook
+
+from services.cl_service import PortfolioSummaryAccumulator
+from services.reporting_service import ReportingService, ReportType, ExportFormat
+
+
+def _positions(count, seed=3):
+    """Enriched position dicts, generated lazily."""
+    rng = random.Random(seed)
+    for i in range(count):
+        investment = rng.choice([0, 1000, 2500, 5000])
+        closed = i % 3 == 0
+        yield {
+            'id': f'pos-{i}',
+            'trade_name': f'Position, "{i}"',
+            'pair_symbol': 'ETH/USDC',
+            'status': 'closed' if closed else 'active',
+            'protocol': 'HyperSwap',
+            'chain': 'hyperevm',
+            'entry_date': f'2024-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00',
+            'exit_date': f'2024-{1 + (i + 1) % 12:02d}-15T00:00:00' if closed else None,
+            'price_range_min': 1800.0,
+            'price_range_max': 2200.0,
+            'initial_investment': investment,
+            'current_value': investment * rng.uniform(0.8, 1.2),
+            'fees_collected': rng.choice([0, 12.5, 40.0]),
+            'apr': 12.0,
+            'current_price': 2000.0,
+            'is_in_range': True,
+            'notes': 'line one\nline two',
+            'total_return': rng.choice([-10.0, 0.0, 10.0]),
+        }
+
+
+def _return_pct(position):
+    if position['initial_investment'] == 0:
+        return 0.0
+    return position.get('total_return', position['fees_collected']) / position['initial_investment'] * 100
+
+
+def _legacy_best_worst(positions):
+    ranked = sorted(((p, _return_pct(p)) for p in positions), key=lambda x: x[1], reverse=True)
+    return ranked[0][0]['trade_name'], ranked[-1][0]['trade_name']
+
+
+def test_csv_and_tax_writers():
+    """CSV rows round-trip through a CSV reader and the streamed tax report matches the in-memory one."""
+    service = ReportingService(os.path.join(tempfile.mkdtemp(), 'reports.db'))
+    positions = list(_positions(50))
+
+    buffer = io.StringIO()
+    assert service.write_positions_csv(buffer, iter(positions)) == 50
+    rows = list(csv.reader(io.StringIO(buffer.getvalue())))
+    assert len(rows) == 51 and rows[1][0] == positions[0]['trade_name'] and rows[1][17] == 'line one\nline two'
+    assert service.export_positions_csv([]) == "No positions to export"
+
+    expected = service.generate_tax_report(positions, 2024)
+    output = io.StringIO()
+    service.write_tax_report(output, iter(positions), 2024)
+    streamed = json.loads(output.getvalue())
+    for report in (expected, streamed):
+        report.pop('generated_at')
+    assert streamed == expected and streamed['taxable_events']
+
+    ledger = io.StringIO()
+    assert service.write_tax_report(ledger, iter(positions), 2024, ExportFormat.CSV) == len(expected['taxable_events'])
+    service.shutdown()
+
+
+def test_excel_and_pdf_from_streams():
+    """Excel and PDF reports render from iterators, with metrics accumulated in the same pass."""
+    service = ReportingService(os.path.join(tempfile.mkdtemp(), 'reports.db'))
+    positions = list(_positions(300))
+
+    totals = PortfolioSummaryAccumulator(_return_pct)
+    history = ({'position_id': f'pos-{i % 5}', 'token_pair': 'ETH/USDC', 'timestamp': i, 'price': 2000 + i}
+               for i in range(40))
+    buffer = io.BytesIO()
+    service.write_portfolio_summary_excel(buffer, totals.track(iter(positions)), totals.summary, history)
+
+    workbook = load_workbook(io.BytesIO(buffer.getvalue()), read_only=True)
+    assert workbook.sheetnames == ['Portfolio Summary', 'Position Details', 'Performance Analysis', 'Price History']
+    assert len(list(workbook['Position Details'].values)) == 301
+    assert len(list(workbook['Price History'].values)) == 41
+    summary = dict(list(workbook['Portfolio Summary'].values)[1:])
+    assert summary['Active Positions'] == 200 and summary['Closed Positions'] == 100
+    performance = dict(list(workbook['Performance Analysis'].values)[1:])
+    assert (performance['Best Performing Position'], performance['Worst Performing Position']) == \
+        _legacy_best_worst(positions)
+    assert performance['Total Trades'] == 300
+
+    pdf = service.generate_portfolio_summary_pdf(iter(positions), totals.summary())
+    assert pdf.startswith(b'%PDF') and pdf.count(b'/Type /Page\n') > 5
+    service.shutdown()
+
+
+def test_report_jobs_render_to_files():
+    """Jobs render in the background to a file, record failures and expire old files."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = ReportingService(os.path.join(tmp_dir, 'reports.db'))
+
+        job_id = service.submit_report_job(ReportType.POSITION_DETAIL, ExportFormat.CSV, _positions(1000))
+        job = service.wait_for_report_job(job_id)
+        assert job['status'] == 'completed' and job['mimetype'] == 'text/csv'
+        assert job['download_name'].endswith('.csv') and os.path.getsize(job['file_path']) == job['file_size']
+        with open(job['file_path'], newline='') as f:
+            assert sum(1 for _ in csv.reader(f)) == 1001
+
+        def broken():
+            yield next(_positions(1))
+            raise RuntimeError('source went away')
+
+        failed = service.wait_for_report_job(service.submit_report_job(ReportType.PORTFOLIO_SUMMARY,
+                                                                       ExportFormat.EXCEL, broken(), {}))
+        assert failed['status'] == 'failed' and 'source went away' in failed['error_message']
+        assert sorted(os.listdir(service.reports_dir)) == [f'{job_id}.csv']
+
+        try:
+            service.submit_report_job(ReportType.TAX_REPORT, ExportFormat.PDF, [])
+            assert False, 'expected ValueError'
+        except ValueError:
+            pass
+
+        assert service.cleanup_report_files(max_age_hours=-1) == 1
+        assert service.get_report_job(job_id)['status'] == 'expired'
+        assert os.listdir(service.reports_dir) == []
+        service.shutdown()
+
+
+def test_streaming_memory_stays_flat():
+    """Peak memory of the CSV and Excel writers does not grow with the number of positions."""
+    service = ReportingService(os.path.join(tempfile.mkdtemp(), 'reports.db'))
+
+    def peak(write, count):
+        with tempfile.TemporaryFile('w+b') as output:
+            tracemalloc.start()
+            write(output, _positions(count))
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        return peak_bytes
+
+    def write_csv(output, positions):
+        service.write_positions_csv(io.TextIOWrapper(output, newline='', write_through=True), positions)
+
+    def write_excel(output, positions):
+        service.write_portfolio_summary_excel(output, positions, {})
+
+    for write in (write_csv, write_excel):
+        small, large = peak(write, 2000), peak(write, 20000)
+        assert large < small * 2, (write.__name__, small, large)
+    service.shutdown()
+
+
+if __name__ == "__main__":
+    test_csv_and_tax_writers()
+    test_excel_and_pdf_from_streams()
+    test_report_jobs_render_to_files()
+    test_streaming_memory_stays_flat()
+    print("✅ Report job tests passed")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-client request rate limiter.
+"""
+
+import os
+import sys
+import tempfile
+import multiprocessing
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.request_rate_limiter import RequestRateLimiter, MemoryRateLimitStore, SQLiteRateLimitStore
+
+
+def _check_gcra(limiter):
+    """A client bursts up to the limit, then gets one request per emission interval."""
+    now = 1000.0
+    decisions = [limiter.hit('client', 6, 60, now=now) for _ in range(7)]
+    assert [d.allowed for d in decisions] == [True] * 6 + [False]
+    assert [d.remaining for d in decisions[:6]] == [5, 4, 3, 2, 1, 0]
+    assert abs(decisions[6].retry_after - 10.0) < 1e-6
+
+    # One interval (60s / 6) later exactly one more request fits
+    assert limiter.hit('client', 6, 60, now=now + 10).allowed
+    assert not limiter.hit('client', 6, 60, now=now + 10).allowed
+    # Rejected requests don't push the client further back
+    assert limiter.hit('client', 6, 60, now=now + 20).allowed
+
+    # After a full period idle the whole burst is available again, and keys are independent
+    assert limiter.hit('client', 6, 60, now=now + 200).remaining == 5
+    assert limiter.hit('other', 6, 60, now=now + 10).remaining == 5
+
+
+def test_memory_store():
+    """GCRA semantics with the in-memory store."""
+    _check_gcra(RequestRateLimiter(MemoryRateLimitStore()))
+
+
+def test_sqlite_store():
+    """GCRA semantics with the shared SQLite store, and pruning of recovered keys."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = SQLiteRateLimitStore(os.path.join(tmp_dir, 'rate_limits.db'), prune_interval=0)
+        limiter = RequestRateLimiter(store)
+        _check_gcra(limiter)
+
+        limiter.hit('late', 6, 60, now=10000.0)
+        assert store.get_metrics()['clients'] == 1
+
+
+def test_lru_eviction():
+    """Client state is bounded, evicting the client seen least recently."""
+    store = MemoryRateLimitStore(max_clients=3)
+    limiter = RequestRateLimiter(store)
+    for key in ('a', 'b', 'c'):
+        limiter.hit(key, 1, 60, now=0.0)
+    limiter.hit('a', 1, 60, now=1.0)   # rejected, but still marks 'a' as recently seen
+    limiter.hit('d', 1, 60, now=1.0)
+
+    metrics = store.get_metrics()
+    assert metrics['clients'] == 3 and metrics['evictions'] == 1
+    assert not limiter.hit('a', 1, 60, now=2.0).allowed
+    assert limiter.hit('b', 1, 60, now=2.0).allowed   # 'b' was evicted, so it starts over
+
+
+def test_store_errors_fail_open():
+    """A failing store allows the request instead of failing it."""
+    class BrokenStore(MemoryRateLimitStore):
+        def hit(self, key, now, limit, period):
+            raise RuntimeError('database is locked')
+
+    limiter = RequestRateLimiter(BrokenStore())
+    assert limiter.hit('client', 1, 60).allowed
+    assert limiter.get_metrics()['store_errors'] == 1
+
+
+def _spend(db_path, attempts, results):
+    limiter = RequestRateLimiter(SQLiteRateLimitStore(db_path))
+    results.put(sum(limiter.hit('shared', 50, 3600).allowed for _ in range(attempts)))
+
+
+def test_shared_limit_across_processes():
+    """Worker processes sharing a SQLite store enforce one limit between them."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'rate_limits.db')
+        SQLiteRateLimitStore(db_path)
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_spend, args=(db_path, 40, results)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        allowed = sum(results.get(timeout=30) for _ in workers)
+        for worker in workers:
+            worker.join()
+        assert allowed == 50
+
+
+def test_routes_limit_per_endpoint():
+    """The integration routes return 429 with Retry-After, counting each endpoint separately."""
+    from flask import Flask
+    from routes import integration_routes
+
+    app = Flask(__name__)
+    app.register_blueprint(integration_routes.integration_bp)
+    integration_routes.request_limiter = RequestRateLimiter(MemoryRateLimitStore())
+    client = app.test_client()
+
+    statuses = [client.post('/api/v1/integration/auth/token', json={}).status_code for _ in range(11)]
+    assert 429 not in statuses[:10] and statuses[10] == 429
+    limited = client.post('/api/v1/integration/auth/token', json={})
+    assert limited.status_code == 429 and int(limited.headers['Retry-After']) >= 1
+    assert client.get('/api/v1/integration/status').status_code != 429
+
+
+if __name__ == "__main__":
+    test_memory_store()
+    test_sqlite_store()
+    test_lru_eviction()
+    test_store_errors_fail_open()
+    test_shared_limit_across_processes()
+    test_routes_limit_per_endpoint()
+    print("✅ Request rate limiter tests passed")
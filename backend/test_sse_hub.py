@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the Server-Sent Events broadcast hub.
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.sse_hub import BroadcastHub, HubFullError, KEEPALIVE_FRAME
+
+
+def _counting_hub(**kwargs):
+    calls = []
+
+    def produce():
+        calls.append(time.monotonic())
+        return {'tick': len(calls)}
+
+    return BroadcastHub(produce, **kwargs), calls
+
+
+def _consume(subscription, frames, count):
+    for frame in subscription:
+        frames.append(frame)
+        if len(frames) >= count:
+            break
+
+
+def test_one_payload_per_tick_for_all_subscribers():
+    """The payload is produced and serialized once per tick, however many clients listen."""
+    hub, calls = _counting_hub(interval_seconds=0.05, max_subscribers=50)
+    subscriptions = [hub.subscribe() for _ in range(25)]
+    received = [[] for _ in subscriptions]
+    readers = [threading.Thread(target=_consume, args=(s, frames, 4))
+               for s, frames in zip(subscriptions, received)]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join(timeout=5)
+
+    assert all(len(frames) == 4 for frames in received)
+    assert received[0][0] == b'data: {"tick": 1}\n\n'
+    # Every client got the very same frame object for a tick
+    assert all(frames[1] is received[0][1] for frames in received)
+    assert len(calls) <= 6
+
+    metrics = hub.get_metrics()
+    assert metrics['subscribers'] == 25 and metrics['ticks'] == len(calls)
+    hub.close()
+    assert not hub.get_metrics()['producer_running']
+
+
+def test_slow_subscribers_are_dropped_and_limit_enforced():
+    """A client a full queue behind is dropped; subscribers beyond the limit are rejected."""
+    hub, _ = _counting_hub(interval_seconds=0.02, max_subscribers=2, queue_size=2)
+    slow = hub.subscribe()
+    fast = hub.subscribe()
+
+    try:
+        hub.subscribe()
+        assert False, 'expected HubFullError'
+    except HubFullError:
+        pass
+
+    frames = []
+    _consume(fast, frames, 8)
+    assert len(frames) == 8
+    assert slow.dropped and list(slow) == []
+
+    metrics = hub.get_metrics()
+    assert metrics['subscribers'] == 1 and metrics['dropped'] == 1 and metrics['rejected'] == 1
+
+    # The freed slot can be used again
+    hub.subscribe().close()
+    fast.close()
+    hub.close()
+
+
+def test_producer_runs_only_while_subscribed():
+    """The producer starts with the first subscriber, stops after the last and survives errors."""
+    state = {'fail': True}
+
+    def produce():
+        if state.pop('fail', False):
+            raise RuntimeError('metrics unavailable')
+        return {'ok': True}
+
+    hub = BroadcastHub(produce, interval_seconds=0.02, keepalive_seconds=0.05)
+    assert not hub.get_metrics()['producer_running']
+
+    subscription = hub.subscribe()
+    frames = []
+    _consume(subscription, frames, 1)
+    assert frames == [b'data: {"ok": true}\n\n'] and hub.get_metrics()['errors'] == 1
+
+    subscription.close()
+    deadline = time.monotonic() + 2
+    while hub.get_metrics()['producer_running'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not hub.get_metrics()['producer_running']
+    ticks = hub.get_metrics()['ticks']
+    time.sleep(0.1)
+    assert hub.get_metrics()['ticks'] == ticks
+
+
+def test_keepalive_while_idle():
+    """Subscribers yield a keep-alive comment when no frame arrives in time."""
+    hub = BroadcastHub(lambda: {'ok': True}, interval_seconds=60, keepalive_seconds=0.05)
+    subscription = hub.subscribe()
+    frames = []
+    _consume(subscription, frames, 2)
+    assert frames == [b'data: {"ok": true}\n\n', KEEPALIVE_FRAME]
+    hub.close()
+
+
+if __name__ == "__main__":
+    test_one_payload_per_tick_for_all_subscribers()
+    test_slow_subscribers_are_dropped_and_limit_enforced()
+    test_producer_runs_only_while_subscribed()
+    test_keepalive_while_idle()
+    print("✅ SSE hub tests passed")
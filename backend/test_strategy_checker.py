@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass strategy availability evaluator.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pandas as pd
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+import app.data_fetcher as data_fetcher
+from app.strategy_checker import (
+    check_calendar_spread_availability,
+    check_iron_condor_availability,
+    check_naked_options_availability,
+    check_strategies_availability,
+    evaluate_strategy_availability,
+)
+
+
+def _chain(call_strikes, put_strikes):
+    return SimpleNamespace(calls=pd.DataFrame({'strike': call_strikes}, dtype=float),
+                           puts=pd.DataFrame({'strike': put_strikes}, dtype=float))
+
+
+class CountingTicker:
+    """yfinance Ticker stand-in that records market data requests."""
+
+    calls = []
+
+    def __init__(self, ticker, chains=None, price=100.0):
+        self.ticker = ticker
+        self.chains = chains if chains is not None else {
+            '2024-07-19': _chain([90, 95, 100, 105, 110], [90, 95, 100, 105, 110]),
+            '2024-08-16': _chain([95, 100, 105], [95, 100]),
+            '2024-09-20': _chain([100], [100]),
+        }
+        self.price = price
+        self._options = None
+
+    @property
+    def options(self):
+        # yfinance downloads the expiration list once per Ticker object
+        if self._options is None:
+            CountingTicker.calls.append('options')
+            self._options = tuple(self.chains)
+        return self._options
+
+    def history(self, period):
+        CountingTicker.calls.append('history')
+        return pd.DataFrame({'Close': [self.price]})
+
+    def option_chain(self, exp_date):
+        CountingTicker.calls.append('option_chain')
+        return self.chains[exp_date]
+
+
+def test_evaluate_strategy_availability_rules():
+    """Each strategy follows the original availability rules."""
+    chains = {
+        '2024-08-16': _chain([95, 100, 105], [95, 100]),
+        '2024-07-19': _chain([90, 95, 100, 105, 110], [90, 95, 100, 105, 110]),
+    }
+    assert evaluate_strategy_availability(chains, 100.0) == {
+        "calendar_available": True,
+        "naked_available": True,
+        "iron_condor_available": True,
+    }
+
+    # No common near-the-money call strikes between front and back month
+    chains['2024-08-16'] = _chain([150, 160], [50])
+    assert evaluate_strategy_availability(chains, 100.0)["calendar_available"] is False
+
+    # Only one OTM put in the front month, and strikes far from the price
+    single = {'2024-07-19': _chain([200, 210, 220], [20])}
+    assert evaluate_strategy_availability(single, 100.0) == {
+        "calendar_available": False,
+        "naked_available": False,
+        "iron_condor_available": False,
+    }
+
+    # Missing calls still allow naked puts
+    puts_only = {'2024-07-19': _chain([], [95, 100])}
+    assert evaluate_strategy_availability(puts_only, 100.0)["naked_available"] is True
+    assert evaluate_strategy_availability({}, 100.0)["naked_available"] is False
+
+
+def test_single_pass_fetches_once(monkeypatch):
+    """One Ticker, one price and two chains cover all strategies; prefetched chains need none."""
+    monkeypatch.setattr(data_fetcher.yf, 'Ticker', CountingTicker)
+    CountingTicker.calls = []
+
+    separate = (check_calendar_spread_availability('TEST'),
+                check_naked_options_availability('TEST'),
+                check_iron_condor_availability('TEST'))
+    separate_calls = len(CountingTicker.calls)
+
+    CountingTicker.calls = []
+    combined = check_strategies_availability('TEST')
+    assert tuple(combined.values()) == separate
+    assert sorted(CountingTicker.calls) == ['history', 'option_chain', 'option_chain', 'options']
+    assert separate_calls == 10
+
+    CountingTicker.calls = []
+    stock = CountingTicker('TEST')
+    prefetched = check_strategies_availability('TEST', options_chains=stock.chains, current_price=stock.price)
+    assert prefetched == combined
+    assert CountingTicker.calls == []
+
+
+if __name__ == "__main__":
+    test_evaluate_strategy_availability_rules()
+    print("✅ Strategy checker tests passed")
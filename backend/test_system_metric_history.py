@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the non-blocking metric sampler and in-memory metric history in SystemMonitor.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from datetime import datetime
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.system_monitor import SystemMonitor, SystemMetrics, MetricHistory
+
+
+def _metrics(timestamp, cpu):
+    return SystemMetrics(
+        timestamp=datetime.fromtimestamp(timestamp),
+        cpu_usage=cpu,
+        memory_usage=50.0,
+        disk_usage=40.0,
+        network_io={'bytes_sent': timestamp, 'bytes_recv': 0, 'packets_sent': 0, 'packets_recv': 0},
+        process_count=100,
+        uptime_seconds=timestamp,
+        load_average=[1.0, 0.5, cpu / 100]
+    )
+
+
+def test_rollups_across_resolutions():
+    """Samples roll up into minute and hour buckets and the rings stay bounded."""
+    history = MetricHistory()
+    start = 1_700_000_000 - 1_700_000_000 % 3600
+    closed = []
+
+    for second in range(2 * 3600 + 90):
+        cpu = float(second % 60)  # 0..59 within every minute
+        point = SystemMonitor._sample_point(_metrics(start + second, cpu))
+        rollup = history.record(point)
+        if rollup is not None:
+            closed.append(rollup)
+
+    assert len(history.rings['1s']) == 3600
+    assert len(closed) == 121 and [p['timestamp'] for p in closed] == [start + 60 * i for i in range(121)]
+    assert all(p['samples'] == 60 and p['cpu_usage'] == 29.5 and p['cpu_usage_max'] == 59.0 for p in closed)
+    assert closed[0]['network_io']['bytes_sent'] == start + 59
+
+    hours = history.query(0, '1h')
+    assert [p['timestamp'] for p in hours] == [start, start + 3600, start + 7200]
+    assert hours[0]['samples'] == 3600 and hours[0]['cpu_usage'] == 29.5
+    # The last point is the hour still being filled, from its completed minutes
+    assert hours[-1]['samples'] == 60
+
+    assert len(history.query(start + 7200 - 300, '1m')) == 7
+    assert history.resolution_for(3600) == '1s'
+    assert history.resolution_for(24 * 3600) == '1m'
+    assert history.resolution_for(7 * 24 * 3600) == '1h'
+
+
+def test_sampling_does_not_block():
+    """Collecting a sample is far below the old one-second cpu_percent interval and is measured."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monitor = SystemMonitor(os.path.join(tmp_dir, 'monitoring.db'))
+
+        started = time.perf_counter()
+        for _ in range(5):
+            monitor._collect_system_metrics()
+        assert time.perf_counter() - started < 1.0
+
+        stats = monitor.get_sampler_stats()
+        assert stats['samples'] == 5 and 0 < stats['avg_sample_ms'] <= stats['max_sample_ms']
+        assert len(monitor.get_metrics_history('system', hours=1)) == 5
+
+        # Without the sampler running, current metrics are sampled on demand
+        current = monitor.get_current_metrics()
+        assert current['timestamp'] == monitor.metric_history.latest.timestamp.isoformat()
+        assert monitor.get_sampler_stats()['samples'] == 6
+
+
+def test_rollups_persist_and_reload():
+    """Minute rollups are saved in one batch and rebuild the history of a new monitor."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'monitoring.db')
+        monitor = SystemMonitor(db_path)
+        now = int(time.time())
+        start = now - now % 60 - 600
+
+        for second in range(3 * 60 + 1):
+            monitor._record_sample(_metrics(start + second, 10.0 if second < 60 else 30.0), 0.001, 0.001)
+
+        assert monitor._persist_metric_rollups() == 3
+        assert monitor._persist_metric_rollups() == 0
+        expected = monitor.get_metrics_history('system', hours=1, resolution='1m')[:3]
+
+        restarted = SystemMonitor(db_path)
+        minutes = restarted.get_metrics_history('system', hours=1, resolution='1m')
+        assert minutes == expected
+        assert [p['cpu_usage'] for p in minutes] == [10.0, 30.0, 30.0]
+        assert sum(p['samples'] for p in restarted.get_metrics_history('system', hours=24 * 7)) == 180
+        assert restarted.get_metrics_history('system', hours=1, resolution='1s') == []
+
+
+def test_monitoring_threads_start_and_stop():
+    """The sampler runs on its own schedule and stopping does not wait out the monitoring interval."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monitor = SystemMonitor(os.path.join(tmp_dir, 'monitoring.db'), {'sample_interval_seconds': 0.05})
+        monitor.start_monitoring(interval_seconds=60)
+        time.sleep(0.6)
+
+        started = time.perf_counter()
+        monitor.stop_monitoring()
+        assert time.perf_counter() - started < 2.0
+        assert not monitor.sampler_thread.is_alive() and not monitor.monitor_thread.is_alive()
+        assert monitor.get_sampler_stats()['samples'] >= 5
+
+
+if __name__ == "__main__":
+    test_rollups_across_resolutions()
+    test_sampling_does_not_block()
+    test_rollups_persist_and_reload()
+    test_monitoring_threads_start_and_stop()
+    print("✅ System metric history tests passed")
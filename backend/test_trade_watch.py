@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Tests for the background trade watch engine: bulk trigger/exit evaluation
+and single-transaction recording of each watch cycle.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(__file__))
+
+from services.trade_watch_service import TradeWatchService, evaluate_trades
+
+
+def _insert_trade(db_path, ticker, action, entry, target, stop, status='waiting', entry_condition=''):
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO active_trades (ticker, timeframe, analysis_id, action, entry_price,
+                                       target_price, stop_loss, entry_condition, status, created_at)
+            VALUES (?, '1h', 1, ?, ?, ?, ?, ?, ?, ?)
+        ''', (ticker, action, entry, target, stop, entry_condition, status,
+              (datetime.now() - timedelta(hours=1)).isoformat()))
+        conn.commit()
+        return cursor.lastrowid
+
+
+def test_evaluate_trades_rules():
+    """Triggers, exits and waiting-trade invalidation follow the existing trade rules."""
+    trades = [
+        # Traditional buy waiting for a dip to 100 -> triggers at 99
+        {'id': 1, 'ticker': 'AAA', 'action': 'buy', 'entry_price': 100, 'target_price': 110,
+         'stop_loss': 95, 'status': 'waiting', 'entry_condition': 'Buy the dip'},
+        # Breakout buy above 100 does not trigger on a dip
+        {'id': 2, 'ticker': 'AAA', 'action': 'buy', 'entry_price': 100, 'target_price': 110,
+         'stop_loss': 90, 'status': 'waiting', 'entry_condition': 'Wait for breakout above 100'},
+        # Active sell hits its target
+        {'id': 3, 'ticker': 'BBB', 'action': 'sell', 'entry_price': 60, 'target_price': 50,
+         'stop_loss': 65, 'status': 'active'},
+        # Waiting breakout buy invalidated by its stop before entry
+        {'id': 4, 'ticker': 'CCC', 'action': 'buy', 'entry_price': 30, 'target_price': 40,
+         'stop_loss': 25, 'status': 'waiting', 'entry_condition': 'Break above 30'},
+        # No price this cycle
+        {'id': 5, 'ticker': 'DDD', 'action': 'buy', 'entry_price': 10, 'target_price': 12,
+         'stop_loss': 9, 'status': 'active'},
+    ]
+    prices = {'AAA': 99.0, 'BBB': 49.5, 'CCC': 24.0}
+
+    price_updates, triggers, exits = evaluate_trades(trades, prices)
+
+    assert [u['trade_id'] for u in price_updates] == [1, 2, 3, 4]
+    assert triggers == [{'trade_id': 1, 'price': 99.0}]
+    assert [(e['trade_id'], e['exit_reason'], e['waiting_trade']) for e in exits] == [
+        (3, 'PROFIT_TARGET_HIT', False),
+        (4, 'STOP_LOSS_HIT', True),
+    ]
+    assert exits[0]['realized_pnl'] == 10.5
+    assert exits[1]['realized_pnl'] == 0.0
+
+
+def test_evaluate_trades_wicks():
+    """Highs/lows since the last poll close trades at the level their wick crossed."""
+    trades = [
+        # Active buy whose stop was wicked through although the price recovered
+        {'id': 1, 'ticker': 'AAA', 'action': 'buy', 'entry_price': 100, 'target_price': 110,
+         'stop_loss': 95, 'status': 'active'},
+        # Active sell whose target was wicked through
+        {'id': 2, 'ticker': 'BBB', 'action': 'sell', 'entry_price': 60, 'target_price': 50,
+         'stop_loss': 65, 'status': 'active'},
+        # Waiting buy triggering this cycle: the target wick may have come before the trigger
+        {'id': 3, 'ticker': 'CCC', 'action': 'buy', 'entry_price': 30, 'target_price': 40,
+         'stop_loss': 25, 'status': 'waiting', 'entry_condition': 'Buy the dip'},
+        # Active buy without a range this cycle
+        {'id': 4, 'ticker': 'DDD', 'action': 'buy', 'entry_price': 10, 'target_price': 12,
+         'stop_loss': 9, 'status': 'active'},
+    ]
+    prices = {'AAA': 101.0, 'BBB': 55.0, 'CCC': 29.0, 'DDD': 10.5}
+    ranges = {'AAA': (104.0, 94.0), 'BBB': (57.0, 49.0), 'CCC': (41.0, 28.0)}
+
+    price_updates, triggers, exits = evaluate_trades(trades, prices, ranges)
+
+    assert triggers == [{'trade_id': 3, 'price': 29.0}]
+    assert [(e['trade_id'], e['exit_reason'], e['exit_price'], e['realized_pnl']) for e in exits] == [
+        (1, 'STOP_LOSS_HIT', 95.0, -5.0),
+        (2, 'PROFIT_TARGET_HIT', 50.0, 10.0),
+    ]
+    assert [u['wicks_checked'] for u in price_updates] == [True, True, True, False]
+    assert price_updates[0]['max_favorable_price'] == 104.0 and price_updates[0]['max_adverse_price'] == 94.0
+    assert price_updates[2]['max_favorable_price'] == 30.0   # the 41 wick may predate the entry
+
+
+def test_watch_cycle_records_results():
+    """One cycle fetches prices once and records triggers and exits with the watch time."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'chart_analysis.db')
+        fetch_calls = []
+
+        def fake_fetch(tickers, since):
+            fetch_calls.append((tickers, since))
+            return {'ETHUSD': {'price': 2900.0, 'high': 2950.0, 'low': 2890.0}, 'AAPL': {'price': 205.0}}
+
+        watch = TradeWatchService(db_path=db_path, quote_fetcher=fake_fetch)
+        waiting_id = _insert_trade(db_path, 'ETHUSD', 'buy', 3000, 3300, 2800)
+        stop_id = _insert_trade(db_path, 'AAPL', 'sell', 200, 180, 204, status='active')
+
+        summary = watch.run_cycle()
+
+        assert fetch_calls[0][0] == ['AAPL', 'ETHUSD']
+        # Never-watched trades have their highs/lows checked from creation
+        created_at = datetime.fromisoformat(watch.trade_service.get_active_trade('ETHUSD')['created_at'])
+        assert fetch_calls[0][1]['ETHUSD'] == created_at
+        assert summary['trades_checked'] == 2
+        assert summary['triggers'] == 1
+        assert summary['exits'] == 1
+
+        trade = watch.trade_service.get_active_trade('ETHUSD')
+        assert trade['id'] == waiting_id
+        assert trade['status'] == 'active'
+        assert trade['trigger_hit_price'] == 2900.0
+        assert trade['last_watched_at'] == summary['timestamp']
+
+        assert watch.trade_service.get_active_trade('AAPL') is None
+        with sqlite3.connect(db_path) as conn:
+            status, close_time, close_price = conn.execute(
+                'SELECT status, close_time, close_price FROM active_trades WHERE id = ?', (stop_id,)
+            ).fetchone()
+        assert status == 'stop_hit'
+        assert close_time == summary['timestamp']
+        assert close_price == 205.0
+
+        # Second cycle only sees the remaining open trade, from where the last one left off
+        watch.run_cycle()
+        assert fetch_calls[-1] == (['ETHUSD'], {'ETHUSD': datetime.fromisoformat(summary['timestamp'])})
+
+
+def test_watch_cycle_without_wicks_keeps_replay_baseline():
+    """A trade whose highs/lows could not be fetched keeps its last watch time for the candle replay."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'chart_analysis.db')
+        watch = TradeWatchService(db_path=db_path, quote_fetcher=lambda tickers, since: {'AAPL': {'price': 201.0}})
+        _insert_trade(db_path, 'AAPL', 'buy', 200, 220, 190, status='active')
+
+        watch.run_cycle()
+        trade = watch.trade_service.get_active_trade('AAPL')
+        assert trade['current_price'] == 201.0 and trade['last_watched_at'] is None
+
+
+def test_watch_cycle_skips_trades_closed_elsewhere():
+    """Triggers and exits for trades no longer open write no trade update rows."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'chart_analysis.db')
+        watch = TradeWatchService(db_path=db_path, quote_fetcher=lambda tickers, since: {})
+        closed_id = _insert_trade(db_path, 'AAPL', 'buy', 200, 220, 190, status='user_closed')
+
+        assert watch.trade_service.record_watch_cycle(
+            datetime.now(), [],
+            [{'trade_id': closed_id, 'price': 199.0}],
+            [{'trade_id': closed_id, 'exit_price': 189.0, 'exit_reason': 'STOP_LOSS_HIT',
+              'exit_type': 'LOSS', 'realized_pnl': -11.0, 'waiting_trade': False}]
+        )
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute('SELECT COUNT(*) FROM trade_updates').fetchone()[0] == 0
+            assert conn.execute('SELECT status FROM active_trades WHERE id = ?',
+                                (closed_id,)).fetchone()[0] == 'user_closed'
+
+
+def test_candle_replay_starts_after_last_watched_at():
+    """The historical candle replay only covers candles after the trade watch engine's last poll."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'chart_analysis.db')
+        service = TradeWatchService(db_path=db_path, quote_fetcher=lambda tickers, since: {}).trade_service
+        now = datetime.now()
+        analysis_time = now - timedelta(minutes=30)
+        baselines, closed = [], []
+
+        service._get_last_chart_analysis_time = lambda ticker: analysis_time
+        last_watched = now - timedelta(minutes=20)
+        service._fetch_historical_candles_since_analysis = lambda ticker, since: baselines.append(since) or [
+            # Already checked by the watcher
+            {'timestamp': now - timedelta(minutes=25), 'high': 221.0, 'low': 199.0, 'open': 200.0, 'close': 200.5},
+            {'timestamp': now - timedelta(minutes=10), 'high': 201.0, 'low': 189.5, 'open': 200.0, 'close': 200.5}
+        ]
+        service._close_trade_with_exit = lambda **kwargs: closed.append(kwargs)
+
+        trade = {'id': 1, 'ticker': 'AAPL', 'action': 'buy', 'entry_price': 200, 'target_price': 220,
+                 'stop_loss': 190, 'status': 'active', 'created_at': (now - timedelta(hours=1)).isoformat(),
+                 'last_watched_at': last_watched.isoformat()}
+        result = service._check_historical_exit_conditions('AAPL', trade)
+
+        assert baselines == [last_watched]
+        assert result['exit_reason'] == 'STOP_LOSS_HIT' and result['exit_price'] == 190.0
+        assert closed[0]['trade_id'] == 1
+
+
+if __name__ == "__main__":
+    test_evaluate_trades_rules()
+    test_evaluate_trades_wicks()
+    test_watch_cycle_records_results()
+    test_watch_cycle_without_wicks_keeps_replay_baseline()
+    test_watch_cycle_skips_trades_closed_elsewhere()
+    test_candle_replay_starts_after_last_watched_at()
+    print("✅ Trade watch tests passed")
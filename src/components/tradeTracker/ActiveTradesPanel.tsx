@@ -147,46 +147,47 @@ const ActiveTradesPanel: React.FC = () => {
     let errorCount = 0;
     
     try {
-      // Process trades sequentially to avoid overwhelming the API
+      // Fetch prices for all trades in one request; the backend fetches each
+      // option chain once per ticker and expiration across all trades
+      const response = await fetch('http://localhost:5000/api/fetch-option-prices/batch', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+          trades: optionTrades.map(trade => ({
+            id: trade.id,
+            ticker: trade.ticker,
+            contracts: trade.legs.map((leg: OptionLeg) => ({
+              optionType: leg.optionType,
+              strike: leg.strike,
+              expiration: leg.expiration,
+              quantity: leg.quantity,
+              isLong: leg.isLong
+            }))
+          }))
+        })
+      });
+      
+      if (!response.ok) {
+        throw new Error(`API request failed: ${response.status}`);
+      }
+      
+      const batchData = await response.json();
+      const { tradeTrackerDB } = await import('../../services/tradeTrackerDB');
+      
       for (const trade of optionTrades) {
         try {
-          // Prepare contract specifications for the dedicated API
-          const contracts = trade.legs.map((leg: OptionLeg) => ({
-            optionType: leg.optionType,
-            strike: leg.strike,
-            expiration: leg.expiration,
-            quantity: leg.quantity,
-            isLong: leg.isLong
-          }));
-
-          // Call the dedicated option price fetching endpoint
-          const response = await fetch(`http://localhost:5000/api/fetch-option-prices/${trade.ticker}`, {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-              contracts: contracts
-            })
-          });
+          const priceData = batchData.results?.[String(trade.id)];
           
-          if (!response.ok) {
-            throw new Error(`API request failed: ${response.status}`);
-          }
-          
-          const priceData = await response.json();
-          
-          if (!priceData.success) {
-            throw new Error(priceData.error || 'Failed to fetch option prices');
+          if (!priceData || !priceData.success) {
+            throw new Error(priceData?.errors?.join(', ') || 'Failed to fetch option prices');
           }
           
           // Extract prices from the response
           const newPrices: {[key: string]: number} = priceData.prices || {};
           
           if (Object.keys(newPrices).length > 0) {
-            // Update the trade in the database with current prices
-            const { tradeTrackerDB } = await import('../../services/tradeTrackerDB');
-            
             // Create updated trade with current prices stored in metadata
             const updatedTrade = {
               ...trade,
@@ -217,9 +218,6 @@ const ActiveTradesPanel: React.FC = () => {
             successCount++;
           }
           
-          // Add a small delay between requests to be respectful to the API
-          await new Promise(resolve => setTimeout(resolve, 500));
-          
         } catch (error) {
           console.error(`Error fetching prices for ${trade.ticker}:`, error);
           errorCount++;